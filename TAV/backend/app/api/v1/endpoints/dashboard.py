@@ -18,6 +18,7 @@ from app.schemas.user import JWTUser
 from app.schemas.workflow import WorkflowDefinition, ExecutionStatus, NodeCategory
 from app.utils.timezone import get_local_now, to_local
 from app.core.execution.orchestrator import get_active_executor
+from app.core.execution.admission import get_admission_controller
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +67,18 @@ async def get_active_executions(
                 "trigger_count": 1,
                 "monitoring_started_at": "...",
                 "recent_execution_count": 5,
-                "last_execution_at": "..."
+                "last_execution_at": "...",
+                "queued_events": 0
+            }
+        ],
+        "queued_executions": [
+            {
+                "execution_id": "...",
+                "workflow_id": "...",
+                "workflow_name": "...",
+                "position": 1,
+                "priority": 5,
+                "waiting_seconds": 3.2
             }
         ]
     }
@@ -178,12 +190,25 @@ async def get_active_executions(
                 "trigger_count": len(trigger_info["trigger_nodes"]),
                 "monitoring_started_at": trigger_info["started_at"].isoformat(),
                 "recent_execution_count": recent_count,
-                "last_execution_at": last_execution.started_at.isoformat() if last_execution and last_execution.started_at else None
+                "last_execution_at": last_execution.started_at.isoformat() if last_execution and last_execution.started_at else None,
+                "queued_events": trigger_manager.queued_counts.get(workflow_id, 0)
+            })
+        
+        # Executions waiting for a slot (admission control)
+        queued_list = []
+        for entry in get_admission_controller().stats()["queue"]:
+            workflow_db = db.query(WorkflowModel)\
+                .filter(WorkflowModel.id == entry["workflow_id"])\
+                .first()
+            queued_list.append({
+                **entry,
+                "workflow_name": workflow_db.name if workflow_db else "Unknown"
             })
         
         return {
             "active_executions": active_list,
             "monitoring_workflows": monitoring_list,
+            "queued_executions": queued_list,
             "timestamp": get_local_now().isoformat()
         }
     
@@ -197,11 +197,10 @@ async def _resume_workflow(interaction: EmailInteraction, edited_draft: Optional
         from app.core.execution.orchestrator import get_active_executor
         from app.core.nodes.builtin.communication.email_approval import EmailApprovalNode
         from app.core.nodes.registry import NodeRegistry
+        from app.core.execution.hibernation import is_hibernated, rehydrate_execution
         
-        # Get active executor
-        executor = get_active_executor(interaction.workflow_id)
-        
-        if not executor:
+        # Execution must still be waiting, in memory or hibernated
+        if not get_active_executor(interaction.workflow_id) and not is_hibernated(db, interaction.execution_id):
             logger.warning(f"⚠️ No active executor found for workflow: {interaction.workflow_id}")
             # Workflow might have timed out or been stopped
             return
@@ -264,6 +263,17 @@ async def _resume_workflow(interaction: EmailInteraction, edited_draft: Optional
             interaction.mark_sent()
             db.commit()
         
+        # Get active executor (no awaits from here on, so it cannot hibernate underneath us)
+        executor = get_active_executor(interaction.workflow_id)
+        
+        if not executor:
+            # Hibernated while waiting for the response - load it back into memory
+            executor = await rehydrate_execution(interaction.execution_id)
+        
+        if not executor:
+            logger.warning(f"⚠️ Execution {interaction.execution_id} could not be resumed")
+            return
+        
         # Update executor context with the final node outputs
         # The ParallelExecutor will handle resuming execution automatically
         from app.utils.timezone import get_local_now
@@ -18,7 +18,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db, get_current_user_smart
+from app.api.deps import get_db, get_current_user_smart, get_trigger_manager
 from app.schemas.user import JWTUser
 from app.database.models.execution import Execution
 from app.database.models.workflow import Workflow
@@ -742,6 +742,71 @@ async def get_sse_stats(
     return stats
 
 
+@router.get(
+    "/pools/stats",
+    summary="Get global resource pool statistics",
+    description="Capacity, usage and per-workflow fair-share state of the process-wide node pools"
+)
+async def get_pool_stats(
+    current_user: JWTUser = Depends(get_current_user_smart)
+):
+    """
+    Get global resource pool statistics.
+
+    Pools are per process: in queue mode each worker reports its own.
+
+    Returns:
+        Per resource class (standard, llm, ai, compute): capacity, slots in use,
+        waiting nodes, and per workflow weight, reservation, cap, usage and
+        average wait
+    """
+    from app.core.execution.resource_pools import get_resource_pools
+
+    return get_resource_pools().stats()
+
+
+@router.get(
+    "/admission/stats",
+    summary="Get admission queue statistics",
+    description="In-flight and queued manual/API executions, with queue positions"
+)
+async def get_admission_stats(
+    current_user: JWTUser = Depends(get_current_user_smart)
+):
+    """
+    Get admission control statistics.
+
+    Returns:
+        Limits, in-flight and queued counts, rejections (HTTP 429), the current
+        Retry-After estimate and the ordered wait queue
+    """
+    from app.core.execution.admission import get_admission_controller
+
+    return get_admission_controller().stats()
+
+
+@router.get(
+    "/triggers/queue/stats",
+    summary="Get trigger queue statistics",
+    description="Depth and age of the durable trigger event queue per workflow"
+)
+async def get_trigger_queue_stats(
+    current_user: JWTUser = Depends(get_current_user_smart),
+    trigger_manager=Depends(get_trigger_manager)
+):
+    """
+    Get trigger event queue statistics.
+
+    Trigger events that arrive while a workflow is at its concurrency limit
+    wait in the event_queue table until a run finishes.
+
+    Returns:
+        Per workflow: queued events, age of the oldest one, running count,
+        limits, overflow policy and events dropped or coalesced since startup
+    """
+    return trigger_manager.get_queue_stats()
+
+
 @router.post(
     "/sse/test/{execution_id}",
     summary="Test SSE event publishing",
@@ -994,6 +1059,21 @@ async def retry_execution(
         skipped_nodes = result.get("skipped_nodes", [])
         warnings = result.get("warnings", [])
         
+        # Step 2a: Queue mode - a worker process runs the prepared retry
+        from app.core.execution.worker import is_queue_backend, enqueue_retry
+        
+        if is_queue_backend():
+            enqueue_retry(db, new_execution_id, result["_original_execution"].workflow_id)
+            
+            return {
+                "success": True,
+                "requires_confirmation": False,
+                "execution_id": new_execution_id,
+                "skipped_nodes": skipped_nodes,
+                "warnings": warnings,
+                "message": f"Retry queued. Skipping {len(skipped_nodes)} completed node(s)."
+            }
+        
         # Step 2: Run execution in background (returns immediately)
         async def run_retry_background():
             """Background task to execute retry"""
@@ -1036,4 +1116,168 @@ async def retry_execution(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Retry failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+def _get_owned_execution(db: Session, execution_id: str, current_user: JWTUser) -> Execution:
+    """
+    Load an execution of one of the current user's workflows.
+    
+    Raises:
+        403: Execution belongs to another user's workflow
+        404: Execution not found
+    """
+    execution = db.query(Execution).filter(Execution.id == execution_id).first()
+    if not execution:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Execution {execution_id} not found"
+        )
+    
+    workflow = db.query(Workflow.owner_id).filter(Workflow.id == execution.workflow_id).first()
+    if not workflow or workflow.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have access to this execution"
+        )
+    
+    return execution
+
+
+@router.post(
+    "/{execution_id}/recover",
+    summary="Resume or fail an execution interrupted by a restart",
+    description="Decide what happens to an execution paused by EXECUTION_RECOVERY_POLICY=ask"
+)
+async def recover_execution(
+    execution_id: str,
+    action: str = Query(
+        default="resume",
+        description="resume (continue from checkpoint) or fail"
+    ),
+    db: Session = Depends(get_db),
+    current_user: JWTUser = Depends(get_current_user_smart)
+):
+    """
+    Resume or fail an execution that was interrupted by a server restart.
+
+    Resuming continues the SAME execution: completed nodes are restored
+    from the durable checkpoint and only the incomplete frontier runs.
+
+    Args:
+        execution_id: Interrupted execution ID
+        action: resume | fail
+        db: Database session
+        current_user: Authenticated user
+
+    Returns:
+        Dict with execution_id and the resulting status
+
+    Raises:
+        400: Execution is not awaiting a recovery decision, or unknown action
+        403: Execution belongs to another user's workflow
+        404: Execution not found
+    """
+    from app.core.execution.orchestrator import WorkflowOrchestrator
+    from app.core.execution.recovery import RECOVERY_KEY
+    from app.schemas.workflow import ExecutionStatus
+    from app.utils.timezone import get_local_now
+
+    execution = _get_owned_execution(db, execution_id, current_user)
+
+    if RECOVERY_KEY not in (execution.execution_metadata or {}):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Execution {execution_id} is not awaiting a recovery decision"
+        )
+
+    if action == "fail":
+        execution.status = ExecutionStatus.FAILED
+        execution.completed_at = get_local_now()
+        execution.error_message = "Execution interrupted by server restart"
+        execution.execution_metadata = {
+            key: value for key, value in execution.execution_metadata.items() if key != RECOVERY_KEY
+        }
+        db.commit()
+        return {"execution_id": execution_id, "status": "failed"}
+
+    if action != "resume":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown action '{action}' (expected resume or fail)"
+        )
+
+    # Queue mode - a worker process resumes the execution
+    from app.core.execution.worker import is_queue_backend, enqueue_resume
+
+    if is_queue_backend():
+        enqueue_resume(db, execution_id, execution.workflow_id)
+        return {"execution_id": execution_id, "status": "queued"}
+
+    async def run_resume_background():
+        """Background task to resume the execution"""
+        from app.database.session import SessionLocal
+        background_db = SessionLocal()
+        try:
+            await WorkflowOrchestrator(background_db).resume_execution(execution_id)
+        except Exception as e:
+            logger.error(f"Background resume of execution {execution_id} failed: {e}", exc_info=True)
+        finally:
+            background_db.close()
+
+    asyncio.create_task(run_resume_background())
+
+    return {"execution_id": execution_id, "status": "running"}
+
+# ============================================================================
+# NODE OUTPUT ARTIFACTS
+# ============================================================================
+
+@router.get(
+    "/{execution_id}/artifacts/{artifact_key}",
+    summary="Get a spilled node output value",
+    description="Resolve an artifact reference ({\"$artifact\": key}) found in node_results, final_outputs or SSE events"
+)
+async def get_execution_artifact(
+    execution_id: str,
+    artifact_key: str,
+    db: Session = Depends(get_db),
+    current_user: JWTUser = Depends(get_current_user_smart)
+):
+    """
+    Get the value behind an artifact reference.
+    
+    Large node outputs are stored in the artifact store and only referenced
+    from execution JSON columns and events; this resolves one reference.
+    
+    Args:
+        execution_id: Execution UUID
+        artifact_key: Artifact digest from the reference
+        db: Database session
+        current_user: Authenticated user
+    
+    Returns:
+        Dict with artifact_key and value
+    
+    Raises:
+        403: Execution belongs to another user's workflow
+        404: Execution or artifact not found
+    """
+    from app.core.execution.artifacts import get_artifact_store
+    from app.core.execution.blocking import run_blocking
+    
+    _get_owned_execution(db, execution_id, current_user)
+    
+    store = get_artifact_store()
+    
+    try:
+        if not await run_blocking(store.is_referenced_by, artifact_key, execution_id):
+            raise FileNotFoundError(artifact_key)
+        value = await run_blocking(store.get, artifact_key)
+    except (FileNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Artifact {artifact_key} not found for execution {execution_id}"
+        )
+    
+    return {"artifact_key": artifact_key, "value": value}
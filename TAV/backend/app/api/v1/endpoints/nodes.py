@@ -4,9 +4,12 @@ Node Definitions API Endpoints
 Provides node type information for the workflow editor.
 """
 
+import gzip
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Query, HTTPException
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+from fastapi import APIRouter, Query, HTTPException, Request, Response
 from pydantic import BaseModel
 
 from app.core.nodes.registry import NodeRegistry
@@ -53,6 +56,7 @@ class NodeRegistryStatusResponse(BaseModel):
 
 @router.get("/definitions", response_model=NodeDefinitionsResponse)
 async def get_node_definitions(
+    request: Request,
     category: Optional[str] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search in name or description")
 ):
@@ -67,6 +71,11 @@ async def get_node_definitions(
     
     Used by the frontend to populate the node sidebar and configure nodes.
     
+    The serialized response is built once per registry version (nodes being
+    registered or hot-reloaded invalidate it) and served with a strong ETag:
+    requests with a matching If-None-Match get 304 Not Modified, and clients
+    accepting gzip get the precompressed body.
+    
     Query Parameters:
     - category: Filter nodes by category (e.g., "ai", "actions", "triggers")
     - search: Search nodes by name or description
@@ -79,71 +88,170 @@ async def get_node_definitions(
     logger.info(f"📋 Fetching node definitions (category={category}, search={search})")
     
     try:
-        # Get all nodes with full details
-        all_nodes = NodeRegistry.list_all_with_details()
-        
-        logger.info(f"Found {len(all_nodes)} registered nodes")
-        
-        # Build node definitions
-        node_definitions = []
-        for node_type, metadata in all_nodes.items():
-            # Apply category filter
-            if category and metadata.get("category") != category:
-                continue
-            
-            # Apply search filter
-            if search:
-                search_lower = search.lower()
-                if (search_lower not in metadata.get("display_name", "").lower() and
-                    search_lower not in metadata.get("description", "").lower()):
-                    continue
-            
-            node_def = NodeDefinition(
-                node_type=node_type,
-                display_name=metadata.get("display_name", node_type),
-                description=metadata.get("description", ""),
-                category=metadata.get("category"),
-                icon=metadata.get("icon"),
-                input_ports=metadata.get("input_ports", []),
-                output_ports=metadata.get("output_ports", []),
-                config_schema=metadata.get("config_schema", {}),
-                class_name=metadata.get("class_name", "")
-            )
-            node_definitions.append(node_def)
-        
-        # Group by category
-        categories = {}
-        for node_def in node_definitions:
-            cat = node_def.category or "uncategorized"
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(node_def)
-        
-        # Registry info
-        registry_info = {
-            "total_categories": len(categories),
-            "available_categories": list(categories.keys()),
-            "nodes_per_category": {cat: len(nodes) for cat, nodes in categories.items()}
-        }
-        
-        logger.info(
-            f"✅ Returning {len(node_definitions)} nodes in {len(categories)} categories"
-        )
-        
-        return NodeDefinitionsResponse(
-            success=True,
-            nodes=node_definitions,
-            categories=categories,
-            registry_info=registry_info,
-            total_nodes=len(node_definitions)
-        )
-    
+        catalog = _get_catalog_body(category, search)
     except Exception as e:
         logger.error(f"❌ Error fetching node definitions: {e}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch node definitions: {str(e)}"
         )
+    
+    use_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    etag = f'"{catalog.digest}-gzip"' if use_gzip else f'"{catalog.digest}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",  # Always revalidate, 304 keeps it cheap
+        "Vary": "Accept-Encoding",
+    }
+    
+    if _etag_matches(request.headers.get("if-none-match"), catalog.digest):
+        logger.debug("Node definitions not modified, returning 304")
+        return Response(status_code=304, headers=headers)
+    
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=catalog.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
+
+
+@dataclass(frozen=True)
+class _CatalogBody:
+    """Serialized node definitions response"""
+    digest: str
+    body: bytes
+    gzip_body: bytes
+
+
+# Serialized responses per (category, search), valid for one registry version
+_catalog_cache: Dict[Tuple[Optional[str], Optional[str]], _CatalogBody] = {}
+_catalog_cache_version: Optional[int] = None
+CATALOG_CACHE_MAX_ENTRIES = 64
+
+
+def _get_catalog_body(category: Optional[str], search: Optional[str]) -> _CatalogBody:
+    """Serialized (and gzipped) node definitions, built once per registry version"""
+    global _catalog_cache_version
+    
+    version = NodeRegistry.get_version()
+    if version != _catalog_cache_version:
+        _catalog_cache.clear()
+        _catalog_cache_version = version
+    
+    key = (category, search)
+    catalog = _catalog_cache.get(key)
+    if catalog is None:
+        body = _build_node_definitions(category, search).model_dump_json().encode("utf-8")
+        catalog = _CatalogBody(
+            digest=hashlib.sha256(body).hexdigest(),
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=9, mtime=0),
+        )
+        if NodeRegistry.get_version() == version:
+            if len(_catalog_cache) >= CATALOG_CACHE_MAX_ENTRIES:
+                _catalog_cache.pop(next(iter(_catalog_cache)))
+            _catalog_cache[key] = catalog
+        logger.info(
+            f"📦 Built node definitions: {len(body)} bytes ({len(catalog.gzip_body)} gzipped), "
+            f"registry version {version}"
+        )
+    return catalog
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (q > 0)"""
+    wildcard = False
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding == "gzip":
+            return quality > 0
+        if coding == "*":
+            wildcard = quality > 0
+    return wildcard
+
+
+def _etag_matches(if_none_match: Optional[str], digest: str) -> bool:
+    """If-None-Match uses weak comparison and matches either encoding of the body"""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag in (f'"{digest}"', f'"{digest}-gzip"'):
+            return True
+    return False
+
+
+def _build_node_definitions(category: Optional[str], search: Optional[str]) -> NodeDefinitionsResponse:
+    """Build the node definitions response from the registry"""
+    # Get all nodes with full details
+    all_nodes = NodeRegistry.list_all_with_details()
+    
+    logger.info(f"Found {len(all_nodes)} registered nodes")
+    
+    # Build node definitions
+    node_definitions = []
+    for node_type, metadata in all_nodes.items():
+        # Apply category filter
+        if category and metadata.get("category") != category:
+            continue
+        
+        # Apply search filter
+        if search:
+            search_lower = search.lower()
+            if (search_lower not in metadata.get("display_name", "").lower() and
+                search_lower not in metadata.get("description", "").lower()):
+                continue
+        
+        node_def = NodeDefinition(
+            node_type=node_type,
+            display_name=metadata.get("display_name", node_type),
+            description=metadata.get("description", ""),
+            category=metadata.get("category"),
+            icon=metadata.get("icon"),
+            input_ports=metadata.get("input_ports", []),
+            output_ports=metadata.get("output_ports", []),
+            config_schema=metadata.get("config_schema", {}),
+            class_name=metadata.get("class_name", "")
+        )
+        node_definitions.append(node_def)
+    
+    # Group by category
+    categories = {}
+    for node_def in node_definitions:
+        cat = node_def.category or "uncategorized"
+        if cat not in categories:
+            categories[cat] = []
+        categories[cat].append(node_def)
+    
+    # Registry info
+    registry_info = {
+        "total_categories": len(categories),
+        "available_categories": list(categories.keys()),
+        "nodes_per_category": {cat: len(nodes) for cat, nodes in categories.items()}
+    }
+    
+    logger.info(
+        f"✅ Returning {len(node_definitions)} nodes in {len(categories)} categories"
+    )
+    
+    return NodeDefinitionsResponse(
+        success=True,
+        nodes=node_definitions,
+        categories=categories,
+        registry_info=registry_info,
+        total_nodes=len(node_definitions)
+    )
 
 
 @router.get("/registry/status", response_model=NodeRegistryStatusResponse)
@@ -193,8 +301,9 @@ async def reload_node_registry():
     Force re-discovery and re-registration of all nodes.
     Useful during development when adding new nodes.
     
-    WARNING: This clears the registry and re-scans all modules.
-    Should only be used in development environments.
+    WARNING: This clears the registry and re-scans all modules (node modules
+    are only imported again if their sources changed since the node manifest
+    was built). Should only be used in development environments.
     
     Returns:
     - Discovery statistics
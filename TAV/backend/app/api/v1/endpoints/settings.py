@@ -164,6 +164,11 @@ async def update_execution_settings(
             updated_by=get_user_identifier(current_user)
         )
         logger.info(f"Execution settings updated by {get_user_identifier(current_user)}")
+        
+        # Trigger concurrency limits are cached from these settings
+        from app.core.execution.trigger_manager import invalidate_trigger_limits
+        invalidate_trigger_limits()
+        
         return updated_settings
     except Exception as e:
         logger.error(f"Failed to update execution settings: {e}", exc_info=True)
@@ -248,6 +248,9 @@ class ExecuteWorkflowResponse(BaseModel):
     error_message: Optional[str] = Field(default=None, description="Error message if failed (sync mode)")
     execution_metadata: Optional[Dict[str, Any]] = Field(default=None, description="Execution metadata (sync mode)")
     timeout_exceeded: Optional[bool] = Field(default=None, description="True if timeout was exceeded (sync mode)")
+    
+    # Admission control (when all execution slots are taken)
+    queue_position: Optional[int] = Field(default=None, description="Position in the admission queue (status=queued)")
 
 
 class StopWorkflowResponse(BaseModel):
@@ -271,6 +274,7 @@ class ExecutionStatusResponse(BaseModel):
     error_message: Optional[str]
     execution_metadata: Optional[Dict[str, Any]]
     node_results: Optional[Dict[str, Any]] = Field(default=None, description="Individual node execution results")
+    queue_position: Optional[int] = Field(default=None, description="Position in the admission queue while waiting for a slot")
 
 
 # --- Helper Functions ---
@@ -651,6 +655,10 @@ async def update_workflow(
             workflow.tags = workflow_update.tags
         if workflow_update.execution_config is not None:
             workflow.execution_config = workflow_update.execution_config
+            
+            # Trigger concurrency limits are cached per workflow
+            from app.core.execution.trigger_manager import invalidate_trigger_limits
+            invalidate_trigger_limits(workflow_id)
         if workflow_update.recommended_await_completion is not None:
             workflow.recommended_await_completion = workflow_update.recommended_await_completion
         
@@ -1135,8 +1143,12 @@ async def execute_workflow(
     Returns:
         Execution/activation info (immediate or after completion)
     
+    Oneshot executions pass admission control: when all execution slots are
+    taken they wait in a bounded queue (status "queued", queue_position).
+    
     Raises:
         404: Workflow not found
+        429: Admission queue full (Retry-After header set)
         500: Execution/activation failed
     """
     logger.info(
@@ -1277,28 +1289,112 @@ async def execute_workflow(
             from app.database.models.execution import Execution
             from app.schemas.workflow import ExecutionStatus
             from app.utils.timezone import get_local_now
+            from app.core.execution.worker import is_queue_backend, enqueue_execution, wait_for_execution
+            from app.core.execution.admission import (
+                get_admission_controller, AdmissionRejected, AdmissionCancelled
+            )
             
             execution_id = str(uuid.uuid4())
             
+            # Admission control (inline mode; workers bound queue mode)
+            admission = None
+            ticket = None
+            if not is_queue_backend():
+                admission = get_admission_controller()
+                admission.configure(execution_settings)
+                try:
+                    ticket = admission.reserve(
+                        execution_id,
+                        workflow_id,
+                        priority=(workflow_db.execution_config or {}).get("priority")
+                    )
+                except AdmissionRejected as e:
+                    logger.warning(f"🚦 Rejected execution of workflow {workflow_id}: {e}")
+                    raise HTTPException(
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        detail=f"Too many executions in progress ({e.queued} queued). Retry after {e.retry_after}s.",
+                        headers={"Retry-After": str(e.retry_after)}
+                    )
+            
             # Create execution record with PENDING status initially
-            execution_db = Execution(
-                id=execution_id,
-                workflow_id=workflow_id,
-                status=ExecutionStatus.PENDING,  # Will be updated to RUNNING when execution starts
-                execution_source="manual",
-                trigger_data=merged_trigger_data,  # Store merged trigger + initial data
-                started_by=user_id,
-                started_at=get_local_now(),
-                execution_mode=request.execution_mode,
-                workflow_snapshot=workflow_db.workflow_data,
-                metadata={}
-            )
-            db.add(execution_db)
-            db.commit()
-            db.refresh(execution_db)
+            try:
+                execution_db = Execution(
+                    id=execution_id,
+                    workflow_id=workflow_id,
+                    status=ExecutionStatus.PENDING,  # Will be updated to RUNNING when execution starts
+                    execution_source="manual",
+                    trigger_data=merged_trigger_data,  # Store merged trigger + initial data
+                    started_by=user_id,
+                    started_at=get_local_now(),
+                    execution_mode=request.execution_mode,
+                    workflow_snapshot=workflow_db.workflow_data,
+                    metadata={}
+                )
+                db.add(execution_db)
+                db.commit()
+                db.refresh(execution_db)
+            except Exception:
+                # Nothing will run - give the admission slot (or queue place) back
+                db.rollback()
+                if admission is not None:
+                    admission.release(execution_id)
+                raise
             
             logger.info(f"Created execution record: {execution_id}")
             
+            if is_queue_backend():
+                # --- QUEUE MODE: Hand execution to a worker process ---
+                enqueue_execution(
+                    db,
+                    execution_id=execution_id,
+                    workflow_id=workflow_id,
+                    trigger_data=merged_trigger_data,
+                    execution_source="manual",
+                    started_by=user_id,
+                    execution_mode=request.execution_mode,
+                    frontend_origin=frontend_origin
+                )
+                
+                if not await_completion:
+                    return ExecuteWorkflowResponse(
+                        workflow_id=workflow_id,
+                        mode="oneshot",
+                        status="pending",
+                        execution_id=execution_id,
+                        message="Workflow execution queued"
+                    )
+                
+                from app.database.session import SessionLocal
+                finished = await wait_for_execution(SessionLocal, execution_id, timeout_seconds)
+                db.refresh(execution_db)
+                
+                if not finished:
+                    return ExecuteWorkflowResponse(
+                        workflow_id=workflow_id,
+                        mode="oneshot",
+                        status=execution_db.status or "pending",
+                        execution_id=execution_id,
+                        message=f"Execution still running after {timeout_seconds}s timeout. Poll /executions/{execution_id} for results.",
+                        timeout_exceeded=True
+                    )
+                
+                duration = None
+                if execution_db.started_at and execution_db.completed_at:
+                    duration = (execution_db.completed_at - execution_db.started_at).total_seconds()
+                
+                return ExecuteWorkflowResponse(
+                    workflow_id=workflow_id,
+                    mode="oneshot",
+                    status=execution_db.status,
+                    execution_id=execution_id,
+                    message=f"Workflow execution {execution_db.status}",
+                    duration_seconds=duration,
+                    final_outputs=execution_db.final_outputs,
+                    error_message=execution_db.error_message,
+                    execution_metadata=execution_db.execution_metadata,
+                    timeout_exceeded=False
+                )
+            
             if not await_completion:
                 # --- ASYNC MODE (Current behavior): Return immediately ---
                 
@@ -1306,6 +1402,9 @@ async def execute_workflow(
                 async def run_execution_background():
                     """Background task to execute workflow"""
                     try:
+                        # Wait for an execution slot (no-op when admitted straight away)
+                        await admission.wait(ticket)
+                        
                         # Small delay to allow SSE connection to establish first
                         # This ensures the frontend receives real-time node_start events
                         await asyncio.sleep(0.3)  # 300ms delay
@@ -1328,7 +1427,13 @@ async def execute_workflow(
                         finally:
                             bg_db.close()
                     except Exception as e:
-                        logger.error(f"Background execution {execution_id} failed: {e}", exc_info=True)
+                        if isinstance(e, AdmissionCancelled):
+                            final_status, error_message = ExecutionStatus.STOPPED, "Execution stopped while queued"
+                        elif isinstance(e, asyncio.TimeoutError) and not ticket.admitted:
+                            final_status, error_message = ExecutionStatus.FAILED, "Timed out waiting for an execution slot"
+                        else:
+                            final_status, error_message = ExecutionStatus.FAILED, str(e)
+                            logger.error(f"Background execution {execution_id} failed: {e}", exc_info=True)
                         # Update execution record to failed status
                         try:
                             from app.database.session import SessionLocal
@@ -1336,18 +1441,32 @@ async def execute_workflow(
                             try:
                                 error_execution = error_db.query(Execution).filter(Execution.id == execution_id).first()
                                 if error_execution:
-                                    error_execution.status = ExecutionStatus.FAILED
-                                    error_execution.error_message = str(e)
+                                    error_execution.status = final_status
+                                    error_execution.error_message = error_message
                                     error_execution.completed_at = get_local_now()
                                     error_db.commit()
                             finally:
                                 error_db.close()
                         except Exception as update_error:
                             logger.error(f"Failed to update execution status: {update_error}")
+                    finally:
+                        admission.release(execution_id)
                 
                 # Start background task
                 asyncio.create_task(run_execution_background())
                 
+                if not ticket.admitted:
+                    queue_position = admission.position(execution_id)
+                    logger.info(f"Oneshot execution queued: {execution_id} (position {queue_position})")
+                    return ExecuteWorkflowResponse(
+                        workflow_id=workflow_id,
+                        mode="oneshot",
+                        status="queued",
+                        execution_id=execution_id,
+                        message=f"All execution slots are busy, queued at position {queue_position}",
+                        queue_position=queue_position
+                    )
+                
                 logger.info(f"Oneshot execution started in background: {execution_id}")
                 
                 return ExecuteWorkflowResponse(
@@ -1362,25 +1481,29 @@ async def execute_workflow(
                 # --- SYNC MODE (NEW): Wait for completion ---
                 logger.info(f"Sync execution: waiting for completion (timeout={timeout_seconds}s)")
                 
-                try:
+                async def admit_and_execute():
+                    """Wait for an execution slot, then run"""
+                    await admission.wait(ticket, timeout=timeout_seconds)
+                    
                     # Small delay to allow SSE connection to establish if client connects
                     await asyncio.sleep(0.1)
                     
                     # Execute workflow and wait (with timeout)
                     orchestrator = WorkflowOrchestrator(db)
                     
-                    await asyncio.wait_for(
-                        orchestrator.execute_workflow(
-                            workflow_id=workflow_id,
-                            trigger_data=merged_trigger_data,
-                            execution_source="manual",
-                            started_by=user_id,
-                            execution_mode=request.execution_mode,
-                            execution_id=execution_id,
-                            frontend_origin=frontend_origin  # Auto-detected from request headers
-                        ),
-                        timeout=timeout_seconds
+                    await orchestrator.execute_workflow(
+                        workflow_id=workflow_id,
+                        trigger_data=merged_trigger_data,
+                        execution_source="manual",
+                        started_by=user_id,
+                        execution_mode=request.execution_mode,
+                        execution_id=execution_id,
+                        frontend_origin=frontend_origin  # Auto-detected from request headers
                     )
+                
+                try:
+                    # The timeout covers time spent queued for admission
+                    await asyncio.wait_for(admit_and_execute(), timeout=timeout_seconds)
                     
                     # Execution completed! Refresh to get latest data
                     db.refresh(execution_db)
@@ -1406,6 +1529,22 @@ async def execute_workflow(
                     )
                 
                 except asyncio.TimeoutError:
+                    if not ticket.admitted:
+                        # Never got a slot - the execution will not run
+                        execution_db.status = ExecutionStatus.FAILED
+                        execution_db.error_message = "Timed out waiting for an execution slot"
+                        execution_db.completed_at = get_local_now()
+                        db.commit()
+                        return ExecuteWorkflowResponse(
+                            workflow_id=workflow_id,
+                            mode="oneshot",
+                            status="failed",
+                            execution_id=execution_id,
+                            message=f"No execution slot became free within {timeout_seconds}s",
+                            error_message=execution_db.error_message,
+                            timeout_exceeded=True
+                        )
+                    
                     # Timeout exceeded - execution still running
                     logger.warning(f"⏱️ Sync execution timeout after {timeout_seconds}s: {execution_id}")
                     
@@ -1440,6 +1579,9 @@ async def execute_workflow(
                         error_message=execution_db.error_message or str(e),
                         execution_metadata=execution_db.metadata
                     )
+                
+                finally:
+                    admission.release(execution_id)
     
     except ValueError as e:
         logger.error(f"Workflow execution failed (ValueError): {e}")
@@ -1531,10 +1673,10 @@ async def stop_workflow(
             db.commit()
             stopped_mode = "persistent"
         
-        # 2. Cancel any running executions (for both oneshot and persistent)
+        # 2. Cancel any running or hibernated executions (for both oneshot and persistent)
         running_executions = db.query(Execution).filter(
             Execution.workflow_id == workflow_id,
-            Execution.status == "running"
+            Execution.status.in_(["running", "paused"])
         ).all()
         
         if running_executions:
@@ -1545,15 +1687,24 @@ async def stop_workflow(
             orchestrator = WorkflowOrchestrator(db)
             for execution in running_executions:
                 try:
-                    await orchestrator.cancel_execution(execution.id)
-                    stopped_count += 1
+                    if await orchestrator.cancel_execution(execution.id):
+                        stopped_count += 1
                 except Exception as e:
                     logger.error(f"Failed to cancel execution {execution.id}: {e}")
             
             if not stopped_mode:
                 stopped_mode = "oneshot"
         
-        # 3. No activity detected
+        # 3. Drop executions still waiting for an execution slot
+        from app.core.execution.admission import get_admission_controller
+        dequeued = get_admission_controller().cancel_workflow(workflow_id)
+        if dequeued:
+            logger.info(f"Removed {len(dequeued)} queued executions of workflow {workflow_id}")
+            stopped_count += len(dequeued)
+            if not stopped_mode:
+                stopped_mode = "oneshot"
+        
+        # 4. No activity detected
         if not stopped_mode:
             logger.info(f"Workflow {workflow_id} is idle, nothing to stop")
             return StopWorkflowResponse(
@@ -1698,6 +1849,8 @@ async def get_execution_status(
         duration = execution_data["completed_at"] - execution_data["started_at"]
         duration_seconds = duration.total_seconds()
     
+    from app.core.execution.admission import get_admission_controller
+    
     return ExecutionStatusResponse(
         execution_id=execution_data["execution_id"],
         workflow_id=execution_data["workflow_id"],
@@ -1709,7 +1862,8 @@ async def get_execution_status(
         final_outputs=execution_data.get("final_outputs"),
         error_message=execution_data.get("error_message"),
         execution_metadata=execution_data.get("execution_metadata"),
-        node_results=execution_data.get("node_results")
+        node_results=execution_data.get("node_results"),
+        queue_position=get_admission_controller().position(execution_id)
     )
 
 
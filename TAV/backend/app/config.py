@@ -187,6 +187,55 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: Optional[str] = Field(default=None, env="CELERY_RESULT_BACKEND")
 
 
+    # Execution Backend
+    # "inline" = executions run inside the API process that received the request
+    # "queue"  = executions are enqueued on event_queue and run by worker processes
+    #            (python -m app.core.execution.worker)
+    EXECUTION_BACKEND: str = Field(default="inline", env="EXECUTION_BACKEND")
+    WORKER_CONCURRENCY: int = Field(default=4, env="WORKER_CONCURRENCY")  # Executions per worker process
+    WORKER_LEASE_SECONDS: int = Field(default=60, env="WORKER_LEASE_SECONDS")
+    WORKER_POLL_INTERVAL: float = Field(default=1.0, env="WORKER_POLL_INTERVAL")
+
+    # Crash Recovery (executions left running by a restart)
+    # "resume" = continue from the durable checkpoint, "fail" = mark failed,
+    # "ask" = pause until a user resumes or fails them
+    EXECUTION_RECOVERY_POLICY: str = Field(default="resume", env="EXECUTION_RECOVERY_POLICY")
+
+    # Paused Executions (waiting for human-in-the-loop responses)
+    HIBERNATE_PAUSED_AFTER: int = Field(default=300, env="HIBERNATE_PAUSED_AFTER")  # Seconds before eviction from memory (0 = never)
+    PAUSED_EXECUTION_TIMEOUT: int = Field(default=1800, env="PAUSED_EXECUTION_TIMEOUT")  # Seconds, unless the interaction sets expires_at
+
+    # Trigger Concurrency (TriggerManager counts runs in memory, corrected from the DB at this interval)
+    TRIGGER_RECONCILE_INTERVAL: float = Field(default=30.0, env="TRIGGER_RECONCILE_INTERVAL")  # Seconds
+
+
+    # Global Resource Pools (node slots shared by every execution in this process, see resource_pools.py)
+    POOL_STANDARD_SLOTS: int = Field(default=64, env="POOL_STANDARD_SLOTS")
+    POOL_LLM_SLOTS: int = Field(default=8, env="POOL_LLM_SLOTS")  # Total concurrent LLM calls
+    POOL_AI_SLOTS: int = Field(default=4, env="POOL_AI_SLOTS")
+
+    # Compute Pool (process pool for CPU-bound nodes with ComputeCapability)
+    COMPUTE_WORKERS: int = Field(default=0, env="COMPUTE_WORKERS")  # 0 = CPU count
+    COMPUTE_TASK_TIMEOUT: float = Field(default=300.0, env="COMPUTE_TASK_TIMEOUT")  # Seconds per task
+    COMPUTE_WARM_WORKERS: bool = Field(default=True, env="COMPUTE_WARM_WORKERS")  # Start workers at startup
+
+    # Blocking Pool (thread pool for synchronous I/O in nodes, see @blocking)
+    BLOCKING_THREADS: int = Field(default=16, env="BLOCKING_THREADS")
+    LOOP_STALL_DETECTION: bool = Field(default=False, env="LOOP_STALL_DETECTION")  # Debug: log code that blocks the event loop
+    LOOP_STALL_THRESHOLD: float = Field(default=0.25, env="LOOP_STALL_THRESHOLD")  # Seconds
+
+    # Node Result Cache (memoized outputs of nodes with cache_results enabled)
+    NODE_CACHE_MAX_BYTES: int = Field(default=536870912, env="NODE_CACHE_MAX_BYTES")  # 512 MB total, LRU eviction
+    NODE_CACHE_MAX_ENTRY_BYTES: int = Field(default=10485760, env="NODE_CACHE_MAX_ENTRY_BYTES")  # 10 MB per entry
+
+    # Processed-File Index (files seen by file polling triggers, processed_files table)
+    PROCESSED_FILE_RETENTION_DAYS: int = Field(default=30, env="PROCESSED_FILE_RETENTION_DAYS")  # Keep rows of moved/deleted files this long
+    PROCESSED_FILE_MAX_ENTRIES: int = Field(default=100000, env="PROCESSED_FILE_MAX_ENTRIES")  # Per trigger node, oldest moved/deleted rows go first
+
+    # Node Manifest (cached node metadata, node modules are imported on first use)
+    NODE_MANIFEST_PATH: str = Field(default="./data/node_manifest.json", env="NODE_MANIFEST_PATH")  # Empty = import every node module at startup
+
+
     # Security & Encryption
     ENCRYPTION_KEY: str = Field(
         default="dev-encryption-key-change-prod-32b",
@@ -0,0 +1,247 @@
+"""
+Admission Control for Manual and API Executions
+
+POST /workflows/{id}/execute used to start an orchestrator task for every
+request, so a burst of API calls could launch hundreds of concurrent
+executions and exhaust the DB connection pool. Oneshot executions started
+from the API now pass through a process-wide admission controller:
+
+- At most max_concurrent_runs_global executions run at once
+- Up to max_queued_runs_global more wait in a bounded queue, ordered by
+  workflow priority (execution_config["priority"], 1=highest) when
+  use_priority_queue is on, otherwise first in, first out
+- Beyond that the request is rejected (HTTP 429 with Retry-After, estimated
+  from recent execution durations)
+- A queued execution that waits longer than queue_timeout fails
+
+All limits are execution settings (database). Trigger-driven executions are
+bounded by TriggerManager and queue-mode executions by the workers, so
+neither goes through this controller.
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_PRIORITY = 5
+DEFAULT_RUN_SECONDS = 10.0
+
+
+class AdmissionRejected(Exception):
+    """The wait queue is full; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int, queued: int):
+        self.retry_after = retry_after
+        self.queued = queued
+        super().__init__(f"Execution queue is full ({queued} waiting), retry after {retry_after}s")
+
+
+class AdmissionCancelled(Exception):
+    """A queued execution was stopped before it got a slot."""
+
+
+@dataclass
+class AdmissionTicket:
+    """An execution's place in the admission controller"""
+    execution_id: str
+    workflow_id: str
+    priority: int
+    seq: int
+    enqueued_at: float
+    future: Optional[asyncio.Future] = None  # None when admitted straight away
+    admitted_at: Optional[float] = None
+
+    @property
+    def admitted(self) -> bool:
+        return self.admitted_at is not None
+
+
+@dataclass
+class _Limits:
+    max_in_flight: int = 8
+    max_queued: int = 100
+    priority_queue: bool = True
+    queue_timeout: Optional[float] = None
+
+
+class AdmissionController:
+    """
+    Bounds in-flight manual/API executions and queues the overflow.
+    """
+
+    def __init__(self, max_in_flight: int = 8, max_queued: int = 100, priority_queue: bool = True):
+        self.limits = _Limits(max_in_flight, max_queued, priority_queue)
+        self.in_flight: Dict[str, AdmissionTicket] = {}
+        self.queue: Dict[str, AdmissionTicket] = {}
+        self._counter = itertools.count()
+        self._avg_run_seconds: Optional[float] = None
+        self.rejected = 0
+
+    def configure(self, execution_settings: Any):
+        """Apply limits from ExecutionSettings (read per request, so changes apply live)"""
+        self.limits.max_in_flight = max(1, execution_settings.max_concurrent_runs_global)
+        self.limits.max_queued = max(0, execution_settings.max_queued_runs_global)
+        self.limits.priority_queue = execution_settings.use_priority_queue
+        self.limits.queue_timeout = execution_settings.queue_timeout
+        self._dispatch()
+
+    # ==================== Admission ====================
+
+    def reserve(self, execution_id: str, workflow_id: str, priority: Optional[int] = None) -> AdmissionTicket:
+        """
+        Admit an execution or place it in the wait queue.
+
+        Must be called from the event loop.
+
+        Raises:
+            AdmissionRejected: If the queue is full
+        """
+        ticket = AdmissionTicket(
+            execution_id=execution_id,
+            workflow_id=workflow_id,
+            priority=priority or DEFAULT_PRIORITY,
+            seq=next(self._counter),
+            enqueued_at=time.monotonic(),
+        )
+
+        if len(self.in_flight) < self.limits.max_in_flight and not self.queue:
+            self._admit(ticket)
+            return ticket
+
+        if len(self.queue) >= self.limits.max_queued:
+            self.rejected += 1
+            raise AdmissionRejected(self.retry_after(), len(self.queue))
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self.queue[execution_id] = ticket
+        logger.info(
+            f"⏳ Execution {execution_id} queued for admission "
+            f"(position {self.position(execution_id)}, {len(self.in_flight)} running)"
+        )
+        return ticket
+
+    async def wait(self, ticket: AdmissionTicket, timeout: Optional[float] = None):
+        """
+        Wait until a queued ticket is admitted.
+
+        Raises:
+            asyncio.TimeoutError: Still queued after `timeout` (default queue_timeout)
+            AdmissionCancelled: Stopped while queued
+        """
+        if ticket.admitted:
+            return
+        timeout = timeout if timeout is not None else self.limits.queue_timeout
+        try:
+            await asyncio.wait_for(asyncio.shield(ticket.future), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            if not ticket.admitted:
+                self.queue.pop(ticket.execution_id, None)
+            raise
+
+    def release(self, execution_id: str):
+        """Free the slot of a finished execution (no-op for unknown IDs)"""
+        ticket = self.in_flight.pop(execution_id, None)
+        if ticket is None:
+            self.queue.pop(execution_id, None)
+            return
+        run_seconds = time.monotonic() - ticket.admitted_at
+        self._avg_run_seconds = run_seconds if self._avg_run_seconds is None else (
+            0.2 * run_seconds + 0.8 * self._avg_run_seconds
+        )
+        self._dispatch()
+
+    def cancel(self, execution_id: str) -> bool:
+        """Remove a queued execution; its waiter raises AdmissionCancelled"""
+        ticket = self.queue.pop(execution_id, None)
+        if ticket is None:
+            return False
+        if not ticket.future.done():
+            ticket.future.set_exception(AdmissionCancelled(execution_id))
+        return True
+
+    def cancel_workflow(self, workflow_id: str) -> List[str]:
+        """Remove every queued execution of a workflow"""
+        execution_ids = [t.execution_id for t in self.queue.values() if t.workflow_id == workflow_id]
+        for execution_id in execution_ids:
+            self.cancel(execution_id)
+        return execution_ids
+
+    # ==================== Visibility ====================
+
+    def position(self, execution_id: str) -> Optional[int]:
+        """1-based queue position (None if not queued)"""
+        if execution_id not in self.queue:
+            return None
+        ordered = self._ordered_queue()
+        return next(i for i, ticket in enumerate(ordered, start=1) if ticket.execution_id == execution_id)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to be free for a new request"""
+        avg = self._avg_run_seconds or DEFAULT_RUN_SECONDS
+        waves = (len(self.queue) + 1) / self.limits.max_in_flight
+        return max(1, min(3600, math.ceil(avg * waves)))
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "max_in_flight": self.limits.max_in_flight,
+            "max_queued": self.limits.max_queued,
+            "order": "priority" if self.limits.priority_queue else "fifo",
+            "in_flight": len(self.in_flight),
+            "queued": len(self.queue),
+            "rejected": self.rejected,
+            "avg_run_seconds": round(self._avg_run_seconds, 2) if self._avg_run_seconds else None,
+            "retry_after": self.retry_after(),
+            "queue": [
+                {
+                    "execution_id": ticket.execution_id,
+                    "workflow_id": ticket.workflow_id,
+                    "position": position,
+                    "priority": ticket.priority,
+                    "waiting_seconds": round(now - ticket.enqueued_at, 1),
+                }
+                for position, ticket in enumerate(self._ordered_queue(), start=1)
+            ],
+        }
+
+    # ==================== Internal ====================
+
+    def _ordered_queue(self) -> List[AdmissionTicket]:
+        if self.limits.priority_queue:
+            return sorted(self.queue.values(), key=lambda t: (t.priority, t.seq))
+        return sorted(self.queue.values(), key=lambda t: t.seq)
+
+    def _admit(self, ticket: AdmissionTicket):
+        ticket.admitted_at = time.monotonic()
+        self.in_flight[ticket.execution_id] = ticket
+
+    def _dispatch(self):
+        while len(self.in_flight) < self.limits.max_in_flight and self.queue:
+            ticket = self._ordered_queue()[0]
+            del self.queue[ticket.execution_id]
+            if ticket.future.done():
+                continue
+            self._admit(ticket)
+            ticket.future.set_result(True)
+            logger.info(
+                f"✅ Execution {ticket.execution_id} admitted after "
+                f"{ticket.admitted_at - ticket.enqueued_at:.1f}s in queue"
+            )
+
+
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the process-wide admission controller"""
+    global _admission_controller
+    if _admission_controller is None:
+        _admission_controller = AdmissionController()
+    return _admission_controller
@@ -0,0 +1,342 @@
+"""
+Artifact Store for Large Node Outputs
+
+Node outputs above a size threshold (CSV rows, base64 media, long LLM
+transcripts, ...) are spilled to a content-addressed store instead of being
+written inline into executions.node_results / final_outputs and SSE events.
+
+Design:
+- Values are JSON-serialized and stored once per SHA-256 digest
+  (data/node_outputs/<aa>/<digest>.json); identical outputs share a file
+- The execution_results table is the index (result_type="artifact",
+  artifact_key=<digest>), so artifacts follow execution deletion (CASCADE)
+- JSON columns and events only carry a lightweight reference:
+      {"$artifact": "<digest>", "size_bytes": 123456, "preview": "..."}
+- References are resolved lazily when a downstream node assembles its inputs
+  or an API reader asks for the value
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+ARTIFACT_REF_KEY = "$artifact"
+ARTIFACT_RESULT_TYPE = "artifact"
+ARTIFACT_CATEGORY = "node_output"
+PREVIEW_CHARS = 200
+
+# Default spill threshold (execution_config["max_inline_bytes"] overrides)
+DEFAULT_MAX_INLINE_BYTES = 1048576
+
+
+def is_artifact_ref(value: Any) -> bool:
+    """Check if a value is an artifact reference."""
+    return isinstance(value, dict) and ARTIFACT_REF_KEY in value
+
+
+class ArtifactStore:
+    """
+    Content-addressed store for large node output values.
+
+    Storage is the local filesystem; execution_results rows index which
+    executions reference which artifacts.
+    """
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        """
+        Initialize artifact store.
+
+        Args:
+            base_path: Storage directory (default: data/node_outputs)
+            session_factory: Factory for DB sessions (default: SessionLocal)
+        """
+        if session_factory is None:
+            from app.database.session import SessionLocal
+            session_factory = SessionLocal
+
+        self.base_path = Path(base_path) if base_path else Path("data") / "node_outputs"
+        self.session_factory = session_factory
+
+    # ==================== WRITE ====================
+
+    def spill_outputs(
+        self,
+        outputs: Dict[str, Any],
+        execution_id: str,
+        max_inline_bytes: int = DEFAULT_MAX_INLINE_BYTES,
+        workflow_id: Optional[str] = None,
+        node_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Replace large port values with artifact references.
+
+        Args:
+            outputs: Node outputs (port → value); not modified
+            execution_id: Execution the outputs belong to
+            max_inline_bytes: Values whose JSON exceeds this are spilled (0 = never)
+            workflow_id: Workflow UUID (for the index row)
+            node_id: Producing node (for the index row)
+
+        Returns:
+            Outputs dict safe to persist/broadcast (same object if nothing was spilled)
+        """
+        if not outputs or max_inline_bytes <= 0 or not isinstance(outputs, dict):
+            return outputs
+
+        spilled = None
+
+        for port, value in outputs.items():
+            if value is None or isinstance(value, (bool, int, float)) or is_artifact_ref(value):
+                continue
+            if isinstance(value, str) and len(value) <= max_inline_bytes // 4:
+                # Cheap skip: even 4-byte UTF-8 chars cannot exceed the limit
+                continue
+
+            try:
+                payload = json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+            except (TypeError, ValueError) as e:
+                logger.debug(f"Output {node_id}.{port} is not JSON-serializable, kept inline: {e}")
+                continue
+
+            if len(payload) <= max_inline_bytes:
+                continue
+
+            try:
+                ref = self.put_bytes(
+                    payload,
+                    execution_id=execution_id,
+                    workflow_id=workflow_id,
+                    description=f"{node_id}.{port}" if node_id else port,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to spill output {node_id}.{port} to artifact store: {e}")
+                continue
+
+            if spilled is None:
+                spilled = dict(outputs)
+            spilled[port] = ref
+
+        return outputs if spilled is None else spilled
+
+    def put(self, value: Any, execution_id: str, **kwargs) -> Dict[str, Any]:
+        """
+        Store a JSON-serializable value.
+
+        Args:
+            value: Value to store
+            execution_id: Execution referencing the artifact
+            **kwargs: workflow_id, description (see put_bytes)
+
+        Returns:
+            Artifact reference
+        """
+        payload = json.dumps(value, default=str, ensure_ascii=False).encode("utf-8")
+        return self.put_bytes(payload, execution_id=execution_id, **kwargs)
+
+    def put_bytes(
+        self,
+        payload: bytes,
+        execution_id: str,
+        workflow_id: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Store serialized JSON and index it for an execution.
+
+        Args:
+            payload: UTF-8 JSON bytes
+            execution_id: Execution referencing the artifact
+            workflow_id: Workflow UUID
+            description: What the artifact is (e.g., "node_id.port")
+
+        Returns:
+            Artifact reference
+        """
+        key = hashlib.sha256(payload).hexdigest()
+        path = self._path_for(key)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+            logger.debug(f"📦 Stored artifact {key[:12]} ({len(payload)} bytes)")
+
+        self._index(key, path, len(payload), execution_id, workflow_id, description)
+
+        preview = payload[:PREVIEW_CHARS * 4].decode("utf-8", errors="ignore")[:PREVIEW_CHARS]
+        return {
+            ARTIFACT_REF_KEY: key,
+            "size_bytes": len(payload),
+            "content_type": "application/json",
+            "preview": preview,
+        }
+
+    # ==================== READ ====================
+
+    def get(self, ref_or_key: Any) -> Any:
+        """
+        Load an artifact value.
+
+        Args:
+            ref_or_key: Artifact reference dict or digest
+
+        Returns:
+            Stored value
+
+        Raises:
+            FileNotFoundError: If the artifact no longer exists
+        """
+        key = ref_or_key[ARTIFACT_REF_KEY] if is_artifact_ref(ref_or_key) else str(ref_or_key)
+        path = self._path_for(key)
+
+        with open(path, "rb") as f:
+            return json.loads(f.read().decode("utf-8"))
+
+    def resolve(self, value: Any) -> Any:
+        """Load the value behind an artifact reference (other values pass through)."""
+        if is_artifact_ref(value):
+            return self.get(value)
+        return value
+
+    def resolve_outputs(self, outputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Resolve every artifact reference in a node outputs dict."""
+        if not isinstance(outputs, dict) or not any(is_artifact_ref(v) for v in outputs.values()):
+            return outputs
+        return {port: self.resolve(value) for port, value in outputs.items()}
+
+    def is_referenced_by(self, key: str, execution_id: str) -> bool:
+        """Check if an execution references an artifact (access control for API readers)."""
+        from app.database.models.execution_result import ExecutionResult
+
+        db = self.session_factory()
+        try:
+            return db.query(ExecutionResult.id).filter(
+                ExecutionResult.execution_id == execution_id,
+                ExecutionResult.result_type == ARTIFACT_RESULT_TYPE,
+                ExecutionResult.artifact_key == key,
+            ).first() is not None
+        finally:
+            db.close()
+
+    # ==================== MAINTENANCE ====================
+
+    def cleanup_unreferenced(self, min_age_seconds: int = 3600) -> Dict[str, int]:
+        """
+        Delete stored artifacts that no execution references anymore.
+
+        Args:
+            min_age_seconds: Skip files younger than this (their index row
+                             may not be committed yet)
+
+        Returns:
+            Stats dict: files_removed, space_freed_bytes
+        """
+        from app.database.models.execution_result import ExecutionResult
+
+        stats = {"files_removed": 0, "space_freed_bytes": 0}
+        if not self.base_path.exists():
+            return stats
+
+        db = self.session_factory()
+        try:
+            referenced = {
+                row[0] for row in db.query(ExecutionResult.artifact_key).filter(
+                    ExecutionResult.result_type == ARTIFACT_RESULT_TYPE
+                ).distinct().all()
+            }
+        finally:
+            db.close()
+
+        cutoff = time.time() - min_age_seconds
+
+        for path in self.base_path.rglob("*.json"):
+            if path.stem in referenced:
+                continue
+            try:
+                stat = path.stat()
+                if stat.st_mtime > cutoff:
+                    continue
+                size = stat.st_size
+                path.unlink()
+                stats["files_removed"] += 1
+                stats["space_freed_bytes"] += size
+            except OSError as e:
+                logger.error(f"❌ Failed to delete unreferenced artifact {path}: {e}")
+
+        if stats["files_removed"]:
+            logger.info(
+                f"✅ Removed {stats['files_removed']} unreferenced node output artifacts "
+                f"({stats['space_freed_bytes'] / (1024*1024):.2f} MB)"
+            )
+
+        return stats
+
+    # ==================== INTERNAL ====================
+
+    def _path_for(self, key: str) -> Path:
+        """Storage path for a digest (sharded by the first two hex chars)."""
+        if len(key) != 64 or any(c not in "0123456789abcdef" for c in key):
+            raise ValueError(f"Invalid artifact key: {key!r}")
+        return self.base_path / key[:2] / f"{key}.json"
+
+    def _index(
+        self,
+        key: str,
+        path: Path,
+        size: int,
+        execution_id: str,
+        workflow_id: Optional[str],
+        description: Optional[str]
+    ):
+        """Record that an execution references an artifact (once per execution)."""
+        from app.database.models.execution_result import ExecutionResult
+
+        db = self.session_factory()
+        try:
+            exists = db.query(ExecutionResult.id).filter(
+                ExecutionResult.execution_id == execution_id,
+                ExecutionResult.result_type == ARTIFACT_RESULT_TYPE,
+                ExecutionResult.artifact_key == key,
+            ).first()
+
+            if not exists:
+                db.add(ExecutionResult(
+                    execution_id=execution_id,
+                    workflow_id=workflow_id,
+                    result_type=ARTIFACT_RESULT_TYPE,
+                    artifact_key=key,
+                    artifact_category=ARTIFACT_CATEGORY,
+                    file_path=str(path),
+                    file_size_bytes=size,
+                    mime_type="application/json",
+                    description=description,
+                ))
+                db.commit()
+        finally:
+            db.close()
+
+
+# Global artifact store instance
+_artifact_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Get the process-wide artifact store."""
+    global _artifact_store
+    if _artifact_store is None:
+        _artifact_store = ArtifactStore()
+    return _artifact_store
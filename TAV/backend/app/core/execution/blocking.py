@@ -0,0 +1,257 @@
+"""
+Blocking Pool for Synchronous Node Code
+
+Many node libraries are synchronous (smtplib, imaplib, PyMuPDF, sync
+SQLAlchemy). Calling them directly inside `async def execute` freezes the
+event loop - and with it every other running execution, trigger and API
+request in the process.
+
+This module provides:
+- A bounded thread pool for blocking sections (run_blocking)
+- The @blocking decorator: turns a sync function/method into an awaitable
+  that runs in that pool (use on helpers, or on a whole sync `execute`)
+- LoopStallDetector: debug watchdog that logs the node (and stack) that
+  blocked the event loop longer than a threshold
+
+Contract:
+- Blocking code runs in a worker thread: it must not touch asyncio objects
+  (queues, events, the execution context's locks) or await anything
+- Use ComputeCapability/run_in_process instead for CPU-bound work (threads
+  do not help against the GIL)
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingPool:
+    """Bounded thread pool for blocking I/O sections."""
+
+    def __init__(self, max_threads: Optional[int] = None):
+        """
+        Initialize blocking pool.
+
+        Args:
+            max_threads: Worker threads (default: BLOCKING_THREADS)
+        """
+        threads = settings.BLOCKING_THREADS if max_threads is None else max_threads
+        self.max_threads = max(1, threads or 1)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_threads,
+                thread_name_prefix="tav-blocking"
+            )
+            logger.info(f"🧵 Blocking pool started ({self.max_threads} thread(s))")
+        return self._executor
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking function in a worker thread.
+
+        Context variables are copied into the thread (like asyncio.to_thread).
+
+        Args:
+            func: Synchronous callable
+            *args, **kwargs: Arguments
+
+        Returns:
+            Function result
+        """
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), call)
+
+    def shutdown(self, wait: bool = True):
+        """Stop all worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("🧵 Blocking pool stopped")
+
+
+# Global blocking pool instance
+_blocking_pool: Optional[BlockingPool] = None
+
+
+def get_blocking_pool() -> BlockingPool:
+    """Get the process-wide blocking pool."""
+    global _blocking_pool
+    if _blocking_pool is None:
+        _blocking_pool = BlockingPool()
+    return _blocking_pool
+
+
+def shutdown_blocking_pool():
+    """Stop the process-wide blocking pool (if it was started)."""
+    global _blocking_pool
+    if _blocking_pool is not None:
+        _blocking_pool.shutdown()
+        _blocking_pool = None
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking function in the process-wide blocking pool."""
+    return await get_blocking_pool().run(func, *args, **kwargs)
+
+
+def blocking(func: Callable) -> Callable:
+    """
+    Decorator: run a synchronous function in the blocking pool.
+
+    The decorated function becomes awaitable; works on plain functions and
+    methods (including a node's whole `execute`).
+
+    Usage:
+        class MyNode(Node):
+            @blocking
+            def _send(self, message):
+                smtp.sendmail(...)   # runs in a worker thread
+
+            async def execute(self, input_data):
+                await self._send(message)
+    """
+    if asyncio.iscoroutinefunction(func):
+        raise TypeError(f"@blocking expects a synchronous function, got coroutine function {func.__qualname__}")
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(func, *args, **kwargs)
+
+    wrapper.__blocking__ = True
+    return wrapper
+
+
+# ==================== Event Loop Stall Detection ====================
+
+class LoopStallDetector:
+    """
+    Debug watchdog for code that blocks the event loop.
+
+    A watchdog thread pings the loop every `interval` seconds. If the ping is
+    not answered within `threshold`, the loop thread's current stack is
+    captured and logged together with the node that is running it (found by
+    walking the stack for a Node instance).
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        threshold: Optional[float] = None,
+        interval: Optional[float] = None,
+        max_reports: int = 50
+    ):
+        """
+        Initialize stall detector.
+
+        Args:
+            loop: Event loop to watch
+            threshold: Seconds the loop may be unresponsive (default: LOOP_STALL_THRESHOLD)
+            interval: Seconds between pings (default: threshold / 2)
+            max_reports: Recent stall reports kept in memory
+        """
+        self.loop = loop
+        self.threshold = settings.LOOP_STALL_THRESHOLD if threshold is None else threshold
+        self.interval = interval if interval is not None else max(self.threshold / 2, 0.01)
+        self.reports: deque = deque(maxlen=max_reports)
+        self._loop_thread_id: Optional[int] = None
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start watching. Must be called from the loop's thread."""
+        if self._thread is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._watch, name="tav-loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(f"🐢 Event loop stall detector started (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        """Stop watching."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+            self._thread = None
+
+    def _watch(self):
+        while not self._stopped.wait(self.interval):
+            answered = threading.Event()
+            pinged_at = time.monotonic()
+            try:
+                self.loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # Loop closed
+
+            if answered.wait(self.threshold):
+                continue
+
+            report = self._capture()
+            # Wait for the loop to recover before pinging again
+            while not answered.wait(self.interval):
+                if self._stopped.is_set():
+                    return
+            report["duration"] = round(time.monotonic() - pinged_at, 3)
+            self.reports.append(report)
+            logger.warning(
+                f"🐢 Event loop blocked for {report['duration']:.2f}s by {report['node'] or 'non-node code'}"
+            )
+
+    def _capture(self) -> Dict[str, Any]:
+        """Capture and log the loop thread's stack while it is blocked."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+        node = _find_node(frame)
+
+        logger.warning(
+            f"🐢 Event loop blocked > {self.threshold * 1000:.0f}ms by {node or 'non-node code'}:\n{stack}"
+        )
+        return {"node": node, "stack": stack, "detected_at": time.time()}
+
+
+def _find_node(frame) -> Optional[str]:
+    """Describe the innermost Node instance on a stack (if any)."""
+    from app.core.nodes.base import Node
+
+    while frame is not None:
+        candidate = frame.f_locals.get("self")
+        if isinstance(candidate, Node):
+            return f"{candidate.node_type} ({candidate.node_id})"
+        frame = frame.f_back
+    return None
+
+
+# Global stall detector instance
+_stall_detector: Optional[LoopStallDetector] = None
+
+
+def start_stall_detector(threshold: Optional[float] = None) -> LoopStallDetector:
+    """Start the stall detector on the running loop (idempotent)."""
+    global _stall_detector
+    if _stall_detector is None:
+        _stall_detector = LoopStallDetector(asyncio.get_running_loop(), threshold=threshold)
+        _stall_detector.start()
+    return _stall_detector
+
+
+def stop_stall_detector():
+    """Stop the stall detector (if running)."""
+    global _stall_detector
+    if _stall_detector is not None:
+        _stall_detector.stop()
+        _stall_detector = None
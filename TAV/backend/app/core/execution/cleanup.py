@@ -1,68 +1,118 @@
 """
 Execution Cleanup Utilities
 
-Handles cleanup of orphaned executions after server restarts.
+Handles orphaned executions after server restarts.
 """
 
 import logging
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Set
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database.models.execution import Execution
+from app.core.execution.recovery import RECOVERY_POLICIES, RECOVERY_KEY, get_checkpoint
+from app.utils.timezone import get_local_now
 
 logger = logging.getLogger(__name__)
 
 
-def cleanup_orphaned_executions_on_startup(db: Session) -> List[str]:
+def cleanup_orphaned_executions_on_startup(db: Session, policy: Optional[str] = None) -> Dict[str, List[str]]:
     """
-    Cleanup orphaned executions from previous server session.
-    
+    Handle orphaned executions from previous server session.
+
     When the server restarts (crash, manual restart, etc.), ALL executions
     marked as 'running' or 'pending' are orphaned - the executor process is gone.
-    We need to mark them as failed so the UI doesn't try to reconnect to them.
-    
-    This is safe because:
-    - If server just started, those executions CANNOT be running
-    - They're remnants from the previous server session
-    - Trigger-based workflows will restart on next trigger
-    - One-shot workflows are truly dead
-    
+    What happens to them depends on the recovery policy:
+
+    - "resume": left RUNNING and returned, the caller resumes them from their
+      durable checkpoint (WorkflowOrchestrator.resume_execution)
+    - "fail": marked as failed so the UI doesn't try to reconnect to them
+    - "ask": marked as paused until a user resumes or fails them
+
+    Executions without a workflow snapshot cannot be rebuilt and are always
+    failed. With EXECUTION_BACKEND=queue, executions whose job is still on
+    the queue are left alone - a worker (re)claims them when its lease expires.
+
     Args:
         db: Database session
-        
+        policy: resume | fail | ask (default: EXECUTION_RECOVERY_POLICY)
+
     Returns:
-        List of execution IDs that were cleaned up
+        Dict with execution IDs per outcome: resume, failed, awaiting_decision
     """
+    policy = (policy or settings.EXECUTION_RECOVERY_POLICY).lower()
+    if policy not in RECOVERY_POLICIES:
+        logger.warning(f"⚠️  Unknown execution recovery policy '{policy}', using 'fail'")
+        policy = "fail"
+
+    outcome = {"resume": [], "failed": [], "awaiting_decision": []}
+
     # Find ALL running/pending executions (they're all orphaned if server just started)
     orphaned = db.query(Execution).filter(
         Execution.status.in_(['pending', 'running']),
         Execution.completed_at.is_(None)
     ).all()
-    
+
+    queued = _get_queued_execution_ids(db)
+    orphaned = [execution for execution in orphaned if execution.id not in queued]
+
     if not orphaned:
         logger.info("✅ No orphaned executions from previous session")
-        return []
-    
-    logger.warning(f"🔍 Found {len(orphaned)} orphaned execution(s) from previous session")
-    
-    cleaned_ids = []
+        return outcome
+
+    logger.warning(f"🔍 Found {len(orphaned)} orphaned execution(s) from previous session (policy={policy})")
+
     for exec in orphaned:
-        age = datetime.now() - exec.started_at if exec.started_at else None
+        age = datetime.now() - exec.started_at.replace(tzinfo=None) if exec.started_at else None
+        checkpoint = get_checkpoint(exec.execution_metadata)
         logger.warning(
             f"  • Execution {exec.id} (workflow={exec.workflow_id}): "
-            f"orphaned in '{exec.status}' state{f', age: {age}' if age else ''}"
+            f"orphaned in '{exec.status}' state{f', age: {age}' if age else ''}, "
+            f"{len(exec.node_results or {})} node result(s)"
         )
-        
-        # Mark as failed
-        exec.status = "failed"
-        exec.completed_at = datetime.now()
-        exec.error = "Execution interrupted by server restart"
-        
-        cleaned_ids.append(exec.id)
-    
+
+        if policy == "fail" or not exec.workflow_snapshot:
+            # Mark as failed
+            exec.status = "failed"
+            exec.completed_at = datetime.now()
+            exec.error_message = "Execution interrupted by server restart"
+            outcome["failed"].append(exec.id)
+
+        elif policy == "ask":
+            exec.status = "paused"
+            exec.execution_metadata = {
+                **(exec.execution_metadata or {}),
+                RECOVERY_KEY: {
+                    "state": "awaiting_decision",
+                    "interrupted_at": get_local_now().isoformat(),
+                    "has_checkpoint": bool(checkpoint),
+                }
+            }
+            outcome["awaiting_decision"].append(exec.id)
+
+        else:
+            outcome["resume"].append(exec.id)
+
     db.commit()
-    logger.info(f"✅ Cleaned up {len(cleaned_ids)} orphaned execution(s)")
-    
-    return cleaned_ids
+    logger.info(
+        f"✅ Orphaned executions: {len(outcome['resume'])} to resume, "
+        f"{len(outcome['failed'])} failed, {len(outcome['awaiting_decision'])} awaiting decision"
+    )
 
+    return outcome
+
+
+def _get_queued_execution_ids(db: Session) -> Set[str]:
+    """Execution IDs that still have an open job on the execution queue."""
+    from app.core.execution.worker import is_queue_backend, EXECUTION_EVENT_TYPES
+    from app.database.models.event_queue import EventQueue
+
+    if not is_queue_backend():
+        return set()
+
+    rows = db.query(EventQueue.event_data).filter(
+        EventQueue.event_type.in_(EXECUTION_EVENT_TYPES),
+        EventQueue.status.in_(['pending', 'processing'])
+    ).all()
+    return {(data or {}).get("execution_id") for (data,) in rows} - {None}
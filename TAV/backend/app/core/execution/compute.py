@@ -0,0 +1,178 @@
+"""
+Compute Pool for CPU-Bound Node Work
+
+Nodes with ComputeCapability run their heavy sections (PDF rendering,
+pandas parsing, simulations) in a managed ProcessPoolExecutor instead of on
+the event loop, so one large file cannot freeze every other execution.
+
+Contract:
+- The function must be importable at module level (no lambdas, closures or
+  bound methods) - it is pickled by reference
+- Arguments and return values must be picklable (plain data, paths, dicts)
+- Workers are separate processes: no access to the DB session, event loop
+  or execution context of the caller
+
+Design:
+- One process pool per API/worker process, created lazily or warmed at startup
+- Workers use the "spawn" start method (forking a process that runs an
+  event loop and DB pools is unsafe)
+- Per-task timeout: a task that exceeds it has its worker pool recycled
+  (the stuck process is terminated); tasks that were running on the old
+  pool are retried once on the new one
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up() -> int:
+    """No-op task used to start worker processes ahead of time."""
+    return os.getpid()
+
+
+class ComputePool:
+    """Managed process pool for CPU-bound node sections."""
+
+    def __init__(self, max_workers: Optional[int] = None, task_timeout: Optional[float] = None):
+        """
+        Initialize compute pool.
+
+        Args:
+            max_workers: Worker processes (default: COMPUTE_WORKERS, 0 = CPU count)
+            task_timeout: Default per-task timeout in seconds (default: COMPUTE_TASK_TIMEOUT)
+        """
+        workers = settings.COMPUTE_WORKERS if max_workers is None else max_workers
+        self.max_workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+        self.task_timeout = settings.COMPUTE_TASK_TIMEOUT if task_timeout is None else task_timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._generation = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            self._generation += 1
+            logger.info(f"🧮 Compute pool started ({self.max_workers} worker process(es))")
+        return self._executor
+
+    async def warm(self):
+        """Start all worker processes now (instead of on the first task)."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        pids = await asyncio.gather(*(
+            loop.run_in_executor(executor, _warm_up) for _ in range(self.max_workers)
+        ))
+        logger.info(f"🔥 Compute pool warmed: {len(set(pids))} worker process(es) ready")
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a picklable function in a worker process.
+
+        Args:
+            func: Module-level function
+            *args, **kwargs: Picklable arguments
+            timeout: Seconds before the task is abandoned (default: task_timeout)
+
+        Returns:
+            Function result
+
+        Raises:
+            TypeError: If the function or its arguments cannot be pickled
+            asyncio.TimeoutError: If the task exceeded the timeout
+        """
+        timeout = self.task_timeout if timeout is None else timeout
+        call = _Call(func, args, kwargs)
+
+        for attempt in range(2):
+            executor = self._get_executor()
+            generation = self._generation
+            future = asyncio.get_running_loop().run_in_executor(executor, call)
+
+            try:
+                return await asyncio.wait_for(future, timeout=timeout if timeout and timeout > 0 else None)
+            except asyncio.TimeoutError:
+                logger.error(f"⏱️ Compute task {_name(func)} timed out after {timeout}s, recycling pool")
+                self._recycle(generation)
+                raise
+            except BrokenProcessPool:
+                # Pool was recycled (or a worker died) while this task ran
+                self._recycle(generation)
+                if attempt == 0:
+                    logger.warning(f"Compute pool broken while running {_name(func)}, retrying once")
+                    continue
+                raise
+            except (pickle.PicklingError, AttributeError, TypeError) as e:
+                if "pickle" in str(e).lower():
+                    raise TypeError(
+                        f"Compute task {_name(func)} must be a module-level function with "
+                        f"picklable arguments and result: {e}"
+                    ) from e
+                raise
+
+    def _recycle(self, generation: int):
+        """Terminate the pool of the given generation (no-op if already replaced)."""
+        if self._executor is None or generation != self._generation:
+            return
+
+        executor, self._executor = self._executor, None
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """Stop all worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("🧮 Compute pool stopped")
+
+
+class _Call:
+    """Picklable (func, args, kwargs) bundle executed in the worker."""
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __call__(self) -> Any:
+        return self.func(*self.args, **self.kwargs)
+
+
+def _name(func: Callable) -> str:
+    return getattr(func, "__qualname__", repr(func))
+
+
+# Global compute pool instance
+_compute_pool: Optional[ComputePool] = None
+
+
+def get_compute_pool() -> ComputePool:
+    """Get the process-wide compute pool."""
+    global _compute_pool
+    if _compute_pool is None:
+        _compute_pool = ComputePool()
+    return _compute_pool
+
+
+def shutdown_compute_pool():
+    """Stop the process-wide compute pool (if it was started)."""
+    global _compute_pool
+    if _compute_pool is not None:
+        _compute_pool.shutdown()
+        _compute_pool = None
@@ -106,21 +106,45 @@ class NodeExecutionResult:
     duration_ms: Optional[int] = None
     retry_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # True if outputs came from the node result cache (node was not executed)
+    cached: bool = False
+    # Outputs with large values replaced by artifact references (None = same as outputs)
+    stored_outputs: Optional[Dict[str, Any]] = field(default=None, repr=False, compare=False)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
         return {
             "node_id": self.node_id,
             "success": self.success,
-            "outputs": self.outputs,
+            "outputs": self.outputs if self.stored_outputs is None else self.stored_outputs,
             "error": self.error,
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "duration_ms": self.duration_ms,
             "retry_count": self.retry_count,
             "metadata": self.metadata,
+            "cached": self.cached,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NodeExecutionResult":
+        """Rebuild a result persisted with to_dict (outputs stay as stored)"""
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            node_id=data["node_id"],
+            success=bool(data.get("success")),
+            outputs=data.get("outputs") or {},
+            error=data.get("error"),
+            started_at=parse(data.get("started_at")),
+            completed_at=parse(data.get("completed_at")),
+            duration_ms=data.get("duration_ms"),
+            retry_count=data.get("retry_count", 0),
+            metadata=data.get("metadata") or {},
+            cached=data.get("cached", False),
+        )
+
 
 @dataclass
 class ExecutionContext:
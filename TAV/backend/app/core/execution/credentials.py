@@ -0,0 +1,169 @@
+"""
+Execution Credential Resolver
+
+Resolves the credentials a workflow's nodes reference, scoped to a single
+execution:
+- Prefetches every credential ID referenced anywhere in the workflow in one query
+- Decrypts each credential once (cipher is process-cached in security.encryption)
+- Serves nodes from memory
+- Wipes decrypted data when the execution ends
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration
+
+logger = logging.getLogger(__name__)
+
+
+def find_credential_ids(config: Optional[Dict[str, Any]]) -> Set[int]:
+    """
+    Find credential references in a node config.
+
+    Matches both "credential_id" and fields ending with "_credential_id".
+
+    Args:
+        config: Node config dictionary
+
+    Returns:
+        Set of referenced credential IDs
+    """
+    credential_ids = set()
+
+    for key, value in (config or {}).items():
+        if (key == "credential_id" or key.endswith("_credential_id")) and value:
+            try:
+                credential_ids.add(int(value))
+            except (ValueError, TypeError):
+                logger.warning(f"Invalid credential reference {key}={value!r}")
+
+    return credential_ids
+
+
+class CredentialResolver:
+    """
+    Per-execution credential cache.
+
+    Created by the executor when an execution starts and cleared when it
+    ends. IDs not seen during prefetch (e.g. agent config overrides) are
+    fetched on first use and cached as well; IDs that could not be found
+    are remembered so they are not queried again.
+    """
+
+    def __init__(
+        self,
+        user_id: Optional[int],
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        """
+        Initialize resolver.
+
+        Args:
+            user_id: User who owns the credentials (None = no credential access)
+            session_factory: Factory for DB sessions (default: SessionLocal)
+        """
+        if session_factory is None:
+            from app.database.session import SessionLocal
+            session_factory = SessionLocal
+
+        self.user_id = user_id
+        self.session_factory = session_factory
+        self._cache: Dict[int, Dict[str, Any]] = {}
+        self._missing: Set[int] = set()
+
+    def prefetch(self, workflow: WorkflowDefinition) -> int:
+        """
+        Load every credential referenced by the workflow's nodes.
+
+        Args:
+            workflow: Workflow definition
+
+        Returns:
+            Number of credentials loaded
+        """
+        credential_ids = set()
+        for node in workflow.nodes:
+            credential_ids |= find_credential_ids(node.config)
+
+        if not credential_ids:
+            return 0
+
+        self._load(credential_ids)
+        logger.info(
+            f"🔐 Prefetched {len(self._cache)}/{len(credential_ids)} credential(s) "
+            f"for workflow {workflow.workflow_id}"
+        )
+        return len(self._cache)
+
+    def resolve(self, node_config: NodeConfiguration) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Get decrypted credentials for a node.
+
+        Args:
+            node_config: Node configuration that may contain credential references
+
+        Returns:
+            Dictionary of credential_id → decrypted credential data,
+            or None if the node needs no (valid) credentials
+        """
+        if not self.user_id:
+            return None
+
+        credential_ids = find_credential_ids(node_config.config)
+        if not credential_ids:
+            return None
+
+        unknown = credential_ids - self._cache.keys() - self._missing
+        if unknown:
+            self._load(unknown)
+
+        # Copies so a node mutating its credentials cannot affect other nodes
+        credentials = {cid: dict(self._cache[cid]) for cid in credential_ids if cid in self._cache}
+
+        for cid in credential_ids - credentials.keys():
+            logger.warning(
+                f"❌ Credential {cid} not found for user {self.user_id} "
+                f"(node: {node_config.node_id})"
+            )
+
+        if not credentials:
+            return None
+
+        logger.debug(f"🔐 Injected credentials {sorted(credentials)} into node {node_config.node_id}")
+        return credentials
+
+    def clear(self):
+        """Wipe decrypted credential data."""
+        for data in self._cache.values():
+            data.clear()
+        self._cache.clear()
+        self._missing.clear()
+
+    def _load(self, credential_ids: Iterable[int]):
+        """
+        Fetch and decrypt credentials into the cache.
+
+        Errors propagate and nothing is remembered as missing, so the next
+        resolve() queries the IDs again.
+        """
+        if not self.user_id:
+            return
+
+        credential_ids = set(credential_ids)
+
+        from app.services.credential_manager import CredentialManager
+
+        db = self.session_factory()
+        try:
+            loaded = CredentialManager(db).get_credentials_data(list(credential_ids), self.user_id)
+        except Exception as e:
+            logger.error(f"Error loading credentials {sorted(credential_ids)}: {e}", exc_info=True)
+            raise
+        finally:
+            db.close()
+
+        self._cache.update(loaded)
+        self._missing |= credential_ids - loaded.keys()
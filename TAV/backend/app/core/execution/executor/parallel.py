@@ -12,6 +12,8 @@ Reactive, parallel workflow execution engine with:
 
 import asyncio
 import logging
+import threading
+import time
 from typing import Dict, List, Any, Optional, Set
 from contextlib import AsyncExitStack
 
@@ -20,7 +22,21 @@ from app.utils.timezone import get_local_now
 from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, ExecutionStatus
 from app.core.execution.graph.types import ExecutionGraph, NodeExecutionPhase
 from app.core.execution.context import ExecutionContext, NodeExecutionResult, ExecutionMode, ExecutionProgress
-from app.core.nodes import NodeRegistry, NodeExecutionInput, get_resource_classes
+from app.core.execution.credentials import CredentialResolver
+from app.core.execution.artifacts import get_artifact_store, is_artifact_ref, DEFAULT_MAX_INLINE_BYTES
+from app.core.execution.streams import NodeStream, is_stream_source, materialize, DEFAULT_STREAM_BUFFER
+from app.core.execution.compute import get_compute_pool
+from app.core.execution.blocking import run_blocking
+from app.core.execution.result_cache import (
+    get_result_cache, compute_cache_key, Uncacheable, DEFAULT_CACHE_TTL
+)
+from app.core.execution.recovery import capture_checkpoint, serialize_checkpoint, CHECKPOINT_KEY
+from app.core.execution.hibernation import ExecutionHibernated, get_pause_timers
+from app.core.execution.scheduling import (
+    PrioritySemaphore, SchedulingKey, DEFAULT_KEY, compute_scheduling_keys, get_duration_stats
+)
+from app.core.execution.resource_pools import get_resource_pools
+from app.core.nodes import NodeRegistry, NodeExecutionInput, get_resource_classes, has_trigger_capability
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +69,7 @@ class ParallelExecutor:
                 Expected keys:
                 - max_concurrent_nodes: Worker pool size
                 - ai_concurrent_limit: AI/LLM pool size
+                - compute_concurrent_limit: Compute pool size (default: compute worker processes)
                 - default_timeout: Node timeout (seconds)
                 - workflow_timeout: Overall timeout (seconds)
                 - stop_on_error: Stop on first error vs continue
@@ -60,13 +77,23 @@ class ParallelExecutor:
                 - retry_delay: Initial retry delay
                 - backoff_multiplier: Exponential backoff multiplier
                 - max_retry_delay: Max retry delay
+                - priority_scheduling: Order pool slots by priority/critical path
+                - priority: Workflow scheduling priority (1=highest, 10=lowest)
+                - pool_weight / pool_reservations / pool_caps: Share of the global pools
         """
         self.config = execution_config
         
-        # Resource pools (semaphores for bounded concurrency)
-        self.standard_pool = asyncio.Semaphore(self.config.get("max_concurrent_nodes", 5))
-        self.llm_pool = asyncio.Semaphore(self.config.get("ai_concurrent_limit", 1))
-        self.ai_pool = asyncio.Semaphore(self.config.get("ai_concurrent_limit", 1))
+        # Resource pools (semaphores for bounded concurrency, slots granted by scheduling key).
+        # Nodes also take a slot in the process-wide pools (resource_pools.py).
+        self.standard_pool = PrioritySemaphore(self.config.get("max_concurrent_nodes", 5))
+        self.llm_pool = PrioritySemaphore(self.config.get("ai_concurrent_limit", 1))
+        self.ai_pool = PrioritySemaphore(self.config.get("ai_concurrent_limit", 1))
+        self.compute_pool = PrioritySemaphore(
+            self.config.get("compute_concurrent_limit") or get_compute_pool().max_workers
+        )
+        
+        # Scheduling keys (node_id → key, lower runs first; see scheduling.py)
+        self.scheduling_keys: Dict[str, SchedulingKey] = {}
         
         # Execution tracking
         self.active_tasks: Dict[str, asyncio.Task] = {}  # node_id → task
@@ -79,11 +106,32 @@ class ParallelExecutor:
         # Variable name mapping for duplicate detection (node_id → variable_name)
         self.variable_name_mapping: Dict[str, str] = {}
         
+        # Per-execution credential cache (created in execute_workflow, wiped at the end)
+        self.credential_resolver: Optional[CredentialResolver] = None
+        
+        # Output release tracking: source node → consumer nodes that have not finished
+        self.pending_consumers: Dict[str, Set[str]] = {}
+        self.released_outputs: Set[str] = set()
+        
+        # Streamed outputs opened during this execution (closed when it ends)
+        self.active_streams: List[NodeStream] = []
+        
         # Pause/Resume control
         self.paused = False
         self.pause_event = asyncio.Event()
         self.pause_event.set()  # Start unpaused (event is "set" means proceed)
         self.paused_at: Optional[Any] = None  # Track when paused for timeout
+        self.hibernated = False  # State persisted and evicted while paused (see hibernation.py)
+        
+        # Durable checkpoint writer (see _request_checkpoint)
+        self._checkpoint_task: Optional[asyncio.Task] = None
+        self._checkpoint_requested = False
+        self._checkpoint_writing = False
+        self._checkpoint_written_at = 0.0
+        self._checkpoint_results: Dict[str, NodeExecutionResult] = {}  # Results as last persisted
+        self._checkpoint_node_results: Dict[str, Dict[str, Any]] = {}  # ... and their dicts
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_final = False
         
         logger.info(
             f"ParallelExecutor initialized: "
@@ -173,6 +221,31 @@ class ParallelExecutor:
         # Build variable name mapping for duplicate detection
         self._build_variable_name_mapping(workflow)
         
+        # Count downstream consumers so intermediate outputs can be released early
+        self._init_output_release(workflow, graph)
+        
+        # Rank nodes by explicit priority and longest remaining path
+        if self.config.get("priority_scheduling", True):
+            self.scheduling_keys = compute_scheduling_keys(
+                workflow, graph, workflow_priority=self.config.get("priority")
+            )
+        
+        # Take part in the process-wide pools until this run ends
+        resource_pools = get_resource_pools()
+        resource_pools.register(
+            context.workflow_id,
+            weight=self.config.get("pool_weight", 1.0),
+            reservations=self.config.get("pool_reservations"),
+            caps=self.config.get("pool_caps"),
+        )
+        
+        # Prefetch all credentials the workflow references (one query, decrypted once)
+        self.credential_resolver = CredentialResolver(self._get_user_id(context))
+        try:
+            self.credential_resolver.prefetch(workflow)
+        except Exception as e:
+            logger.error(f"Error prefetching credentials: {e}", exc_info=True)
+        
         logger.info(
             f"Starting parallel execution: workflow={workflow.workflow_id}, "
             f"nodes={len(workflow.nodes)}, mode={context.execution_mode}"
@@ -201,6 +274,10 @@ class ParallelExecutor:
             
             return context
         
+        except ExecutionHibernated:
+            logger.info(f"💤 Workflow {workflow.workflow_id} hibernated while awaiting interaction")
+            raise
+        
         except asyncio.TimeoutError:
             context.completed_at = get_local_now()
             context.errors.append(f"Workflow timeout after {workflow_timeout}s")
@@ -212,6 +289,19 @@ class ParallelExecutor:
             context.errors.append(str(e))
             logger.error(f"Workflow {workflow.workflow_id} failed: {e}", exc_info=True)
             raise
+        
+        finally:
+            resource_pools.unregister(context.workflow_id)
+            
+            await self._close_checkpoint_writer(graph, context)
+            
+            # Wipe decrypted credentials
+            self.credential_resolver.clear()
+            
+            # Stop producers nobody finished reading
+            for stream in self.active_streams:
+                await stream.aclose()
+            self.active_streams = []
     
     async def _execute_reactive_loop(
         self,
@@ -270,8 +360,17 @@ class ParallelExecutor:
                 break
             
             # Wait if paused (current nodes continue, but no new nodes start)
+            was_paused = self.paused
             await self.pause_event.wait()
             
+            # Evicted while waiting for human input; state is already persisted
+            if self.hibernated:
+                raise ExecutionHibernated(context.execution_id)
+            
+            # Pick up nodes unblocked while paused (e.g. by an interaction response)
+            if was_paused and not self.paused:
+                ready_nodes = list(dict.fromkeys(ready_nodes + self._get_ready_nodes(graph)))
+            
             # If paused and no active tasks, we're waiting for human interaction
             # Check if execution is actually complete (no nodes awaiting interaction)
             if self.paused and not self.active_tasks:
@@ -283,8 +382,8 @@ class ParallelExecutor:
                     await asyncio.sleep(0.5)
                     continue
             
-            # Start tasks for ready nodes
-            for node_id in ready_nodes:
+            # Start tasks for ready nodes (most urgent first)
+            for node_id in self._sort_by_priority(ready_nodes):
                 if node_id not in self.active_tasks:
                     task = asyncio.create_task(
                         self._execute_node_with_tracking(node_id, workflow, graph, context)
@@ -292,6 +391,7 @@ class ParallelExecutor:
                     self.active_tasks[node_id] = task
             
             ready_nodes = []
+            finished = False
             
             # Wait for at least one task to complete
             if self.active_tasks:
@@ -299,6 +399,7 @@ class ParallelExecutor:
                     self.active_tasks.values(),
                     return_when=asyncio.FIRST_COMPLETED
                 )
+                finished = bool(done)
                 
                 # Process completed tasks
                 for task in done:
@@ -351,6 +452,18 @@ class ParallelExecutor:
                                 graph.nodes[completed_node_id].phase = NodeExecutionPhase.FAILED
                                 graph.failed_nodes.add(completed_node_id)
             
+            # Drop outputs whose consumers have all finished
+            if self.pending_consumers:
+                await self._release_consumed_outputs(graph, context)
+            
+            # Stop buffering stream chunks nobody will read
+            if finished and self.active_streams:
+                await self._release_stream_consumers(graph)
+            
+            # Record progress so a restart can resume instead of starting over
+            if finished:
+                self._request_checkpoint(graph, context)
+            
             # Check if we've completed a loop iteration
             # This happens when we have no more ready nodes, no active tasks, but workflow has loops
             if not ready_nodes and not self.active_tasks and graph.has_loops:
@@ -371,6 +484,209 @@ class ParallelExecutor:
         
         logger.info(f"Reactive execution loop completed")
     
+    def _init_output_release(self, workflow: WorkflowDefinition, graph: ExecutionGraph):
+        """
+        Compute, from the graph, which nodes consume each node's outputs.
+        
+        Outputs are only tracked (and later released) when nothing else
+        needs them after their consumers ran:
+        - Not in looping workflows (loop nodes re-read outputs each iteration)
+        - Not for nodes sharing output to variables
+        - Not for sink nodes (no consumers; their outputs are the final results)
+        - Tool connections don't count (they pass node config, not outputs)
+        """
+        self.pending_consumers = {}
+        self.released_outputs = set()
+        
+        if graph.has_loops or not self.config.get("release_intermediate_outputs", True):
+            return
+        
+        shared_nodes = {node.node_id for node in workflow.nodes if node.share_output_to_variables}
+        
+        for consumer_id, node_deps in graph.nodes.items():
+            for conn_info in node_deps.input_connections:
+                if conn_info.get('target_port') == "tools":
+                    continue
+                source_node_id = conn_info.get('source_node_id') or conn_info.get('source_node')
+                if source_node_id in graph.nodes and source_node_id not in shared_nodes:
+                    self.pending_consumers.setdefault(source_node_id, set()).add(consumer_id)
+        
+        logger.debug(f"Tracking output consumers for {len(self.pending_consumers)} node(s)")
+    
+    async def _release_consumed_outputs(self, graph: ExecutionGraph, context: ExecutionContext):
+        """Release outputs of nodes whose consumers have all completed, failed or been skipped."""
+        finished = graph.completed_nodes | graph.failed_nodes | graph.skipped_nodes
+        
+        for source_node_id in list(self.pending_consumers):
+            consumers = self.pending_consumers[source_node_id]
+            consumers -= finished
+            
+            if consumers or source_node_id not in context.node_outputs:
+                continue
+            
+            del self.pending_consumers[source_node_id]
+            await self._release_node_outputs(source_node_id, context)
+    
+    async def _release_stream_consumers(self, graph: ExecutionGraph):
+        """Release stream channels of consumers that completed, failed or were skipped."""
+        finished = graph.completed_nodes | graph.failed_nodes | graph.skipped_nodes
+        for stream in self.active_streams:
+            await stream.release(finished)
+    
+    async def _release_node_outputs(self, node_id: str, context: ExecutionContext):
+        """
+        Drop a node's in-memory outputs.
+        
+        The node result keeps its persisted form: values above
+        release_inline_bytes are spilled to the artifact store so the
+        result stays complete for the database, the UI and checkpoint retries.
+        """
+        outputs = context.node_outputs.pop(node_id, None)
+        result = context.node_results.get(node_id)
+        
+        if result is not None and outputs is not None:
+            persisted = result.outputs if result.stored_outputs is None else result.stored_outputs
+            try:
+                result.outputs = await run_blocking(
+                    get_artifact_store().spill_outputs,
+                    persisted,
+                    execution_id=context.execution_id,
+                    max_inline_bytes=self.config.get("release_inline_bytes", 4096),
+                    workflow_id=context.workflow_id,
+                    node_id=node_id
+                )
+            except Exception as e:
+                logger.warning(f"Failed to spill released outputs of node {node_id}: {e}")
+                result.outputs = persisted
+            result.stored_outputs = None
+        
+        self.released_outputs.add(node_id)
+        logger.debug(f"♻️ Released outputs of node {node_id} (all consumers finished)")
+    
+    def _request_checkpoint(self, graph: ExecutionGraph, context: ExecutionContext):
+        """
+        Ask for node_results plus the recovery checkpoint to be persisted.
+        
+        Requests are coalesced: a single writer task persists them at most
+        once per checkpoint_interval seconds, so a wide workflow does not
+        rewrite the execution row after every batch. All writes of
+        node_results go through this writer, so they land in order.
+        """
+        if not self.config.get("durable_checkpoints", True):
+            return
+        self._checkpoint_requested = True
+        if self._checkpoint_task is None or self._checkpoint_task.done():
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_writer(graph, context))
+    
+    async def _checkpoint_writer(self, graph: ExecutionGraph, context: ExecutionContext):
+        """Persist requested checkpoints, spaced by checkpoint_interval."""
+        interval = self.config.get("checkpoint_interval", 2.0)
+        
+        while self._checkpoint_requested:
+            delay = self._checkpoint_written_at + interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._checkpoint_requested = False
+            await self._persist_checkpoint(graph, context)
+    
+    async def _close_checkpoint_writer(self, graph: ExecutionGraph, context: ExecutionContext):
+        """
+        Stop the writer and persist whatever it had not written yet.
+        
+        A write already running in the blocking pool is awaited so it
+        cannot land after the orchestrator's final update.
+        """
+        task = self._checkpoint_task
+        if task is not None and not task.done():
+            if not self._checkpoint_writing:
+                task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        self._checkpoint_task = None
+        
+        if self._checkpoint_requested and not self.hibernated:
+            self._checkpoint_requested = False
+            await self._persist_checkpoint(graph, context)
+    
+    async def _persist_checkpoint(self, graph: ExecutionGraph, context: ExecutionContext):
+        """
+        Persist node_results plus the recovery checkpoint.
+        
+        Together they form the durable completion log used to resume the
+        execution after a restart (see app.core.execution.recovery).
+        Serialization, spilling and the commit run in the blocking pool.
+        """
+        node_results, captured = self._capture_checkpoint(graph, context)
+        self._checkpoint_writing = True
+        try:
+            await run_blocking(self._write_checkpoint, context, node_results, captured)
+        except Exception as e:
+            logger.warning(f"Failed to persist checkpoint for execution {context.execution_id}: {e}")
+        finally:
+            self._checkpoint_writing = False
+            self._checkpoint_written_at = time.monotonic()
+    
+    def _capture_checkpoint(self, graph: ExecutionGraph, context: ExecutionContext):
+        """
+        Snapshot what to persist, on the event loop.
+        
+        Only results replaced since the last checkpoint are serialized
+        again; the others reuse their previously persisted dicts.
+        """
+        persisted = self._checkpoint_results
+        for node_id in [nid for nid in persisted if nid not in context.node_results]:
+            del persisted[node_id]
+            del self._checkpoint_node_results[node_id]
+        
+        for node_id, result in context.node_results.items():
+            if persisted.get(node_id) is not result:
+                persisted[node_id] = result
+                self._checkpoint_node_results[node_id] = result.to_dict()
+        
+        return dict(self._checkpoint_node_results), capture_checkpoint(graph, context, paused=self.paused)
+    
+    def _write_checkpoint(
+        self,
+        context: ExecutionContext,
+        node_results: Dict[str, Any],
+        captured: Dict[str, Any],
+        final: bool = False
+    ):
+        """
+        Write a captured checkpoint to the execution row (blocking).
+        
+        Once the final checkpoint (hibernation) is written, later writes
+        carry older state and are dropped; so are all writes of an
+        abandoned execution (see abandon).
+        """
+        from app.database.session import SessionLocal
+        from app.database.models import Execution
+        
+        checkpoint = serialize_checkpoint(
+            captured,
+            execution_id=context.execution_id,
+            workflow_id=context.workflow_id,
+            max_inline_bytes=self.config.get("max_inline_bytes", DEFAULT_MAX_INLINE_BYTES)
+        )
+        
+        with self._checkpoint_lock:
+            if self._checkpoint_final:
+                return
+            db = SessionLocal()
+            try:
+                execution_db = db.query(Execution).filter(Execution.id == context.execution_id).first()
+                if execution_db:
+                    execution_db.node_results = node_results
+                    # Reassign so the JSON column is flagged as changed
+                    execution_db.execution_metadata = {
+                        **(execution_db.execution_metadata or {}),
+                        CHECKPOINT_KEY: checkpoint
+                    }
+                    db.commit()
+            finally:
+                db.close()
+            if final:
+                self._checkpoint_final = True
+    
     def _check_loop_continuation(self, workflow: "WorkflowDefinition", graph: ExecutionGraph, context: ExecutionContext) -> bool:
         """
         Check if the loop should continue for another iteration.
@@ -555,7 +871,13 @@ class ParallelExecutor:
                     logger.debug(f"🚫 Skipping tool-only node from ready list: {node_id}")
                     continue
                 ready.append(node_id)
-        return ready
+        return self._sort_by_priority(ready)
+    
+    def _sort_by_priority(self, node_ids: List[str]) -> List[str]:
+        """Order node IDs by scheduling key (stable for equal keys)."""
+        if not self.scheduling_keys:
+            return node_ids
+        return sorted(node_ids, key=lambda node_id: self.scheduling_keys.get(node_id, DEFAULT_KEY))
     
     def _mark_node_completed(
         self,
@@ -830,25 +1152,9 @@ class ParallelExecutor:
         except Exception as e:
             logger.warning(f"Failed to broadcast node_start event: {e}")
         
-        # Persist "running" status to database for state recovery
-        try:
-            from app.database.session import SessionLocal
-            from app.database.models import Execution
-            
-            db = SessionLocal()
-            try:
-                execution_db = db.query(Execution).filter(Execution.id == context.execution_id).first()
-                if execution_db:
-                    # Serialize all node_results to database
-                    execution_db.node_results = {
-                        nid: result.to_dict() for nid, result in context.node_results.items()
-                    }
-                    db.commit()
-                    logger.info(f"✅ Persisted running status for node {node_id} to database")
-            finally:
-                db.close()
-        except Exception as persist_error:
-            logger.warning(f"Failed to persist running node status to database: {persist_error}")
+        # Persist "running" status for state recovery (through the checkpoint writer,
+        # so writes land in order)
+        self._request_checkpoint(graph, context)
         
         # Instantiate node
         node_class = NodeRegistry.get(node_config.node_type)
@@ -869,6 +1175,9 @@ class ParallelExecutor:
             input_ports.update(override_inputs)
             logger.debug(f"📥 Applied override inputs for node {node_id}: {list(override_inputs.keys())}")
         
+        # Streamed inputs: iterator for streaming-aware ports, list for the rest
+        input_ports = await self._resolve_stream_inputs(node_id, node_instance, input_ports)
+        
         # INJECT TRIGGER DATA into input ports (if available)
         # This makes trigger_data available to ALL nodes via their input ports
         # Now supports ANY fields from initial_data, not just hardcoded ones
@@ -905,18 +1214,7 @@ class ParallelExecutor:
                 logger.debug(f"💬 Injected conversation context into '_conversation_context' port for node {node_id}")
         
         # Inject credentials (if node config references any)
-        # Get user_id from context.started_by (it's a string user_id)
-        user_id = None
-        if context.started_by:
-            try:
-                user_id = int(context.started_by)
-                logger.info(f"🔐 Extracted user_id={user_id} from context.started_by={context.started_by}")
-            except (ValueError, TypeError):
-                logger.warning(f"Could not parse user_id from started_by: {context.started_by}")
-        else:
-            logger.warning(f"⚠️ context.started_by is None! Cannot inject credentials for node {node_id}")
-        
-        credentials_dict = await self._inject_credentials(node_config, user_id)
+        credentials_dict = await self._inject_credentials(node_config, context)
         
         # Define node runner callback for Agents
         async def node_runner(target_node_id: str, inputs: Dict[str, Any], config_overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -950,6 +1248,11 @@ class ParallelExecutor:
                     target_config = self._get_node_config(workflow, target_node_id)
                     target_config.config = original_config
 
+        # Define map runner callback for Map nodes
+        async def map_runner(target_node_id: str, items: Any, **options) -> Dict[str, Any]:
+            """Run a node once per item (see _run_map for options)."""
+            return await self._run_map(node_id, target_node_id, items, workflow, graph, context, **options)
+
         # Build NodeExecutionInput
         input_data = NodeExecutionInput(
             ports=input_ports,
@@ -960,6 +1263,7 @@ class ParallelExecutor:
             config=node_config.config,
             credentials=credentials_dict,
             node_runner=node_runner,
+            map_runner=map_runner,
             frontend_origin=context.frontend_origin
         )
         
@@ -971,27 +1275,44 @@ class ParallelExecutor:
         # Get resource classes for this node
         resource_classes = get_resource_classes(node_instance)
         
-        # Acquire resource semaphores and execute
-        semaphores = self._get_semaphores(resource_classes)
         
         node_timeout = self.config.get("default_timeout", 300)
         
+        # Memoized outputs from an earlier run with identical config and inputs
+        cache_key = self._get_cache_key(node_config, node_instance, input_ports, context)
+        cached_outputs = None
+        if cache_key and self.config.get("result_cache", "opt_in") != "refresh":
+            cached_outputs = await self._get_cached_outputs(node_id, cache_key)
+        
         try:
-            async with AsyncExitStack() as stack:
-                # Acquire all needed semaphores
-                for sem in semaphores:
-                    await stack.enter_async_context(sem)
-                
-                logger.debug(
-                    f"Node {node_id} acquired resources: {resource_classes}, "
-                    f"timeout={node_timeout}s"
-                )
-                
-                # Execute with timeout (use asyncio.wait_for for Python 3.10 compatibility)
-                outputs = await asyncio.wait_for(
-                    node_instance.execute(input_data),
-                    timeout=node_timeout
-                )
+            if cached_outputs is not None:
+                outputs = cached_outputs
+                logger.info(f"♻️ Node {node_id} skipped: outputs served from result cache")
+            else:
+                async with AsyncExitStack() as stack:
+                    # Acquire execution and global pool slots
+                    await self._acquire_resources(stack, resource_classes, node_id, context)
+                    
+                    logger.debug(
+                        f"Node {node_id} acquired resources: {resource_classes}, "
+                        f"timeout={node_timeout}s"
+                    )
+                    
+                    # Execute with timeout (use asyncio.wait_for for Python 3.10 compatibility)
+                    run_started = time.monotonic()
+                    outputs = await asyncio.wait_for(
+                        node_instance.execute(input_data),
+                        timeout=node_timeout
+                    )
+                    
+                    # Feed the duration estimates used for critical path ranking
+                    get_duration_stats().record(node_config.node_type, time.monotonic() - run_started)
+            
+            # Wrap async iterator outputs so consumers can read them while produced
+            outputs = await self._open_output_streams(
+                node_id, node_config, outputs, graph,
+                pipelined=override_inputs is None
+            )
             
             # Store outputs in context
             context.node_outputs[node_id] = outputs
@@ -1050,15 +1371,7 @@ class ParallelExecutor:
             # ========== SOFT ERROR DETECTION ==========
             # Check if node returned an error in output dictionary (common pattern for AI nodes)
             # This catches cases where nodes swallow exceptions and return error in output
-            soft_error = None
-            if isinstance(outputs, dict):
-                # Check for common error indicators
-                if outputs.get("error"):
-                    soft_error = str(outputs.get("error"))
-                elif outputs.get("_error"):
-                    soft_error = str(outputs.get("_error"))
-                elif outputs.get("success") is False:
-                    soft_error = outputs.get("message", "Node reported failure")
+            soft_error = self._get_soft_error(outputs)
             
             if soft_error:
                 logger.warning(f"⚠️ Node {node_id} returned soft error in output: {soft_error}")
@@ -1089,9 +1402,14 @@ class ParallelExecutor:
                 outputs=outputs,
                 error=None,
                 started_at=original_started_at,
-                completed_at=get_local_now()
+                completed_at=get_local_now(),
+                cached=cached_outputs is not None,
+                stored_outputs=await self._spill_outputs(node_id, outputs, context)
             )
             
+            if cache_key and cached_outputs is None:
+                await self._store_cached_outputs(node_config, cache_key, outputs, context)
+            
             # Share to variables if configured
             if node_config.share_output_to_variables:
                 self._share_to_variables(node_config, outputs, context)
@@ -1102,10 +1420,10 @@ class ParallelExecutor:
             try:
                 from app.api.v1.endpoints.executions import publish_execution_event
                 
-                # Get outputs safely
+                # Get outputs safely (large values are artifact references)
                 result_outputs = {}
                 if node_id in context.node_results:
-                    result_outputs = context.node_results[node_id].outputs
+                    result_outputs = context.node_results[node_id].to_dict()["outputs"]
                 
                 await publish_execution_event(context.execution_id, {
                     "type": "node_complete",
@@ -1113,31 +1431,15 @@ class ParallelExecutor:
                     "node_type": node_config.node_type,
                     "node_name": node_config.name,
                     "status": "completed",
+                    "cached": cached_outputs is not None,
                     "outputs": result_outputs,  # Include outputs for preview
                     "progress": graph.get_execution_progress()
                 })
             except Exception as e:
                 logger.warning(f"Failed to broadcast node_complete event: {e}")
             
-            # Persist node_results to database for state recovery
-            try:
-                from app.database.session import SessionLocal
-                from app.database.models import Execution
-                
-                db = SessionLocal()
-                try:
-                    execution_db = db.query(Execution).filter(Execution.id == context.execution_id).first()
-                    if execution_db:
-                        # Serialize all node_results to database
-                        execution_db.node_results = {
-                            nid: result.to_dict() for nid, result in context.node_results.items()
-                        }
-                        db.commit()
-                        logger.info(f"✅ Persisted node_results to database for execution {context.execution_id}")
-                finally:
-                    db.close()
-            except Exception as e:
-                logger.warning(f"Failed to persist node_results to database: {e}")
+            # Persist node_results for state recovery
+            self._request_checkpoint(graph, context)
         
         except asyncio.TimeoutError:
             logger.error(f"Node {node_id} timed out after {node_timeout}s")
@@ -1223,25 +1525,8 @@ class ParallelExecutor:
             except Exception as broadcast_error:
                 logger.warning(f"Failed to broadcast node_failed event: {broadcast_error}")
             
-            # Persist node_results to database for state recovery
-            try:
-                from app.database.session import SessionLocal
-                from app.database.models import Execution
-                
-                db = SessionLocal()
-                try:
-                    execution_db = db.query(Execution).filter(Execution.id == context.execution_id).first()
-                    if execution_db:
-                        # Serialize all node_results to database
-                        execution_db.node_results = {
-                            nid: result.to_dict() for nid, result in context.node_results.items()
-                        }
-                        db.commit()
-                        logger.info(f"✅ Persisted node_results to database for execution {context.execution_id}")
-                finally:
-                    db.close()
-            except Exception as persist_error:
-                logger.warning(f"Failed to persist node_results to database: {persist_error}")
+            # Persist node_results for state recovery
+            self._request_checkpoint(graph, context)
             
             raise
         
@@ -1253,6 +1538,311 @@ class ParallelExecutor:
                 except Exception as cleanup_error:
                     logger.warning(f"Error during node cleanup for {node_id}: {cleanup_error}")
     
+    def _get_cache_key(
+        self,
+        node_config: NodeConfiguration,
+        node_instance: Any,
+        input_ports: Dict[str, Any],
+        context: ExecutionContext
+    ) -> Optional[str]:
+        """
+        Get the result cache key of a node run (None = not cached).
+        
+        Only nodes with cache_results enabled are cached, and never when the
+        workflow's result_cache policy is "off". Trigger nodes and runs with
+        streamed or live-object inputs are not cacheable.
+        """
+        if not node_config.cache_results or self.config.get("result_cache", "opt_in") == "off":
+            return None
+        if has_trigger_capability(node_instance):
+            return None
+        
+        from app.core.nodes.variables import resolve_config_value
+        
+        try:
+            resolved_config = {
+                key: resolve_config_value(value, context.variables)
+                for key, value in node_config.config.items()
+            }
+            metadata = NodeRegistry.get_metadata(node_config.node_type) or {}
+            return compute_cache_key(
+                node_config.node_type, metadata.get("version"), resolved_config, input_ports
+            )
+        except Uncacheable as e:
+            logger.debug(f"Node {node_config.node_id} not cacheable for this run: {e}")
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to compute result cache key for {node_config.node_id}: {e}")
+            return None
+    
+    async def _get_cached_outputs(self, node_id: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Look up memoized outputs (cache errors count as a miss)."""
+        try:
+            return await run_blocking(get_result_cache().get, cache_key)
+        except Exception as e:
+            logger.warning(f"Result cache lookup failed for node {node_id}: {e}")
+            return None
+    
+    async def _store_cached_outputs(
+        self,
+        node_config: NodeConfiguration,
+        cache_key: str,
+        outputs: Dict[str, Any],
+        context: ExecutionContext
+    ):
+        """Memoize successful outputs (streams and non-JSON outputs are skipped)."""
+        if not isinstance(outputs, dict) or any(isinstance(v, NodeStream) for v in outputs.values()):
+            return
+        
+        ttl = node_config.cache_ttl
+        if ttl is None:
+            ttl = self.config.get("result_cache_ttl", DEFAULT_CACHE_TTL)
+        
+        try:
+            await run_blocking(
+                get_result_cache().put,
+                cache_key,
+                outputs,
+                node_type=node_config.node_type,
+                workflow_id=context.workflow_id,
+                node_id=node_config.node_id,
+                ttl_seconds=ttl
+            )
+        except Uncacheable as e:
+            logger.debug(f"Outputs of {node_config.node_id} not cached: {e}")
+        except Exception as e:
+            logger.warning(f"Failed to store result cache entry for {node_config.node_id}: {e}")
+    
+    @staticmethod
+    def _get_soft_error(outputs: Any) -> Optional[str]:
+        """Get the error a node reported in its outputs (instead of raising), if any."""
+        if not isinstance(outputs, dict):
+            return None
+        
+        # Check for common error indicators
+        if outputs.get("error"):
+            return str(outputs.get("error"))
+        if outputs.get("_error"):
+            return str(outputs.get("_error"))
+        if outputs.get("success") is False:
+            return outputs.get("message", "Node reported failure")
+        return None
+    
+    async def _run_map(
+        self,
+        map_node_id: str,
+        body_node_id: str,
+        items: Any,
+        workflow: WorkflowDefinition,
+        graph: ExecutionGraph,
+        context: ExecutionContext,
+        item_port: str = "input",
+        concurrency: Optional[int] = None,
+        error_policy: str = "fail",
+        item_retries: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Run a node once per item with bounded concurrency.
+        
+        Items are pulled lazily (lists or streamed async iterators), so at
+        most `concurrency` items are in flight. Each item run also acquires
+        the body node's own resource pools (standard/llm/ai), so the
+        effective parallelism is min(concurrency, pool size).
+        
+        Args:
+            map_node_id: Map node coordinating the run (for events)
+            body_node_id: Node to run per item
+            items: List, iterable or async iterable of items
+            item_port: Body node input port that receives the item
+            concurrency: Max items in flight (default: max_concurrent_nodes)
+            error_policy: "fail" (stop at first failed item), "skip" (drop
+                          failed items) or "collect" (None result + error entry)
+            item_retries: Extra attempts per item before it counts as failed
+        
+        Returns:
+            {"results": [...in item order...], "errors": [{"index", "error"}], "count": n, "failed": n}
+        
+        Raises:
+            RuntimeError: If an item failed and error_policy is "fail"
+        """
+        if error_policy not in ("fail", "skip", "collect"):
+            raise ValueError(f"Unknown map error policy: {error_policy}")
+        
+        body_config = self._get_node_config(workflow, body_node_id)
+        limit = max(1, concurrency or self.config.get("max_concurrent_nodes", 5))
+        total = len(items) if isinstance(items, (list, tuple)) else None
+        
+        results: Dict[int, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        gate = asyncio.Semaphore(limit)
+        tasks: Set[asyncio.Task] = set()
+        first_failure: List[BaseException] = []
+        finished = 0
+        last_event = 0.0
+        
+        logger.info(
+            f"🗺️ Map {map_node_id}: running {body_node_id} over "
+            f"{total if total is not None else 'streamed'} item(s), concurrency={limit}"
+        )
+        
+        async def publish_progress(final: bool = False):
+            nonlocal last_event
+            now = time.monotonic()
+            if not final and now - last_event < 0.5:
+                return
+            last_event = now
+            try:
+                from app.api.v1.endpoints.executions import publish_execution_event
+                await publish_execution_event(context.execution_id, {
+                    "type": "map_progress",
+                    "node_id": map_node_id,
+                    "body_node_id": body_node_id,
+                    "completed": finished,
+                    "failed": len(errors),
+                    "total": total,
+                    "progress": graph.get_execution_progress()
+                })
+            except Exception as e:
+                logger.debug(f"Failed to broadcast map_progress event: {e}")
+        
+        async def run_item(index: int, item: Any):
+            nonlocal finished
+            try:
+                for attempt in range(item_retries + 1):
+                    try:
+                        results[index] = await self._execute_map_item(
+                            body_config, {item_port: item}, index, item, graph, context
+                        )
+                        break
+                    except Exception as e:
+                        if attempt < item_retries:
+                            logger.warning(f"Map item {index} failed (attempt {attempt + 1}), retrying: {e}")
+                            continue
+                        logger.warning(f"Map item {index} of {map_node_id} failed: {e}")
+                        errors.append({"index": index, "error": str(e)})
+                        if error_policy == "collect":
+                            results[index] = None
+                        elif error_policy == "fail":
+                            first_failure.append(e)
+                            raise
+                finished += 1
+                await publish_progress()
+            finally:
+                gate.release()
+        
+        async def item_source():
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    yield item
+            else:
+                for item in items or []:
+                    yield item
+        
+        count = 0
+        try:
+            async for item in item_source():
+                await gate.acquire()
+                if first_failure:
+                    gate.release()
+                    break
+                task = asyncio.create_task(run_item(count, item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                count += 1
+            
+            if tasks:
+                await asyncio.gather(*tasks)
+        except Exception:
+            if not first_failure:
+                raise
+        finally:
+            # Stop in-flight items after a failure (error_policy="fail") or cancellation
+            pending = list(tasks)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        if first_failure:
+            error = errors[0]
+            raise RuntimeError(f"Map item {error['index']} failed: {error['error']}") from first_failure[0]
+        
+        total = count
+        await publish_progress(final=True)
+        
+        logger.info(f"✅ Map {map_node_id} finished: {count} item(s), {len(errors)} failed")
+        
+        return {
+            "results": [results[i] for i in range(count) if i in results],
+            "errors": sorted(errors, key=lambda e: e["index"]),
+            "count": count,
+            "failed": len(errors),
+        }
+    
+    async def _execute_map_item(
+        self,
+        body_config: NodeConfiguration,
+        input_ports: Dict[str, Any],
+        index: int,
+        item: Any,
+        graph: ExecutionGraph,
+        context: ExecutionContext
+    ) -> Dict[str, Any]:
+        """
+        Execute one map item in isolation.
+        
+        Unlike _execute_node, nothing is written to the shared context
+        (node_outputs, node_results): many items of the same node run at
+        once. Per-item variables map_item/map_index are available to the
+        body node's templates.
+        """
+        node_class = NodeRegistry.get(body_config.node_type)
+        if not node_class:
+            raise ValueError(f"Node type not registered: {body_config.node_type}")
+        
+        node_instance = node_class(body_config)
+        node_instance.execution_context = context
+        
+        validation_errors = node_instance.validate_inputs(input_ports)
+        if validation_errors:
+            raise ValueError(f"Node {body_config.node_id} input validation failed: {validation_errors}")
+        
+        input_data = NodeExecutionInput(
+            ports=input_ports,
+            workflow_id=context.workflow_id,
+            execution_id=context.execution_id,
+            node_id=body_config.node_id,
+            variables={**context.variables, "map_item": item, "map_index": index},
+            config=body_config.config,
+            credentials=await self._inject_credentials(body_config, context),
+            frontend_origin=context.frontend_origin
+        )
+        
+        resource_classes = get_resource_classes(node_instance)
+        node_timeout = self.config.get("default_timeout", 300)
+        
+        try:
+            async with AsyncExitStack() as stack:
+                await self._acquire_resources(stack, resource_classes, body_config.node_id, context)
+                
+                outputs = await asyncio.wait_for(node_instance.execute(input_data), timeout=node_timeout)
+            
+            outputs = await self._open_output_streams(
+                body_config.node_id, body_config, outputs, graph, pipelined=False
+            )
+        finally:
+            if hasattr(node_instance, 'cleanup'):
+                try:
+                    node_instance.cleanup()
+                except Exception as cleanup_error:
+                    logger.warning(f"Error during node cleanup for {body_config.node_id}: {cleanup_error}")
+        
+        soft_error = self._get_soft_error(outputs)
+        if soft_error:
+            raise RuntimeError(soft_error)
+        
+        return outputs
+    
     def _get_node_config(self, workflow: WorkflowDefinition, node_id: str) -> NodeConfiguration:
         """Get node configuration from workflow."""
         for node in workflow.nodes:
@@ -1260,7 +1850,30 @@ class ParallelExecutor:
                 return node
         raise ValueError(f"Node not found: {node_id}")
     
-    def _get_semaphores(self, resource_classes: List[str]) -> List[asyncio.Semaphore]:
+    async def _acquire_resources(
+        self,
+        stack: AsyncExitStack,
+        resource_classes: List[str],
+        node_id: str,
+        context: ExecutionContext
+    ):
+        """
+        Acquire the slots a node needs, released when `stack` closes.
+        
+        Execution-level semaphores first, then the process-wide pools, so a
+        node never holds a global slot while waiting on its own execution.
+        """
+        scheduling_key = self.scheduling_keys.get(node_id, DEFAULT_KEY)
+        for sem in self._get_semaphores(resource_classes):
+            await stack.enter_async_context(sem.slot(scheduling_key))
+        
+        resource_pools = get_resource_pools()
+        for resource_class in resource_classes:
+            await stack.enter_async_context(
+                resource_pools.get(resource_class).slot(context.workflow_id, context.execution_id, scheduling_key)
+            )
+    
+    def _get_semaphores(self, resource_classes: List[str]) -> List[PrioritySemaphore]:
         """Get semaphores for resource classes."""
         semaphores = []
         for resource_class in resource_classes:
@@ -1268,6 +1881,8 @@ class ParallelExecutor:
                 semaphores.append(self.llm_pool)
             elif resource_class == "ai":
                 semaphores.append(self.ai_pool)
+            elif resource_class == "compute":
+                semaphores.append(self.compute_pool)
             else:  # "standard"
                 semaphores.append(self.standard_pool)
         return semaphores
@@ -1334,6 +1949,11 @@ class ParallelExecutor:
             if source_port in source_outputs:
                 value = source_outputs[source_port]
                 
+                # Outputs restored from the database may be artifact references
+                if is_artifact_ref(value):
+                    value = get_artifact_store().get(value)
+                    source_outputs[source_port] = value
+                
                 # If target port already has a value, convert to list and append
                 # This supports multiple connections to the same input port (e.g. list of images)
                 if target_port in inputs:
@@ -1357,6 +1977,128 @@ class ParallelExecutor:
         
         return inputs
     
+    async def _spill_outputs(
+        self,
+        node_id: str,
+        outputs: Dict[str, Any],
+        context: ExecutionContext
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Spill large output values to the artifact store.
+        
+        The in-memory outputs are untouched; the returned dict (with artifact
+        references) is what gets persisted and broadcast. The file write and
+        index commit run in the blocking pool.
+        
+        Returns:
+            Outputs with references, or None if nothing was spilled
+        """
+        persisted = outputs
+        if isinstance(outputs, dict) and any(isinstance(v, NodeStream) for v in outputs.values()):
+            # Streams are consumed once; persist a placeholder
+            persisted = {
+                port: value.describe() if isinstance(value, NodeStream) else value
+                for port, value in outputs.items()
+            }
+        
+        try:
+            stored = await run_blocking(
+                get_artifact_store().spill_outputs,
+                persisted,
+                execution_id=context.execution_id,
+                max_inline_bytes=self.config.get("max_inline_bytes", DEFAULT_MAX_INLINE_BYTES),
+                workflow_id=context.workflow_id,
+                node_id=node_id
+            )
+        except Exception as e:
+            logger.warning(f"Failed to spill outputs of node {node_id}: {e}")
+            stored = persisted
+        
+        return None if stored is outputs else stored
+    
+    async def _open_output_streams(
+        self,
+        node_id: str,
+        node_config: NodeConfiguration,
+        outputs: Dict[str, Any],
+        graph: ExecutionGraph,
+        pipelined: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Wrap async iterator outputs in NodeStreams.
+        
+        A stream is pipelined to its downstream connections only when nothing
+        else needs the full value; otherwise it is materialized into a list
+        right away:
+        - No downstream connection on the port (value is a final output)
+        - Node shares its output to variables
+        - Workflow has loops (loop nodes re-read outputs)
+        - Node was run by an Agent (outputs go straight back to the Agent)
+        
+        Returns:
+            Outputs with streams wrapped or materialized
+        """
+        if not isinstance(outputs, dict) or not any(is_stream_source(v) for v in outputs.values()):
+            return outputs
+        
+        pipelined = pipelined and not graph.has_loops and not node_config.share_output_to_variables
+        outputs = dict(outputs)
+        
+        for port, value in outputs.items():
+            if not is_stream_source(value) or isinstance(value, NodeStream):
+                continue
+            
+            consumers = [
+                (consumer_id, conn_info.get('target_port'))
+                for consumer_id, node_deps in graph.nodes.items()
+                for conn_info in node_deps.input_connections
+                if (conn_info.get('source_node_id') or conn_info.get('source_node')) == node_id
+                and conn_info.get('source_port') == port
+                and conn_info.get('target_port') != "tools"
+            ] if pipelined else []
+            
+            if not consumers:
+                outputs[port] = await materialize(value)
+                logger.debug(f"Materialized stream {node_id}.{port} ({len(outputs[port])} items)")
+                continue
+            
+            stream = NodeStream(
+                value,
+                consumers,
+                node_id=node_id,
+                port=port,
+                buffer_size=self.config.get("stream_buffer_size", DEFAULT_STREAM_BUFFER)
+            )
+            self.active_streams.append(stream)
+            outputs[port] = stream
+            logger.info(f"🌊 Streaming {node_id}.{port} to {len(consumers)} consumer(s)")
+        
+        return outputs
+    
+    async def _resolve_stream_inputs(
+        self,
+        node_id: str,
+        node_instance: Any,
+        input_ports: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Hand streamed inputs to a consuming node.
+        
+        Input ports declared with streaming=True get an async iterator over
+        the chunks; all other ports get the materialized list.
+        """
+        for port_name, value in input_ports.items():
+            if not isinstance(value, NodeStream):
+                continue
+            
+            port = node_instance.get_input_port(port_name)
+            if port is not None and port.streaming:
+                input_ports[port_name] = value.subscribe(node_id, port_name)
+            else:
+                input_ports[port_name] = await value.collect(node_id, port_name)
+        
+        return input_ports
+    
     def _share_to_variables(
         self,
         node_config: NodeConfiguration,
@@ -1434,79 +2176,50 @@ class ParallelExecutor:
             f"(key='{node_key}', fields={list(shared_data.keys()) if isinstance(shared_data, dict) else 'non-dict'})"
         )
     
+    def _get_user_id(self, context: ExecutionContext) -> Optional[int]:
+        """
+        Get the user ID that owns the execution's credentials.
+        
+        context.started_by holds the user ID as a string.
+        """
+        if not context.started_by:
+            logger.warning("⚠️ context.started_by is None! Cannot inject credentials")
+            return None
+        
+        try:
+            return int(context.started_by)
+        except (ValueError, TypeError):
+            logger.warning(f"Could not parse user_id from started_by: {context.started_by}")
+            return None
+    
     async def _inject_credentials(
         self, 
         node_config: NodeConfiguration, 
-        user_id: Optional[int]
+        context: ExecutionContext
     ) -> Optional[Dict[int, Dict[str, Any]]]:
         """
         Inject credentials into node execution input.
         
-        Scans node config for credential_id fields, fetches and decrypts
-        the credentials, and returns them as a dictionary.
+        Serves the credentials referenced by the node config (credential_id
+        fields) from the execution's credential cache.
         
         Args:
             node_config: Node configuration that may contain credential_id
-            user_id: User ID who owns the workflow (for credential access)
+            context: Execution context (started_by identifies the credential owner)
             
         Returns:
             Dictionary of credential_id → decrypted credential data
             Returns None if no credentials needed
         """
-        if not user_id or not node_config.config:
+        if not node_config.config:
             return None
         
-        # Scan config for credential_id fields
-        credential_ids = set()
-        for key, value in node_config.config.items():
-            # Match both "credential_id" and fields ending with "_credential_id"
-            if (key == "credential_id" or key.endswith("_credential_id")) and value:
-                try:
-                    cred_id = int(value)
-                    credential_ids.add(cred_id)
-                    logger.info(f"Found credential reference: {key}={cred_id} in node {node_config.node_id}")
-                except (ValueError, TypeError):
-                    logger.warning(f"Invalid credential_id in node {node_config.node_id}: {value}")
-        
-        if not credential_ids:
-            logger.debug(f"No credentials needed for node {node_config.node_id}")
-            return None
+        if self.credential_resolver is None:
+            # Node executed outside execute_workflow (e.g., tests)
+            self.credential_resolver = CredentialResolver(self._get_user_id(context))
         
-        # Fetch and decrypt credentials
         try:
-            from app.database.session import SessionLocal
-            from app.services.credential_manager import CredentialManager
-            
-            credentials_dict = {}
-            
-            db = SessionLocal()
-            try:
-                credential_manager = CredentialManager(db)
-                
-                for cred_id in credential_ids:
-                    cred_data = credential_manager.get_credential_data(cred_id, user_id)
-                    if cred_data:
-                        credentials_dict[cred_id] = cred_data
-                        logger.info(
-                            f"✅ Injected credential {cred_id} for node {node_config.node_id} "
-                            f"(fields: {list(cred_data.keys())})"
-                        )
-                    else:
-                        logger.warning(
-                            f"❌ Credential {cred_id} not found for user {user_id} "
-                            f"(node: {node_config.node_id})"
-                        )
-                
-                if credentials_dict:
-                    logger.info(f"🔐 Total credentials injected: {len(credentials_dict)}")
-                    return credentials_dict
-                else:
-                    logger.warning(f"No valid credentials found for node {node_config.node_id}")
-                    return None
-                
-            finally:
-                db.close()
-                
+            return self.credential_resolver.resolve(node_config)
         except Exception as e:
             logger.error(f"Error injecting credentials: {e}", exc_info=True)
             return None
@@ -1533,6 +2246,7 @@ class ParallelExecutor:
             self.paused = True
             self.paused_at = get_local_now()
             self.pause_event.clear()  # Block new nodes from starting
+            get_pause_timers().on_paused(self)
             logger.info("Execution paused - current nodes will finish, new nodes blocked")
         else:
             logger.warning("Execution already paused")
@@ -1547,10 +2261,41 @@ class ParallelExecutor:
             self.paused = False
             self.paused_at = None
             self.pause_event.set()  # Unblock execution
+            if self.context:
+                get_pause_timers().on_resumed(self.context.execution_id)
             logger.info("Execution resumed")
         else:
             logger.warning("Execution is not paused")
     
+    def hibernate(self) -> bool:
+        """
+        Persist state and stop the paused reactive loop.
+        
+        Only valid while paused with no running nodes; the loop exits with
+        ExecutionHibernated and the execution is later resumed from the
+        persisted checkpoint (see app.core.execution.hibernation).
+        
+        Returns:
+            False if the checkpoint could not be written; the execution then
+            stays paused in memory
+        """
+        if not self.paused or self.active_tasks:
+            raise RuntimeError("Only a paused execution without running nodes can hibernate")
+        
+        # Written synchronously so the state is durable before eviction
+        self._checkpoint_requested = False
+        if self._checkpoint_task is not None and not self._checkpoint_writing:
+            self._checkpoint_task.cancel()
+        try:
+            self._write_checkpoint(self.context, *self._capture_checkpoint(self.graph, self.context), final=True)
+        except Exception as e:
+            logger.warning(f"Failed to persist checkpoint for execution {self.context.execution_id}, not hibernating: {e}")
+            self._request_checkpoint(self.graph, self.context)
+            return False
+        self.hibernated = True
+        self.pause_event.set()  # Wake the loop so it exits
+        return True
+    
     def is_paused(self) -> bool:
         """Check if execution is currently paused."""
         return self.paused
@@ -1561,9 +2306,26 @@ class ParallelExecutor:
         self.cancel_requested = True
         await self._cancel_all_tasks()
         
+        # Wake a paused loop so it can observe the cancellation
+        self.pause_event.set()
+        
         # Pending nodes will be marked as STOPPED in the reactive loop
         logger.info("Cancellation complete - pending nodes will be marked as stopped in reactive loop")
     
+    async def abandon(self):
+        """
+        Stop the execution without persisting anything more.
+        
+        Used when another process took the execution over (e.g. a worker
+        whose job lease was reclaimed): running nodes are cancelled and
+        pending checkpoints dropped, so this copy cannot overwrite the new
+        owner's state. The caller cancels the task running the execution.
+        """
+        logger.warning("Execution abandoned - it is now run by another process")
+        self._checkpoint_requested = False
+        self._checkpoint_final = True
+        await self._cancel_all_tasks()
+    
     def get_progress(self) -> Dict[str, Any]:
         """
         Get current execution progress from the graph.
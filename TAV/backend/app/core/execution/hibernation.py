@@ -0,0 +1,446 @@
+"""
+Execution Hibernation
+
+An execution paused in a human-in-the-loop node (email approval, forms)
+used to keep its ParallelExecutor, context, graph and tasks in memory until
+the response arrived, while a monitor scanned every active execution once
+a minute for pause timeouts. Approvals can take days.
+
+Now a paused execution:
+- is hibernated after HIBERNATE_PAUSED_AFTER seconds - its durable
+  checkpoint (see recovery.py) is written, the record is marked PAUSED and
+  the executor is evicted from memory
+- is rehydrated on demand when the interaction response arrives
+  (rehydrate_execution), continuing the same execution record
+- is stopped at its deadline: the earliest expires_at of its pending
+  interactions, else PAUSED_EXECUTION_TIMEOUT after pausing
+
+Deadlines live in a heap served by one sleeping task (PauseTimers) instead
+of a periodic scan; deadlines of hibernated executions are persisted and
+re-armed on startup.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.utils.timezone import get_local_now
+
+if TYPE_CHECKING:
+    from app.core.execution.executor.parallel import ParallelExecutor
+
+logger = logging.getLogger(__name__)
+
+
+HIBERNATION_KEY = "hibernation"
+
+ACTION_HIBERNATE = "hibernate"
+ACTION_EXPIRE = "expire"
+
+
+class ExecutionHibernated(Exception):
+    """Raised in a hibernated executor's loop; its state is already persisted."""
+    pass
+
+
+class PauseTimers:
+    """Deadline heap for paused executions, served by a single sleeping task."""
+
+    def __init__(self, hibernate_after: Optional[int] = None, pause_timeout: Optional[int] = None):
+        """
+        Initialize pause timers.
+
+        Args:
+            hibernate_after: Seconds paused before hibernating (0 = never, default: HIBERNATE_PAUSED_AFTER)
+            pause_timeout: Deadline without interaction expiry (default: PAUSED_EXECUTION_TIMEOUT)
+        """
+        self.hibernate_after = settings.HIBERNATE_PAUSED_AFTER if hibernate_after is None else hibernate_after
+        self.pause_timeout = settings.PAUSED_EXECUTION_TIMEOUT if pause_timeout is None else pause_timeout
+
+        self._heap: List[Tuple[float, int, str, str]] = []  # (due timestamp, seq, execution_id, action)
+        self._live: Dict[Tuple[str, str], int] = {}  # (execution_id, action) → seq of the live entry
+        self._seq = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ==================== SCHEDULING ====================
+
+    def on_paused(self, executor: "ParallelExecutor"):
+        """Arm hibernation and deadline timers for a paused executor."""
+        context = executor.context
+        if context is None:
+            return
+
+        self.schedule(context.execution_id, ACTION_EXPIRE, get_pause_deadline(
+            context.pending_interactions, self.pause_timeout
+        ))
+        if self.hibernate_after and context.pending_interactions:
+            self.schedule(
+                context.execution_id, ACTION_HIBERNATE,
+                get_local_now() + timedelta(seconds=self.hibernate_after)
+            )
+
+    def on_resumed(self, execution_id: str):
+        """Disarm the timers of a resumed executor."""
+        self.cancel(execution_id)
+
+    def schedule(self, execution_id: str, action: str, due_at: datetime):
+        """
+        Schedule (or reschedule) a timer.
+
+        Args:
+            execution_id: Execution the timer belongs to
+            action: ACTION_HIBERNATE or ACTION_EXPIRE
+            due_at: When the timer fires
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (sync callers/tests): nothing can fire anyway
+            return
+
+        seq = next(self._seq)
+        self._live[(execution_id, action)] = seq
+        heapq.heappush(self._heap, (due_at.timestamp(), seq, execution_id, action))
+
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    def cancel(self, execution_id: str, action: Optional[str] = None):
+        """Cancel timers of an execution (entries are dropped lazily from the heap)."""
+        for key in [key for key in self._live if key[0] == execution_id and action in (None, key[1])]:
+            del self._live[key]
+
+    def pending(self) -> List[Tuple[str, str]]:
+        """(execution_id, action) of armed timers."""
+        return sorted(self._live)
+
+    # ==================== FIRING ====================
+
+    async def _run(self):
+        """Sleep until the earliest deadline, fire due timers, repeat."""
+        while True:
+            self._wakeup.clear()
+
+            now = get_local_now().timestamp()
+            while self._heap and self._heap[0][0] <= now:
+                _, seq, execution_id, action = heapq.heappop(self._heap)
+                if self._live.get((execution_id, action)) != seq:
+                    continue
+                del self._live[(execution_id, action)]
+                try:
+                    await self._fire(execution_id, action)
+                except Exception as e:
+                    logger.error(f"Pause timer '{action}' failed for execution {execution_id}: {e}", exc_info=True)
+
+            # Drop cancelled entries so they don't cause early wakeups
+            while self._heap and self._live.get((self._heap[0][2], self._heap[0][3])) != self._heap[0][1]:
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(),
+                    timeout=max(self._heap[0][0] - get_local_now().timestamp(), 0)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, execution_id: str, action: str):
+        """Handle a due timer."""
+        from app.core.execution.orchestrator import _active_executions
+
+        executor = _active_executions.get(execution_id)
+
+        if action == ACTION_HIBERNATE:
+            if not executor or not executor.paused or not executor.context.pending_interactions:
+                return
+            if executor.active_tasks:
+                # Other branches are still running; try again later
+                self.schedule(execution_id, ACTION_HIBERNATE, get_local_now() + timedelta(seconds=self.hibernate_after))
+                return
+            deadline = get_pause_deadline(executor.context.pending_interactions, self.pause_timeout)
+            if not hibernate_execution(executor, deadline):
+                # Checkpoint write failed; keep it in memory and try again later
+                self.schedule(execution_id, ACTION_HIBERNATE, get_local_now() + timedelta(seconds=self.hibernate_after))
+                return
+            self.schedule(execution_id, ACTION_EXPIRE, deadline)
+
+        elif action == ACTION_EXPIRE:
+            await expire_paused_execution(execution_id)
+
+
+# ==================== HIBERNATE / REHYDRATE / EXPIRE ====================
+
+def hibernate_execution(executor: "ParallelExecutor", deadline: datetime, session_factory=None) -> bool:
+    """
+    Persist a paused executor and evict it from memory.
+
+    Runs without awaiting, so an interaction response cannot observe a
+    half-hibernated execution.
+
+    Args:
+        executor: Paused executor with no running tasks
+        deadline: When the hibernated execution is stopped
+        session_factory: Factory for DB sessions (default: SessionLocal)
+
+    Returns:
+        True if hibernated, False if the checkpoint could not be written
+        (the executor stays in memory, still paused)
+    """
+    from app.core.execution.orchestrator import unregister_execution
+    from app.database.models.execution import Execution
+    from app.database.models.workflow import Workflow
+    from app.schemas.workflow import ExecutionStatus
+
+    if session_factory is None:
+        from app.database.session import SessionLocal
+        session_factory = SessionLocal
+
+    context = executor.context
+
+    # Writes node_results + checkpoint, then wakes the loop so it exits
+    if not executor.hibernate():
+        return False
+
+    db = session_factory()
+    try:
+        execution_db = db.query(Execution).filter(Execution.id == context.execution_id).first()
+        if execution_db:
+            execution_db.status = ExecutionStatus.PAUSED
+            execution_db.execution_metadata = {
+                **(execution_db.execution_metadata or {}),
+                HIBERNATION_KEY: {
+                    "hibernated_at": get_local_now().isoformat(),
+                    "deadline": deadline.isoformat(),
+                    "awaiting_nodes": sorted(context.pending_interactions),
+                }
+            }
+            workflow_db = db.query(Workflow).filter(Workflow.id == context.workflow_id).first()
+            if workflow_db:
+                workflow_db.status = ExecutionStatus.PAUSED
+            db.commit()
+    finally:
+        db.close()
+
+    unregister_execution(context.execution_id, context.workflow_id)
+    logger.info(
+        f"💤 Hibernated execution {context.execution_id} awaiting "
+        f"{sorted(context.pending_interactions)} (deadline {deadline.isoformat()})"
+    )
+    return True
+
+
+async def rehydrate_execution(execution_id: str) -> Optional["ParallelExecutor"]:
+    """
+    Load a hibernated execution back into memory.
+
+    The execution is resumed in the background, paused at its awaiting
+    nodes; the returned executor can be updated with the interaction result
+    and resumed like one that never left memory.
+
+    Args:
+        execution_id: Hibernated execution ID
+
+    Returns:
+        Registered executor, or None if the execution is not hibernated
+    """
+    from app.core.execution.orchestrator import WorkflowOrchestrator
+    from app.database.session import SessionLocal
+
+    db = SessionLocal()
+    orchestrator = WorkflowOrchestrator(db)
+    try:
+        prepared = orchestrator.prepare_resume(execution_id)
+    except ValueError as e:
+        logger.warning(f"Cannot rehydrate execution {execution_id}: {e}")
+        db.close()
+        return None
+
+    async def run_resumed():
+        try:
+            await orchestrator.run_prepared_resume(prepared)
+        except Exception as e:
+            logger.error(f"Rehydrated execution {execution_id} failed: {e}", exc_info=True)
+        finally:
+            db.close()
+
+    asyncio.create_task(run_resumed())
+    logger.info(f"☀️ Rehydrated execution {execution_id}")
+    return prepared["_executor"]
+
+
+async def expire_paused_execution(execution_id: str, session_factory=None) -> bool:
+    """
+    Stop a paused execution whose deadline passed.
+
+    Args:
+        execution_id: Execution ID
+        session_factory: Factory for DB sessions (default: SessionLocal)
+
+    Returns:
+        True if the execution was stopped
+    """
+    from app.core.execution.orchestrator import _active_executions
+    from app.database.models.execution import Execution
+    from app.schemas.workflow import ExecutionStatus
+
+    executor = _active_executions.get(execution_id)
+
+    if executor is not None:
+        if not executor.paused:
+            return False
+        logger.warning(f"Execution {execution_id} passed its pause deadline, auto-cancelling...")
+        await executor.cancel_execution()
+    else:
+        if session_factory is None:
+            from app.database.session import SessionLocal
+            session_factory = SessionLocal
+
+        db = session_factory()
+        try:
+            execution_db = db.query(Execution).filter(Execution.id == execution_id).first()
+            if (
+                not execution_db
+                or execution_db.status != ExecutionStatus.PAUSED
+                or HIBERNATION_KEY not in (execution_db.execution_metadata or {})
+            ):
+                return False
+
+            logger.warning(f"Hibernated execution {execution_id} passed its pause deadline, stopping")
+            stop_hibernated_execution(db, execution_db, "Execution cancelled due to pause timeout")
+        finally:
+            db.close()
+
+    try:
+        from app.api.v1.endpoints.executions import publish_execution_event
+        await publish_execution_event(execution_id, {
+            "type": "execution_stopped",
+            "execution_id": execution_id,
+            "reason": "pause_timeout",
+            "message": "Execution cancelled due to pause timeout"
+        })
+    except Exception as e:
+        logger.warning(f"Failed to broadcast timeout event: {e}")
+
+    return True
+
+
+def stop_hibernated_execution(db: Session, execution_db, error_message: str):
+    """
+    Stop a hibernated execution from its checkpoint, without rehydrating it.
+
+    The execution keeps the node_results written at hibernation; the
+    workflow, left PAUSED by hibernate_execution, goes back to monitoring
+    (PENDING) if it has trigger nodes, like after any finished run.
+
+    Args:
+        db: Database session execution_db is bound to
+        execution_db: Hibernated Execution record
+        error_message: Reason stored on the execution
+    """
+    from app.database.models.workflow import Workflow
+    from app.schemas.workflow import ExecutionStatus, NodeCategory, WorkflowDefinition
+
+    execution_db.status = ExecutionStatus.STOPPED
+    execution_db.completed_at = get_local_now()
+    execution_db.error_message = error_message
+    execution_db.execution_metadata = {
+        key: value for key, value in (execution_db.execution_metadata or {}).items()
+        if key != HIBERNATION_KEY
+    }
+
+    workflow_db = db.query(Workflow).filter(Workflow.id == execution_db.workflow_id).first()
+    if workflow_db and workflow_db.status == ExecutionStatus.PAUSED:
+        workflow_def = WorkflowDefinition(**(execution_db.workflow_snapshot or workflow_db.workflow_data))
+        has_triggers = any(node.category == NodeCategory.TRIGGERS for node in workflow_def.nodes)
+        workflow_db.status = ExecutionStatus.PENDING if has_triggers else ExecutionStatus.STOPPED
+        workflow_db.last_run_at = execution_db.completed_at
+
+    db.commit()
+    get_pause_timers().cancel(execution_db.id)
+
+
+def is_hibernated(db: Session, execution_id: str) -> bool:
+    """Check if an execution is hibernated (paused and evicted from memory)."""
+    from app.database.models.execution import Execution
+    from app.schemas.workflow import ExecutionStatus
+
+    execution = db.query(Execution).filter(Execution.id == execution_id).first()
+    return bool(
+        execution
+        and execution.status == ExecutionStatus.PAUSED
+        and HIBERNATION_KEY in (execution.execution_metadata or {})
+    )
+
+
+def schedule_hibernated_deadlines(db: Session) -> int:
+    """
+    Re-arm deadlines of hibernated executions (after a restart).
+
+    Args:
+        db: Database session
+
+    Returns:
+        Number of deadlines armed
+    """
+    from app.database.models.execution import Execution
+    from app.schemas.workflow import ExecutionStatus
+
+    timers = get_pause_timers()
+    armed = 0
+
+    for execution in db.query(Execution).filter(Execution.status == ExecutionStatus.PAUSED).all():
+        hibernation = (execution.execution_metadata or {}).get(HIBERNATION_KEY)
+        if not hibernation:
+            continue
+        try:
+            deadline = datetime.fromisoformat(hibernation["deadline"])
+        except (KeyError, TypeError, ValueError):
+            deadline = get_local_now()
+        timers.schedule(execution.id, ACTION_EXPIRE, deadline)
+        armed += 1
+
+    if armed:
+        logger.info(f"⏰ Re-armed deadlines of {armed} hibernated execution(s)")
+    return armed
+
+
+def get_pause_deadline(pending_interactions: Dict[str, Dict], pause_timeout: int) -> datetime:
+    """Earliest expires_at of the pending interactions, else now + pause_timeout."""
+    deadlines = []
+    for interaction in pending_interactions.values():
+        try:
+            deadlines.append(datetime.fromisoformat(interaction["expires_at"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    if deadlines:
+        return min(deadlines, key=lambda d: d.timestamp())
+    return get_local_now() + timedelta(seconds=pause_timeout)
+
+
+# Global timers instance
+_pause_timers: Optional[PauseTimers] = None
+
+
+def get_pause_timers() -> PauseTimers:
+    """Get the process-wide pause timers."""
+    global _pause_timers
+    if _pause_timers is None:
+        _pause_timers = PauseTimers()
+    return _pause_timers
@@ -12,9 +12,8 @@ High-level coordinator for workflow execution. Responsibilities:
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set, Tuple
 from uuid import uuid4
-from datetime import timedelta
 
 from app.utils.timezone import get_local_now
 
@@ -24,8 +23,16 @@ from app.database.models.workflow import Workflow
 from app.database.models.execution import Execution
 from app.schemas.workflow import WorkflowDefinition, ExecutionStatus, NodeCategory
 from app.core.execution.graph.builder import GraphBuilder
-from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.graph.types import ExecutionGraph, NodeExecutionPhase
+from app.core.execution.context import ExecutionContext, ExecutionMode, NodeExecutionResult
 from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.artifacts import get_artifact_store, DEFAULT_MAX_INLINE_BYTES
+from app.core.execution.blocking import run_blocking
+from app.core.execution.streams import is_stream_ref
+from app.core.execution.recovery import restore_checkpoint, get_checkpoint, RECOVERY_KEY
+from app.core.execution.hibernation import (
+    ExecutionHibernated, HIBERNATION_KEY, is_hibernated, stop_hibernated_execution
+)
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -36,7 +43,6 @@ logger = logging.getLogger(__name__)
 # Track all currently running executions for pause/resume/stop control
 _active_executions: Dict[str, ParallelExecutor] = {}  # execution_id -> executor
 _active_executions_by_workflow: Dict[str, str] = {}  # workflow_id -> execution_id
-_pause_timeout_task: Optional[asyncio.Task] = None  # Background monitoring task
 
 
 def register_execution(execution_id: str, workflow_id: str, executor: ParallelExecutor):
@@ -44,11 +50,6 @@ def register_execution(execution_id: str, workflow_id: str, executor: ParallelEx
     _active_executions[execution_id] = executor
     _active_executions_by_workflow[workflow_id] = execution_id
     logger.debug(f"Registered execution {execution_id} for workflow {workflow_id}")
-    
-    # Start pause timeout monitor if not already running
-    global _pause_timeout_task
-    if _pause_timeout_task is None or _pause_timeout_task.done():
-        _pause_timeout_task = asyncio.create_task(_monitor_paused_executions())
 
 
 def unregister_execution(execution_id: str, workflow_id: str):
@@ -68,59 +69,6 @@ def get_active_executor(workflow_id: str) -> Optional[ParallelExecutor]:
     return None
 
 
-async def _monitor_paused_executions():
-    """
-    Background task to monitor paused executions and auto-cancel after 30 minutes.
-    
-    Runs indefinitely, checking every 60 seconds.
-    """
-    logger.info("Started pause timeout monitor")
-    
-    try:
-        while True:
-            await asyncio.sleep(60)  # Check every minute
-            
-            if not _active_executions:
-                # No active executions, can exit
-                logger.debug("No active executions, pause monitor exiting")
-                break
-            
-            # Check each active execution for pause timeout
-            now = get_local_now()
-            timeout_limit = timedelta(minutes=30)
-            
-            for execution_id, executor in list(_active_executions.items()):
-                if executor.paused and executor.paused_at:
-                    paused_duration = now - executor.paused_at
-                    
-                    if paused_duration > timeout_limit:
-                        logger.warning(
-                            f"Execution {execution_id} has been paused for "
-                            f"{paused_duration.total_seconds():.0f}s (>30min), "
-                            f"auto-cancelling..."
-                        )
-                        
-                        # Auto-cancel the execution
-                        await executor.cancel_execution()
-                        
-                        # Broadcast timeout event
-                        try:
-                            from app.api.v1.endpoints.executions import publish_execution_event
-                            await publish_execution_event(execution_id, {
-                                "type": "execution_stopped",
-                                "execution_id": execution_id,
-                                "reason": "pause_timeout",
-                                "message": "Execution cancelled due to 30-minute pause timeout"
-                            })
-                        except Exception as e:
-                            logger.warning(f"Failed to broadcast timeout event: {e}")
-    
-    except Exception as e:
-        logger.error(f"Error in pause timeout monitor: {e}", exc_info=True)
-    finally:
-        logger.info("Pause timeout monitor stopped")
-
-
 class WorkflowOrchestrator:
     """
     High-level workflow execution coordinator.
@@ -336,119 +284,33 @@ class WorkflowOrchestrator:
             unregister_execution(execution_id, workflow_id)
             
             # 7. Update execution record - SUCCESS
-            execution_db.status = ExecutionStatus.COMPLETED
-            execution_db.completed_at = context.completed_at
-            execution_db.final_outputs = context.final_outputs
-            execution_db.node_results = {
-                node_id: result.to_dict() for node_id, result in context.node_results.items()
-            }
-            execution_db.execution_log = context.execution_log
-            execution_db.execution_metadata = {
-                "duration_seconds": (
-                    (context.completed_at - context.started_at).total_seconds()
-                    if context.completed_at and context.started_at else 0
-                )
-            }
-            
-            # Update workflow status
-            workflow_db.status = ExecutionStatus.COMPLETED
-            workflow_db.last_execution_id = execution_id
-            workflow_db.last_run_at = execution_db.completed_at
-            
-            self.db.commit()
-            
-            logger.info(
-                f"Workflow execution completed successfully: {execution_id}, "
-                f"duration={execution_db.execution_metadata.get('duration_seconds')}s"
+            await self._complete_execution(
+                execution_db, workflow_db, context, execution_config,
+                message="Workflow execution completed successfully"
             )
             
-            # Broadcast execution complete event via SSE
-            try:
-                from app.api.v1.endpoints.executions import publish_execution_event
-                await publish_execution_event(execution_id, {
-                    "type": "execution_complete",
-                    "execution_id": execution_id,
-                    "workflow_id": workflow_id,
-                    "status": "completed",
-                    "duration_seconds": execution_db.execution_metadata.get('duration_seconds'),
-                    "message": "Workflow execution completed successfully"
-                })
-            except Exception as e:
-                logger.warning(f"Failed to broadcast execution_complete event: {e}")
-            
             # Auto-revert for persistent workflows (back to monitoring after 2 sec)
-            # Detect if workflow has trigger nodes by checking the workflow definition
-            has_triggers = any(
-                node.category == NodeCategory.TRIGGERS
-                for node in workflow_def.nodes
-            )
-            
-            if has_triggers:
-                import asyncio
-                await asyncio.sleep(2)
-                
-                # Refresh workflow to check if status is still "completed"
-                self.db.refresh(workflow_db)
-                if workflow_db.status == ExecutionStatus.COMPLETED:
-                    workflow_db.status = ExecutionStatus.PENDING
-                    self.db.commit()
-                    logger.info(f"Auto-reverted workflow {workflow_id} status to PENDING (monitoring)")
+            await self._revert_to_monitoring(workflow_db, workflow_def, ExecutionStatus.COMPLETED)
             
             return execution_id
         
+        except ExecutionHibernated:
+            # Persisted and unregistered by hibernate_execution; an interaction
+            # response rehydrates it (see app.core.execution.hibernation)
+            return execution_id
+        
         except Exception as e:
             # Unregister executor on failure
             unregister_execution(execution_id, workflow_id)
             
             # 7. Update execution record - FAILURE
-            logger.error(f"Workflow execution failed: {execution_id}, error={e}", exc_info=True)
-            
-            execution_db.status = ExecutionStatus.FAILED
-            execution_db.completed_at = get_local_now()
-            execution_db.error_message = str(e)
-            execution_db.execution_log = context.execution_log
-            execution_db.node_results = {
-                node_id: result.to_dict() for node_id, result in context.node_results.items()
-            }
-            
-            # Update workflow status
-            workflow_db.status = ExecutionStatus.FAILED
-            workflow_db.last_execution_id = execution_id
-            workflow_db.last_run_at = execution_db.completed_at
-            
-            self.db.commit()
-            
-            # Broadcast execution failed event via SSE
-            try:
-                from app.api.v1.endpoints.executions import publish_execution_event
-                await publish_execution_event(execution_id, {
-                    "type": "execution_failed",
-                    "execution_id": execution_id,
-                    "workflow_id": workflow_id,
-                    "status": "failed",
-                    "error": str(e),
-                    "message": f"Workflow execution failed: {str(e)}"
-                })
-            except Exception as broadcast_error:
-                logger.warning(f"Failed to broadcast execution_failed event: {broadcast_error}")
-            
-            # Auto-revert for persistent workflows (back to monitoring after 2 sec)
-            # Detect if workflow has trigger nodes
-            has_triggers = any(
-                node.category == NodeCategory.TRIGGERS
-                for node in workflow_def.nodes
+            await self._fail_execution(
+                execution_db, workflow_db, context, e,
+                message="Workflow execution failed"
             )
             
-            if has_triggers:
-                import asyncio
-                await asyncio.sleep(2)
-                
-                # Refresh workflow to check if status is still "failed"
-                self.db.refresh(workflow_db)
-                if workflow_db.status == ExecutionStatus.FAILED:
-                    workflow_db.status = ExecutionStatus.PENDING
-                    self.db.commit()
-                    logger.info(f"Auto-reverted workflow {workflow_id} status to PENDING (monitoring) after failure")
+            # Auto-revert for persistent workflows (back to monitoring after 2 sec)
+            await self._revert_to_monitoring(workflow_db, workflow_def, ExecutionStatus.FAILED)
             
             raise
     
@@ -456,7 +318,8 @@ class WorkflowOrchestrator:
         """
         Cancel running execution.
         
-        Hard stop: immediately cancels all running tasks.
+        Hard stop: immediately cancels all running tasks. A hibernated
+        execution is stopped from its checkpoint without rehydrating it.
         
         Args:
             execution_id: Execution UUID
@@ -469,24 +332,29 @@ class WorkflowOrchestrator:
         if not execution_db:
             raise ValueError(f"Execution not found: {execution_id}")
         
-        if execution_db.status != ExecutionStatus.RUNNING:
+        if is_hibernated(self.db, execution_id) and execution_id not in _active_executions:
+            logger.info(f"Stopping hibernated execution {execution_id}")
+            stop_hibernated_execution(self.db, execution_db, "Execution stopped by user")
+        
+        elif execution_db.status != ExecutionStatus.RUNNING:
             logger.warning(f"Execution {execution_id} is not running, cannot stop")
             return False
         
-        # Signal the executor to cancel all tasks (hard stop)
-        if execution_id in _active_executions:
-            executor = _active_executions[execution_id]
-            logger.info(f"Sending cancel signal to executor for {execution_id}")
-            await executor.cancel_execution()
         else:
-            logger.warning(f"Executor not found in registry for {execution_id}, updating DB only")
-        
-        # Update DB status
-        execution_db.status = ExecutionStatus.STOPPED
-        execution_db.completed_at = get_local_now()
-        execution_db.error_message = "Execution stopped by user"
-        
-        self.db.commit()
+            # Signal the executor to cancel all tasks (hard stop)
+            if execution_id in _active_executions:
+                executor = _active_executions[execution_id]
+                logger.info(f"Sending cancel signal to executor for {execution_id}")
+                await executor.cancel_execution()
+            else:
+                logger.warning(f"Executor not found in registry for {execution_id}, updating DB only")
+            
+            # Update DB status
+            execution_db.status = ExecutionStatus.STOPPED
+            execution_db.completed_at = get_local_now()
+            execution_db.error_message = "Execution stopped by user"
+            
+            self.db.commit()
         
         # Broadcast stop event to SSE clients
         try:
@@ -583,48 +451,14 @@ class WorkflowOrchestrator:
                 }
         
         # 5. Identify completed nodes from original execution
-        completed_node_ids = set()
-        completed_node_outputs = {}
-        
-        if original_execution.node_results:
-            for node_id, result in original_execution.node_results.items():
-                if result.get("success") is True:
-                    # Check if this node still exists in current workflow
-                    node_exists = any(
-                        node.node_id == node_id 
-                        for node in current_workflow_def.nodes
-                    )
-                    
-                    if node_exists:
-                        completed_node_ids.add(node_id)
-                        completed_node_outputs[node_id] = result.get("outputs", {})
-                        logger.debug(f"  ✅ Will skip completed node: {node_id}")
-                    else:
-                        logger.warning(f"  ⚠️ Completed node {node_id} no longer exists in workflow")
+        completed_node_ids, completed_node_outputs = self._collect_completed_nodes(
+            original_execution, current_workflow_def
+        )
         
         logger.info(f"📊 Found {len(completed_node_ids)} completed nodes to skip")
         
-        # 6. Build execution graph from CURRENT workflow
-        graph_builder = GraphBuilder(current_workflow_def)
-        graph = graph_builder.build()
-        
-        # 7. Pre-mark completed nodes in the graph
-        from app.core.execution.graph.types import NodeExecutionPhase
-        
-        for node_id in completed_node_ids:
-            if node_id in graph.nodes:
-                # Mark node as completed
-                graph.nodes[node_id].phase = NodeExecutionPhase.COMPLETED
-                graph.completed_nodes.add(node_id)
-                
-                # Decrement dependency counters for all dependent nodes
-                for dependent_id in graph.nodes[node_id].dependents:
-                    if dependent_id in graph.nodes:
-                        graph.nodes[dependent_id].remaining_deps -= 1
-                        logger.debug(
-                            f"  📉 Decremented deps for {dependent_id}: "
-                            f"remaining={graph.nodes[dependent_id].remaining_deps}"
-                        )
+        # 6-7. Build execution graph from CURRENT workflow with completed nodes pre-marked
+        graph = self._build_retry_graph(current_workflow_def, completed_node_ids)
         
         # 8. Create new execution record
         new_execution_id = str(uuid4())
@@ -650,7 +484,8 @@ class WorkflowOrchestrator:
                 "retry_count": retry_count,
                 "skipped_nodes": list(completed_node_ids),
                 "original_failed_at": original_execution.completed_at.isoformat() if original_execution.completed_at else None,
-                "structure_warnings": warnings if warnings else None
+                "structure_warnings": warnings if warnings else None,
+                "frontend_origin": frontend_origin
             }
         )
         self.db.add(new_execution_db)
@@ -666,27 +501,14 @@ class WorkflowOrchestrator:
         logger.info(f"✅ Created retry execution: {new_execution_id} (retry #{retry_count})")
         
         # 9. Create execution context with restored outputs
-        context = ExecutionContext(
-            workflow_id=original_execution.workflow_id,
-            execution_id=new_execution_id,
-            execution_source="retry",
-            trigger_data=original_execution.trigger_data or {},
-            started_by=started_by or original_execution.started_by,
-            execution_mode=ExecutionMode.PARALLEL,
-            frontend_origin=frontend_origin
+        context = self._build_retry_context(
+            original_execution,
+            new_execution_id,
+            started_by or original_execution.started_by,
+            frontend_origin,
+            completed_node_outputs
         )
         
-        # Restore outputs from completed nodes
-        for node_id, outputs in completed_node_outputs.items():
-            context.node_outputs[node_id] = outputs
-            logger.debug(f"  📦 Restored outputs for node {node_id}: {list(outputs.keys())}")
-        
-        # Inject trigger data (same as original execution)
-        if original_execution.trigger_data:
-            context.variables["trigger_data"] = original_execution.trigger_data
-            for key, value in original_execution.trigger_data.items():
-                context.variables[f"trigger_{key}"] = value
-        
         # Get execution config
         execution_config = self._merge_execution_config(workflow_db)
         
@@ -735,7 +557,7 @@ class WorkflowOrchestrator:
             # Update execution record - SUCCESS
             new_execution_db.status = ExecutionStatus.COMPLETED
             new_execution_db.completed_at = context.completed_at
-            new_execution_db.final_outputs = context.final_outputs
+            new_execution_db.final_outputs = await self._store_final_outputs(context, execution_config)
             new_execution_db.node_results = {
                 node_id: result.to_dict() for node_id, result in context.node_results.items()
             }
@@ -874,7 +696,7 @@ class WorkflowOrchestrator:
             # Update execution record - SUCCESS
             new_execution_db.status = ExecutionStatus.COMPLETED
             new_execution_db.completed_at = context.completed_at
-            new_execution_db.final_outputs = context.final_outputs
+            new_execution_db.final_outputs = await self._store_final_outputs(context, execution_config)
             new_execution_db.node_results = {
                 node_id: result.to_dict() for node_id, result in context.node_results.items()
             }
@@ -908,6 +730,16 @@ class WorkflowOrchestrator:
                 "success": True
             }
         
+        except ExecutionHibernated:
+            # Persisted and unregistered by hibernate_execution
+            return {
+                "execution_id": new_execution_id,
+                "skipped_nodes": list(completed_node_ids),
+                "warnings": warnings,
+                "success": True,
+                "hibernated": True
+            }
+        
         except Exception as e:
             unregister_execution(new_execution_id, original_execution.workflow_id)
             
@@ -954,6 +786,536 @@ class WorkflowOrchestrator:
             raise
         finally:
             db.close()
+
+    async def resume_execution(self, execution_id: str) -> str:
+        """
+        Resume an execution interrupted by a restart or hibernated while paused.
+
+        Unlike retry_from_checkpoint, this continues the SAME execution record:
+        context and graph are rebuilt from the durable completion log
+        (node_results + execution_metadata["checkpoint"]) and only the
+        incomplete frontier runs. The workflow snapshot is used, so the run
+        matches what was originally started.
+
+        Args:
+            execution_id: Interrupted or hibernated execution ID
+
+        Returns:
+            Execution ID
+
+        Raises:
+            ValueError: If the execution or its workflow is not found, or it already finished
+            Exception: If the resumed execution fails
+        """
+        prepared = self.prepare_resume(execution_id)
+        return await self.run_prepared_resume(prepared)
+
+    def prepare_resume(self, execution_id: str) -> Dict[str, Any]:
+        """
+        Rebuild and register the executor of an execution to resume.
+
+        The executor is registered (and paused at nodes awaiting interaction)
+        before anything runs, so callers can update its context first - this
+        is how hibernated executions receive interaction responses.
+
+        Args:
+            execution_id: Interrupted or hibernated execution ID
+
+        Returns:
+            Dict accepted by run_prepared_resume() (includes "_executor")
+
+        Raises:
+            ValueError: If the execution or its workflow is not found, or it already finished
+        """
+        execution_db = self.db.query(Execution).filter(Execution.id == execution_id).first()
+        if not execution_db:
+            raise ValueError(f"Execution not found: {execution_id}")
+
+        resumable_statuses = [ExecutionStatus.PENDING, ExecutionStatus.RUNNING, ExecutionStatus.PAUSED]
+        if execution_db.status not in resumable_statuses:
+            raise ValueError(f"Cannot resume execution with status '{execution_db.status}'")
+
+        workflow_db = self.db.query(Workflow).filter(Workflow.id == execution_db.workflow_id).first()
+        if not workflow_db:
+            raise ValueError(f"Workflow not found: {execution_db.workflow_id}")
+
+        workflow_def = WorkflowDefinition(**(execution_db.workflow_snapshot or workflow_db.workflow_data))
+        execution_config = self._merge_execution_config(workflow_db)
+        graph, context, awaiting = self._build_resume_state(execution_db, workflow_def)
+
+        metadata = dict(execution_db.execution_metadata or {})
+        metadata.pop(RECOVERY_KEY, None)
+        metadata.pop(HIBERNATION_KEY, None)
+        metadata["resume_count"] = metadata.get("resume_count", 0) + 1
+        execution_db.execution_metadata = metadata
+        execution_db.status = ExecutionStatus.RUNNING
+        workflow_db.status = ExecutionStatus.RUNNING
+        workflow_db.last_execution_id = execution_id
+        self.db.commit()
+
+        logger.info(
+            f"♻️ Resuming execution {execution_id}: {len(graph.completed_nodes)} node(s) restored, "
+            f"{len(awaiting)} awaiting interaction"
+        )
+
+        executor = ParallelExecutor(execution_config)
+        executor.context = context
+        executor.graph = graph
+        if awaiting:
+            # Wait for the interaction again; submission resumes the executor
+            executor.pause()
+        register_execution(execution_id, execution_db.workflow_id, executor)
+
+        return {
+            "execution_id": execution_id,
+            "_executor": executor,
+            "_workflow_def": workflow_def,
+            "_graph": graph,
+            "_context": context,
+            "_execution_config": execution_config,
+            "_execution_db": execution_db,
+            "_workflow_db": workflow_db,
+            "_metadata": metadata,
+        }
+
+    async def run_prepared_resume(self, prepared: Dict[str, Any]) -> str:
+        """
+        Run an execution prepared by prepare_resume().
+
+        Must be called on the same orchestrator (DB session) that prepared it.
+
+        Args:
+            prepared: Dict returned by prepare_resume()
+
+        Returns:
+            Execution ID
+        """
+        execution_id = prepared["execution_id"]
+        executor = prepared["_executor"]
+        workflow_def = prepared["_workflow_def"]
+        graph = prepared["_graph"]
+        context = prepared["_context"]
+        execution_config = prepared["_execution_config"]
+        execution_db = prepared["_execution_db"]
+        workflow_db = prepared["_workflow_db"]
+        metadata = prepared["_metadata"]
+
+        try:
+            from app.api.v1.endpoints.executions import publish_execution_event
+            await publish_execution_event(execution_id, {
+                "type": "execution_start",
+                "execution_id": execution_id,
+                "workflow_id": execution_db.workflow_id,
+                "status": "running",
+                "message": "Execution resumed",
+                "skipped_nodes": sorted(graph.completed_nodes)
+            })
+        except Exception as e:
+            logger.warning(f"Failed to broadcast resume event: {e}")
+
+        try:
+            context = await executor.execute_workflow(workflow_def, graph, context)
+            unregister_execution(execution_id, execution_db.workflow_id)
+
+            await self._complete_execution(
+                execution_db, workflow_db, context, execution_config,
+                message="Resumed execution completed successfully",
+                metadata={"resume_count": metadata["resume_count"]}
+            )
+            return execution_id
+
+        except ExecutionHibernated:
+            # Persisted and unregistered by hibernate_execution
+            return execution_id
+
+        except Exception as e:
+            unregister_execution(execution_id, execution_db.workflow_id)
+            await self._fail_execution(
+                execution_db, workflow_db, context, e,
+                message="Resumed execution failed"
+            )
+            raise
+
+    async def _complete_execution(
+        self,
+        execution_db: Execution,
+        workflow_db: Workflow,
+        context: ExecutionContext,
+        execution_config: Dict[str, Any],
+        message: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Record a successful run on the execution and workflow and broadcast it.
+
+        Args:
+            execution_db: Execution record (bound to self.db)
+            workflow_db: Workflow record (bound to self.db)
+            context: Finished execution context
+            execution_config: Merged execution config
+            message: Log and SSE message
+            metadata: Extra execution_metadata stored next to duration_seconds
+        """
+        duration = (
+            (context.completed_at - context.started_at).total_seconds()
+            if context.completed_at and context.started_at else 0
+        )
+
+        execution_db.status = ExecutionStatus.COMPLETED
+        execution_db.completed_at = context.completed_at
+        execution_db.final_outputs = await self._store_final_outputs(context, execution_config)
+        execution_db.node_results = {
+            node_id: result.to_dict() for node_id, result in context.node_results.items()
+        }
+        execution_db.execution_log = context.execution_log
+        execution_db.execution_metadata = {**(metadata or {}), "duration_seconds": duration}
+
+        workflow_db.status = ExecutionStatus.COMPLETED
+        workflow_db.last_execution_id = execution_db.id
+        workflow_db.last_run_at = execution_db.completed_at
+
+        self.db.commit()
+
+        logger.info(f"✅ {message}: {execution_db.id}, duration={duration}s")
+
+        try:
+            from app.api.v1.endpoints.executions import publish_execution_event
+            await publish_execution_event(execution_db.id, {
+                "type": "execution_complete",
+                "execution_id": execution_db.id,
+                "workflow_id": execution_db.workflow_id,
+                "status": "completed",
+                "duration_seconds": duration,
+                "message": message
+            })
+        except Exception as e:
+            logger.warning(f"Failed to broadcast execution_complete event: {e}")
+
+    async def _fail_execution(
+        self,
+        execution_db: Execution,
+        workflow_db: Workflow,
+        context: ExecutionContext,
+        error: Exception,
+        message: str
+    ):
+        """
+        Record a failed run on the execution and workflow and broadcast it.
+
+        Must be called from the except block handling the error (logs its traceback).
+
+        Args:
+            execution_db: Execution record (bound to self.db)
+            workflow_db: Workflow record (bound to self.db)
+            context: Execution context (partial node results are kept)
+            error: Exception the run failed with
+            message: Log and SSE message
+        """
+        logger.error(f"❌ {message}: {execution_db.id}, error={error}", exc_info=True)
+
+        execution_db.status = ExecutionStatus.FAILED
+        execution_db.completed_at = get_local_now()
+        execution_db.error_message = str(error)
+        execution_db.execution_log = context.execution_log
+        execution_db.node_results = {
+            node_id: result.to_dict() for node_id, result in context.node_results.items()
+        }
+
+        workflow_db.status = ExecutionStatus.FAILED
+        workflow_db.last_execution_id = execution_db.id
+        workflow_db.last_run_at = execution_db.completed_at
+
+        self.db.commit()
+
+        try:
+            from app.api.v1.endpoints.executions import publish_execution_event
+            await publish_execution_event(execution_db.id, {
+                "type": "execution_failed",
+                "execution_id": execution_db.id,
+                "workflow_id": execution_db.workflow_id,
+                "status": "failed",
+                "error": str(error),
+                "message": f"{message}: {str(error)}"
+            })
+        except Exception as broadcast_error:
+            logger.warning(f"Failed to broadcast execution_failed event: {broadcast_error}")
+
+    async def _revert_to_monitoring(
+        self,
+        workflow_db: Workflow,
+        workflow_def: WorkflowDefinition,
+        finished_status: str
+    ):
+        """
+        Put a workflow with trigger nodes back to PENDING (monitoring) 2 sec after a run.
+
+        Skipped if the workflow status changed in the meantime (e.g. another run started).
+        """
+        has_triggers = any(
+            node.category == NodeCategory.TRIGGERS
+            for node in workflow_def.nodes
+        )
+        if not has_triggers:
+            return
+
+        await asyncio.sleep(2)
+
+        # Refresh workflow to check if status is still the finished one
+        self.db.refresh(workflow_db)
+        if workflow_db.status == finished_status:
+            workflow_db.status = ExecutionStatus.PENDING
+            self.db.commit()
+            logger.info(f"Auto-reverted workflow {workflow_db.id} status to PENDING (monitoring)")
+
+    def _build_resume_state(
+        self,
+        execution_db: Execution,
+        workflow_def: WorkflowDefinition
+    ) -> Tuple[ExecutionGraph, ExecutionContext, Set[str]]:
+        """
+        Rebuild graph and context of an interrupted execution.
+
+        Nodes that completed are pre-marked with their stored outputs;
+        nodes that were executing when the process died run again.
+
+        Args:
+            execution_db: Interrupted execution
+            workflow_def: Workflow definition the execution runs
+
+        Returns:
+            (graph, context, node IDs awaiting human interaction)
+        """
+        stored_results = execution_db.node_results or {}
+        awaiting_ids = {
+            node_id for node_id, result in stored_results.items()
+            if (result.get("metadata") or {}).get("awaiting_interaction")
+        }
+
+        completed_node_ids, completed_node_outputs = self._collect_completed_nodes(execution_db, workflow_def)
+        completed_node_ids -= awaiting_ids
+
+        graph = self._build_retry_graph(workflow_def, completed_node_ids)
+
+        modes = {mode.value for mode in ExecutionMode}
+        context = ExecutionContext(
+            workflow_id=execution_db.workflow_id,
+            execution_id=execution_db.id,
+            execution_source=execution_db.execution_source or "manual",
+            trigger_data=execution_db.trigger_data or {},
+            started_by=execution_db.started_by,
+            execution_mode=(
+                ExecutionMode(execution_db.execution_mode)
+                if execution_db.execution_mode in modes else ExecutionMode.PARALLEL
+            ),
+            frontend_origin=(execution_db.execution_metadata or {}).get("frontend_origin")
+        )
+
+        if execution_db.trigger_data:
+            context.variables["trigger_data"] = execution_db.trigger_data
+            for key, value in execution_db.trigger_data.items():
+                context.variables[f"trigger_{key}"] = value
+
+        for node_id in completed_node_ids:
+            context.node_outputs[node_id] = completed_node_outputs[node_id]
+            context.node_results[node_id] = NodeExecutionResult.from_dict(stored_results[node_id])
+
+        awaiting = restore_checkpoint(get_checkpoint(execution_db.execution_metadata), graph, context)
+        for node_id in awaiting & awaiting_ids:
+            context.node_outputs[node_id] = stored_results[node_id].get("outputs") or {}
+            context.node_results[node_id] = NodeExecutionResult.from_dict(stored_results[node_id])
+
+        return graph, context, awaiting
+
+    def _collect_completed_nodes(
+        self,
+        original_execution: Execution,
+        workflow_def: WorkflowDefinition
+    ) -> Tuple[Set[str], Dict[str, Dict[str, Any]]]:
+        """
+        Find nodes that completed successfully in an execution and still exist.
+        
+        Args:
+            original_execution: Execution to collect results from
+            workflow_def: Workflow definition the retry will run
+        
+        Returns:
+            (completed node IDs, node_id → outputs)
+        """
+        completed_node_ids = set()
+        completed_node_outputs = {}
+        
+        if original_execution.node_results:
+            current_node_ids = {node.node_id for node in workflow_def.nodes}
+            
+            for node_id, result in original_execution.node_results.items():
+                if result.get("success") is True:
+                    # Streamed outputs were never stored; the node has to run again
+                    outputs = result.get("outputs") or {}
+                    if isinstance(outputs, dict) and any(is_stream_ref(v) for v in outputs.values()):
+                        logger.debug(f"  🌊 Will re-run streaming node: {node_id}")
+                        continue
+                    
+                    # Check if this node still exists in current workflow
+                    if node_id in current_node_ids:
+                        completed_node_ids.add(node_id)
+                        completed_node_outputs[node_id] = result.get("outputs", {})
+                        logger.debug(f"  ✅ Will skip completed node: {node_id}")
+                    else:
+                        logger.warning(f"  ⚠️ Completed node {node_id} no longer exists in workflow")
+        
+        return completed_node_ids, completed_node_outputs
+    
+    def _build_retry_graph(
+        self,
+        workflow_def: WorkflowDefinition,
+        completed_node_ids: Set[str]
+    ) -> ExecutionGraph:
+        """
+        Build execution graph with completed nodes pre-marked.
+        
+        Args:
+            workflow_def: Workflow definition to build from
+            completed_node_ids: Nodes to mark as completed
+        
+        Returns:
+            Execution graph where only pending/failed nodes remain to run
+        """
+        graph_builder = GraphBuilder(workflow_def)
+        graph = graph_builder.build()
+        
+        for node_id in completed_node_ids:
+            if node_id in graph.nodes:
+                # Mark node as completed
+                graph.nodes[node_id].phase = NodeExecutionPhase.COMPLETED
+                graph.completed_nodes.add(node_id)
+                
+                # Decrement dependency counters for all dependent nodes
+                for dependent_id in graph.nodes[node_id].dependents:
+                    if dependent_id in graph.nodes:
+                        graph.nodes[dependent_id].remaining_deps -= 1
+                        logger.debug(
+                            f"  📉 Decremented deps for {dependent_id}: "
+                            f"remaining={graph.nodes[dependent_id].remaining_deps}"
+                        )
+        
+        return graph
+    
+    def _build_retry_context(
+        self,
+        original_execution: Execution,
+        execution_id: str,
+        started_by: Optional[str],
+        frontend_origin: Optional[str],
+        completed_node_outputs: Dict[str, Dict[str, Any]]
+    ) -> ExecutionContext:
+        """
+        Create execution context for a retry with restored node outputs.
+        
+        Args:
+            original_execution: Execution being retried
+            execution_id: New execution ID
+            started_by: User who initiated the retry
+            frontend_origin: Frontend origin URL for links
+            completed_node_outputs: node_id → outputs to restore
+        
+        Returns:
+            Execution context ready for ParallelExecutor
+        """
+        context = ExecutionContext(
+            workflow_id=original_execution.workflow_id,
+            execution_id=execution_id,
+            execution_source="retry",
+            trigger_data=original_execution.trigger_data or {},
+            started_by=started_by,
+            execution_mode=ExecutionMode.PARALLEL,
+            frontend_origin=frontend_origin
+        )
+        
+        # Restore outputs from completed nodes
+        for node_id, outputs in completed_node_outputs.items():
+            context.node_outputs[node_id] = outputs
+            logger.debug(f"  📦 Restored outputs for node {node_id}: {list(outputs.keys())}")
+        
+        # Inject trigger data (same as original execution)
+        if original_execution.trigger_data:
+            context.variables["trigger_data"] = original_execution.trigger_data
+            for key, value in original_execution.trigger_data.items():
+                context.variables[f"trigger_{key}"] = value
+        
+        return context
+    
+    def load_prepared_retry(self, execution_id: str) -> Dict[str, Any]:
+        """
+        Rebuild prepared retry info for an existing retry execution record.
+        
+        Counterpart of retry_from_checkpoint(prepare_only=True) for processes
+        that did not prepare the retry themselves (e.g., queue workers).
+        The workflow snapshot stored on the retry record is used, so the run
+        matches what the user confirmed.
+        
+        Args:
+            execution_id: Retry execution ID (created by prepare_only)
+        
+        Returns:
+            Dict accepted by run_prepared_retry()
+        
+        Raises:
+            ValueError: If the execution is not a prepared retry
+        """
+        new_execution = self.db.query(Execution).filter(Execution.id == execution_id).first()
+        if not new_execution:
+            raise ValueError(f"Execution not found: {execution_id}")
+        
+        metadata = new_execution.execution_metadata or {}
+        original_execution_id = metadata.get("retry_from")
+        if not original_execution_id:
+            raise ValueError(f"Execution {execution_id} is not a retry execution")
+        
+        original_execution = self.db.query(Execution).filter(
+            Execution.id == original_execution_id
+        ).first()
+        if not original_execution:
+            raise ValueError(f"Execution not found: {original_execution_id}")
+        
+        workflow_db = self.db.query(Workflow).filter(
+            Workflow.id == new_execution.workflow_id
+        ).first()
+        if not workflow_db:
+            raise ValueError(f"Workflow not found: {new_execution.workflow_id}")
+        
+        workflow_def = WorkflowDefinition(**(new_execution.workflow_snapshot or workflow_db.workflow_data))
+        
+        completed_node_ids, completed_node_outputs = self._collect_completed_nodes(
+            original_execution, workflow_def
+        )
+        skipped = set(metadata.get("skipped_nodes") or [])
+        completed_node_ids &= skipped
+        completed_node_outputs = {
+            node_id: outputs for node_id, outputs in completed_node_outputs.items()
+            if node_id in completed_node_ids
+        }
+        
+        graph = self._build_retry_graph(workflow_def, completed_node_ids)
+        context = self._build_retry_context(
+            original_execution,
+            execution_id,
+            new_execution.started_by,
+            metadata.get("frontend_origin"),
+            completed_node_outputs
+        )
+        
+        return {
+            "execution_id": execution_id,
+            "skipped_nodes": list(completed_node_ids),
+            "warnings": metadata.get("structure_warnings") or [],
+            "requires_confirmation": False,
+            "_workflow_def": workflow_def,
+            "_graph": graph,
+            "_context": context,
+            "_execution_config": self._merge_execution_config(workflow_db),
+            "_workflow_db": workflow_db,
+            "_original_execution": original_execution
+        }
     
     def _detect_structure_changes(
         self,
@@ -1021,6 +1383,20 @@ class WorkflowOrchestrator:
         
         return warnings
     
+    async def _store_final_outputs(self, context: ExecutionContext, execution_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Final outputs for the database, with large values spilled to the artifact store."""
+        try:
+            return await run_blocking(
+                get_artifact_store().spill_outputs,
+                context.final_outputs,
+                execution_id=context.execution_id,
+                max_inline_bytes=execution_config.get("max_inline_bytes", DEFAULT_MAX_INLINE_BYTES),
+                workflow_id=context.workflow_id
+            )
+        except Exception as e:
+            logger.warning(f"Failed to spill final outputs: {e}")
+            return context.final_outputs
+    
     def _merge_execution_config(self, workflow_db: Workflow) -> Dict[str, Any]:
         """
         Merge execution config from workflow and global settings.
@@ -1070,6 +1446,27 @@ class WorkflowOrchestrator:
                 "max_payload_chars": 1000000,
                 "max_payload_items": 10000,
                 "max_inline_bytes": 1048576,
+                
+                # Memory: drop intermediate outputs once all consumers finished
+                "release_intermediate_outputs": True,
+                "release_inline_bytes": 4096,
+                
+                # Node result cache: opt_in | refresh | off
+                "result_cache": "opt_in",
+                "result_cache_ttl": 86400,
+                
+                # Crash recovery: persist a resumable checkpoint as batches of nodes finish
+                # (coalesced, at most once per checkpoint_interval seconds)
+                "durable_checkpoints": True,
+                "checkpoint_interval": 2.0,
+                
+                # Scheduling: grant pool slots by priority and longest remaining path
+                "priority_scheduling": True,
+                
+                # Global pools: fair-share weight, reserved and maximum slots per resource class
+                "pool_weight": 1.0,
+                "pool_reservations": {},
+                "pool_caps": {},
             }
         except Exception as e:
             logger.warning(f"Failed to load execution settings from database, using defaults: {e}")
@@ -1103,6 +1500,27 @@ class WorkflowOrchestrator:
                 "max_payload_chars": 1000000,
                 "max_payload_items": 10000,
                 "max_inline_bytes": 1048576,
+                
+                # Memory: drop intermediate outputs once all consumers finished
+                "release_intermediate_outputs": True,
+                "release_inline_bytes": 4096,
+                
+                # Node result cache: opt_in | refresh | off
+                "result_cache": "opt_in",
+                "result_cache_ttl": 86400,
+                
+                # Crash recovery: persist a resumable checkpoint as batches of nodes finish
+                # (coalesced, at most once per checkpoint_interval seconds)
+                "durable_checkpoints": True,
+                "checkpoint_interval": 2.0,
+                
+                # Scheduling: grant pool slots by priority and longest remaining path
+                "priority_scheduling": True,
+                
+                # Global pools: fair-share weight, reserved and maximum slots per resource class
+                "pool_weight": 1.0,
+                "pool_reservations": {},
+                "pool_caps": {},
             }
         
         # Overlay workflow-specific config (if exists)
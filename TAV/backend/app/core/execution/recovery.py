@@ -0,0 +1,191 @@
+"""
+Execution Recovery
+
+Executions interrupted by a server or worker restart used to be marked as
+failed on startup, discarding every node that had already completed. The
+executor now keeps a durable completion log so interrupted executions can
+be resumed where they stopped:
+
+- execution.node_results - per-node results, large outputs stored by
+  reference in the artifact store (written as nodes finish, coalesced to
+  at most one write per checkpoint_interval)
+- execution.execution_metadata["checkpoint"] - graph/context state that
+  node results do not capture: skipped branches, nodes awaiting human
+  interaction, workflow variables (incl. loop counters) and pause state
+
+On startup, EXECUTION_RECOVERY_POLICY decides what happens to executions
+left in RUNNING/PENDING:
+- "resume" (default) - rebuild context + graph and run the incomplete frontier
+- "fail"   - mark them failed (previous behaviour)
+- "ask"    - mark them paused until a user resumes or fails them
+  (POST /executions/{id}/recover)
+
+Nodes that were executing when the process died are run again, so node
+side effects are at-least-once across a crash.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Optional, Set
+
+from app.core.execution.artifacts import get_artifact_store, DEFAULT_MAX_INLINE_BYTES
+from app.core.execution.context import ExecutionContext
+from app.core.execution.graph.types import ExecutionGraph, NodeExecutionPhase
+from app.utils.timezone import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+RECOVERY_POLICIES = ("resume", "fail", "ask")
+CHECKPOINT_KEY = "checkpoint"
+RECOVERY_KEY = "recovery"
+
+
+def build_checkpoint(
+    graph: ExecutionGraph,
+    context: ExecutionContext,
+    paused: bool = False,
+    max_inline_bytes: int = DEFAULT_MAX_INLINE_BYTES
+) -> Dict[str, Any]:
+    """
+    Capture the execution state that node_results does not hold.
+
+    Args:
+        graph: Execution graph
+        context: Execution context
+        paused: Whether the executor is paused
+        max_inline_bytes: Variables larger than this are stored by reference
+
+    Returns:
+        JSON-serializable checkpoint dict
+    """
+    return serialize_checkpoint(
+        capture_checkpoint(graph, context, paused=paused),
+        execution_id=context.execution_id,
+        workflow_id=context.workflow_id,
+        max_inline_bytes=max_inline_bytes
+    )
+
+
+def capture_checkpoint(
+    graph: ExecutionGraph,
+    context: ExecutionContext,
+    paused: bool = False
+) -> Dict[str, Any]:
+    """
+    Copy the checkpoint state off the live graph and context.
+
+    Cheap enough for the event loop; serialize_checkpoint does the
+    expensive part and may run in a worker thread afterwards.
+    """
+    return {
+        "skipped_nodes": sorted(graph.skipped_nodes),
+        "awaiting_nodes": sorted(
+            node_id for node_id, node in graph.nodes.items()
+            if node.phase == NodeExecutionPhase.AWAITING_INTERACTION
+        ),
+        "variables": dict(context.variables),
+        "loop_iteration": context.loop_iteration,
+        "pending_interactions": dict(context.pending_interactions),
+        "paused": paused,
+        "updated_at": get_local_now().isoformat(),
+    }
+
+
+def serialize_checkpoint(
+    captured: Dict[str, Any],
+    execution_id: str,
+    workflow_id: Optional[str] = None,
+    max_inline_bytes: int = DEFAULT_MAX_INLINE_BYTES
+) -> Dict[str, Any]:
+    """
+    Make a captured checkpoint JSON-safe, spilling large variables.
+
+    Blocking (artifact file writes and index commits).
+
+    Args:
+        captured: Dict from capture_checkpoint
+        execution_id: Execution the checkpoint belongs to
+        workflow_id: Workflow UUID (for artifact index rows)
+        max_inline_bytes: Variables larger than this are stored by reference
+
+    Returns:
+        JSON-serializable checkpoint dict
+    """
+    variables = _json_safe(captured["variables"])
+    try:
+        variables = get_artifact_store().spill_outputs(
+            variables,
+            execution_id=execution_id,
+            max_inline_bytes=max_inline_bytes,
+            workflow_id=workflow_id,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to spill checkpoint variables of {execution_id}: {e}")
+
+    return {
+        **captured,
+        "variables": variables,
+        "pending_interactions": _json_safe(captured["pending_interactions"]),
+    }
+
+
+def restore_checkpoint(
+    checkpoint: Dict[str, Any],
+    graph: ExecutionGraph,
+    context: ExecutionContext
+) -> Set[str]:
+    """
+    Apply a checkpoint to a freshly built graph and context.
+
+    Completed nodes must already be marked on the graph; skipped branches
+    are re-propagated from here.
+
+    Args:
+        checkpoint: Dict from build_checkpoint
+        graph: Graph to update
+        context: Context to update
+
+    Returns:
+        Node IDs awaiting human interaction (executor must start paused)
+    """
+    for node_id in checkpoint.get("skipped_nodes") or []:
+        if node_id in graph.nodes and node_id not in graph.completed_nodes:
+            graph.mark_node_skipped(node_id)
+
+    awaiting = set()
+    for node_id in checkpoint.get("awaiting_nodes") or []:
+        if node_id in graph.nodes and node_id not in graph.completed_nodes:
+            graph.nodes[node_id].phase = NodeExecutionPhase.AWAITING_INTERACTION
+            awaiting.add(node_id)
+
+    variables = checkpoint.get("variables")
+    if isinstance(variables, dict):
+        context.variables.update(get_artifact_store().resolve_outputs(variables))
+
+    if checkpoint.get("loop_iteration") is not None:
+        context.loop_iteration = checkpoint["loop_iteration"]
+
+    for node_id, interaction in (checkpoint.get("pending_interactions") or {}).items():
+        if node_id in awaiting:
+            context.pending_interactions[node_id] = interaction
+
+    return awaiting
+
+
+def get_checkpoint(execution_metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Get the checkpoint stored on an execution ({} if none was written)."""
+    return (execution_metadata or {}).get(CHECKPOINT_KEY) or {}
+
+
+def _json_safe(values: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop entries that cannot be stored in a JSON column."""
+    safe = {}
+    for key, value in values.items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Checkpoint skips non-serializable value '{key}'")
+            continue
+        safe[key] = value
+    return safe
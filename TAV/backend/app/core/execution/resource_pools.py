@@ -0,0 +1,299 @@
+"""
+Global Resource Pools
+
+Each ParallelExecutor bounds its own concurrency, but those limits are per
+execution: fifty concurrent executions used to get fifty times the
+configured LLM concurrency, and one bulk run could starve interactive
+ones. These process-wide pools bound the total number of node slots per
+resource class and share them fairly between workflows.
+
+Sharing (per resource class):
+- Weighted fair queuing between workflows - each workflow is a flow with a
+  weight (execution_config["pool_weight"], default 1.0); waiting flows are
+  served by virtual start tag, so a flow with weight 2 gets twice the slots
+  of a flow with weight 1 while both are waiting, and an idle flow builds up
+  no credit
+- Reservation - execution_config["pool_reservations"] ({"llm": 2}) holds
+  slots back for a workflow while it has an execution running
+- Cap - execution_config["pool_caps"] ({"llm": 3}) limits the slots one
+  workflow can hold at once
+- Inside a workflow, the execution holding the fewest slots goes first,
+  then the node scheduling key (see scheduling.py)
+
+Sizes: POOL_STANDARD_SLOTS, POOL_LLM_SLOTS, POOL_AI_SLOTS; the compute pool
+matches the number of compute worker processes.
+
+Nodes acquire their execution-level slot first and the global slot second,
+so a node never holds a global slot while waiting on its own execution.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.execution.scheduling import SchedulingKey, DEFAULT_KEY
+
+logger = logging.getLogger(__name__)
+
+
+RESOURCE_CLASSES = ("standard", "llm", "ai", "compute")
+
+
+@dataclass
+class _Waiter:
+    execution_id: str
+    key: SchedulingKey
+    seq: int
+    enqueued_at: float
+    future: asyncio.Future
+
+
+@dataclass
+class _Flow:
+    """Per-workflow state in one pool"""
+    weight: float = 1.0
+    reservation: int = 0
+    cap: Optional[int] = None
+    executions: int = 0                      # Registered executions (reservation holds while > 0)
+    in_use: int = 0
+    finish_tag: float = 0.0
+    waiters: List[_Waiter] = field(default_factory=list)
+    execution_in_use: Dict[str, int] = field(default_factory=dict)
+    granted: int = 0
+    wait_seconds: float = 0.0
+
+    def live_waiters(self) -> List[_Waiter]:
+        self.waiters = [waiter for waiter in self.waiters if not waiter.future.done()]
+        return self.waiters
+
+    def can_take(self) -> bool:
+        return self.cap is None or self.in_use < self.cap
+
+
+class FairPool:
+    """
+    Bounded slot pool shared by all executions, fair across workflows.
+    """
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self.virtual_time = 0.0
+        self.flows: Dict[str, _Flow] = {}
+        self.granted = 0
+        self._counter = itertools.count()
+
+    # ==================== Flow registration ====================
+
+    def register(
+        self,
+        flow_id: str,
+        weight: float = 1.0,
+        reservation: int = 0,
+        cap: Optional[int] = None
+    ):
+        """Register an execution of a workflow (settings from the latest registration win)"""
+        flow = self.flows.setdefault(flow_id, _Flow())
+        flow.weight = weight if weight and weight > 0 else 1.0
+        flow.reservation = max(0, reservation or 0)
+        flow.cap = cap if cap and cap > 0 else None
+        flow.executions += 1
+
+    def unregister(self, flow_id: str):
+        """Unregister an execution; frees the workflow's reservation after its last one"""
+        flow = self.flows.get(flow_id)
+        if not flow:
+            return
+        flow.executions = max(0, flow.executions - 1)
+        self._drop_if_idle(flow_id)
+        self._dispatch()
+
+    # ==================== Acquire / release ====================
+
+    async def acquire(self, flow_id: str, execution_id: str, key: SchedulingKey = DEFAULT_KEY):
+        flow = self.flows.setdefault(flow_id, _Flow())
+        waiter = _Waiter(
+            execution_id=execution_id,
+            key=key,
+            seq=next(self._counter),
+            enqueued_at=time.monotonic(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        flow.waiters.append(waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # Granted just before the cancel landed: hand the slot on
+            if waiter.future.done() and not waiter.future.cancelled():
+                self.release(flow_id, execution_id)
+            else:
+                self._drop_if_idle(flow_id)
+            raise
+
+    def release(self, flow_id: str, execution_id: str):
+        flow = self.flows.get(flow_id)
+        if flow is None or flow.in_use == 0:
+            logger.warning(f"Pool {self.name}: release without acquire for {flow_id}")
+            return
+
+        self.in_use -= 1
+        flow.in_use -= 1
+        remaining = flow.execution_in_use.get(execution_id, 1) - 1
+        if remaining > 0:
+            flow.execution_in_use[execution_id] = remaining
+        else:
+            flow.execution_in_use.pop(execution_id, None)
+
+        self._drop_if_idle(flow_id)
+        self._dispatch()
+
+    def slot(self, flow_id: str, execution_id: str, key: SchedulingKey = DEFAULT_KEY) -> "_PoolSlot":
+        """Context manager holding one slot"""
+        return _PoolSlot(self, flow_id, execution_id, key)
+
+    # ==================== Scheduling ====================
+
+    def _unused_reservations(self, exclude: str) -> int:
+        return sum(
+            max(0, flow.reservation - flow.in_use)
+            for flow_id, flow in self.flows.items()
+            if flow_id != exclude and flow.executions > 0
+        )
+
+    def _dispatch(self):
+        while self.in_use < self.capacity:
+            free = self.capacity - self.in_use
+            best: Optional[Tuple[Tuple[float, int], str, _Flow, _Waiter]] = None
+
+            for flow_id, flow in self.flows.items():
+                waiters = flow.live_waiters()
+                if not waiters or not flow.can_take():
+                    continue
+                # Slots reserved for other workflows are off limits beyond our own reservation
+                if flow.in_use >= flow.reservation and free <= self._unused_reservations(flow_id):
+                    continue
+
+                waiter = min(waiters, key=lambda w: (
+                    w.key[0], flow.execution_in_use.get(w.execution_id, 0), w.key[1:], w.seq
+                ))
+                # Flows still inside their reservation go ahead of the fair share
+                tag = -1.0 if flow.in_use < flow.reservation else max(self.virtual_time, flow.finish_tag)
+                rank = (tag, waiter.seq)
+                if best is None or rank < best[0]:
+                    best = (rank, flow_id, flow, waiter)
+
+            if best is None:
+                return
+
+            (tag, _), flow_id, flow, waiter = best
+            if tag >= 0:
+                self.virtual_time = tag
+                flow.finish_tag = tag + 1.0 / flow.weight
+
+            flow.waiters.remove(waiter)
+            flow.in_use += 1
+            flow.execution_in_use[waiter.execution_id] = flow.execution_in_use.get(waiter.execution_id, 0) + 1
+            flow.granted += 1
+            flow.wait_seconds += time.monotonic() - waiter.enqueued_at
+            self.in_use += 1
+            self.granted += 1
+            waiter.future.set_result(True)
+
+    def _drop_if_idle(self, flow_id: str):
+        flow = self.flows.get(flow_id)
+        if flow and flow.executions == 0 and flow.in_use == 0 and not flow.live_waiters():
+            del self.flows[flow_id]
+
+    # ==================== Metrics ====================
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "waiting": sum(len(flow.live_waiters()) for flow in self.flows.values()),
+            "granted": self.granted,
+            "flows": {
+                flow_id: {
+                    "weight": flow.weight,
+                    "reservation": flow.reservation,
+                    "cap": flow.cap,
+                    "executions": flow.executions,
+                    "in_use": flow.in_use,
+                    "waiting": len(flow.waiters),
+                    "granted": flow.granted,
+                    "avg_wait_ms": round(flow.wait_seconds / flow.granted * 1000, 2) if flow.granted else 0.0,
+                }
+                for flow_id, flow in self.flows.items()
+            },
+        }
+
+
+class _PoolSlot:
+    def __init__(self, pool: FairPool, flow_id: str, execution_id: str, key: SchedulingKey):
+        self.pool = pool
+        self.flow_id = flow_id
+        self.execution_id = execution_id
+        self.key = key
+
+    async def __aenter__(self):
+        await self.pool.acquire(self.flow_id, self.execution_id, self.key)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.pool.release(self.flow_id, self.execution_id)
+
+
+class ResourcePools:
+    """The process-wide pools, one per resource class"""
+
+    def __init__(self, capacities: Optional[Dict[str, int]] = None):
+        if capacities is None:
+            from app.core.execution.compute import get_compute_pool
+            capacities = {
+                "standard": settings.POOL_STANDARD_SLOTS,
+                "llm": settings.POOL_LLM_SLOTS,
+                "ai": settings.POOL_AI_SLOTS,
+                "compute": get_compute_pool().max_workers,
+            }
+        self.pools = {name: FairPool(name, capacities.get(name, 1)) for name in RESOURCE_CLASSES}
+
+    def get(self, resource_class: str) -> FairPool:
+        """Pool for a resource class (unknown classes share the standard pool)"""
+        return self.pools.get(resource_class, self.pools["standard"])
+
+    def register(
+        self,
+        flow_id: str,
+        weight: float = 1.0,
+        reservations: Optional[Dict[str, int]] = None,
+        caps: Optional[Dict[str, int]] = None
+    ):
+        """Register an execution of a workflow in every pool"""
+        reservations = reservations or {}
+        caps = caps or {}
+        for name, pool in self.pools.items():
+            pool.register(flow_id, weight, reservations.get(name, 0), caps.get(name))
+
+    def unregister(self, flow_id: str):
+        for pool in self.pools.values():
+            pool.unregister(flow_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: pool.stats() for name, pool in self.pools.items()}
+
+
+_resource_pools: Optional[ResourcePools] = None
+
+
+def get_resource_pools() -> ResourcePools:
+    """Get the process-wide resource pools (created on first use)"""
+    global _resource_pools
+    if _resource_pools is None:
+        _resource_pools = ResourcePools()
+    return _resource_pools
@@ -0,0 +1,369 @@
+"""
+Node Result Cache
+
+Re-running a workflow after a late-stage failure used to repeat every
+expensive upstream step (document loading, embeddings, LLM calls,
+transcription) even when its inputs were identical. Nodes that opt in
+(NodeConfiguration.cache_results) have their outputs memoized across
+executions; a cache hit skips the node entirely.
+
+Cache key: SHA-256 over
+- node type and node version (register_node(version=...))
+- resolved config (templates/variables substituted)
+- inputs (file-backed values are fingerprinted by size + mtime, artifact
+  references by digest)
+
+Policy (execution_config["result_cache"], per workflow):
+- "opt_in"  (default) - cache nodes with cache_results enabled
+- "refresh" - recompute opted-in nodes and overwrite their entries
+- "off"     - never read or write the cache
+
+Limits: per-entry TTL (node cache_ttl → execution_config
+["result_cache_ttl"]), NODE_CACHE_MAX_ENTRY_BYTES per entry and
+NODE_CACHE_MAX_BYTES in total (least recently used entries are evicted).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.utils.timezone import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_POLICIES = ("opt_in", "refresh", "off")
+DEFAULT_CACHE_TTL = 86400  # 1 day
+
+
+class Uncacheable(Exception):
+    """Raised when a node's inputs or outputs cannot be fingerprinted/stored."""
+    pass
+
+
+# ==================== KEYS ====================
+
+def compute_cache_key(
+    node_type: str,
+    node_version: Optional[str],
+    config: Dict[str, Any],
+    inputs: Dict[str, Any]
+) -> str:
+    """
+    Compute the cache key of a node run.
+
+    Args:
+        node_type: Node type identifier
+        node_version: Registered node version (None = unversioned)
+        config: Resolved node config
+        inputs: Input port values
+
+    Returns:
+        SHA-256 hex digest
+
+    Raises:
+        Uncacheable: If a value cannot be fingerprinted (streams, live objects)
+    """
+    payload = json.dumps(
+        {
+            "node_type": node_type,
+            "version": node_version or "",
+            "config": _fingerprint(config),
+            "inputs": _fingerprint(inputs),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _fingerprint(value: Any) -> Any:
+    """Convert a value into deterministic JSON-compatible data for hashing."""
+    from app.core.execution.artifacts import is_artifact_ref, ARTIFACT_REF_KEY
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+
+    if isinstance(value, dict):
+        if is_artifact_ref(value):
+            return {ARTIFACT_REF_KEY: value[ARTIFACT_REF_KEY]}
+        result = {str(k): _fingerprint(v) for k, v in value.items()}
+        file_path = _referenced_file(value)
+        if file_path:
+            # Same path, different content must not hit the cache
+            try:
+                stat = os.stat(file_path)
+                result["$file"] = [stat.st_size, stat.st_mtime_ns]
+            except OSError:
+                pass
+        return result
+
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+
+    if isinstance(value, (set, frozenset)):
+        return sorted((_fingerprint(v) for v in value), key=repr)
+
+    if isinstance(value, (bytes, bytearray)):
+        return {"$bytes": hashlib.sha256(value).hexdigest()}
+
+    if isinstance(value, Enum):
+        return _fingerprint(value.value)
+
+    if isinstance(value, (datetime, Decimal, UUID)):
+        return str(value)
+
+    if hasattr(value, "model_dump"):
+        return _fingerprint(value.model_dump(mode="json"))
+
+    raise Uncacheable(f"cannot fingerprint value of type {type(value).__name__}")
+
+
+# ==================== STORE ====================
+
+class NodeResultCache:
+    """Persistent node output cache (node_result_cache table)."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        """
+        Initialize result cache.
+
+        Args:
+            session_factory: Factory for DB sessions (default: SessionLocal)
+        """
+        if session_factory is None:
+            from app.database.session import SessionLocal
+            session_factory = SessionLocal
+
+        self.session_factory = session_factory
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up cached outputs.
+
+        Expired entries and entries whose output files no longer exist are
+        deleted and reported as a miss.
+
+        Args:
+            cache_key: Key from compute_cache_key
+
+        Returns:
+            Cached outputs or None
+        """
+        from app.database.models.node_result_cache import NodeResultCacheEntry
+
+        db = self.session_factory()
+        try:
+            entry = db.query(NodeResultCacheEntry).filter(
+                NodeResultCacheEntry.cache_key == cache_key
+            ).first()
+            if entry is None:
+                return None
+
+            now = get_local_now()
+            if _is_expired(entry.expires_at, now) or not _files_exist(entry.outputs):
+                db.delete(entry)
+                db.commit()
+                return None
+
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = now
+            db.commit()
+            return entry.outputs
+        finally:
+            db.close()
+
+    def put(
+        self,
+        cache_key: str,
+        outputs: Dict[str, Any],
+        node_type: str,
+        workflow_id: Optional[str] = None,
+        node_id: Optional[str] = None,
+        ttl_seconds: Optional[int] = DEFAULT_CACHE_TTL,
+        max_entry_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None
+    ) -> bool:
+        """
+        Store node outputs.
+
+        Args:
+            cache_key: Key from compute_cache_key
+            outputs: Node outputs (must be JSON-serializable)
+            node_type: Node type identifier
+            workflow_id: Producing workflow (per-workflow invalidation)
+            node_id: Producing node
+            ttl_seconds: Entry lifetime (None/0 = no expiry)
+            max_entry_bytes: Skip outputs larger than this (default: NODE_CACHE_MAX_ENTRY_BYTES)
+            max_total_bytes: Evict LRU entries above this (default: NODE_CACHE_MAX_BYTES)
+
+        Returns:
+            True if stored, False if the outputs were too large
+
+        Raises:
+            Uncacheable: If the outputs are not JSON-serializable
+        """
+        from app.database.models.node_result_cache import NodeResultCacheEntry
+
+        max_entry_bytes = settings.NODE_CACHE_MAX_ENTRY_BYTES if max_entry_bytes is None else max_entry_bytes
+        max_total_bytes = settings.NODE_CACHE_MAX_BYTES if max_total_bytes is None else max_total_bytes
+
+        try:
+            size = len(json.dumps(outputs, ensure_ascii=False).encode("utf-8"))
+        except (TypeError, ValueError) as e:
+            raise Uncacheable(f"outputs are not JSON-serializable: {e}") from e
+
+        if max_entry_bytes and size > max_entry_bytes:
+            logger.debug(f"Outputs of {node_id} ({size} bytes) exceed cache entry limit, not cached")
+            return False
+
+        now = get_local_now()
+        expires_at = now + timedelta(seconds=ttl_seconds) if ttl_seconds else None
+
+        db = self.session_factory()
+        try:
+            entry = db.query(NodeResultCacheEntry).filter(
+                NodeResultCacheEntry.cache_key == cache_key
+            ).first()
+            if entry is None:
+                entry = NodeResultCacheEntry(cache_key=cache_key, hit_count=0, created_at=now)
+                db.add(entry)
+
+            entry.node_type = node_type
+            entry.workflow_id = workflow_id
+            entry.node_id = node_id
+            entry.outputs = outputs
+            entry.size_bytes = size
+            entry.last_used_at = now
+            entry.expires_at = expires_at
+            db.commit()
+
+            if max_total_bytes:
+                self._evict(db, max_total_bytes)
+            return True
+        finally:
+            db.close()
+
+    def invalidate(self, workflow_id: Optional[str] = None, node_id: Optional[str] = None) -> int:
+        """
+        Delete cache entries.
+
+        Args:
+            workflow_id: Only entries produced by this workflow (None = all)
+            node_id: Only entries of this node (requires workflow_id)
+
+        Returns:
+            Number of entries deleted
+        """
+        from app.database.models.node_result_cache import NodeResultCacheEntry
+
+        db = self.session_factory()
+        try:
+            query = db.query(NodeResultCacheEntry)
+            if workflow_id:
+                query = query.filter(NodeResultCacheEntry.workflow_id == workflow_id)
+                if node_id:
+                    query = query.filter(NodeResultCacheEntry.node_id == node_id)
+            deleted = query.delete(synchronize_session=False)
+            db.commit()
+            return deleted
+        finally:
+            db.close()
+
+    def cleanup_expired(self) -> int:
+        """Delete expired entries. Returns number of entries deleted."""
+        from app.database.models.node_result_cache import NodeResultCacheEntry
+
+        db = self.session_factory()
+        try:
+            deleted = db.query(NodeResultCacheEntry).filter(
+                NodeResultCacheEntry.expires_at.isnot(None),
+                NodeResultCacheEntry.expires_at <= get_local_now()
+            ).delete(synchronize_session=False)
+            db.commit()
+            if deleted:
+                logger.info(f"✅ Removed {deleted} expired node result cache entries")
+            return deleted
+        finally:
+            db.close()
+
+    def _evict(self, db: Session, max_total_bytes: int):
+        """Delete least recently used entries until the cache fits."""
+        from app.database.models.node_result_cache import NodeResultCacheEntry
+
+        total = db.query(func.coalesce(func.sum(NodeResultCacheEntry.size_bytes), 0)).scalar() or 0
+        if total <= max_total_bytes:
+            return
+
+        evicted = 0
+        rows = db.query(NodeResultCacheEntry.cache_key, NodeResultCacheEntry.size_bytes).order_by(
+            NodeResultCacheEntry.last_used_at.asc()
+        ).all()
+        for key, size in rows:
+            if total <= max_total_bytes:
+                break
+            db.query(NodeResultCacheEntry).filter(NodeResultCacheEntry.cache_key == key).delete(
+                synchronize_session=False
+            )
+            total -= size or 0
+            evicted += 1
+
+        db.commit()
+        logger.info(f"🧹 Evicted {evicted} node result cache entries (size limit {max_total_bytes} bytes)")
+
+
+def _is_expired(expires_at: Optional[datetime], now: datetime) -> bool:
+    if expires_at is None:
+        return False
+    # SQLite returns naive datetimes
+    if (expires_at.tzinfo is None) != (now.tzinfo is None):
+        expires_at, now = expires_at.replace(tzinfo=None), now.replace(tzinfo=None)
+    return expires_at <= now
+
+
+def _referenced_file(value: Dict[str, Any]) -> Optional[str]:
+    """
+    Path of the file a dict refers to: a "file_path" field, or the data of a
+    file_path MediaFormat (including MediaHandles).
+    """
+    path = value.get("file_path")
+    if isinstance(path, str):
+        return path
+    if value.get("data_type") == "file_path" and isinstance(value.get("data"), str):
+        return value["data"]
+    return None
+
+
+def _files_exist(value: Any) -> bool:
+    """Check that every file referenced by cached outputs still exists."""
+    if isinstance(value, dict):
+        path = _referenced_file(value)
+        if path and os.path.isabs(path) and not os.path.exists(path):
+            return False
+        return all(_files_exist(v) for v in value.values())
+    if isinstance(value, list):
+        return all(_files_exist(v) for v in value)
+    return True
+
+
+# Global result cache instance
+_result_cache: Optional[NodeResultCache] = None
+
+
+def get_result_cache() -> NodeResultCache:
+    """Get the process-wide node result cache."""
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = NodeResultCache()
+    return _result_cache
@@ -0,0 +1,415 @@
+"""
+Shared Schedule Timer
+
+Schedule trigger nodes used to run one asyncio.sleep loop each, drifting by
+the time every fire took and losing their place on restart. All schedules
+now live in one ScheduleTimer:
+
+- One min-heap of due times across all schedules, served by a single task
+  that sleeps until the earliest one (re-checking the wall clock at least
+  every MAX_SLEEP_SECONDS, since cron schedules follow wall-clock time)
+- Fire times are anchored to the schedule (interval: previous scheduled
+  time + interval; cron: next match), never to when the previous fire ran
+- Cron expressions are parsed once per expression (app.utils.cron)
+- jitter_seconds delays each fire by a random 0..jitter, so schedules
+  sharing a time do not start all at once
+- Everything due in the same tick is dispatched as one batch; fire times
+  are saved to trigger_schedules in one transaction before firing
+
+Misfires: a fire more than misfire_grace_seconds late (server down, event
+loop stalled) is handled by the schedule's misfire_policy:
+- fire_once: one fire for all missed times, with missed_count (default)
+- fire_all: one fire per missed time (at most MAX_CATCHUP_FIRES)
+- skip: drop missed times, continue with the next one
+
+Missed-fire catch-up after restart: when a schedule is added with stored
+fire times for the same schedule_key, it continues from the stored last
+fire, so fires due while the server was down are misfires.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.execution.blocking import run_blocking
+from app.utils.cron import parse_cron
+from app.utils.timezone import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+MISFIRE_POLICIES = ("fire_once", "fire_all", "skip")
+
+# Upper bound of fires per schedule when catching up with fire_all
+MAX_CATCHUP_FIRES = 100
+
+# Stop counting missed fire times beyond this (missed_count saturates)
+MAX_MISSED_SCAN = 10000
+
+# Schedules dispatched per batch
+DISPATCH_BATCH_SIZE = 200
+
+# Longest sleep before re-checking the wall clock
+MAX_SLEEP_SECONDS = 60.0
+
+# Due times this close together are dispatched in the same batch
+BATCH_TOLERANCE_SECONDS = 0.005
+
+# (fire info) -> None; fire info: scheduled_for, missed_count, catch_up
+ScheduleCallback = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(frozen=True)
+class ScheduleSpec:
+    """When a schedule fires and how it handles misfires"""
+
+    interval_seconds: Optional[float] = None
+    cron: Optional[str] = None
+    jitter_seconds: float = 0.0
+    misfire_policy: str = "fire_once"
+    misfire_grace_seconds: float = 60.0
+
+    def __post_init__(self):
+        if (self.interval_seconds is None) == (self.cron is None):
+            raise ValueError("Schedule needs either an interval or a cron expression")
+        if self.interval_seconds is not None and self.interval_seconds < 1:
+            raise ValueError(f"Schedule interval must be at least 1 second (got {self.interval_seconds}s)")
+        if self.cron is not None:
+            # Raises ValueError for invalid or never-matching expressions
+            parse_cron(self.cron).next_after(get_local_now())
+        if self.misfire_policy not in MISFIRE_POLICIES:
+            raise ValueError(f"Unknown misfire policy '{self.misfire_policy}' (use one of {', '.join(MISFIRE_POLICIES)})")
+
+    @property
+    def key(self) -> str:
+        """Identifies the fire times (jitter and misfire settings do not change them)"""
+        if self.cron is not None:
+            return f"cron:{hashlib.sha1(self.cron.strip().encode()).hexdigest()[:16]}"
+        return f"interval:{self.interval_seconds:g}"
+
+    def next_fire(self, after: datetime) -> datetime:
+        """First scheduled time after a moment"""
+        if self.cron is not None:
+            return parse_cron(self.cron).next_after(after)
+        return after + timedelta(seconds=self.interval_seconds)
+
+
+@dataclass
+class _Entry:
+    workflow_id: Optional[str]
+    node_id: str
+    spec: ScheduleSpec
+    callback: ScheduleCallback
+    next_fire: datetime
+    due: float = 0.0
+    last_fire: Optional[datetime] = None
+    fire_count: int = 0
+    version: int = 0
+    cancelled: bool = False
+
+    def schedule(self, next_fire: datetime):
+        """Set the next scheduled time and its (jittered) due time"""
+        self.next_fire = next_fire
+        jitter = random.uniform(0, self.spec.jitter_seconds) if self.spec.jitter_seconds > 0 else 0.0
+        self.due = next_fire.timestamp() + jitter
+        self.version += 1
+
+
+@dataclass
+class ScheduleTimerStats:
+    schedules: int = 0
+    batches: int = 0
+    fires: int = 0
+    misfires: int = 0
+    skipped: int = 0
+    largest_batch: int = 0
+
+
+class ScheduleTimer:
+    """
+    Process-wide timer for schedule triggers (see module docstring).
+
+    Usage:
+        timer = get_schedule_timer()
+        await timer.add(workflow_id, node_id, ScheduleSpec(interval_seconds=300), on_fire)
+        ...
+        timer.remove(workflow_id, node_id)
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[Optional[str], str], _Entry] = {}
+        self._heap: List[Tuple[float, int, int, _Entry]] = []
+        self._sequence = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._dispatches: set = set()
+        self.stats = ScheduleTimerStats()
+
+    async def add(
+        self,
+        workflow_id: Optional[str],
+        node_id: str,
+        spec: ScheduleSpec,
+        callback: ScheduleCallback
+    ) -> datetime:
+        """
+        Add (or replace) a node's schedule.
+
+        Continues from stored fire times when the schedule is unchanged, so
+        fires missed while the server was down are caught up.
+
+        Returns:
+            Next scheduled fire time (may be in the past when catching up)
+        """
+        self.remove(workflow_id, node_id)
+
+        now = get_local_now()
+        state = await run_blocking(_load_state, workflow_id, node_id)
+        entry = _Entry(workflow_id, node_id, spec, callback, next_fire=now)
+
+        if state and state["schedule_key"] == spec.key:
+            entry.last_fire = state["last_fire_at"]
+            entry.fire_count = state["fire_count"] or 0
+            if entry.last_fire is not None:
+                next_fire = spec.next_fire(entry.last_fire)
+            else:
+                next_fire = state["next_fire_at"] or spec.next_fire(now)
+            if next_fire < now:
+                logger.info(f"⏰ Schedule {node_id}: catching up from {next_fire.isoformat()}")
+        else:
+            next_fire = spec.next_fire(now)
+
+        entry.schedule(next_fire)
+        # Saved before the timer can fire it (the fire's save must come last)
+        await run_blocking(_save_states, [_state_row(entry)])
+        self.remove(workflow_id, node_id)
+        self._entries[(workflow_id, node_id)] = entry
+        self.stats.schedules = len(self._entries)
+        self._push(entry)
+        return next_fire
+
+    def remove(self, workflow_id: Optional[str], node_id: str) -> bool:
+        """Remove a node's schedule (its stored fire times are kept)"""
+        entry = self._entries.pop((workflow_id, node_id), None)
+        if entry is None:
+            return False
+        entry.cancelled = True
+        self.stats.schedules = len(self._entries)
+        if not self._entries:
+            self._heap.clear()
+            if self._task is not None:
+                self._task.cancel()
+                self._task = None
+        return True
+
+    def get_next_fire(self, workflow_id: Optional[str], node_id: str) -> Optional[datetime]:
+        entry = self._entries.get((workflow_id, node_id))
+        return entry.next_fire if entry else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "schedules": self.stats.schedules,
+            "batches": self.stats.batches,
+            "fires": self.stats.fires,
+            "misfires": self.stats.misfires,
+            "skipped": self.stats.skipped,
+            "largest_batch": self.stats.largest_batch,
+        }
+
+    async def shutdown(self):
+        """Stop the timer task and wait for running dispatches"""
+        for key in list(self._entries):
+            self.remove(*key)
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Timer loop
+    # ------------------------------------------------------------------
+
+    def _push(self, entry: _Entry):
+        heapq.heappush(self._heap, (entry.due, next(self._sequence), entry.version, entry))
+        if self._task is None or self._task.done():
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        elif self._heap[0][3] is entry:
+            # New earliest due time: shorten the current sleep
+            self._wake.set()
+
+    @staticmethod
+    def _is_stale(item: Tuple[float, int, int, _Entry]) -> bool:
+        _, _, version, entry = item
+        return entry.cancelled or version != entry.version
+
+    async def _run(self):
+        try:
+            while self._heap:
+                if self._is_stale(self._heap[0]):
+                    heapq.heappop(self._heap)
+                    continue
+
+                delay = self._heap[0][0] - time.time()
+                if delay > 0:
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), min(delay, MAX_SLEEP_SECONDS))
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                horizon = time.time() + BATCH_TOLERANCE_SECONDS
+                batch: List[_Entry] = []
+                while self._heap and len(batch) < DISPATCH_BATCH_SIZE and self._heap[0][0] <= horizon:
+                    item = heapq.heappop(self._heap)
+                    if not self._is_stale(item):
+                        batch.append(item[3])
+                if batch:
+                    self._dispatch(batch)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"❌ Schedule timer failed: {e}", exc_info=True)
+
+    def _dispatch(self, batch: List[_Entry]):
+        """Work out each schedule's fires, reschedule, and fire the batch in the background"""
+        now = get_local_now()
+        fires: List[Tuple[_Entry, Dict[str, Any]]] = []
+        for entry in batch:
+            entry_fires = self._collect_fires(entry, now)
+            entry.fire_count += len(entry_fires)
+            fires.extend(entry_fires)
+            self._push(entry)
+
+        self.stats.batches += 1
+        self.stats.largest_batch = max(self.stats.largest_batch, len(batch))
+        if len(batch) > 1:
+            logger.debug(f"⏰ Dispatching {len(batch)} due schedules ({len(fires)} fires)")
+
+        task = asyncio.create_task(self._fire_batch(fires, [_state_row(entry) for entry in batch]))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatches.discard)
+
+    def _collect_fires(self, entry: _Entry, now: datetime) -> List[Tuple[_Entry, Dict[str, Any]]]:
+        """
+        Fires for a due entry, applying the misfire policy; advances the
+        entry to its next scheduled time after now.
+        """
+        spec = entry.spec
+        times = [entry.next_fire]
+        upcoming = spec.next_fire(entry.next_fire)
+        while upcoming <= now and len(times) < MAX_MISSED_SCAN:
+            times.append(upcoming)
+            upcoming = spec.next_fire(upcoming)
+        while upcoming <= now:
+            upcoming = spec.next_fire(upcoming)
+        entry.last_fire = times[-1]
+        entry.schedule(upcoming)
+
+        grace = timedelta(seconds=spec.misfire_grace_seconds + spec.jitter_seconds)
+        late = [t for t in times if now - t > grace]
+        on_time = times[len(late):]
+        if not late and len(on_time) == 1:
+            return [(entry, {"scheduled_for": on_time[0], "missed_count": 0, "catch_up": False})]
+
+        self.stats.misfires += len(late)
+        if spec.misfire_policy == "fire_all":
+            selected = times[:MAX_CATCHUP_FIRES]
+            if len(times) > len(selected):
+                self.stats.skipped += len(times) - len(selected)
+                logger.warning(
+                    f"⚠️  Schedule {entry.node_id}: {len(times)} missed fires, catching up the first {len(selected)}"
+                )
+            return [(entry, {"scheduled_for": t, "missed_count": 0, "catch_up": t in late}) for t in selected]
+
+        if spec.misfire_policy == "skip":
+            self.stats.skipped += len(times) - (1 if on_time else 0)
+            if late:
+                logger.info(f"⏭️  Schedule {entry.node_id}: skipped {len(late)} missed fire(s)")
+            if not on_time:
+                return []
+            return [(entry, {"scheduled_for": on_time[-1], "missed_count": 0, "catch_up": False})]
+
+        # fire_once: one fire for every time due
+        logger.info(f"⏰ Schedule {entry.node_id}: {len(times)} fires due, firing once")
+        return [(entry, {"scheduled_for": times[-1], "missed_count": len(times) - 1, "catch_up": bool(late)})]
+
+    async def _fire_batch(self, fires: List[Tuple[_Entry, Dict[str, Any]]], states: List[Dict[str, Any]]):
+        # Save fire times first: a crash after firing must not fire again
+        await run_blocking(_save_states, states)
+        results = await asyncio.gather(
+            *(entry.callback(info) for entry, info in fires if not entry.cancelled),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Schedule fire failed: {result}", exc_info=result)
+        self.stats.fires += len(results)
+
+
+def _state_row(entry: _Entry) -> Dict[str, Any]:
+    return {
+        "workflow_id": entry.workflow_id,
+        "node_id": entry.node_id,
+        "schedule_key": entry.spec.key,
+        "last_fire_at": entry.last_fire,
+        "next_fire_at": entry.next_fire,
+        "fire_count": entry.fire_count,
+    }
+
+
+def _load_state(workflow_id: Optional[str], node_id: str) -> Optional[Dict[str, Any]]:
+    from app.database.session import SessionLocal
+    from app.database.repositories.trigger_schedule import TriggerScheduleRepository
+
+    db = SessionLocal()
+    try:
+        return TriggerScheduleRepository(db).get(workflow_id, node_id)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not load schedule state of {node_id}: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def _save_states(states: List[Dict[str, Any]]):
+    if not states:
+        return
+    from app.database.session import SessionLocal
+    from app.database.repositories.trigger_schedule import TriggerScheduleRepository
+
+    db = SessionLocal()
+    try:
+        TriggerScheduleRepository(db).save_many(states)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"⚠️  Could not save schedule state: {e}")
+    finally:
+        db.close()
+
+
+# Global schedule timer instance
+_schedule_timer: Optional[ScheduleTimer] = None
+
+
+def get_schedule_timer() -> ScheduleTimer:
+    """Get the process-wide schedule timer."""
+    global _schedule_timer
+    if _schedule_timer is None:
+        _schedule_timer = ScheduleTimer()
+    return _schedule_timer
+
+
+async def shutdown_schedule_timer():
+    """Stop the process-wide schedule timer (if it was started), awaiting in-flight fires."""
+    global _schedule_timer
+    if _schedule_timer is not None:
+        await _schedule_timer.shutdown()
+        _schedule_timer = None
+        logger.info("⏰ Schedule timer stopped")
@@ -0,0 +1,293 @@
+"""
+Streaming Node Outputs
+
+A node can return an async iterator on an output port instead of a full
+value (e.g. CSV rows). The executor wraps it in a NodeStream, which lets
+downstream nodes consume the rows while they are still being produced.
+
+Design:
+- One background pump task reads the source iterator
+- Each downstream connection gets its own channel (fan-out)
+- Streaming-aware input ports (NodePort.streaming=True) receive an async
+  iterator over their channel; other ports receive a materialized list
+- Backpressure: the pump waits while any *subscribed* streaming consumer has
+  buffer_size unread chunks. Channels of consumers that have not started yet
+  (or whose reader stopped) buffer without limit, so a consumer waiting on
+  other dependencies can never deadlock the producer. The executor releases
+  the channels of consumers that finished, failed or were skipped, which
+  frees their buffer; once every channel is released the producer stops.
+- A consumer attempt that failed before reading anything (node retry) can
+  subscribe again; chunks already consumed cannot be replayed
+- Producer errors are re-raised in every consumer
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+STREAM_REF_KEY = "$stream"
+
+# Default number of unread chunks per streaming consumer
+DEFAULT_STREAM_BUFFER = 64
+
+
+def is_stream_source(value: Any) -> bool:
+    """Check if a node output value is an async iterator to stream."""
+    return hasattr(value, "__aiter__") and not isinstance(value, (str, bytes, dict, list))
+
+
+def is_stream_ref(value: Any) -> bool:
+    """Check if a persisted output value is a stream placeholder."""
+    return isinstance(value, dict) and STREAM_REF_KEY in value
+
+
+class StreamError(RuntimeError):
+    """Raised in consumers when the producing node's iterator failed."""
+
+
+_END = object()
+
+
+class _Channel:
+    """Buffer between the pump and one downstream connection."""
+
+    def __init__(self):
+        self.items: deque = deque()
+        self.subscribed = False      # Consumer claimed the channel
+        self.streaming = False       # A reader consumes incrementally (vs. materializes)
+        self.reading = False         # A reader is iterating right now
+        self.delivered = 0           # Chunks handed to readers so far
+        self.closed = False          # Released: consumer finished, failed or was skipped
+        self.materialized: Optional[List[Any]] = None
+
+
+class NodeStream:
+    """
+    Fan-out wrapper around a node's async iterator output.
+
+    Each consumer is identified by (target node ID, target port) and can read
+    the stream once, either incrementally (subscribe) or as a list (collect).
+    A collected list is cached so a retried consumer gets it again; a retried
+    streaming consumer can subscribe again if its failed attempt read nothing.
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        consumers: Iterable[Tuple[str, str]],
+        node_id: str = "",
+        port: str = "",
+        buffer_size: int = DEFAULT_STREAM_BUFFER
+    ):
+        """
+        Initialize stream.
+
+        Args:
+            source: Async iterable produced by the node
+            consumers: (target_node_id, target_port) for every downstream connection
+            node_id: Producing node (for logs and errors)
+            port: Producing output port
+            buffer_size: Max unread chunks per streaming consumer
+        """
+        self.source = source
+        self.node_id = node_id
+        self.port = port
+        self.buffer_size = max(1, buffer_size)
+        self.items_produced = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+        self._channels: Dict[Tuple[str, str], _Channel] = {key: _Channel() for key in consumers}
+        self._condition = asyncio.Condition()
+        self._pump_task: Optional[asyncio.Task] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.node_id}.{self.port}"
+
+    # ==================== CONSUMERS ====================
+
+    def subscribe(self, node_id: str, port: str) -> AsyncIterator[Any]:
+        """
+        Read the stream incrementally.
+
+        Args:
+            node_id: Consuming node
+            port: Consuming input port
+
+        Returns:
+            Async iterator over the chunks
+
+        Raises:
+            ValueError: If the consumer was not declared, was released or already
+                        read part of the stream
+        """
+        channel = self._claim(node_id, port)
+        channel.streaming = True
+        return self._iterate(channel)
+
+    async def collect(self, node_id: str, port: str) -> List[Any]:
+        """
+        Read the whole stream into a list.
+
+        Args:
+            node_id: Consuming node
+            port: Consuming input port
+
+        Returns:
+            All chunks in order
+        """
+        channel = self._channels.get((node_id, port))
+        if channel is not None and channel.materialized is not None:
+            return channel.materialized
+
+        channel = self._claim(node_id, port)
+        channel.materialized = [item async for item in self._iterate(channel)]
+        return channel.materialized
+
+    def describe(self) -> Dict[str, Any]:
+        """Placeholder stored instead of the stream in persisted node results."""
+        return {
+            STREAM_REF_KEY: self.name,
+            "items_produced": self.items_produced,
+            "done": self.done,
+        }
+
+    async def release(self, node_ids: Iterable[str]):
+        """
+        Drop the channels of consumers that will not read (any more).
+
+        Called for consumers that finished, failed or were skipped, so their
+        unread chunks are freed and no longer hold back the producer.
+
+        Args:
+            node_ids: Consuming nodes to release (others are ignored)
+        """
+        node_ids = set(node_ids)
+        channels = [
+            channel for (node_id, _), channel in self._channels.items()
+            if node_id in node_ids and not channel.closed
+        ]
+        if not channels:
+            return
+
+        async with self._condition:
+            for channel in channels:
+                channel.closed = True
+                channel.items.clear()
+            self._condition.notify_all()
+
+    async def aclose(self):
+        """Stop producing (consumers still reading see the stream end)."""
+        if self._pump_task and not self._pump_task.done():
+            self._pump_task.cancel()
+            try:
+                await self._pump_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        elif self._pump_task is None:
+            await self._close_source()
+
+    # ==================== INTERNAL ====================
+
+    def _claim(self, node_id: str, port: str) -> _Channel:
+        channel = self._channels.get((node_id, port))
+        if channel is None:
+            raise ValueError(f"Node {node_id}.{port} is not a consumer of stream {self.name}")
+        if channel.closed:
+            raise ValueError(f"Stream {self.name} was released for {node_id}.{port}")
+        if channel.reading or channel.delivered:
+            if self.done and self.error is not None:
+                raise StreamError(f"Stream {self.name} failed: {self.error}") from self.error
+            raise ValueError(
+                f"Stream {self.name} was already read by {node_id}.{port} "
+                f"({channel.delivered} chunk(s) consumed cannot be replayed)"
+            )
+
+        if channel.subscribed and self.done and not channel.items:
+            # A previous attempt consumed the end of an empty stream
+            channel.items.append(_END)
+        channel.subscribed = True
+        if self._pump_task is None:
+            self._pump_task = asyncio.create_task(self._pump())
+        return channel
+
+    async def _iterate(self, channel: _Channel) -> AsyncIterator[Any]:
+        channel.reading = True
+        try:
+            while True:
+                async with self._condition:
+                    await self._condition.wait_for(lambda: channel.items or channel.closed)
+                    if channel.closed:
+                        return
+                    item = channel.items.popleft()
+                    self._condition.notify_all()
+
+                if item is _END:
+                    if self.error is not None:
+                        raise StreamError(f"Stream {self.name} failed: {self.error}") from self.error
+                    return
+                channel.delivered += 1
+                yield item
+        finally:
+            # Keep the channel for a retry until the executor releases it,
+            # without holding back the producer meanwhile
+            async with self._condition:
+                channel.reading = False
+                channel.streaming = False
+                self._condition.notify_all()
+
+    def _has_space(self) -> bool:
+        return all(
+            len(channel.items) < self.buffer_size
+            for channel in self._channels.values()
+            if channel.streaming and not channel.closed
+        )
+
+    def _open_channels(self) -> List[_Channel]:
+        return [channel for channel in self._channels.values() if not channel.closed]
+
+    async def _pump(self):
+        """Move chunks from the source iterator into every open channel."""
+        try:
+            async for item in self.source:
+                async with self._condition:
+                    await self._condition.wait_for(self._has_space)
+                    channels = self._open_channels()
+                    if not channels:
+                        logger.debug(f"All consumers of stream {self.name} stopped reading")
+                        break
+                    for channel in channels:
+                        channel.items.append(item)
+                    self.items_produced += 1
+                    self._condition.notify_all()
+        except asyncio.CancelledError:
+            logger.debug(f"Stream {self.name} cancelled after {self.items_produced} chunk(s)")
+            self.error = StreamError("stream was closed before it finished")
+        except Exception as e:
+            logger.error(f"❌ Stream {self.name} failed after {self.items_produced} chunk(s): {e}")
+            self.error = e
+        finally:
+            self.done = True
+            await self._close_source()
+            async with self._condition:
+                for channel in self._open_channels():
+                    channel.items.append(_END)
+                self._condition.notify_all()
+
+    async def _close_source(self):
+        aclose = getattr(self.source, "aclose", None)
+        if aclose is not None:
+            try:
+                await aclose()
+            except Exception as e:
+                logger.debug(f"Error closing stream source {self.name}: {e}")
+
+
+async def materialize(source: Any) -> List[Any]:
+    """Read a whole stream source (async iterable) into a list."""
+    return [item async for item in source]
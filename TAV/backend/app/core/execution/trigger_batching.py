@@ -0,0 +1,244 @@
+"""
+Trigger Micro-Batching and Debounce
+
+A folder receiving 500 files used to start 500 executions, each parsing the
+workflow, building a graph and writing execution rows. Trigger nodes can
+now collect events before firing (node config, injected for every trigger):
+
+- event_batching = "batch": collect up to batch_max_items events or
+  batch_window_ms milliseconds, then start one execution whose trigger data
+  is the merged batch (TriggerCapability.merge_trigger_batch; file and email
+  triggers produce their usual batch payloads)
+- event_batching = "debounce": events with the same debounce_key value (or
+  identical payloads when no key is set) arriving within debounce_ms of each
+  other collapse into one execution with the latest payload
+
+The TriggerManager wraps each trigger node's callback in a TriggerBatcher
+when batching is on; with "off" (the default) nothing changes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+BATCHING_MODES = ("off", "batch", "debounce")
+
+# (workflow_id, trigger_data, execution_source) -> None
+TriggerCallback = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class _Debounced:
+    trigger_data: Dict[str, Any]
+    execution_source: str
+    count: int = 1
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+def _int_or_default(value: Any, default: int) -> int:
+    """Config integer where an explicit 0 is kept (unset or empty → default)"""
+    if value is None or value == "":
+        return default
+    return int(value)
+
+
+@dataclass
+class BatchingConfig:
+    mode: str = "off"
+    max_items: int = 100
+    window_ms: int = 1000
+    debounce_ms: int = 500
+    debounce_key: Optional[str] = None
+
+    @classmethod
+    def from_node_config(cls, config: Dict[str, Any]) -> "BatchingConfig":
+        mode = config.get("event_batching") or "off"
+        return cls(
+            mode=mode if mode in BATCHING_MODES else "off",
+            max_items=max(1, int(config.get("batch_max_items") or 100)),
+            window_ms=max(0, _int_or_default(config.get("batch_window_ms"), 1000)),
+            debounce_ms=max(0, _int_or_default(config.get("debounce_ms"), 500)),
+            debounce_key=config.get("debounce_key") or None,
+        )
+
+
+@dataclass
+class BatcherStats:
+    events_in: int = 0
+    executions_out: int = 0
+    last_flush_at: Optional[float] = None
+    flush_sizes: List[int] = field(default_factory=list)
+
+
+class TriggerBatcher:
+    """
+    Buffers one trigger node's events in front of the TriggerManager callback.
+    """
+
+    def __init__(self, node: Any, callback: TriggerCallback, config: BatchingConfig):
+        self.node = node
+        self.callback = callback
+        self.config = config
+        self.stats = BatcherStats()
+        self._workflow_id: Optional[str] = None
+
+        # Batch mode
+        self._buffer: List[Tuple[Dict[str, Any], str]] = []
+        self._window_timer: Optional[asyncio.TimerHandle] = None
+
+        # Debounce mode
+        self._debounced: Dict[str, _Debounced] = {}
+
+        self._flush_tasks: set = set()
+        self._closed = False
+
+    @classmethod
+    def for_node(cls, node: Any, callback: TriggerCallback) -> Optional["TriggerBatcher"]:
+        """Batcher for a trigger node, or None when its batching is off"""
+        config = BatchingConfig.from_node_config(getattr(node, "config", None) or {})
+        if config.mode == "off":
+            return None
+        logger.info(f"🧺 Trigger {node.node_id}: event batching mode={config.mode}")
+        return cls(node, callback, config)
+
+    async def submit(self, workflow_id: str, trigger_data: Dict[str, Any], execution_source: str):
+        """Executor callback handed to the trigger node instead of the manager's"""
+        if self._closed:
+            return
+        self._workflow_id = workflow_id
+        self.stats.events_in += 1
+
+        if self.config.mode == "debounce":
+            self._debounce(trigger_data, execution_source)
+            return
+
+        self._buffer.append((trigger_data, execution_source))
+        if len(self._buffer) >= self.config.max_items:
+            # Full batch: fire now (awaiting gives the poller backpressure)
+            await self.flush()
+        elif self._window_timer is None:
+            self._window_timer = asyncio.get_running_loop().call_later(
+                self.config.window_ms / 1000, self._schedule_flush
+            )
+
+    # ==================== Batch ====================
+
+    async def flush(self):
+        """Fire the buffered events as one execution"""
+        if self._window_timer:
+            self._window_timer.cancel()
+            self._window_timer = None
+        if not self._buffer:
+            return
+
+        events, self._buffer = self._buffer, []
+        payload = self._merge([trigger_data for trigger_data, _ in events])
+        await self._fire(payload, events[-1][1], len(events))
+
+    def _schedule_flush(self):
+        self._window_timer = None
+        self._track(asyncio.create_task(self.flush()))
+
+    def _merge(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.node.merge_trigger_batch(events)
+
+    # ==================== Debounce ====================
+
+    def _debounce(self, trigger_data: Dict[str, Any], execution_source: str):
+        key = self._debounce_key(trigger_data)
+        pending = self._debounced.get(key)
+        if pending:
+            pending.timer.cancel()
+            pending.trigger_data = trigger_data
+            pending.execution_source = execution_source
+            pending.count += 1
+        else:
+            pending = self._debounced[key] = _Debounced(trigger_data, execution_source)
+
+        pending.timer = asyncio.get_running_loop().call_later(
+            self.config.debounce_ms / 1000, self._schedule_debounced, key
+        )
+
+    def _debounce_key(self, trigger_data: Dict[str, Any]) -> str:
+        if self.config.debounce_key and self.config.debounce_key in trigger_data:
+            return str(trigger_data[self.config.debounce_key])
+        serialized = json.dumps(trigger_data, sort_keys=True, default=str)
+        return hashlib.sha1(serialized.encode()).hexdigest()
+
+    def _schedule_debounced(self, key: str):
+        pending = self._debounced.pop(key, None)
+        if pending:
+            self._track(asyncio.create_task(self._fire_debounced(pending)))
+
+    async def _fire_debounced(self, pending: _Debounced):
+        payload = pending.trigger_data
+        if pending.count > 1:
+            payload = {**payload, "debounced_count": pending.count}
+        await self._fire(payload, pending.execution_source, pending.count)
+
+    # ==================== Internal ====================
+
+    async def _fire(self, payload: Dict[str, Any], execution_source: str, event_count: int):
+        self.stats.executions_out += 1
+        self.stats.last_flush_at = time.monotonic()
+        self.stats.flush_sizes = (self.stats.flush_sizes + [event_count])[-20:]
+        logger.info(
+            f"🧺 Trigger {self.node.node_id}: firing one execution for {event_count} event(s) "
+            f"({self.config.mode})"
+        )
+        try:
+            await self.callback(
+                workflow_id=self._workflow_id,
+                trigger_data=payload,
+                execution_source=execution_source
+            )
+        except Exception as e:
+            logger.error(f"❌ Batched trigger {self.node.node_id} failed: {e}", exc_info=True)
+
+    def _track(self, task: asyncio.Task):
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def close(self) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Stop batching and hand back what has not fired yet.
+
+        Returns:
+            List of (trigger_data, execution_source) - one merged batch, or
+            one entry per pending debounce key
+        """
+        self._closed = True
+        pending: List[Tuple[Dict[str, Any], str]] = []
+
+        if self._window_timer:
+            self._window_timer.cancel()
+            self._window_timer = None
+        if self._buffer:
+            pending.append((self._merge([data for data, _ in self._buffer]), self._buffer[-1][1]))
+            self._buffer = []
+
+        for entry in self._debounced.values():
+            entry.timer.cancel()
+            payload = entry.trigger_data
+            if entry.count > 1:
+                payload = {**payload, "debounced_count": entry.count}
+            pending.append((payload, entry.execution_source))
+        self._debounced.clear()
+
+        return pending
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.config.mode,
+            "events_in": self.stats.events_in,
+            "executions_out": self.stats.executions_out,
+            "pending": len(self._buffer) + len(self._debounced),
+            "recent_flush_sizes": list(self.stats.flush_sizes),
+        }
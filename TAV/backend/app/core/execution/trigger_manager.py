@@ -6,24 +6,74 @@ Manages trigger node lifecycle for persistent workflows:
 - Start/stop trigger nodes (schedule, webhook, polling, etc.)
 - Spawn workflow executions when triggers fire
 - Enforce concurrency limits
+
+Concurrency accounting is in memory: per-workflow counters move when an
+execution starts and finishes, limits are cached until the workflow or the
+execution settings change, and a reconcile loop corrects the counters from
+the DB every TRIGGER_RECONCILE_INTERVAL seconds (manual runs, queue-mode
+runs handed to workers). Firing a trigger does no DB reads.
+
+Events that arrive while a workflow is at its limit are persisted to the
+event_queue table (event_type "trigger.fired") and started in order by a
+per-workflow drain worker, so a burst survives a restart and is picked up
+when the workflow is activated again. Beyond max_queue_depth_per_workflow
+the overflow policy applies (execution_config["trigger_overflow_policy"] or
+the execution setting):
+- spill: keep queuing, the table absorbs the burst (default)
+- drop_oldest: discard the oldest queued event
+- drop_newest: discard the incoming event
+- coalesce: fold the incoming event into the newest queued one (its
+  trigger data wins)
+Drops and merges are counted and reported in queue stats.
+
+Trigger nodes with event_batching enabled fire through a TriggerBatcher
+(see trigger_batching.py), so a burst of events becomes one execution.
+
+Schedule triggers run on the shared ScheduleTimer (schedule_timer.py). Their
+stored fire times survive shutdown, so missed fires are caught up when the
+workflow is activated again; deactivating a workflow forgets them.
 """
 
 import asyncio
 import logging
-from typing import Dict, Optional, Callable, Awaitable, Set, Any
-from datetime import datetime
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Callable, Awaitable, Set, Any
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from app.utils.timezone import get_local_now
+from app.config import settings
+from app.utils.timezone import get_local_now, get_local_timezone
 
 from app.database.models.workflow import Workflow
 from app.database.models.execution import Execution
+from app.database.repositories.event_queue import EventQueueRepository, STATUS_PENDING
+from app.database.repositories.trigger_schedule import TriggerScheduleRepository
 from app.schemas.workflow import WorkflowDefinition, NodeCategory, ExecutionStatus
 from app.core.nodes import NodeRegistry, has_trigger_capability
+from app.core.execution.trigger_batching import TriggerBatcher
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_MAX_CONCURRENT = 5
+DEFAULT_MAX_QUEUE_DEPTH = 200
+DEFAULT_OVERFLOW_POLICY = "spill"
+OVERFLOW_POLICIES = ("spill", "drop_oldest", "drop_newest", "coalesce")
+
+EVENT_TRIGGER_FIRED = "trigger.fired"
+EVENT_LEASE_SECONDS = 60  # Renewed while the event's execution starts
+EVENT_RETRY_DELAY = 5.0  # Seconds before a queued event whose execution failed to start is retried
+
+
+class TriggerLimits(NamedTuple):
+    """Cached per-workflow limits"""
+    max_concurrent: int
+    max_queue_depth: int
+    overflow_policy: str
+
+
 class TriggerManager:
     """
     Central manager for workflow trigger nodes.
@@ -32,7 +82,8 @@ class TriggerManager:
     - Trigger nodes are regular nodes with TriggerCapability mixin
     - TriggerManager starts/stops trigger monitoring for workflows
     - When trigger fires → directly spawn execution via callback
-    - No event queues, no dispatchers, no ack tracking
+    - No dispatchers, no ack tracking; events over the concurrency limit
+      wait in the durable event_queue table
     
     Design:
     - Singleton pattern (one manager per app instance)
@@ -72,14 +123,32 @@ class TriggerManager:
         # trigger_info = {
         #     "workflow": WorkflowDefinition,
         #     "trigger_nodes": {node_id: node_instance},
+        #     "batchers": {node_id: TriggerBatcher},  # nodes with event batching on
         #     "started_at": datetime,
         # }
         
-        # Execution queues (per workflow)
-        self.execution_queues: Dict[str, asyncio.Queue] = {}  # workflow_id → Queue
+        # Durable execution queues (event_queue rows; counts mirrored in memory)
+        self.queued_counts: Dict[str, int] = {}  # workflow_id → pending trigger events
+        self.overflow_counts: Dict[str, Dict[str, int]] = {}  # workflow_id → {"dropped": n, "coalesced": n}
+        self.worker_id = f"triggers:{socket.gethostname()}:{os.getpid()}"
+        self._last_enqueued_at: Optional[datetime] = None
+        
+        # Concurrency accounting (in memory, reconciled with the DB)
+        self.running_counts: Dict[str, int] = {}   # workflow_id → runs started here, not finished
+        self.external_counts: Dict[str, int] = {}  # workflow_id → other PENDING/RUNNING runs (last reconcile)
+        self._limits: Dict[str, TriggerLimits] = {}
+        
+        # Queue drain workers (one per active workflow, woken when a run finishes)
+        self._drain_events: Dict[str, asyncio.Event] = {}
+        self._drain_tasks: Dict[str, asyncio.Task] = {}
+        self._queued_runs: Set[asyncio.Task] = set()
+        self._reconcile_task: Optional[asyncio.Task] = None
         
         self._shutdown_requested = False
         
+        global _trigger_manager
+        _trigger_manager = self
+        
         logger.info("TriggerManager initialized")
     
     async def activate_workflow(self, workflow_id: str) -> Dict[str, any]:
@@ -138,6 +207,7 @@ class TriggerManager:
             
             # Instantiate and start trigger nodes
             trigger_instances = {}
+            batchers = {}
             for node_id, node_config in trigger_nodes.items():
                 try:
                     # Get node class
@@ -155,10 +225,15 @@ class TriggerManager:
                             f"implement TriggerCapability mixin"
                         )
                     
-                    # Start monitoring
+                    # Start monitoring (through a batcher if event batching is on)
+                    callback = self._create_trigger_callback(workflow_id)
+                    batcher = TriggerBatcher.for_node(node_instance, callback)
+                    if batcher:
+                        batchers[node_id] = batcher
+                        callback = batcher.submit
                     await node_instance.start_monitoring(
                         workflow_id=workflow_id,
-                        executor_callback=self._create_trigger_callback(workflow_id)
+                        executor_callback=callback
                     )
                     
                     trigger_instances[node_id] = node_instance
@@ -181,9 +256,23 @@ class TriggerManager:
             self.active_workflows[workflow_id] = {
                 "workflow": workflow_def,
                 "trigger_nodes": trigger_instances,
+                "batchers": batchers,
                 "started_at": started_at,
             }
             
+            # Seed counters with runs already in flight and events queued
+            # before a restart, start the queue worker
+            self.reconcile_counts(db, [workflow_id])
+            backlog = EventQueueRepository(db).get_backlog(EVENT_TRIGGER_FIRED).get(workflow_id)
+            self.queued_counts[workflow_id] = backlog["pending"] if backlog else 0
+            self._start_drain_worker(workflow_id)
+            if self.queued_counts[workflow_id]:
+                self._wake_drain_worker(workflow_id)
+                logger.info(
+                    f"📥 {self.queued_counts[workflow_id]} queued trigger events waiting for workflow {workflow_id}"
+                )
+            self._ensure_reconciler()
+            
             activation_info = {
                 "workflow_id": workflow_id,
                 "trigger_count": len(trigger_instances),
@@ -201,7 +290,7 @@ class TriggerManager:
         finally:
             db.close()
     
-    async def deactivate_workflow(self, workflow_id: str) -> bool:
+    async def deactivate_workflow(self, workflow_id: str, clear_queue: bool = True) -> bool:
         """
         Deactivate workflow trigger monitoring.
         
@@ -214,6 +303,10 @@ class TriggerManager:
         
         Args:
             workflow_id: Workflow UUID
+            clear_queue: Delete queued trigger events and stored schedule fire
+                         times (False on shutdown, so they run and missed
+                         fires are caught up when the workflow is
+                         activated again)
         
         Returns:
             True if deactivated, False if not active
@@ -232,28 +325,36 @@ class TriggerManager:
         # Stop all trigger nodes
         await self._stop_trigger_nodes(trigger_instances)
         
-        # Clear execution queue
-        if workflow_id in self.execution_queues:
-            queue = self.execution_queues[workflow_id]
-            queue_size = queue.qsize()
-            
-            # Drain the queue
-            while not queue.empty():
-                try:
-                    queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
-            
-            del self.execution_queues[workflow_id]
-            
-            if queue_size > 0:
-                logger.info(
-                    f"Cleared {queue_size} queued events for workflow {workflow_id}"
-                )
+        # Events still waiting in a batch or debounce window: queue them on
+        # shutdown so they run after a restart, drop them otherwise
+        pending_batches = []
+        for batcher in trigger_info.get("batchers", {}).values():
+            pending_batches.extend(batcher.close())
+        if pending_batches and not clear_queue:
+            for trigger_data, execution_source in pending_batches:
+                self._enqueue_event(workflow_id, trigger_data, execution_source)
+        elif pending_batches:
+            logger.info(f"Discarded {len(pending_batches)} pending trigger batches for workflow {workflow_id}")
+        
+        # Stop the queue worker and clear execution queue
+        drain_task = self._drain_tasks.pop(workflow_id, None)
+        if drain_task:
+            drain_task.cancel()
+        self._drain_events.pop(workflow_id, None)
+        self.queued_counts.pop(workflow_id, None)
         
         # Update workflow state in DB
         db = self.db_session_factory()
         try:
+            if clear_queue:
+                queue_size = EventQueueRepository(db).delete_pending(EVENT_TRIGGER_FIRED, workflow_id)
+                if queue_size > 0:
+                    logger.info(
+                        f"Cleared {queue_size} queued events for workflow {workflow_id}"
+                    )
+                # Schedules start fresh on the next activation (no catch-up)
+                TriggerScheduleRepository(db).delete_for_workflow(workflow_id)
+            
             workflow_db = db.query(Workflow).filter(Workflow.id == workflow_id).first()
             if workflow_db:
                 workflow_db.status = ExecutionStatus.STOPPED
@@ -264,6 +365,8 @@ class TriggerManager:
         
         # Remove from memory
         del self.active_workflows[workflow_id]
+        self.external_counts.pop(workflow_id, None)
+        self._limits.pop(workflow_id, None)
         
         logger.info(f"Workflow {workflow_id} deactivated successfully")
         
@@ -283,10 +386,14 @@ class TriggerManager:
         workflow_ids = list(self.active_workflows.keys())
         for workflow_id in workflow_ids:
             try:
-                await self.deactivate_workflow(workflow_id)
+                await self.deactivate_workflow(workflow_id, clear_queue=False)
             except Exception as e:
                 logger.error(f"Error deactivating workflow {workflow_id} during shutdown: {e}")
         
+        if self._reconcile_task:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+        
         logger.info("TriggerManager shutdown complete")
     
     def get_active_workflows(self) -> Dict[str, Dict]:
@@ -299,7 +406,10 @@ class TriggerManager:
                 "trigger_count": int,
                 "trigger_nodes": List[str],
                 "started_at": datetime,
-                "uptime_seconds": float
+                "uptime_seconds": float,
+                "running_executions": int,
+                "queued_events": int,
+                "batching": {node_id: batcher stats}
             }
         """
         result = {}
@@ -311,6 +421,53 @@ class TriggerManager:
                 "trigger_nodes": list(trigger_info["trigger_nodes"].keys()),
                 "started_at": trigger_info["started_at"],
                 "uptime_seconds": uptime,
+                "running_executions": self._count_active_executions(workflow_id),
+                "queued_events": self.queued_counts.get(workflow_id, 0),
+                "batching": {
+                    node_id: batcher.get_stats()
+                    for node_id, batcher in trigger_info.get("batchers", {}).items()
+                },
+            }
+        return result
+    
+    def get_queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Durable trigger queue state per workflow with queued events.
+        
+        Returns:
+            Dict of workflow_id → {
+                "queued": int,
+                "oldest_age_seconds": float,
+                "active": bool,
+                "running": int,
+                "max_concurrent": int | None,
+                "max_queue_depth": int | None,
+                "overflow_policy": str | None,
+                "dropped": int,
+                "coalesced": int
+            }
+        """
+        db = self.db_session_factory()
+        try:
+            backlog = EventQueueRepository(db).get_backlog(EVENT_TRIGGER_FIRED)
+        finally:
+            db.close()
+        
+        result = {}
+        for workflow_id in set(backlog) | set(self.active_workflows) | set(self.overflow_counts):
+            entry = backlog.get(workflow_id) or {"pending": 0, "oldest_at": None}
+            limits = self._limits.get(workflow_id)
+            overflow = self.overflow_counts.get(workflow_id, {})
+            result[workflow_id] = {
+                "queued": entry["pending"],
+                "oldest_age_seconds": _age_seconds(entry["oldest_at"]),
+                "active": workflow_id in self.active_workflows,
+                "running": self._count_active_executions(workflow_id),
+                "max_concurrent": limits.max_concurrent if limits else None,
+                "max_queue_depth": limits.max_queue_depth if limits else None,
+                "overflow_policy": limits.overflow_policy if limits else None,
+                "dropped": overflow.get("dropped", 0),
+                "coalesced": overflow.get("coalesced", 0),
             }
         return result
     
@@ -318,6 +475,53 @@ class TriggerManager:
         """Check if workflow is currently active."""
         return workflow_id in self.active_workflows
     
+    def invalidate_limits(self, workflow_id: Optional[str] = None):
+        """
+        Drop cached concurrency limits (next trigger reloads them).
+        
+        Args:
+            workflow_id: Workflow whose config changed, or None after a
+                         change to the global execution settings
+        """
+        if workflow_id is None:
+            self._limits.clear()
+        else:
+            self._limits.pop(workflow_id, None)
+        # A higher limit may free capacity for queued events
+        for event in self._drain_events.values():
+            event.set()
+    
+    def reconcile_counts(self, db: Session, workflow_ids: Optional[list] = None):
+        """
+        Correct in-memory counters from the DB.
+        
+        Runs this manager has in flight are counted in memory; everything
+        else PENDING/RUNNING (manual runs, runs handed to queue workers) is
+        taken from one grouped COUNT.
+        
+        Args:
+            db: Database session
+            workflow_ids: Workflows to reconcile (default: all active)
+        """
+        workflow_ids = list(self.active_workflows) if workflow_ids is None else workflow_ids
+        if not workflow_ids:
+            return
+        
+        rows = db.query(Execution.workflow_id, func.count(Execution.id)).filter(
+            Execution.workflow_id.in_(workflow_ids),
+            Execution.status.in_([ExecutionStatus.PENDING, ExecutionStatus.RUNNING])
+        ).group_by(Execution.workflow_id).all()
+        db_counts = dict(rows)
+        
+        for workflow_id in workflow_ids:
+            external = max(0, db_counts.get(workflow_id, 0) - self.running_counts.get(workflow_id, 0))
+            if external != self.external_counts.get(workflow_id, 0):
+                logger.debug(
+                    f"Reconciled workflow {workflow_id}: {external} executions outside this manager"
+                )
+            self.external_counts[workflow_id] = external
+            self._wake_drain_worker(workflow_id)
+    
     # --- Internal Methods ---
     
     def _find_trigger_nodes(self, workflow: WorkflowDefinition) -> Dict[str, any]:
@@ -379,7 +583,7 @@ class TriggerManager:
                 )
                 return
             
-            # Check concurrency limit
+            # Check concurrency limit (in memory, no DB round trip)
             active_count = self._count_active_executions(workflow_id)
             max_concurrent = self._get_max_concurrent(workflow_id)
             
@@ -387,40 +591,18 @@ class TriggerManager:
                 f"Concurrency check: {active_count}/{max_concurrent} running"
             )
             
-            if active_count >= max_concurrent:
+            # Queued events go first, so a new event never overtakes them
+            if active_count >= max_concurrent or self.queued_counts.get(workflow_id):
                 # AT LIMIT - Add to queue
                 logger.info(
                     f"⏸️  At concurrency limit ({active_count}/{max_concurrent}), "
                     f"queuing event for workflow {workflow_id}"
                 )
                 
-                # Get or create queue for this workflow
-                if workflow_id not in self.execution_queues:
-                    max_queue_depth = self._get_max_queue_depth(workflow_id)
-                    self.execution_queues[workflow_id] = asyncio.Queue(
-                        maxsize=max_queue_depth
-                    )
-                
-                queue = self.execution_queues[workflow_id]
+                self._enqueue_event(workflow_id, trigger_data, execution_source)
+                self._wake_drain_worker(workflow_id)
                 
-                # Try to add to queue
-                try:
-                    queue.put_nowait({
-                        "trigger_data": trigger_data,
-                        "execution_source": execution_source,
-                        "queued_at": get_local_now()
-                    })
-                    logger.info(
-                        f"📥 Event queued (queue size: {queue.qsize()}/{queue.maxsize})"
-                    )
-                
-                except asyncio.QueueFull:
-                    logger.error(
-                        f"❌ Queue full for workflow {workflow_id} "
-                        f"({queue.maxsize} events), DROPPING event"
-                    )
-                
-                return  # Done, event queued or dropped
+                return  # Done, event queued, merged or dropped
             
             # UNDER LIMIT - Execute immediately
             logger.info(
@@ -428,7 +610,8 @@ class TriggerManager:
                 f"executing immediately"
             )
             
-            await self._execute_with_queue_processing(
+            self._execution_started(workflow_id)
+            await self._run_execution(
                 workflow_id,
                 trigger_data,
                 execution_source
@@ -450,7 +633,7 @@ class TriggerManager:
             except Exception as e:
                 logger.error(f"Error stopping trigger {node_id}: {e}", exc_info=True)
     
-    # --- Database Query Methods ---
+    # --- Concurrency Accounting ---
     
     def _count_active_executions(self, workflow_id: str) -> int:
         """
@@ -460,17 +643,29 @@ class TriggerManager:
             workflow_id: Workflow UUID
         
         Returns:
-            Number of RUNNING executions
+            Runs started by this manager and not finished, plus other PENDING
+            or RUNNING executions as of the last reconcile (PENDING covers
+            executions waiting on a worker when EXECUTION_BACKEND=queue)
         """
-        db = self.db_session_factory()
-        try:
-            count = db.query(Execution).filter(
-                Execution.workflow_id == workflow_id,
-                Execution.status == ExecutionStatus.RUNNING
-            ).count()
-            return count
-        finally:
-            db.close()
+        return self.running_counts.get(workflow_id, 0) + self.external_counts.get(workflow_id, 0)
+    
+    def _execution_started(self, workflow_id: str):
+        self.running_counts[workflow_id] = self.running_counts.get(workflow_id, 0) + 1
+    
+    def _execution_finished(self, workflow_id: str, handed_off: bool = False):
+        """
+        Args:
+            handed_off: The callback only enqueued the run for a worker; it stays
+                        counted as external until the next reconcile
+        """
+        remaining = self.running_counts.get(workflow_id, 0) - 1
+        if remaining > 0:
+            self.running_counts[workflow_id] = remaining
+        else:
+            self.running_counts.pop(workflow_id, None)
+        if handed_off:
+            self.external_counts[workflow_id] = self.external_counts.get(workflow_id, 0) + 1
+        self._wake_drain_worker(workflow_id)
     
     def _get_max_concurrent(self, workflow_id: str) -> int:
         """
@@ -484,28 +679,7 @@ class TriggerManager:
         Returns:
             Max concurrent runs limit
         """
-        db = self.db_session_factory()
-        try:
-            # Load workflow
-            workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
-            if not workflow:
-                return 5  # Default fallback
-            
-            # Check workflow-specific config
-            if workflow.execution_config and "max_concurrent_runs" in workflow.execution_config:
-                return workflow.execution_config["max_concurrent_runs"]
-            
-            # Fall back to global settings
-            from app.core.config.manager import get_settings_manager
-            try:
-                settings_manager = get_settings_manager(db)
-                execution_settings = settings_manager.get_execution_settings()
-                return execution_settings.max_concurrent_runs_per_workflow
-            except Exception:
-                return 5  # Default fallback
-        
-        finally:
-            db.close()
+        return self._get_limits(workflow_id).max_concurrent
     
     def _get_max_queue_depth(self, workflow_id: str) -> int:
         """
@@ -517,39 +691,97 @@ class TriggerManager:
         Returns:
             Max queue depth limit
         """
+        return self._get_limits(workflow_id).max_queue_depth
+    
+    def _get_limits(self, workflow_id: str) -> TriggerLimits:
+        """Limits of a workflow, cached until invalidate_limits()"""
+        limits = self._limits.get(workflow_id)
+        if limits is None:
+            limits = self._limits[workflow_id] = self._load_limits(workflow_id)
+        return limits
+    
+    def _load_limits(self, workflow_id: str) -> TriggerLimits:
         db = self.db_session_factory()
         try:
-            # Load global settings
+            max_concurrent = DEFAULT_MAX_CONCURRENT
+            max_queue_depth = DEFAULT_MAX_QUEUE_DEPTH
+            overflow_policy = DEFAULT_OVERFLOW_POLICY
+            
+            # Global settings
             from app.core.config.manager import get_settings_manager
             try:
                 settings_manager = get_settings_manager(db)
                 execution_settings = settings_manager.get_execution_settings()
-                return execution_settings.max_queue_depth_per_workflow
+                max_concurrent = execution_settings.max_concurrent_runs_per_workflow
+                max_queue_depth = execution_settings.max_queue_depth_per_workflow
+                overflow_policy = execution_settings.trigger_overflow_policy
             except Exception:
-                return 200  # Default fallback
+                pass  # Defaults
+            
+            # Workflow-specific config wins
+            workflow = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+            if not workflow:
+                return TriggerLimits(DEFAULT_MAX_CONCURRENT, max_queue_depth, overflow_policy)
+            execution_config = workflow.execution_config or {}
+            if "max_concurrent_runs" in execution_config:
+                max_concurrent = execution_config["max_concurrent_runs"]
+            if execution_config.get("trigger_overflow_policy") in OVERFLOW_POLICIES:
+                overflow_policy = execution_config["trigger_overflow_policy"]
+            
+            return TriggerLimits(max_concurrent, max_queue_depth, overflow_policy)
         
         finally:
             db.close()
     
+    def _ensure_reconciler(self):
+        if self._reconcile_task is None or self._reconcile_task.done():
+            self._reconcile_task = asyncio.create_task(self._reconcile_loop())
+    
+    async def _reconcile_loop(self):
+        """Periodically correct counters from the DB (one grouped query)"""
+        while not self._shutdown_requested:
+            await asyncio.sleep(settings.TRIGGER_RECONCILE_INTERVAL)
+            if not self.active_workflows:
+                continue
+            db = self.db_session_factory()
+            try:
+                self.reconcile_counts(db)
+            except Exception as e:
+                logger.warning(f"⚠️  Trigger count reconcile failed: {e}")
+            finally:
+                db.close()
+    
     # --- Queue Management Methods ---
     
-    async def _execute_with_queue_processing(
+    async def _run_execution(
         self,
         workflow_id: str,
         trigger_data: Dict[str, Any],
-        execution_source: str
+        execution_source: str,
+        event_id: Optional[str] = None
     ):
         """
-        Execute workflow and process queue afterward.
+        Execute workflow and count it as finished afterwards.
+        
+        Callers count the run as started (_execution_started) before the
+        first await, so the next capacity check already sees it. Finishing
+        wakes the workflow's drain worker, which starts queued events while
+        there is capacity.
         
-        This ensures that after each execution completes, we check if there
-        are queued events waiting and process them.
+        A queued event (event_id) stays claimed until the callback returns
+        an execution; if the callback raises, the event is released for a
+        retry, or marked failed once its retries are used up.
         
         Args:
             workflow_id: Workflow UUID
             trigger_data: Trigger event data
             execution_source: Execution source (e.g., "schedule", "webhook")
+            event_id: Claimed queue event the execution comes from (optional)
         """
+        from app.core.execution.worker import is_queue_backend
+        
+        handed_off = False
+        lease_task = asyncio.create_task(self._hold_lease(event_id)) if event_id else None
         try:
             # Execute the workflow
             execution_id = await self.execution_callback(
@@ -557,69 +789,257 @@ class TriggerManager:
                 trigger_data,
                 execution_source
             )
-            logger.info(f"✅ Execution {execution_id} completed for workflow {workflow_id}")
+            handed_off = is_queue_backend()
+            logger.info(
+                f"✅ Execution {execution_id} "
+                f"{'enqueued' if handed_off else 'completed'} for workflow {workflow_id}"
+            )
+            if event_id:
+                self._release_event(workflow_id, event_id)
         
         except Exception as e:
             logger.error(
                 f"❌ Execution failed for workflow {workflow_id}: {e}",
                 exc_info=True
             )
+            if event_id:
+                self._release_event(workflow_id, event_id, error_message=str(e))
         
         finally:
-            # ALWAYS check queue after execution (success or failure)
-            await self._process_queue(workflow_id)
+            if lease_task:
+                lease_task.cancel()
+            self._execution_finished(workflow_id, handed_off=handed_off)
+    
+    async def _hold_lease(self, event_id: str):
+        """Renew a claimed event's lease until cancelled."""
+        while True:
+            await asyncio.sleep(EVENT_LEASE_SECONDS / 3)
+            db = self.db_session_factory()
+            try:
+                if not EventQueueRepository(db).heartbeat(self.worker_id, [event_id], EVENT_LEASE_SECONDS):
+                    logger.warning(f"⚠️  Lease of trigger event {event_id} was lost")
+                    return
+            except Exception as e:
+                logger.warning(f"⚠️  Failed to renew lease of trigger event {event_id}: {e}")
+            finally:
+                db.close()
     
-    async def _process_queue(self, workflow_id: str):
+    def _release_event(self, workflow_id: str, event_id: str, error_message: Optional[str] = None):
         """
-        Process queued events if under concurrency limit.
-        
-        Called after each execution completes to check if there are
-        queued events waiting and if we have capacity to run them.
-        
-        Args:
-            workflow_id: Workflow UUID
+        Complete a claimed event, or fail it so it is retried (or dead-lettered
+        once out of retries).
         """
-        # Check if workflow is still active
-        if workflow_id not in self.active_workflows:
-            return  # Workflow was deactivated
-        
-        # Check if there are queued events
-        queue = self.execution_queues.get(workflow_id)
-        if not queue or queue.empty():
-            return  # Nothing queued
-        
-        # Check if we're under limit now
-        active_count = self._count_active_executions(workflow_id)
-        max_concurrent = self._get_max_concurrent(workflow_id)
-        
-        if active_count >= max_concurrent:
-            logger.debug(
-                f"Still at concurrency limit ({active_count}/{max_concurrent}), "
-                f"queue remains with {queue.qsize()} events"
-            )
-            return  # Still at limit, queue stays
+        db = self.db_session_factory()
+        try:
+            repo = EventQueueRepository(db)
+            if error_message is None:
+                repo.complete(event_id, self.worker_id)
+                return
+            
+            repo.fail(event_id, self.worker_id, error_message, retry_delay_seconds=EVENT_RETRY_DELAY)
+            event = repo.get_by_id(event_id)
+            if event and event.status == STATUS_PENDING:
+                logger.warning(
+                    f"🔁 Trigger event {event_id} will be retried in {EVENT_RETRY_DELAY:.0f}s "
+                    f"(retry {event.retry_count}/{event.max_retries})"
+                )
+                asyncio.get_running_loop().call_later(EVENT_RETRY_DELAY, self._requeue_event, workflow_id)
+            else:
+                logger.error(f"❌ Trigger event {event_id} failed after all retries, not retrying")
+        except Exception as e:
+            logger.error(f"Failed to release trigger event {event_id}: {e}", exc_info=True)
+        finally:
+            db.close()
+    
+    def _requeue_event(self, workflow_id: str):
+        """Count a retried event as queued again once it is due."""
+        if workflow_id in self.active_workflows:
+            self.queued_counts[workflow_id] = self.queued_counts.get(workflow_id, 0) + 1
+            self._wake_drain_worker(workflow_id)
+    
+    def _enqueue_event(self, workflow_id: str, trigger_data: Dict[str, Any], execution_source: str):
+        """
+        Persist a trigger event, applying the overflow policy when the
+        workflow's queue is at max_queue_depth.
+        """
+        limits = self._get_limits(workflow_id)
+        queued = self.queued_counts.get(workflow_id, 0)
         
-        # We have capacity! Process next queued event
+        db = self.db_session_factory()
         try:
-            queued_event = queue.get_nowait()
+            repo = EventQueueRepository(db)
             
-            wait_time = (get_local_now() - queued_event["queued_at"]).total_seconds()
+            if queued >= limits.max_queue_depth:
+                policy = limits.overflow_policy
+                
+                if policy == "drop_newest":
+                    self._count_overflow(workflow_id, "dropped")
+                    logger.error(
+                        f"❌ Queue full for workflow {workflow_id} "
+                        f"({limits.max_queue_depth} events), DROPPING new event (policy=drop_newest)"
+                    )
+                    return
+                
+                if policy == "coalesce":
+                    newest = repo.newest_pending(EVENT_TRIGGER_FIRED, workflow_id)
+                    if newest:
+                        newest.event_data = {
+                            **newest.event_data,
+                            "trigger_data": trigger_data,
+                            "execution_source": execution_source,
+                            "coalesced": newest.event_data.get("coalesced", 0) + 1,
+                        }
+                        db.commit()
+                        self._count_overflow(workflow_id, "coalesced")
+                        logger.info(
+                            f"🔀 Queue full for workflow {workflow_id}, "
+                            f"merged event into queued event {newest.id}"
+                        )
+                        return
+                
+                elif policy == "drop_oldest":
+                    removed = repo.delete_pending(EVENT_TRIGGER_FIRED, workflow_id, limit=1)
+                    queued -= removed
+                    self._count_overflow(workflow_id, "dropped", removed)
+                    logger.warning(
+                        f"⚠️  Queue full for workflow {workflow_id}, "
+                        f"dropped oldest event (policy=drop_oldest)"
+                    )
+                
+                elif queued == limits.max_queue_depth:
+                    logger.warning(
+                        f"⚠️  Queue for workflow {workflow_id} passed {limits.max_queue_depth} events, "
+                        f"spilling (policy=spill)"
+                    )
+            
+            repo.enqueue(
+                event_type=EVENT_TRIGGER_FIRED,
+                event_data={"trigger_data": trigger_data, "execution_source": execution_source},
+                workflow_id=workflow_id,
+                scheduled_for=self._next_enqueue_time(),
+            )
+            self.queued_counts[workflow_id] = queued + 1
             logger.info(
-                f"🔄 Processing queued event for workflow {workflow_id} "
-                f"(waited {wait_time:.1f}s, {queue.qsize()} remain in queue)"
+                f"📥 Event queued (queue size: {queued + 1}/{limits.max_queue_depth})"
             )
-            
-            # Execute it (this will recursively call _process_queue when done)
-            await self._execute_with_queue_processing(
-                workflow_id,
-                queued_event["trigger_data"],
-                queued_event["execution_source"]
+        
+        finally:
+            db.close()
+    
+    def _claim_events(self, workflow_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Take the next queued events of a workflow, oldest first.
+        
+        Claimed events stay leased until their execution has started (see
+        _run_execution); from then on the execution record (and its
+        checkpoints) carries them.
+        """
+        db = self.db_session_factory()
+        try:
+            repo = EventQueueRepository(db)
+            events = repo.claim(
+                self.worker_id, [EVENT_TRIGGER_FIRED], limit=limit,
+                lease_seconds=EVENT_LEASE_SECONDS, workflow_id=workflow_id
             )
+            return [
+                {**(event.event_data or {}), "id": event.id, "queued_at": event.created_at}
+                for event in events
+            ]
+        finally:
+            db.close()
+    
+    def _next_enqueue_time(self) -> datetime:
+        """Strictly increasing scheduled_for, so claim order is arrival order"""
+        now = get_local_now()
+        if self._last_enqueued_at is not None and now <= self._last_enqueued_at:
+            now = self._last_enqueued_at + timedelta(microseconds=1)
+        self._last_enqueued_at = now
+        return now
+    
+    def _count_overflow(self, workflow_id: str, kind: str, count: int = 1):
+        counts = self.overflow_counts.setdefault(workflow_id, {"dropped": 0, "coalesced": 0})
+        counts[kind] += count
+    
+    def _start_drain_worker(self, workflow_id: str):
+        self._drain_events[workflow_id] = asyncio.Event()
+        self._drain_tasks[workflow_id] = asyncio.create_task(self._drain_queue(workflow_id))
+    
+    def _wake_drain_worker(self, workflow_id: str):
+        event = self._drain_events.get(workflow_id)
+        if event:
+            event.set()
+    
+    async def _drain_queue(self, workflow_id: str):
+        """
+        Start queued events while the workflow is under its concurrency limit.
         
-        except asyncio.QueueEmpty:
-            # Race condition, queue emptied between checks
-            pass
-        except Exception as e:
-            logger.error(f"Error processing queued event: {e}", exc_info=True)
+        Runs until the workflow is deactivated; sleeps until a run finishes,
+        an event is queued, limits change or counters are reconciled.
+        
+        Args:
+            workflow_id: Workflow UUID
+        """
+        event = self._drain_events[workflow_id]
+        while workflow_id in self.active_workflows:
+            await event.wait()
+            event.clear()
+            
+            while self.queued_counts.get(workflow_id) and workflow_id in self.active_workflows:
+                active_count = self._count_active_executions(workflow_id)
+                max_concurrent = self._get_max_concurrent(workflow_id)
+                if active_count >= max_concurrent:
+                    logger.debug(
+                        f"Still at concurrency limit ({active_count}/{max_concurrent}), "
+                        f"queue remains with {self.queued_counts[workflow_id]} events"
+                    )
+                    break
+                
+                try:
+                    queued_events = self._claim_events(workflow_id, max_concurrent - active_count)
+                except Exception as e:
+                    logger.error(f"Failed to read trigger queue of workflow {workflow_id}: {e}", exc_info=True)
+                    break
+                
+                if not queued_events:
+                    self.queued_counts[workflow_id] = 0  # Counter drifted (e.g. rows deleted)
+                    break
+                
+                self.queued_counts[workflow_id] = max(0, self.queued_counts[workflow_id] - len(queued_events))
+                
+                for queued_event in queued_events:
+                    logger.info(
+                        f"🔄 Processing queued event for workflow {workflow_id} "
+                        f"(waited {_age_seconds(queued_event['queued_at']):.1f}s, "
+                        f"{self.queued_counts[workflow_id]} remain in queue)"
+                    )
+                    
+                    self._execution_started(workflow_id)
+                    task = asyncio.create_task(self._run_execution(
+                        workflow_id,
+                        queued_event["trigger_data"],
+                        queued_event["execution_source"],
+                        event_id=queued_event["id"]
+                    ))
+                    self._queued_runs.add(task)
+                    task.add_done_callback(self._queued_runs.discard)
+
 
+def _age_seconds(timestamp: Optional[datetime]) -> Optional[float]:
+    """Seconds since a stored timestamp"""
+    if timestamp is None:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=get_local_timezone())  # SQLite drops the offset
+    return max(0.0, (get_local_now() - timestamp).total_seconds())
 
+
+_trigger_manager: Optional[TriggerManager] = None
+
+
+def invalidate_trigger_limits(workflow_id: Optional[str] = None):
+    """
+    Drop cached trigger concurrency limits after a workflow's execution
+    config or the global execution settings change.
+    """
+    if _trigger_manager is not None:
+        _trigger_manager.invalidate_limits(workflow_id)
@@ -0,0 +1,546 @@
+"""
+Execution Worker
+
+Runs workflow executions pulled from the event_queue table, so API nodes and
+execution capacity can scale independently across cores and hosts.
+
+Enabled with EXECUTION_BACKEND=queue:
+- POST /workflows/{id}/execute, trigger fires and checkpoint retries enqueue jobs
+- Worker processes claim jobs with SELECT ... FOR UPDATE SKIP LOCKED
+- Each claimed job is held under a lease renewed by heartbeats; jobs of a
+  crashed worker become claimable again once their lease expires and resume
+  from the execution's checkpoint (EXECUTION_RECOVERY_POLICY=resume)
+- Stop requests are picked up from the execution record on each heartbeat
+- A job whose lease was reclaimed by another worker is cancelled locally,
+  so the execution is not run twice
+
+Run one or more workers with:
+    python -m app.core.execution.worker
+"""
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Any, Callable, Dict, Optional, Set
+from uuid import uuid4
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database.models.execution import Execution
+from app.database.repositories.event_queue import EventQueueRepository
+from app.schemas.workflow import ExecutionStatus
+from app.utils.timezone import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+# Event types handled by execution workers
+EVENT_EXECUTE_WORKFLOW = "workflow.execute"
+EVENT_RETRY_EXECUTION = "workflow.retry"
+EVENT_RESUME_EXECUTION = "workflow.resume"
+EXECUTION_EVENT_TYPES = (EVENT_EXECUTE_WORKFLOW, EVENT_RETRY_EXECUTION, EVENT_RESUME_EXECUTION)
+
+
+def is_queue_backend() -> bool:
+    """Check if executions should be enqueued for workers instead of run inline."""
+    return settings.EXECUTION_BACKEND.lower() == "queue"
+
+
+def enqueue_execution(
+    db: Session,
+    execution_id: str,
+    workflow_id: str,
+    trigger_data: Optional[Dict[str, Any]] = None,
+    execution_source: str = "manual",
+    started_by: Optional[str] = None,
+    execution_mode: str = "parallel",
+    frontend_origin: Optional[str] = None,
+    priority: int = 5
+) -> str:
+    """
+    Enqueue a workflow execution for a worker.
+
+    The execution record must already exist (status PENDING); the worker
+    hands execution_id to the orchestrator, which updates that record.
+
+    Args:
+        db: Database session
+        execution_id: Existing execution record ID
+        workflow_id: Workflow UUID
+        trigger_data: Trigger/initial data for the run
+        execution_source: How execution was initiated
+        started_by: User ID who initiated execution
+        execution_mode: ExecutionMode value
+        frontend_origin: Frontend origin URL for links
+        priority: Queue priority (1=highest, 10=lowest)
+
+    Returns:
+        Queue event ID
+    """
+    event = EventQueueRepository(db).enqueue(
+        event_type=EVENT_EXECUTE_WORKFLOW,
+        workflow_id=workflow_id,
+        priority=priority,
+        event_data={
+            "execution_id": execution_id,
+            "workflow_id": workflow_id,
+            "trigger_data": trigger_data or {},
+            "execution_source": execution_source,
+            "started_by": started_by,
+            "execution_mode": getattr(execution_mode, "value", execution_mode),
+            "frontend_origin": frontend_origin,
+        },
+    )
+    logger.info(f"📥 Enqueued execution {execution_id} for workflow {workflow_id} (event {event.id})")
+    return event.id
+
+
+def enqueue_retry(db: Session, execution_id: str, workflow_id: str, priority: int = 5) -> str:
+    """
+    Enqueue a prepared checkpoint retry for a worker.
+
+    Args:
+        db: Database session
+        execution_id: Retry execution ID from retry_from_checkpoint(prepare_only=True)
+        workflow_id: Workflow UUID
+        priority: Queue priority (1=highest, 10=lowest)
+
+    Returns:
+        Queue event ID
+    """
+    event = EventQueueRepository(db).enqueue(
+        event_type=EVENT_RETRY_EXECUTION,
+        workflow_id=workflow_id,
+        priority=priority,
+        event_data={"execution_id": execution_id, "workflow_id": workflow_id},
+    )
+    logger.info(f"📥 Enqueued retry execution {execution_id} (event {event.id})")
+    return event.id
+
+
+def enqueue_resume(db: Session, execution_id: str, workflow_id: str, priority: int = 5) -> str:
+    """
+    Enqueue an interrupted execution to be resumed from its checkpoint.
+
+    Args:
+        db: Database session
+        execution_id: Interrupted execution ID
+        workflow_id: Workflow UUID
+        priority: Queue priority (1=highest, 10=lowest)
+
+    Returns:
+        Queue event ID
+    """
+    event = EventQueueRepository(db).enqueue(
+        event_type=EVENT_RESUME_EXECUTION,
+        workflow_id=workflow_id,
+        priority=priority,
+        event_data={"execution_id": execution_id, "workflow_id": workflow_id},
+    )
+    logger.info(f"📥 Enqueued resume of execution {execution_id} (event {event.id})")
+    return event.id
+
+
+async def wait_for_execution(
+    session_factory: Callable[[], Session],
+    execution_id: str,
+    timeout: float,
+    poll_interval: float = 0.5
+) -> bool:
+    """
+    Wait until a queued execution reaches a terminal status.
+
+    Used by sync (X-Await-Completion) requests when the execution runs on a worker.
+
+    Returns:
+        True if the execution finished, False on timeout
+    """
+    terminal = (ExecutionStatus.COMPLETED, ExecutionStatus.FAILED, ExecutionStatus.STOPPED)
+    deadline = asyncio.get_running_loop().time() + timeout
+
+    while True:
+        db = session_factory()
+        try:
+            status = db.query(Execution.status).filter(Execution.id == execution_id).scalar()
+        finally:
+            db.close()
+
+        if status in terminal:
+            return True
+        if asyncio.get_running_loop().time() >= deadline:
+            return False
+        await asyncio.sleep(poll_interval)
+
+
+class ExecutionWorker:
+    """
+    Queue consumer that runs workflow executions.
+
+    Design:
+    - One worker per process, up to `concurrency` executions at a time
+    - Claims only as many jobs as it has free slots (no local backlog)
+    - Heartbeat loop renews leases, propagates stop requests and cancels
+      jobs whose lease was lost
+    - Orchestrator does all persistence; the worker only manages the job
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            session_factory: Factory for DB sessions (default: SessionLocal)
+            concurrency: Max concurrent executions (default: WORKER_CONCURRENCY)
+            lease_seconds: Job lease duration (default: WORKER_LEASE_SECONDS)
+            poll_interval: Idle polling interval (default: WORKER_POLL_INTERVAL)
+            worker_id: Worker identity (default: host:pid:random)
+        """
+        if session_factory is None:
+            from app.database.session import SessionLocal
+            session_factory = SessionLocal
+
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.WORKER_CONCURRENCY
+        self.lease_seconds = lease_seconds or settings.WORKER_LEASE_SECONDS
+        self.poll_interval = poll_interval or settings.WORKER_POLL_INTERVAL
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:6]}"
+
+        self.running_jobs: Dict[str, asyncio.Task] = {}  # event_id → task
+        self.job_executions: Dict[str, str] = {}  # event_id → execution_id
+        self.lost_jobs: Set[str] = set()  # event_ids cancelled after their lease was reclaimed
+        self._stop_event = asyncio.Event()
+
+        logger.info(
+            f"ExecutionWorker initialized: id={self.worker_id}, "
+            f"concurrency={self.concurrency}, lease={self.lease_seconds}s"
+        )
+
+    async def run(self):
+        """Run poll and heartbeat loops until stop() is called, then drain running jobs."""
+        logger.info(f"👷 Worker {self.worker_id} started")
+        heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+        try:
+            while not self._stop_event.is_set():
+                claimed = await self.poll_once()
+
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+            if self.running_jobs:
+                logger.info(f"Waiting for {len(self.running_jobs)} running job(s) to finish...")
+                await asyncio.gather(*self.running_jobs.values(), return_exceptions=True)
+
+        finally:
+            heartbeat_task.cancel()
+            await asyncio.gather(heartbeat_task, return_exceptions=True)
+            logger.info(f"👷 Worker {self.worker_id} stopped")
+
+    def stop(self):
+        """Stop claiming new jobs (running jobs finish)."""
+        self._stop_event.set()
+
+    async def poll_once(self) -> int:
+        """
+        Claim jobs for free slots and start them.
+
+        Returns:
+            Number of jobs started
+        """
+        free_slots = self.concurrency - len(self.running_jobs)
+        if free_slots <= 0:
+            return 0
+
+        db = self.session_factory()
+        try:
+            events = EventQueueRepository(db).claim(
+                worker_id=self.worker_id,
+                event_types=EXECUTION_EVENT_TYPES,
+                limit=free_slots,
+                lease_seconds=self.lease_seconds,
+            )
+            jobs = [(event.id, event.event_type, dict(event.event_data or {})) for event in events]
+        except Exception as e:
+            logger.error(f"Failed to claim jobs: {e}", exc_info=True)
+            return 0
+        finally:
+            db.close()
+
+        for event_id, event_type, event_data in jobs:
+            self.job_executions[event_id] = event_data.get("execution_id")
+            task = asyncio.create_task(self._run_job(event_id, event_type, event_data))
+            self.running_jobs[event_id] = task
+            task.add_done_callback(lambda _t, eid=event_id: self._forget_job(eid))
+
+        return len(jobs)
+
+    def _forget_job(self, event_id: str):
+        """Remove finished job from tracking."""
+        self.running_jobs.pop(event_id, None)
+        self.job_executions.pop(event_id, None)
+        self.lost_jobs.discard(event_id)
+
+    async def _run_job(self, event_id: str, event_type: str, event_data: Dict[str, Any]):
+        """Run a claimed job and release its lease."""
+        execution_id = event_data.get("execution_id")
+        logger.info(f"▶️ Worker {self.worker_id} running {event_type} for execution {execution_id}")
+
+        error_message = None
+        try:
+            await self._dispatch(event_type, event_data)
+        except asyncio.CancelledError:
+            if event_id not in self.lost_jobs:
+                raise
+            # Another worker owns the job now: leave the execution record and
+            # the queue event to it
+            from app.core.execution.orchestrator import unregister_execution
+
+            unregister_execution(execution_id, event_data.get("workflow_id"))
+            logger.warning(f"Job {event_id} abandoned, execution {execution_id} continues on another worker")
+            return
+        except Exception as e:
+            # The orchestrator already persisted the failure on the execution record;
+            # the job itself ran, so it is not retried.
+            error_message = str(e)
+            logger.error(f"Job {event_id} ({event_type}) failed: {e}", exc_info=True)
+            self._mark_execution_failed(execution_id, error_message)
+
+        db = self.session_factory()
+        try:
+            if not EventQueueRepository(db).complete(event_id, self.worker_id, error_message=error_message):
+                logger.warning(f"Lease for job {event_id} was lost before completion")
+        except Exception as e:
+            logger.error(f"Failed to complete job {event_id}: {e}", exc_info=True)
+        finally:
+            db.close()
+
+    async def _dispatch(self, event_type: str, event_data: Dict[str, Any]):
+        """Hand a job to the orchestrator."""
+        from app.core.execution.orchestrator import WorkflowOrchestrator
+        from app.core.execution.context import ExecutionMode
+
+        db = self.session_factory()
+        try:
+            orchestrator = WorkflowOrchestrator(db)
+
+            if event_type == EVENT_EXECUTE_WORKFLOW and self._was_interrupted(db, event_data["execution_id"]):
+                # Job reclaimed from a crashed worker: continue instead of starting over
+                await orchestrator.resume_execution(event_data["execution_id"])
+
+            elif event_type == EVENT_EXECUTE_WORKFLOW:
+                await orchestrator.execute_workflow(
+                    workflow_id=event_data["workflow_id"],
+                    trigger_data=event_data.get("trigger_data") or {},
+                    execution_source=event_data.get("execution_source", "manual"),
+                    started_by=event_data.get("started_by"),
+                    execution_mode=ExecutionMode(event_data.get("execution_mode") or ExecutionMode.PARALLEL.value),
+                    execution_id=event_data["execution_id"],
+                    frontend_origin=event_data.get("frontend_origin"),
+                )
+
+            elif event_type == EVENT_RETRY_EXECUTION:
+                prepared = orchestrator.load_prepared_retry(event_data["execution_id"])
+                await orchestrator.run_prepared_retry(prepared)
+
+            elif event_type == EVENT_RESUME_EXECUTION:
+                await orchestrator.resume_execution(event_data["execution_id"])
+
+            else:
+                raise ValueError(f"Unsupported job type: {event_type}")
+        finally:
+            db.close()
+
+    def _was_interrupted(self, db: Session, execution_id: str) -> bool:
+        """Check if an execution job already made progress on a worker that died."""
+        if settings.EXECUTION_RECOVERY_POLICY.lower() != "resume":
+            return False
+
+        execution = db.query(Execution).filter(Execution.id == execution_id).first()
+        return bool(
+            execution
+            and execution.status == ExecutionStatus.RUNNING
+            and execution.node_results
+        )
+
+    def _mark_execution_failed(self, execution_id: Optional[str], error_message: str):
+        """Fail an execution record that the orchestrator never reached."""
+        if not execution_id:
+            return
+
+        db = self.session_factory()
+        try:
+            execution = db.query(Execution).filter(Execution.id == execution_id).first()
+            if execution and execution.status in (ExecutionStatus.PENDING, ExecutionStatus.RUNNING):
+                execution.status = ExecutionStatus.FAILED
+                execution.error_message = error_message
+                execution.completed_at = get_local_now()
+                db.commit()
+        except Exception as e:
+            logger.error(f"Failed to mark execution {execution_id} as failed: {e}")
+        finally:
+            db.close()
+
+    async def _heartbeat_loop(self):
+        """Renew leases and cancel executions stopped through the API."""
+        interval = max(self.lease_seconds / 3, 1)
+
+        while True:
+            await asyncio.sleep(interval)
+
+            if not self.running_jobs:
+                continue
+
+            try:
+                await self.heartbeat_once()
+            except Exception as e:
+                logger.error(f"Heartbeat failed: {e}", exc_info=True)
+
+    async def heartbeat_once(self):
+        """Renew leases of running jobs, cancel jobs whose lease was lost and propagate stop requests."""
+        event_ids = list(self.running_jobs.keys())
+        execution_ids = [eid for eid in (self.job_executions.get(e) for e in event_ids) if eid]
+
+        db = self.session_factory()
+        try:
+            repo = EventQueueRepository(db)
+            renewed = repo.heartbeat(self.worker_id, event_ids, self.lease_seconds)
+            lost_ids = repo.lost_leases(self.worker_id, event_ids) if renewed < len(event_ids) else []
+            if lost_ids:
+                logger.warning(f"Renewed {renewed}/{len(event_ids)} leases, some jobs were reclaimed")
+
+            stopped_ids = [
+                row[0] for row in db.query(Execution.id).filter(
+                    Execution.id.in_(execution_ids),
+                    Execution.status == ExecutionStatus.STOPPED
+                ).all()
+            ] if execution_ids else []
+        finally:
+            db.close()
+
+        for event_id in lost_ids:
+            await self._abandon_job(event_id)
+
+        if stopped_ids:
+            from app.core.execution.orchestrator import _active_executions
+
+            for execution_id in stopped_ids:
+                executor = _active_executions.get(execution_id)
+                if executor and not executor.cancel_requested:
+                    logger.info(f"🛑 Execution {execution_id} was stopped via API, cancelling on worker")
+                    await executor.cancel_execution()
+
+    async def _abandon_job(self, event_id: str):
+        """Cancel a running job whose lease another worker reclaimed."""
+        task = self.running_jobs.get(event_id)
+        if task is None or task.done() or event_id in self.lost_jobs:
+            return
+
+        from app.core.execution.orchestrator import _active_executions
+
+        execution_id = self.job_executions.get(event_id)
+        logger.warning(f"⚠️ Lease for job {event_id} was reclaimed, cancelling execution {execution_id} on this worker")
+
+        self.lost_jobs.add(event_id)
+        executor = _active_executions.get(execution_id)
+        if executor:
+            # Drop its checkpoints so they cannot overwrite the new owner's
+            await executor.abandon()
+        task.cancel()
+
+
+def _bootstrap():
+    """Prepare a worker process: tables, settings and node registry."""
+    from app.database.base import Base
+    from app.database.session import engine, SessionLocal
+    from app.core.config.manager import init_settings_manager
+    from app.core.nodes.loader import discover_and_register_nodes
+    from app.core.execution.scheduling import load_duration_history
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        init_settings_manager(db)
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to initialize settings: {e}")
+
+    try:
+        load_duration_history(db)
+    except Exception as e:
+        logger.warning(f"⚠️  Failed to load node duration history: {e}")
+    finally:
+        db.close()
+
+    stats = discover_and_register_nodes()
+    logger.info(f"✅ Worker node registry initialized: {stats['nodes_registered']} nodes")
+
+
+async def _start_pools():
+    """Warm compute workers and start the stall detector, as the API process does."""
+    if settings.COMPUTE_WARM_WORKERS:
+        try:
+            from app.core.execution.compute import get_compute_pool
+            await get_compute_pool().warm()
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to warm compute pool (workers start on first use): {e}")
+
+    if settings.LOOP_STALL_DETECTION:
+        from app.core.execution.blocking import start_stall_detector
+        start_stall_detector()
+
+
+def _shutdown_pools():
+    """Stop compute worker processes and blocking I/O threads."""
+    try:
+        from app.core.execution.compute import shutdown_compute_pool
+        shutdown_compute_pool()
+    except Exception as e:
+        logger.error(f"❌ Error during compute pool shutdown: {e}", exc_info=True)
+
+    try:
+        from app.core.execution.blocking import shutdown_blocking_pool, stop_stall_detector
+        stop_stall_detector()
+        shutdown_blocking_pool()
+    except Exception as e:
+        logger.error(f"❌ Error during blocking pool shutdown: {e}", exc_info=True)
+
+
+async def main():
+    """Worker process entry point."""
+    _bootstrap()
+    await _start_pools()
+
+    worker = ExecutionWorker()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Signal handlers are not available on Windows event loops
+            pass
+
+    try:
+        await worker.run()
+    finally:
+        _shutdown_pools()
+
+
+if __name__ == "__main__":
+    from app.observability.logging import setup_logging
+
+    setup_logging()
+    asyncio.run(main())
@@ -10,6 +10,7 @@ from app.core.nodes.capabilities import (
     LLMCapability,
     AICapability,
     ComputeCapability,
+    CoordinationCapability,
     TriggerCapability,
     ExportCapability,
     get_resource_classes,
@@ -31,6 +32,7 @@ __all__ = [
     "LLMCapability",
     "AICapability",
     "ComputeCapability",
+    "CoordinationCapability",
     "TriggerCapability",
     "get_resource_classes",
     "has_llm_capability",
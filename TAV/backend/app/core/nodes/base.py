@@ -31,7 +31,7 @@ Example:
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, AsyncIterator
 from dataclasses import dataclass
 
 from app.schemas.workflow import NodeConfiguration, NodePort, PortType
@@ -64,6 +64,10 @@ class NodeExecutionInput:
     # Signature: async def node_runner(node_id: str, inputs: Dict[str, Any]) -> Dict[str, Any]
     node_runner: Optional[Callable] = None
     
+    # Callback to run a node once per item with bounded concurrency (for Map nodes)
+    # Signature: async def map_runner(node_id: str, items: Iterable | AsyncIterable, **options) -> Dict[str, Any]
+    map_runner: Optional[Callable] = None
+    
     # Frontend origin URL (auto-detected from request headers)
     # Used by nodes like Email Approval to generate correct review links
     frontend_origin: Optional[str] = None
@@ -335,9 +339,48 @@ class Node(ABC):
                 
                 # Return output ports
                 return {"output": result}
+        
+        Streaming:
+            An output port may return an async iterator instead of a value.
+            Downstream input ports declared with "streaming": True receive
+            the chunks as they are produced; other ports receive a list.
+            Use iter_port() to consume either form.
+
+        Blocking code:
+            Synchronous libraries (smtplib, imaplib, PyMuPDF, sync DB sessions)
+            must not run directly here - they freeze the event loop. Wrap them
+            in a method decorated with @blocking (app.core.execution.blocking),
+            or decorate a fully synchronous execute() itself.
         """
         pass
     
+    async def iter_port(self, input_data: NodeExecutionInput, port_name: str) -> AsyncIterator[Any]:
+        """
+        Iterate over an input port's items.
+        
+        Works for streamed inputs (async iterators) as well as lists and
+        single values, so a node can be written once for both.
+        
+        Args:
+            input_data: Node execution input
+            port_name: Input port name
+        
+        Yields:
+            Port items (nothing if the port is empty)
+        """
+        value = input_data.ports.get(port_name)
+        
+        if value is None:
+            return
+        if hasattr(value, "__aiter__"):
+            async for item in value:
+                yield item
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                yield item
+        else:
+            yield value
+    
     def validate_inputs(self, ports: Dict[str, Any]) -> List[str]:
         """
         Validate that required input ports are present.
@@ -380,12 +423,13 @@ class Node(ABC):
         Used by executor for resource management (rate limiting, concurrency control).
         
         Returns:
-            List of resource class names: ["standard"], ["llm"], ["ai"], or ["llm", "ai"]
+            List of resource class names: ["standard"], ["llm"], ["ai"], ["compute"], or combinations
         
         Examples:
             - Standard node: ["standard"]
             - LLM node: ["llm"]
             - AI compute node: ["ai"]
+            - CPU-bound node (ComputeCapability): ["compute"]
             - LLM + AI node: ["llm", "ai"]
         """
         from app.core.nodes.capabilities import get_resource_classes
@@ -1,11 +1,18 @@
 """Action nodes - perform external actions."""
 
-from app.core.nodes.builtin.actions.search import SearchNode
-from app.core.nodes.builtin.actions.weather import WeatherNode
-from app.core.nodes.builtin.actions.http_request import HTTPRequestNode
-
-__all__ = [
-    "SearchNode",
-    "WeatherNode",
-    "HTTPRequestNode",
-]
+import importlib
+
+# Imported on first access, so loading one node does not import its siblings
+_NODE_MODULES = {
+    "SearchNode": "app.core.nodes.builtin.actions.search",
+    "WeatherNode": "app.core.nodes.builtin.actions.weather",
+    "HTTPRequestNode": "app.core.nodes.builtin.actions.http_request",
+}
+
+__all__ = list(_NODE_MODULES)
+
+
+def __getattr__(name):
+    if name in _NODE_MODULES:
+        return getattr(importlib.import_module(_NODE_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,10 +4,20 @@ AI Nodes
 Nodes that use AI/ML capabilities (LLM, embeddings, classification, etc.)
 """
 
-from app.core.nodes.builtin.ai.llm_chat import LLMChatNode
-from app.core.nodes.builtin.ai.vision_llm import VisionLLMNode
-from app.core.nodes.builtin.ai.agent import AIAgentNode
-from app.core.nodes.builtin.ai.huggingface import HuggingFaceNode
+import importlib
 
-__all__ = ["LLMChatNode", "VisionLLMNode", "AIAgentNode", "HuggingFaceNode"]
+# Imported on first access, so loading one node does not import its siblings
+_NODE_MODULES = {
+    "LLMChatNode": "app.core.nodes.builtin.ai.llm_chat",
+    "VisionLLMNode": "app.core.nodes.builtin.ai.vision_llm",
+    "AIAgentNode": "app.core.nodes.builtin.ai.agent",
+    "HuggingFaceNode": "app.core.nodes.builtin.ai.huggingface",
+}
 
+__all__ = list(_NODE_MODULES)
+
+
+def __getattr__(name):
+    if name in _NODE_MODULES:
+        return getattr(importlib.import_module(_NODE_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,16 +4,20 @@ Communication Nodes
 Nodes for email, webhooks, HTTP requests, and other communication channels.
 """
 
-# Import nodes to trigger registration
-from app.core.nodes.builtin.communication.email_composer import EmailComposerNode
-from app.core.nodes.builtin.communication.email_approval import EmailApprovalNode
-from app.core.nodes.builtin.communication.whatsapp_send import WhatsAppSendNode
-from app.core.nodes.builtin.communication.whatsapp_listener import WhatsAppListenerNode
+import importlib
 
-__all__ = [
-    "EmailComposerNode",
-    "EmailApprovalNode",
-    "WhatsAppSendNode",
-    "WhatsAppListenerNode",
-]
+# Imported on first access, so loading one node does not import its siblings
+_NODE_MODULES = {
+    "EmailComposerNode": "app.core.nodes.builtin.communication.email_composer",
+    "EmailApprovalNode": "app.core.nodes.builtin.communication.email_approval",
+    "WhatsAppSendNode": "app.core.nodes.builtin.communication.whatsapp_send",
+    "WhatsAppListenerNode": "app.core.nodes.builtin.communication.whatsapp_listener",
+}
 
+__all__ = list(_NODE_MODULES)
+
+
+def __getattr__(name):
+    if name in _NODE_MODULES:
+        return getattr(importlib.import_module(_NODE_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
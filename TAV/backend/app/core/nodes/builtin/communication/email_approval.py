@@ -10,6 +10,7 @@ from uuid import uuid4
 from typing import Dict, Any, List, Optional
 from datetime import timedelta
 
+from app.core.execution.blocking import blocking
 from app.core.nodes.base import Node, NodeExecutionInput
 from app.core.nodes.registry import register_node
 from app.schemas.workflow import NodeCategory, PortType
@@ -450,7 +451,8 @@ class EmailApprovalNode(Node):
                 "message": f"Failed to process approval: {e}"
             }
     
-    async def _store_interaction(
+    @blocking
+    def _store_interaction(
         self,
         interaction_id: str,
         token: str,
@@ -7,6 +7,7 @@ from email.utils import parsedate_to_datetime
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Tuple, List
 
+from app.core.execution.blocking import run_blocking
 from app.core.nodes.base import Node, NodeExecutionInput
 from app.core.nodes.registry import register_node
 from app.schemas.workflow import NodeCategory, PortType
@@ -574,7 +575,7 @@ class EmailListenerNode(Node):
         poll_count = 0
 
         async def connect() -> Tuple[imaplib.IMAP4_SSL, str]:
-            c, f = await asyncio.to_thread(self._imap_login_and_select, input_data)
+            c, f = await run_blocking(self._imap_login_and_select, input_data)
             return c, f
 
         async def reconnect(reason: str) -> None:
@@ -582,7 +583,7 @@ class EmailListenerNode(Node):
             self._log(logging.WARNING, f"[EmailListener] Reconnecting IMAP (reason: {reason})")
             try:
                 if client is not None:
-                    await asyncio.to_thread(client.logout)
+                    await run_blocking(client.logout)
             except Exception:
                 pass
             client = None
@@ -603,7 +604,7 @@ class EmailListenerNode(Node):
 
                 if noop_every > 0 and (poll_count % noop_every == 0):
                     try:
-                        await asyncio.to_thread(self._imap_noop, client)
+                        await run_blocking(self._imap_noop, client)
                     except Exception as e:
                         if reconnect_on_error:
                             await reconnect(f"NOOP failed: {e}")
@@ -611,7 +612,7 @@ class EmailListenerNode(Node):
                             raise
 
                 try:
-                    msg_ids = await asyncio.to_thread(self._imap_search, client, activation_time)
+                    msg_ids = await run_blocking(self._imap_search, client, activation_time)
                 except Exception as e:
                     self._log(logging.ERROR, f"[EmailListener] IMAP search failed on poll #{poll_count}: {e}")
                     if reconnect_on_error:
@@ -629,7 +630,7 @@ class EmailListenerNode(Node):
 
                 for msg_id in msg_ids_iter:
                     try:
-                        msg = await asyncio.to_thread(self._imap_fetch_message, client, msg_id)
+                        msg = await run_blocking(self._imap_fetch_message, client, msg_id)
                     except Exception:
                         continue
 
@@ -686,7 +687,7 @@ class EmailListenerNode(Node):
 
                     if mark_as_read:
                         try:
-                            await asyncio.to_thread(self._imap_mark_seen, client, msg_id)
+                            await run_blocking(self._imap_mark_seen, client, msg_id)
                         except Exception as e:
                             self._log(logging.WARNING, f"[EmailListener] Failed to mark as read msg_id={msg_id!r}: {e}")
 
@@ -703,6 +704,6 @@ class EmailListenerNode(Node):
         finally:
             if client is not None:
                 try:
-                    await asyncio.to_thread(client.logout)
+                    await run_blocking(client.logout)
                 except Exception:
                     pass
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Parallel Map Node
+
+Runs an attached node once per item of a list, several items at a time,
+and collects the results in item order.
+
+Perfect for:
+- Processing every row from a CSV Reader
+- Handling each email from a polling trigger
+- Any "for each item, do X" batch work
+"""
+
+from typing import Any, Dict, List
+import logging
+
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.capabilities import CoordinationCapability
+from app.core.nodes.registry import register_node
+from app.schemas.workflow import PortType, NodeCategory
+
+logger = logging.getLogger(__name__)
+
+
+@register_node(
+    node_type="parallel_map",
+    category=NodeCategory.WORKFLOW,
+    name="Parallel Map",
+    description="Run a node for each item of a list, in parallel",
+    icon="fa-solid fa-layer-group"
+)
+class ParallelMapNode(Node, CoordinationCapability):
+    """
+    Parallel Map - for-each over a list with bounded concurrency.
+
+    Think of it like:
+    ```python
+    results = await gather(*(node(item) for item in items), limit=concurrency)
+    ```
+
+    Attach the per-item node to the "Per-Item Node" port (like an Agent
+    tool). It receives each item on its input port, and can also use
+    {{map_item}} / {{map_index}} in its config.
+
+    Items can be a list or a stream (e.g. CSV Reader with Stream Rows):
+    streamed items start processing as soon as they are read.
+
+    Each item run uses the attached node's own resource pool
+    (standard/llm/ai), so LLM nodes stay within the LLM concurrency limit.
+    """
+
+    @classmethod
+    def get_input_ports(cls) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": "items",
+                "type": PortType.UNIVERSAL,
+                "display_name": "Items",
+                "description": "List of items to process",
+                "required": True,
+                "streaming": True
+            },
+            {
+                "name": "tools",
+                "type": PortType.TOOLS,
+                "display_name": "Per-Item Node",
+                "description": "Node to run for each item",
+                "required": True
+            },
+        ]
+
+    @classmethod
+    def get_output_ports(cls) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": "results",
+                "type": PortType.UNIVERSAL,
+                "display_name": "Results",
+                "description": "Per-item results, in item order"
+            },
+            {
+                "name": "errors",
+                "type": PortType.UNIVERSAL,
+                "display_name": "Errors",
+                "description": "Failed items: [{index, error}]"
+            },
+            {
+                "name": "count",
+                "type": PortType.UNIVERSAL,
+                "display_name": "Item Count",
+                "description": "Number of items processed"
+            },
+        ]
+
+    @classmethod
+    def get_config_schema(cls) -> Dict[str, Any]:
+        return {
+            "item_port": {
+                "type": "string",
+                "label": "Item Input Port",
+                "description": "Input port of the per-item node that receives the item",
+                "required": False,
+                "default": "input",
+                "widget": "text"
+            },
+            "concurrency": {
+                "type": "integer",
+                "label": "Concurrency",
+                "description": "Maximum items processed at the same time",
+                "required": False,
+                "default": 4,
+                "widget": "number",
+                "min": 1,
+                "max": 100,
+                "help": "Also limited by the node's resource pool (e.g. AI concurrent limit for LLM nodes)"
+            },
+            "error_policy": {
+                "type": "select",
+                "label": "On Item Error",
+                "description": "What to do when an item fails",
+                "required": False,
+                "default": "fail",
+                "widget": "select",
+                "options": [
+                    {"label": "Fail the node", "value": "fail"},
+                    {"label": "Skip the item", "value": "skip"},
+                    {"label": "Keep going (null result)", "value": "collect"}
+                ]
+            },
+            "item_retries": {
+                "type": "integer",
+                "label": "Retries per Item",
+                "description": "Extra attempts before an item counts as failed",
+                "required": False,
+                "default": 0,
+                "widget": "number",
+                "min": 0,
+                "max": 5
+            },
+            "output_port": {
+                "type": "string",
+                "label": "Result Port (Optional)",
+                "description": "Collect only this output port of the per-item node",
+                "required": False,
+                "placeholder": "output",
+                "widget": "text",
+                "help": "Leave empty to collect all outputs of each run"
+            }
+        }
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        tools = input_data.ports.get("tools") or []
+        if not tools:
+            raise ValueError("Parallel Map needs a node attached to its Per-Item Node port")
+        if len(tools) > 1:
+            raise ValueError("Parallel Map supports exactly one per-item node")
+        if not input_data.map_runner:
+            raise RuntimeError("Parallel Map requires an executor with map support")
+
+        items = input_data.ports.get("items")
+        if items is None:
+            items = []
+        elif not isinstance(items, list) and not hasattr(items, "__aiter__"):
+            items = [items]
+
+        output_port = (self.resolve_config(input_data, "output_port", "") or "").strip()
+
+        summary = await input_data.map_runner(
+            tools[0].node_id,
+            items,
+            item_port=self.resolve_config(input_data, "item_port", "input") or "input",
+            concurrency=int(self.resolve_config(input_data, "concurrency", 4) or 4),
+            error_policy=self.resolve_config(input_data, "error_policy", "fail") or "fail",
+            item_retries=int(self.resolve_config(input_data, "item_retries", 0) or 0),
+        )
+
+        results = summary["results"]
+        if output_port:
+            results = [r.get(output_port) if isinstance(r, dict) else r for r in results]
+
+        return {
+            "results": results,
+            "errors": summary["errors"],
+            "count": summary["count"],
+        }
+
+
+if __name__ == "__main__":
+    print("Parallel Map Node - run a node for each item of a list")
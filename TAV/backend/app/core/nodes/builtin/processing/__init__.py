@@ -1,21 +1,23 @@
 """processing nodes."""
 
-from .audio_transcriber import AudioTranscriberNode
-from .document_loader import DocumentLoaderNode
-from .image_loader import ImageLoaderNode
-from .file_converter import FileConverterNode
-from .document_merger import DocumentMergerNode
-from .csv_reader import CSVReaderNode
-from .excel_reader import ExcelReaderNode
-from .file_listener import FileListenerNode
+import importlib
 
-__all__ = [
-    "AudioTranscriberNode",
-    "DocumentLoaderNode",
-    "ImageLoaderNode",
-    "FileConverterNode",
-    "DocumentMergerNode",
-    "CSVReaderNode",
-    "ExcelReaderNode",
-    "FileListenerNode",
-]
\ No newline at end of file
+# Imported on first access, so loading one node does not import its siblings
+_NODE_MODULES = {
+    "AudioTranscriberNode": "app.core.nodes.builtin.processing.audio_transcriber",
+    "DocumentLoaderNode": "app.core.nodes.builtin.processing.document_loader",
+    "ImageLoaderNode": "app.core.nodes.builtin.processing.image_loader",
+    "FileConverterNode": "app.core.nodes.builtin.processing.file_converter",
+    "DocumentMergerNode": "app.core.nodes.builtin.processing.document_merger",
+    "CSVReaderNode": "app.core.nodes.builtin.processing.csv_reader",
+    "ExcelReaderNode": "app.core.nodes.builtin.processing.excel_reader",
+    "FileListenerNode": "app.core.nodes.builtin.processing.file_listener",
+}
+
+__all__ = list(_NODE_MODULES)
+
+
+def __getattr__(name):
+    if name in _NODE_MODULES:
+        return getattr(importlib.import_module(_NODE_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,9 +4,10 @@ CSV Reader Node - Read and parse CSV files into structured data
 Converts CSV files into array of dictionaries for easy data extraction.
 """
 
+import asyncio
 import csv
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, AsyncIterator, Optional
 from pathlib import Path
 
 from app.core.nodes.base import Node, NodeExecutionInput
@@ -38,6 +39,7 @@ class CSVReaderNode(Node, PasswordProtectedFileCapability):
     - Skip rows option
     - Column filtering
     - Type preservation
+    - Optional row streaming (downstream nodes start on the first rows)
     
     Example Output:
     [
@@ -73,7 +75,8 @@ class CSVReaderNode(Node, PasswordProtectedFileCapability):
                 "name": "data",
                 "type": PortType.UNIVERSAL,
                 "display_name": "Parsed Data",
-                "description": "Array of objects (one per CSV row)"
+                "description": "Array of objects (one per CSV row)",
+                "streaming": True
             },
             {
                 "name": "headers",
@@ -147,6 +150,15 @@ class CSVReaderNode(Node, PasswordProtectedFileCapability):
                     {"label": "ASCII", "value": "ascii"}
                 ],
                 "help": "Choose encoding based on file source. UTF-8 is most common."
+            },
+            "stream_rows": {
+                "type": "boolean",
+                "label": "Stream Rows",
+                "description": "Pass rows downstream while the file is being read",
+                "required": False,
+                "default": False,
+                "widget": "checkbox",
+                "help": "For large files. Row count is not known up front, so metadata.row_count is empty."
             }
         }
     
@@ -209,6 +221,9 @@ class CSVReaderNode(Node, PasswordProtectedFileCapability):
             if delimiter == "\\t":
                 delimiter = "\t"
             
+            if self.resolve_config(inputs, "stream_rows", False):
+                return self._stream_csv(file_path, delimiter, has_header, skip_rows, columns_filter, encoding)
+            
             # Read CSV file
             data_rows = []
             headers = []
@@ -288,6 +303,79 @@ class CSVReaderNode(Node, PasswordProtectedFileCapability):
         except Exception as e:
             logger.error(f"❌ CSV Reader failed: {e}", exc_info=True)
             raise
+    
+    def _stream_csv(
+        self,
+        file_path: Path,
+        delimiter: str,
+        has_header: bool,
+        skip_rows: int,
+        columns_filter: Optional[List[str]],
+        encoding: str
+    ) -> Dict[str, Any]:
+        """Read headers now and return the rows as an async iterator."""
+        with open(file_path, 'r', encoding=encoding, newline='') as csvfile:
+            for _ in range(skip_rows):
+                next(csvfile, None)
+            first_row = next(csv.reader(csvfile, delimiter=delimiter), [])
+        
+        headers = first_row if has_header else [f"col_{i}" for i in range(len(first_row))]
+        filtered_headers = [h for h in headers if h in columns_filter] if columns_filter else headers
+        
+        logger.info(f"🌊 Streaming CSV rows from {file_path} (columns: {filtered_headers})")
+        
+        return {
+            "data": self._iter_rows(file_path, delimiter, has_header, skip_rows, headers, columns_filter, encoding),
+            "headers": filtered_headers,
+            "metadata": {
+                "row_count": None,
+                "column_count": len(filtered_headers),
+                "columns": filtered_headers,
+                "file_name": file_path.name,
+                "file_path": str(file_path),
+                "delimiter": delimiter,
+                "encoding": encoding,
+                "streamed": True
+            }
+        }
+    
+    async def _iter_rows(
+        self,
+        file_path: Path,
+        delimiter: str,
+        has_header: bool,
+        skip_rows: int,
+        headers: List[str],
+        columns_filter: Optional[List[str]],
+        encoding: str,
+        batch_size: int = 500
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield row dicts, giving the event loop a turn every batch_size rows."""
+        row_count = 0
+        
+        with open(file_path, 'r', encoding=encoding, newline='') as csvfile:
+            for _ in range(skip_rows):
+                next(csvfile, None)
+            
+            reader = csv.reader(csvfile, delimiter=delimiter)
+            if has_header:
+                next(reader, None)
+            
+            for row in reader:
+                if len(row) == 0:
+                    continue  # Skip empty rows
+                
+                row_dict = dict(zip(headers, row))
+                if columns_filter:
+                    row_dict = {k: v for k, v in row_dict.items() if k in columns_filter}
+                
+                yield row_dict
+                row_count += 1
+                
+                if row_count % batch_size == 0:
+                    await asyncio.sleep(0)
+        
+        logger.info(f"✅ CSV stream finished: {row_count} rows from {file_path.name}")
 
 
 if __name__ == "__main__":
@@ -11,6 +11,7 @@ from pathlib import Path
 from datetime import datetime
 import io
 
+from app.core.execution.blocking import blocking
 from app.core.nodes.base import Node, NodeExecutionInput
 from app.core.nodes.registry import register_node
 from app.schemas.workflow import NodeCategory, PortType
@@ -272,7 +273,7 @@ class DocumentMergerNode(Node):
                 if file_path_obj.suffix.lower() == ".pdf":
                     # Already PDF, add to list
                     pdf_files.append(str(file_path_obj))
-                    page_count = self._count_pdf_pages(str(file_path_obj))
+                    page_count = await self._count_pdf_pages(str(file_path_obj))
                     total_pages += page_count
                     logger.info(f"  📄 PDF: {page_count} page(s)")
                 
@@ -376,6 +377,7 @@ class DocumentMergerNode(Node):
         
         return None
     
+    @blocking
     def _count_pdf_pages(self, pdf_path: str) -> int:
         """Count pages in PDF"""
         try:
@@ -388,7 +390,8 @@ class DocumentMergerNode(Node):
             logger.warning(f"Could not count PDF pages: {e}")
             return 1
     
-    async def _image_to_pdf(
+    @blocking
+    def _image_to_pdf(
         self,
         image_path: str,
         image_quality: str = "high",
@@ -437,7 +440,8 @@ class DocumentMergerNode(Node):
             logger.error(f"Failed to convert image to PDF: {e}", exc_info=True)
             return None
     
-    async def _merge_pdfs(
+    @blocking
+    def _merge_pdfs(
         self,
         pdf_files: List[str],
         output_filename: str,
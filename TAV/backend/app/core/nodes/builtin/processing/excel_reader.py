@@ -5,11 +5,11 @@ Converts Excel files (XLSX, XLS) into array of dictionaries for easy data extrac
 """
 
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from app.core.nodes.base import Node, NodeExecutionInput
-from app.core.nodes.capabilities import PasswordProtectedFileCapability
+from app.core.nodes.capabilities import PasswordProtectedFileCapability, ComputeCapability
 from app.core.nodes.registry import register_node
 from app.schemas.workflow import NodeCategory, PortType
 
@@ -24,7 +24,7 @@ logger = logging.getLogger(__name__)
     icon="fa-solid fa-file-excel",
     version="1.0.0"
 )
-class ExcelReaderNode(Node, PasswordProtectedFileCapability):
+class ExcelReaderNode(Node, PasswordProtectedFileCapability, ComputeCapability):
     """
     Excel Reader Node - Parse Excel files into structured data
     
@@ -136,8 +136,6 @@ class ExcelReaderNode(Node, PasswordProtectedFileCapability):
     async def execute(self, inputs: NodeExecutionInput) -> Dict[str, Any]:
         """Execute Excel reader node."""
         try:
-            import pandas as pd
-            
             file_ref = inputs.ports.get("file")
             
             logger.info(f"📊 Excel Reader received file: {type(file_ref)}")
@@ -218,38 +216,12 @@ class ExcelReaderNode(Node, PasswordProtectedFileCapability):
             else:
                 read_kwargs["sheet_name"] = 0  # First sheet
             
-            # Read the Excel file
-            df = pd.read_excel(actual_file_path, **read_kwargs)
-            
-            # Get sheet names for metadata
-            with pd.ExcelFile(actual_file_path) as xls:
-                all_sheets = xls.sheet_names
-            
-            # Generate column names if no header
-            if not has_header:
-                df.columns = [f"col_{i}" for i in range(len(df.columns))]
-            
-            headers = list(df.columns)
+            # Parse in a compute worker process (pandas is CPU-bound)
+            data_rows, headers, all_sheets = await self.run_in_process(
+                _read_excel, str(actual_file_path), read_kwargs, has_header, columns_filter
+            )
             logger.info(f"📋 Excel Headers: {headers}")
             
-            # Apply column filter
-            if columns_filter:
-                # Validate columns exist
-                invalid_cols = [col for col in columns_filter if col not in headers]
-                if invalid_cols:
-                    logger.warning(f"⚠️ Columns not found in Excel: {invalid_cols}")
-                
-                # Filter columns
-                valid_cols = [col for col in columns_filter if col in headers]
-                if valid_cols:
-                    df = df[valid_cols]
-                    headers = valid_cols
-            
-            # Convert to list of dictionaries
-            # Handle NaN values by converting to None or empty string
-            df = df.fillna("")
-            data_rows = df.to_dict(orient="records")
-            
             # Build metadata
             metadata = {
                 "row_count": len(data_rows),
@@ -281,6 +253,54 @@ class ExcelReaderNode(Node, PasswordProtectedFileCapability):
             raise
 
 
+def _read_excel(
+    file_path: str,
+    read_kwargs: Dict[str, Any],
+    has_header: bool,
+    columns_filter: Optional[List[str]]
+) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Read an Excel sheet into row dicts (runs in a compute worker process).
+    
+    Returns:
+        (data rows, headers, all sheet names)
+    """
+    import pandas as pd
+    
+    # Read the Excel file
+    df = pd.read_excel(file_path, **read_kwargs)
+    
+    # Get sheet names for metadata
+    with pd.ExcelFile(file_path) as xls:
+        all_sheets = xls.sheet_names
+    
+    # Generate column names if no header
+    if not has_header:
+        df.columns = [f"col_{i}" for i in range(len(df.columns))]
+    
+    headers = list(df.columns)
+    
+    # Apply column filter
+    if columns_filter:
+        # Validate columns exist
+        invalid_cols = [col for col in columns_filter if col not in headers]
+        if invalid_cols:
+            logger.warning(f"⚠️ Columns not found in Excel: {invalid_cols}")
+        
+        # Filter columns
+        valid_cols = [col for col in columns_filter if col in headers]
+        if valid_cols:
+            df = df[valid_cols]
+            headers = valid_cols
+    
+    # Convert to list of dictionaries
+    # Handle NaN values by converting to None or empty string
+    df = df.fillna("")
+    data_rows = df.to_dict(orient="records")
+    
+    return data_rows, headers, list(all_sheets)
+
+
 if __name__ == "__main__":
     print("Excel Reader Node - Parse Excel files into structured data")
 
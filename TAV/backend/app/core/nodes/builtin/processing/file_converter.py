@@ -9,13 +9,13 @@ Uses MediaFormat for standardized output.
 import logging
 import os
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 import fitz  # PyMuPDF
 
 from app.core.nodes.base import Node, NodeExecutionInput
 from app.core.nodes.registry import register_node
-from app.core.nodes.capabilities import PasswordProtectedFileCapability
+from app.core.nodes.capabilities import PasswordProtectedFileCapability, ComputeCapability
 from app.core.nodes.multimodal import ImageFormatter, MediaFormat
 from app.schemas.workflow import NodeCategory, PortType
 from app.config import settings
@@ -31,7 +31,7 @@ logger = logging.getLogger(__name__)
     icon="fa-solid fa-file-export",
     version="1.0.0"
 )
-class FileConverterNode(Node, PasswordProtectedFileCapability):
+class FileConverterNode(Node, PasswordProtectedFileCapability, ComputeCapability):
     """
     File Converter Node - Converts files between different formats.
     
@@ -231,6 +231,8 @@ class FileConverterNode(Node, PasswordProtectedFileCapability):
         """
         Convert PDF to images using PyMuPDF.
         
+        Rendering is CPU-bound and runs in a compute worker process.
+        
         Args:
             pdf_path: Path to PDF file
             dpi: Resolution in dots per inch
@@ -245,73 +247,19 @@ class FileConverterNode(Node, PasswordProtectedFileCapability):
         temp_dir = Path("data") / "temp"
         temp_dir.mkdir(parents=True, exist_ok=True)
         
-        # Open PDF with password support
-        doc = self.open_pdf_with_password(pdf_path, password)
-        total_pages = len(doc)
-        
-        logger.info(f"📄 PDF opened: {total_pages} pages")
-        
-        # Parse page selection
-        if extract_pages == "all" or not extract_pages:
-            page_numbers = list(range(total_pages))
-        else:
-            page_numbers = self._parse_page_selection(extract_pages, total_pages)
+        total_pages, pages = await self.run_in_process(
+            _render_pdf_pages, pdf_path, dpi, image_format, extract_pages, password, str(temp_dir)
+        )
         
-        logger.info(f"📑 Extracting {len(page_numbers)} pages: {page_numbers}")
-        
-        # Convert pages to images
-        output_files = []
-        zoom = dpi / 72  # Convert DPI to zoom factor (72 is default PDF DPI)
-        matrix = fitz.Matrix(zoom, zoom)
-        
-        for page_idx in page_numbers:
-            try:
-                page = doc.load_page(page_idx)
-                
-                # Render page to pixmap (image)
-                pix = page.get_pixmap(matrix=matrix, alpha=False)
-                
-                # Generate unique filename
-                file_id = str(uuid.uuid4())
-                ext = "png" if image_format == "png" else "jpg"
-                filename = f"{file_id}_page_{page_idx + 1}.{ext}"
-                output_path = temp_dir / filename
-                
-                # Save image
-                if image_format == "png":
-                    pix.save(output_path)
-                else:
-                    # Convert to RGB for JPEG (PyMuPDF default is RGBA)
-                    if pix.alpha:
-                        pix = fitz.Pixmap(fitz.csRGB, pix)
-                    pix.save(output_path, "jpeg")
-                
-                # Use ImageFormatter to create standardized MediaFormat
-                image_metadata = {
-                    "file_id": file_id,
-                    "filename": filename,
-                    "page_number": page_idx + 1,
-                    "width": pix.width,
-                    "height": pix.height,
-                    "source_page": page_idx + 1,
-                    "source_pdf": os.path.basename(pdf_path)
-                }
-                
-                image_media = ImageFormatter.from_file_path(
-                    file_path=str(output_path),
-                    format=image_format,
-                    metadata=image_metadata
-                )
-                
-                output_files.append(image_media)
-                
-                logger.info(f"✅ Page {page_idx + 1} converted: {filename} (MediaFormat)")
-                
-            except Exception as e:
-                logger.error(f"❌ Error converting page {page_idx + 1}: {e}")
-                continue
-        
-        doc.close()
+        # Use ImageFormatter to create standardized MediaFormat
+        output_files = [
+            ImageFormatter.from_file_path(
+                file_path=page.pop("output_path"),
+                format=image_format,
+                metadata=page
+            )
+            for page in pages
+        ]
         
         # Build metadata
         metadata = {
@@ -327,7 +275,8 @@ class FileConverterNode(Node, PasswordProtectedFileCapability):
             "metadata": metadata
         }
     
-    def _parse_page_selection(self, selection: str, total_pages: int) -> List[int]:
+    @staticmethod
+    def _parse_page_selection(selection: str, total_pages: int) -> List[int]:
         """
         Parse page selection string.
         
@@ -366,3 +315,81 @@ class FileConverterNode(Node, PasswordProtectedFileCapability):
         
         return sorted(list(page_numbers))
 
+
+
+def _render_pdf_pages(
+    pdf_path: str,
+    dpi: int,
+    image_format: str,
+    extract_pages: str,
+    password: Optional[str],
+    temp_dir: str
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Render PDF pages to image files (runs in a compute worker process).
+    
+    Returns:
+        (total pages, [{"output_path", "file_id", "filename", "page_number", ...}])
+    """
+    # Open PDF with password support
+    doc = PasswordProtectedFileCapability.open_pdf_with_password(pdf_path, password)
+    total_pages = len(doc)
+    
+    logger.info(f"📄 PDF opened: {total_pages} pages")
+    
+    # Parse page selection
+    if extract_pages == "all" or not extract_pages:
+        page_numbers = list(range(total_pages))
+    else:
+        page_numbers = FileConverterNode._parse_page_selection(extract_pages, total_pages)
+    
+    logger.info(f"📑 Extracting {len(page_numbers)} pages: {page_numbers}")
+    
+    # Convert pages to images
+    pages = []
+    zoom = dpi / 72  # Convert DPI to zoom factor (72 is default PDF DPI)
+    matrix = fitz.Matrix(zoom, zoom)
+    
+    try:
+        for page_idx in page_numbers:
+            try:
+                page = doc.load_page(page_idx)
+                
+                # Render page to pixmap (image)
+                pix = page.get_pixmap(matrix=matrix, alpha=False)
+                
+                # Generate unique filename
+                file_id = str(uuid.uuid4())
+                ext = "png" if image_format == "png" else "jpg"
+                filename = f"{file_id}_page_{page_idx + 1}.{ext}"
+                output_path = Path(temp_dir) / filename
+                
+                # Save image
+                if image_format == "png":
+                    pix.save(output_path)
+                else:
+                    # Convert to RGB for JPEG (PyMuPDF default is RGBA)
+                    if pix.alpha:
+                        pix = fitz.Pixmap(fitz.csRGB, pix)
+                    pix.save(output_path, "jpeg")
+                
+                pages.append({
+                    "output_path": str(output_path),
+                    "file_id": file_id,
+                    "filename": filename,
+                    "page_number": page_idx + 1,
+                    "width": pix.width,
+                    "height": pix.height,
+                    "source_page": page_idx + 1,
+                    "source_pdf": os.path.basename(pdf_path)
+                })
+                
+                logger.info(f"✅ Page {page_idx + 1} converted: {filename}")
+                
+            except Exception as e:
+                logger.error(f"❌ Error converting page {page_idx + 1}: {e}")
+                continue
+    finally:
+        doc.close()
+    
+    return total_pages, pages
@@ -1,21 +1,21 @@
 """
-File Listener Node - Poll folder for files and pause workflow
+File Listener Node - Watch folder for files and pause workflow
 
-Polls a directory for files matching a pattern, blocks workflow execution
-until a file is found. Similar to WhatsApp Listener but for files.
+Watches a directory for files matching a pattern (inotify on Linux, polling
+elsewhere), blocks workflow execution until a file is found. Similar to
+WhatsApp Listener but for files.
 """
 
 import asyncio
 import logging
 from pathlib import Path
-from typing import Dict, Any, List, Set
+from typing import Dict, Any, List
 from datetime import datetime
-import hashlib
 
 from app.core.nodes.base import Node, NodeExecutionInput
 from app.core.nodes.registry import register_node
 from app.schemas.workflow import NodeCategory, PortType
-from app.utils.timezone import get_local_now
+from app.utils.file_watcher import FolderWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -24,24 +24,25 @@ logger = logging.getLogger(__name__)
     node_type="file_listener",
     category=NodeCategory.PROCESSING,
     name="File Listener",
-    description="Wait for file to appear in folder (polling mode). Pauses workflow until file found.",
+    description="Wait for file to appear in folder. Pauses workflow until file found.",
     icon="fa-solid fa-file",
     version="1.0.0"
 )
 class FileListenerNode(Node):
     """
-    File Listener Node - Wait for File in Folder (Polling)
+    File Listener Node - Wait for File in Folder
     
     **How It Works:**
-    1. Node executes and starts polling folder
+    1. Node executes and starts watching folder
     2. Workflow PAUSES (blocks execution)
-    3. Polls every X seconds for files matching pattern
+    3. Waits for a matching file to appear and finish copying
+       (inotify on Linux, polls every X seconds otherwise)
     4. When file found:
        - Returns file reference
        - Resumes workflow with file data
     
     **Features:**
-    - Configurable polling interval (1-60 seconds)
+    - inotify watching on Linux, configurable polling interval elsewhere
     - Timeout support (max wait time)
     - File pattern matching (*.pdf, *.csv, etc.)
     - Network share support with credentials
@@ -158,7 +159,31 @@ class FileListenerNode(Node):
                 "widget": "number",
                 "min": 1,
                 "max": 3600,
-                "help": "Checks folder every N seconds. 5-10s recommended for near-realtime."
+                "help": "Checks folder every N seconds when polling (network shares, non-Linux hosts, or Watch Mode = Polling). 5-10s recommended for near-realtime."
+            },
+            "watch_mode": {
+                "type": "select",
+                "widget": "select",
+                "label": "Watch Mode",
+                "description": "How new files are detected",
+                "required": False,
+                "default": "auto",
+                "options": [
+                    {"label": "Auto (file system events, polling fallback)", "value": "auto"},
+                    {"label": "Polling only", "value": "polling"}
+                ],
+                "help": "Auto uses inotify on Linux for instant detection and falls back to polling for network shares and other platforms"
+            },
+            "settle_seconds": {
+                "type": "float",
+                "widget": "number",
+                "label": "Settle Time (seconds)",
+                "description": "Wait until a file's size and modified time stop changing for this long",
+                "required": False,
+                "default": 1,
+                "min": 0,
+                "max": 600,
+                "help": "Prevents returning files that are still being copied"
             },
             "timeout_seconds": {
                 "type": "integer",
@@ -250,6 +275,8 @@ class FileListenerNode(Node):
         credential_id = self.config.get("network_credential")
         move_processed_files = self.resolve_config(input_data, "move_processed_files", False)
         processed_folder_suffix = self.resolve_config(input_data, "processed_folder_suffix", "_processed")
+        watch_mode = self.resolve_config(input_data, "watch_mode", "auto")
+        settle_seconds = self.resolve_config(input_data, "settle_seconds", 1)
         
         if not watch_folder:
             error_msg = "Watch folder is required"
@@ -380,114 +407,76 @@ class FileListenerNode(Node):
             f"  Ignore Existing: {ignore_existing}"
         )
         
-        # Track existing files if ignore_existing=True
-        existing_files = set()
-        if ignore_existing:
-            try:
-                initial_files = self._scan_folder(watch_path, file_pattern, recursive)
-                for file_path in initial_files:
-                    file_hash = self._get_file_hash(file_path)
-                    existing_files.add(file_hash)
-                logger.info(f"📂 Initial scan: {len(initial_files)} existing files will be ignored")
-            except Exception as e:
-                logger.warning(f"⚠️  Could not scan for existing files: {e}")
-        
-        # Start polling loop
+        # Watch for stable files (inotify on Linux, polling elsewhere)
+        watcher = FolderWatcher(
+            watch_path,
+            pattern=file_pattern,
+            recursive=recursive,
+            poll_interval=polling_interval,
+            settle_seconds=settle_seconds,
+            use_inotify=watch_mode != "polling",
+        )
         start_time = datetime.now()
-        file_found = None
-        elapsed = 0
-        loop_count = 0
-        
-        while True:
-            # Check timeout
+        try:
+            await watcher.start(include_existing=not ignore_existing)
+            file_found = await asyncio.wait_for(
+                self._wait_for_file(watcher),
+                timeout=timeout_seconds if timeout_seconds > 0 else None
+            )
+        except asyncio.TimeoutError:
             elapsed = (datetime.now() - start_time).total_seconds()
-            if timeout_seconds > 0 and elapsed >= timeout_seconds:
-                error_msg = f"Timeout after {elapsed:.1f}s - no file found matching pattern '{file_pattern}'"
-                logger.error(f"⏱️ {error_msg}")
-                return {
-                    "file": None,
-                    "file_name": "",
-                    "file_path": "",
-                    "error": error_msg,
-                    "timeout": True,
-                    "elapsed_seconds": elapsed
-                }
-            
-            # Poll for files
-            loop_count += 1
-            logger.debug(f"🔍 Polling for files... (loop #{loop_count}, elapsed: {elapsed:.1f}s)")
-            
+            error_msg = f"Timeout after {elapsed:.1f}s - no file found matching pattern '{file_pattern}'"
+            logger.error(f"⏱️ {error_msg}")
+            return {
+                "file": None,
+                "file_name": "",
+                "file_path": "",
+                "error": error_msg,
+                "timeout": True,
+                "elapsed_seconds": elapsed
+            }
+        finally:
+            watcher.close()
+        
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(
+            f"✅ File found: {file_found.name}\n"
+            f"  Path: {file_found}\n"
+            f"  Wait time: {elapsed:.1f}s"
+        )
+        
+        # Move file to processed folder if enabled (before delete_after_read check)
+        if move_processed_files:
+            file_found = self._move_file_to_processed(
+                file_found, 
+                watch_path, 
+                processed_folder_suffix
+            )
+        
+        # Build file reference (with potentially new path)
+        file_ref = self._build_file_reference(file_found)
+        
+        # Delete file if requested (note: this happens after move if both enabled)
+        if delete_after_read:
             try:
-                files = self._scan_folder(watch_path, file_pattern, recursive)
-                logger.debug(f"   Found {len(files)} file(s) matching pattern '{file_pattern}'")
-                
-                # Filter out existing files if ignore_existing=True
-                if ignore_existing and files:
-                    new_files = []
-                    for file_path in files:
-                        file_hash = self._get_file_hash(file_path)
-                        if file_hash not in existing_files:
-                            new_files.append(file_path)
-                    files = new_files
-                    if files:
-                        logger.debug(f"   {len(files)} NEW file(s) after filtering existing")
-                
-                if files:
-                    # Found file(s)!
-                    file_found = files[0]  # Get first match
-                    logger.info(
-                        f"✅ File found: {file_found.name}\n"
-                        f"  Path: {file_found}\n"
-                        f"  Wait time: {elapsed:.1f}s"
-                    )
-                    
-                    # Move file to processed folder if enabled (before delete_after_read check)
-                    if move_processed_files:
-                        file_found = self._move_file_to_processed(
-                            file_found, 
-                            watch_path, 
-                            processed_folder_suffix
-                        )
-                    
-                    # Build file reference (with potentially new path)
-                    file_ref = self._build_file_reference(file_found)
-                    
-                    # Delete file if requested (note: this happens after move if both enabled)
-                    if delete_after_read:
-                        try:
-                            file_found.unlink()
-                            logger.info(f"🗑️  Deleted file after processing: {file_found.name}")
-                        except Exception as e:
-                            logger.warning(f"⚠️  Could not delete file: {e}")
-                    
-                    return {
-                        "file": file_ref,
-                        "file_name": file_found.name,
-                        "file_path": str(file_found.absolute()),
-                        "elapsed_seconds": elapsed
-                    }
-                
+                file_found.unlink()
+                logger.info(f"🗑️  Deleted file after processing: {file_found.name}")
             except Exception as e:
-                logger.error(f"❌ Error scanning folder: {e}", exc_info=True)
-                # Continue polling even if one scan fails
-            
-            # Not found - wait and try again
-            logger.debug(f"   No files found, waiting {polling_interval}s...")
-            await asyncio.sleep(polling_interval)
+                logger.warning(f"⚠️  Could not delete file: {e}")
+        
+        return {
+            "file": file_ref,
+            "file_name": file_found.name,
+            "file_path": str(file_found.absolute()),
+            "elapsed_seconds": elapsed
+        }
     
-    def _get_file_hash(self, file_path: Path) -> str:
-        """
-        Get unique identifier for file.
-        Uses path + size + mtime for identification.
-        """
-        try:
-            stat = file_path.stat()
-            identifier = f"{file_path}:{stat.st_mtime}:{stat.st_size}"
-            return hashlib.md5(identifier.encode()).hexdigest()
-        except Exception as e:
-            logger.error(f"❌ Error getting file hash for {file_path}: {e}")
-            # Fallback to just path
-            return hashlib.md5(str(file_path).encode()).hexdigest()
+    async def _wait_for_file(self, watcher: FolderWatcher) -> Path:
+        """Return the first stable file the watcher reports (newest if several settle together)"""
+        async for events in watcher.events():
+            files = [event for event in events if not event.deleted]
+            if files:
+                return max(files, key=lambda event: event.mtime).path
     
     def _move_file_to_processed(self, file_path: Path, watch_folder: Path, suffix: str = "_processed") -> Path:
         """
@@ -537,28 +526,6 @@ class FileListenerNode(Node):
             # Return original path if move fails - workflow will still work
             return file_path
     
-    def _scan_folder(self, folder: Path, pattern: str, recursive: bool) -> List[Path]:
-        """Scan folder for files matching pattern"""
-        try:
-            if recursive:
-                # Recursive glob: folder/**/*.pdf
-                files = list(folder.rglob(pattern))
-            else:
-                # Non-recursive glob: folder/*.pdf
-                files = list(folder.glob(pattern))
-            
-            # Filter to only files (not directories)
-            files = [f for f in files if f.is_file()]
-            
-            # Sort by modification time (newest first)
-            files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-            
-            return files
-        
-        except Exception as e:
-            logger.error(f"❌ Error scanning folder {folder}: {e}")
-            return []
-    
     def _build_file_reference(self, file_path: Path) -> Dict[str, Any]:
         """
         Build standardized MediaFormat file reference.
@@ -2,19 +2,23 @@
 Email Polling Trigger Node
 
 Monitors an email inbox for new emails and triggers workflow when emails are detected.
-Uses polling mechanism (checks periodically) with IMAP.
+Uses polling mechanism (checks periodically) with IMAP, or a persistent IMAP
+connection with IDLE push.
 """
 
 import asyncio
+import imaplib
 import logging
-from typing import Dict, Any, Callable, Awaitable, Set, List, Optional
+from typing import Dict, Any, Callable, Awaitable, Set, List, Optional, Tuple
 from datetime import datetime
 
 from app.utils.timezone import get_local_now
 
 from app.core.nodes import Node, NodeExecutionInput, TriggerCapability, register_node
 from app.schemas.workflow import NodeCategory, PortType
-from app.services.imap_service import get_imap_service, EMAIL_IMAP_PROVIDERS
+from app.services.imap_service import (
+    get_imap_service, EMAIL_IMAP_PROVIDERS, IMAPMailbox, build_search_criteria, IMAP_IDLE_REFRESH_SECONDS
+)
 
 logger = logging.getLogger(__name__)
 
@@ -42,12 +46,20 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
     - Pass email content and metadata to workflow
     - Optional mark as read
     
-    How it works:
+    How it works (connection_mode=poll):
     1. Every N seconds, checks email inbox via IMAP
     2. Identifies new emails (not seen before)
     3. Triggers workflow with email information
     4. Marks email as processed
     
+    connection_mode=persistent:
+    1. Keeps one IMAP connection open (reconnects with backoff)
+    2. Waits for new mail with IDLE (or polls the open connection every N
+       seconds when the server has no IDLE)
+    3. Fetches only UIDs above the last seen UID (reset if UIDVALIDITY changes),
+       headers and text parts only - attachments are listed with the section
+       to download them on demand (IMAPService.fetch_attachment)
+    
     Use Cases:
     - Automated email processing
     - Support ticket workflows
@@ -61,6 +73,12 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
     # In production, this should be persisted to DB for multi-instance deployments
     _processed_emails: Dict[str, Set[str]] = {}  # node_id -> set of message IDs
     
+    # Persistent mode: node_id -> (UIDVALIDITY, last seen UID)
+    _mailbox_cursors: Dict[str, Tuple[int, int]] = {}
+    
+    # Reconnect backoff for the persistent connection (seconds)
+    RECONNECT_BACKOFF_MAX = 300
+    
     @classmethod
     def get_input_ports(cls) -> List[Dict[str, Any]]:
         """Triggers typically have NO input ports - they start the workflow"""
@@ -184,6 +202,21 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
                 "show_if": {"provider": "custom", "auth_mode": "manual"}
             },
             
+            # Connection Mode
+            "connection_mode": {
+                "type": "select",
+                "widget": "select",
+                "label": "Connection Mode",
+                "description": "How to watch the inbox",
+                "required": False,
+                "default": "poll",
+                "options": [
+                    {"label": "Poll (reconnect every interval)", "value": "poll"},
+                    {"label": "Persistent (IMAP IDLE push)", "value": "persistent"}
+                ],
+                "help": "Persistent keeps one connection open, is notified of new mail by the server and only downloads new messages (attachments on demand)"
+            },
+            
             # Polling Configuration
             "polling_interval": {
                 "type": "integer",
@@ -194,7 +227,7 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
                 "widget": "number",
                 "min": 30,
                 "max": 3600,
-                "help": "Checks inbox every N seconds (minimum 30s)"
+                "help": "Checks inbox every N seconds (minimum 30s). Persistent mode only polls when the server does not support IDLE"
             },
             
             # Email Folder
@@ -339,9 +372,13 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
         self._workflow_id = workflow_id
         self._executor_callback = executor_callback
         self._is_monitoring = True
+        self._mailbox: Optional[IMAPMailbox] = None
         
         # Start polling loop in background
-        self._monitoring_task = asyncio.create_task(self._polling_loop())
+        if self.config.get("connection_mode", "poll") == "persistent":
+            self._monitoring_task = asyncio.create_task(self._persistent_loop())
+        else:
+            self._monitoring_task = asyncio.create_task(self._polling_loop())
         
         logger.info(f"✅ Email polling trigger monitoring started: {self.node_id}")
     
@@ -353,6 +390,11 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
         """
         self._is_monitoring = False
         
+        # Wake a persistent connection out of IDLE
+        mailbox = getattr(self, "_mailbox", None)
+        if mailbox:
+            mailbox.interrupt()
+        
         if self._monitoring_task:
             self._monitoring_task.cancel()
             try:
@@ -441,18 +483,7 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
                     
                     if new_emails:
                         logger.info(f"📧 Detected {len(new_emails)} new email(s)")
-                        
-                        if trigger_mode == "per_email":
-                            # Trigger once per email
-                            for email_data in new_emails:
-                                trigger_data = self._build_trigger_data(email_data)
-                                logger.info(f"🔔 Triggering workflow for: {email_data.get('subject', 'No Subject')}")
-                                await self.fire_trigger(trigger_data)
-                        else:
-                            # Batch mode - trigger once with all emails
-                            trigger_data = self._build_batch_trigger_data(new_emails)
-                            logger.info(f"🔔 Triggering workflow with {len(new_emails)} emails")
-                            await self.fire_trigger(trigger_data)
+                        await self._fire_emails(new_emails, trigger_mode)
                 
                 except Exception as e:
                     logger.error(f"❌ Error checking emails: {e}", exc_info=True)
@@ -463,6 +494,150 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
         except Exception as e:
             logger.error(f"❌ Error in email polling loop {self.node_id}: {e}", exc_info=True)
     
+    async def _persistent_loop(self):
+        """
+        Watch the inbox over one persistent IMAP connection.
+        
+        Fetches everything above the last seen UID, then waits with IDLE
+        (or polling_interval without IDLE) and repeats. Any error reconnects
+        with exponential backoff. The UID cursor only moves past emails once
+        their workflow fired, so a failed fire is retried after reconnecting;
+        it survives reconnects and trigger restarts within the process.
+        """
+        polling_interval = self.config.get("polling_interval", 60)
+        folder_name = self.config.get("folder_name", "INBOX")
+        trigger_mode = self.config.get("trigger_mode", "per_email")
+        ignore_existing = self.config.get("ignore_existing", True)
+        max_emails = self.config.get("max_emails_per_check", 10)
+        mark_as_read = self.config.get("mark_as_read", False)
+        criteria = build_search_criteria(
+            self.config.get("only_unread", True),
+            self.config.get("filter_sender") or None,
+            self.config.get("filter_subject") or None
+        )
+        
+        auth_result = self._get_auth_credentials()
+        if "error" in auth_result:
+            logger.error(f"❌ Email polling trigger {self.node_id}: {auth_result['error']}")
+            return
+        
+        logger.info(f"👁️ Email trigger started (persistent connection): {self.node_id}")
+        logger.info(f"   Email: {auth_result['email']}")
+        logger.info(f"   Server: {auth_result['imap_server']}:{auth_result['imap_port']}")
+        logger.info(f"   Folder: {folder_name}")
+        
+        backoff = 1
+        try:
+            while self._is_monitoring:
+                mailbox = IMAPMailbox(
+                    auth_result["imap_server"], auth_result["imap_port"],
+                    auth_result["email"], auth_result["password"], folder_name
+                )
+                self._mailbox = mailbox
+                try:
+                    await mailbox.run(mailbox.connect)
+                    last_uid = self._sync_mailbox_cursor(mailbox, ignore_existing)
+                    logger.info(
+                        f"📬 IMAP connection ready: {self.node_id} "
+                        f"({'IDLE' if mailbox.supports_idle else f'polling every {polling_interval}s'})"
+                    )
+                    
+                    while self._is_monitoring:
+                        emails, fetched_uid, more = await mailbox.run(
+                            mailbox.fetch_new, last_uid, criteria, max_emails
+                        )
+                        
+                        emails = [e for e in emails if self._passes_filters(e)]
+                        if emails:
+                            logger.info(f"📧 Detected {len(emails)} new email(s)")
+                            await self._fire_and_advance(mailbox, emails, trigger_mode, mark_as_read)
+                        
+                        # Everything up to fetched_uid fired or was filtered out
+                        last_uid = fetched_uid
+                        self._mailbox_cursors[self.node_id] = (mailbox.uidvalidity, last_uid)
+                        backoff = 1
+                        
+                        if more or not self._is_monitoring:
+                            continue
+                        if mailbox.supports_idle:
+                            await mailbox.run(mailbox.idle, IMAP_IDLE_REFRESH_SECONDS)
+                        else:
+                            await asyncio.sleep(polling_interval)
+                
+                except Exception as e:
+                    if not self._is_monitoring:
+                        break
+                    if isinstance(e, (imaplib.IMAP4.error, OSError)):
+                        logger.warning(f"⚠️ IMAP connection error ({self.node_id}): {e} - reconnecting in {backoff}s")
+                    else:
+                        logger.error(f"❌ Email trigger error ({self.node_id}): {e} - reconnecting in {backoff}s", exc_info=True)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, self.RECONNECT_BACKOFF_MAX)
+                finally:
+                    self._mailbox = None
+                    await mailbox.aclose()
+        
+        except asyncio.CancelledError:
+            logger.info(f"⏹️ Email trigger connection closed: {self.node_id}")
+            raise
+        except Exception as e:
+            logger.error(f"❌ Error in email trigger loop {self.node_id}: {e}", exc_info=True)
+    
+    def _sync_mailbox_cursor(self, mailbox: IMAPMailbox, ignore_existing: bool) -> int:
+        """
+        Last seen UID for a freshly selected mailbox.
+        
+        Keeps the stored cursor while UIDVALIDITY matches. Otherwise starts
+        at the current end of the folder (or at the beginning when existing
+        emails should trigger on first activation).
+        """
+        cursor = self._mailbox_cursors.get(self.node_id)
+        if cursor and cursor[0] == mailbox.uidvalidity:
+            return cursor[1]
+        
+        if cursor:
+            logger.warning(
+                f"⚠️ UIDVALIDITY of {mailbox.folder_name} changed ({cursor[0]} → {mailbox.uidvalidity}), "
+                f"resuming from newly arriving emails"
+            )
+        last_uid = mailbox.uidnext - 1 if (cursor or ignore_existing) else 0
+        self._mailbox_cursors[self.node_id] = (mailbox.uidvalidity, last_uid)
+        return last_uid
+    
+    async def _fire_and_advance(
+        self,
+        mailbox: IMAPMailbox,
+        emails: List[Dict[str, Any]],
+        trigger_mode: str,
+        mark_as_read: bool
+    ):
+        """
+        Fire emails and move the UID cursor past each group that fired.
+        
+        Emails are only marked as read once their workflow fired; if firing
+        raises, the cursor still points before the failed group.
+        """
+        groups = [[email_data] for email_data in emails] if trigger_mode == "per_email" else [emails]
+        for group in groups:
+            await self._fire_emails(group, trigger_mode)
+            self._mailbox_cursors[self.node_id] = (mailbox.uidvalidity, max(e["uid"] for e in group))
+            if mark_as_read:
+                await mailbox.run(mailbox.mark_seen, [e["uid"] for e in group])
+    
+    async def _fire_emails(self, emails: List[Dict[str, Any]], trigger_mode: str):
+        """Fire the workflow for new emails (per email or as one batch)"""
+        if trigger_mode == "per_email":
+            # Trigger once per email
+            for email_data in emails:
+                trigger_data = self._build_trigger_data(email_data)
+                logger.info(f"🔔 Triggering workflow for: {email_data.get('subject', 'No Subject')}")
+                await self.fire_trigger(trigger_data)
+        else:
+            # Batch mode - trigger once with all emails
+            trigger_data = self._build_batch_trigger_data(emails)
+            logger.info(f"🔔 Triggering workflow with {len(emails)} emails")
+            await self.fire_trigger(trigger_data)
+    
     def _get_auth_credentials(self) -> Dict[str, Any]:
         """
         Get email authentication credentials from config or credential manager.
@@ -637,6 +812,18 @@ class EmailPollingTriggerNode(Node, TriggerCapability):
             "signal": "emails_received",
             "trigger_source": "email_polling"
         }
+    
+    def merge_trigger_batch(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge batched events into the same payload as trigger_mode=batch"""
+        emails = []
+        for event in events:
+            emails.extend(event["emails"] if "emails" in event else [event])
+        return {
+            "emails": emails,
+            "email_count": len(emails),
+            "signal": "emails_received",
+            "trigger_source": "email_polling"
+        }
 
 
 if __name__ == "__main__":
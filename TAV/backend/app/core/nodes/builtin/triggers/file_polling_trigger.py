@@ -2,16 +2,21 @@
 File Polling Trigger Node
 
 Monitors a folder for new files and triggers workflow when files are detected.
-Uses polling mechanism (checks periodically) instead of real-time watching.
+Uses inotify on Linux (real-time, no scanning) and falls back to polling for
+network shares and other platforms (see app/utils/file_watcher.py).
 """
 
 import asyncio
 import logging
 from pathlib import Path
-from typing import Dict, Any, Callable, Awaitable, Set, List
-import hashlib
+from typing import Dict, Any, Callable, Awaitable, List, Optional, Tuple
 
-from app.utils.timezone import get_local_now
+from app.config import settings
+from app.core.execution.blocking import run_blocking
+from app.database.repositories.processed_file import (
+    ProcessedFileRepository, STATUS_IGNORED, STATUS_TRIGGERED, STATUS_MOVED
+)
+from app.utils.file_watcher import FolderWatcher, Signature, hash_file
 
 from app.core.nodes import Node, NodeExecutionInput, TriggerCapability, register_node
 from app.schemas.workflow import NodeCategory, PortType
@@ -23,7 +28,7 @@ logger = logging.getLogger(__name__)
     node_type="file_polling_trigger",
     category=NodeCategory.TRIGGERS,
     name="File Polling Trigger",
-    description="Monitors folder for new files and triggers workflow (polling-based)",
+    description="Monitors folder for new files and triggers workflow",
     icon="fa-solid fa-folder-open",
     version="1.0.0"
 )
@@ -31,20 +36,22 @@ class FilePollingTriggerNode(Node, TriggerCapability):
     """
     File Polling Trigger - Monitor folder for new files
     
-    Polls a directory at regular intervals and triggers workflow when new files are detected.
+    Watches a directory and triggers workflow when new files are detected.
     
     Features:
-    - Periodic polling (configurable interval)
+    - inotify watching on Linux, periodic polling elsewhere (configurable interval)
     - File pattern matching (*.pdf, *.jpg, etc.)
+    - Waits for files to finish copying (size/mtime unchanged for settle_seconds)
     - Track processed files to avoid duplicates
-    - Pass file path and metadata to workflow
+    - Pass file path, metadata and content hash to workflow
     - Optional recursive scanning
     
     How it works:
-    1. Every N seconds, scans the target folder
-    2. Identifies new files (not seen before)
+    1. Watcher reports files that are new or changed and have settled
+    2. Content is hashed (streamed, off the event loop)
     3. Triggers workflow with file information
-    4. Marks file as processed
+    4. File is recorded in the processed-file index (processed_files table),
+       so restarts resume without firing again for it
     
     Use Cases:
     - Document processing workflows
@@ -55,10 +62,6 @@ class FilePollingTriggerNode(Node, TriggerCapability):
     
     trigger_type = "file_polling"  # Used for execution_source tracking
     
-    # Class-level storage for processed files (per node instance)
-    # In production, this should be persisted to DB for multi-instance deployments
-    _processed_files: Dict[str, Set[str]] = {}  # node_id -> set of file hashes
-    
     @classmethod
     def get_input_ports(cls) -> List[Dict[str, Any]]:
         """Triggers typically have NO input ports - they start the workflow"""
@@ -122,7 +125,40 @@ class FilePollingTriggerNode(Node, TriggerCapability):
                 "widget": "number",
                 "min": 1,
                 "max": 3600,
-                "help": "Checks folder every N seconds"
+                "help": "Checks folder every N seconds when polling (network shares, non-Linux hosts, or Watch Mode = Polling)"
+            },
+            "watch_mode": {
+                "type": "select",
+                "widget": "select",
+                "label": "Watch Mode",
+                "description": "How new files are detected",
+                "required": False,
+                "default": "auto",
+                "options": [
+                    {"label": "Auto (file system events, polling fallback)", "value": "auto"},
+                    {"label": "Polling only", "value": "polling"}
+                ],
+                "help": "Auto uses inotify on Linux for instant detection and falls back to polling for network shares and other platforms"
+            },
+            "settle_seconds": {
+                "type": "float",
+                "widget": "number",
+                "label": "Settle Time (seconds)",
+                "description": "Wait until a file's size and modified time stop changing for this long",
+                "required": False,
+                "default": 1,
+                "min": 0,
+                "max": 600,
+                "help": "Prevents triggering on files that are still being copied"
+            },
+            "hash_files": {
+                "type": "boolean",
+                "widget": "checkbox",
+                "label": "Compute Content Hash",
+                "description": "Add a sha256 content_hash of each file to the trigger data",
+                "required": False,
+                "default": True,
+                "help": "Files are read in chunks, so large files do not use extra memory"
             },
             "recursive": {
                 "type": "boolean",
@@ -150,10 +186,10 @@ class FilePollingTriggerNode(Node, TriggerCapability):
                 "type": "boolean",
                 "widget": "checkbox",
                 "label": "Ignore Existing Files",
-                "description": "Only trigger on files created after trigger starts",
+                "description": "Only trigger on files created after the trigger is first activated",
                 "required": False,
                 "default": True,
-                "help": "Enable to skip files that already exist when trigger starts"
+                "help": "Enable to skip files that already exist when the trigger is first activated. Files that arrive while the workflow is stopped still trigger when it is activated again."
             },
             "move_processed_files": {
                 "type": "boolean",
@@ -263,6 +299,9 @@ class FilePollingTriggerNode(Node, TriggerCapability):
         credential_id = self.config.get("network_credential")
         move_processed_files = self.config.get("move_processed_files", False)
         processed_folder_suffix = self.config.get("processed_folder_suffix", "_processed")
+        watch_mode = self.config.get("watch_mode", "auto")
+        settle_seconds = self.config.get("settle_seconds", 1)
+        hash_files = self.config.get("hash_files", True)
         
         if not watch_folder:
             logger.error(f"❌ File polling trigger {self.node_id}: watch_folder not configured")
@@ -359,157 +398,187 @@ class FilePollingTriggerNode(Node, TriggerCapability):
         logger.info(f"👁️ File polling trigger started: {self.node_id}")
         logger.info(f"   Watching: {watch_path}")
         logger.info(f"   Pattern: {file_pattern}")
-        logger.info(f"   Interval: {polling_interval}s")
+        logger.info(f"   Interval: {polling_interval}s (polling mode)")
+        logger.info(f"   Settle: {settle_seconds}s")
         logger.info(f"   Recursive: {recursive}")
         
-        # Initialize processed files set for this node
-        if self.node_id not in self._processed_files:
-            self._processed_files[self.node_id] = set()
-        
-        # Initial scan handling based on ignore_existing setting
-        if ignore_existing:
-            # Mark existing files as processed so they won't trigger
-            initial_files = self._scan_folder(watch_path, file_pattern, recursive)
-            for file_path in initial_files:
-                file_hash = self._get_file_hash(file_path)
-                self._processed_files[self.node_id].add(file_hash)
-            logger.info(f"📂 Initial scan: {len(initial_files)} existing files marked as processed (will be skipped)")
+        # The index decides which files are new; without it every file in the
+        # folder would fire again, so wait until it can be read
+        while True:
+            try:
+                has_index, known = await run_blocking(self._load_index)
+                break
+            except Exception as e:
+                logger.error(
+                    f"❌ Could not load processed-file index for {self.node_id}, "
+                    f"retrying in {polling_interval}s: {e}"
+                )
+                await asyncio.sleep(polling_interval)
+                if not self._is_monitoring:
+                    return
+        
+        # Watch for stable files (inotify on Linux, polling elsewhere)
+        watcher = FolderWatcher(
+            watch_path,
+            pattern=file_pattern,
+            recursive=recursive,
+            poll_interval=polling_interval,
+            settle_seconds=settle_seconds,
+            use_inotify=watch_mode != "polling",
+        )
+        # Resume from the processed-file index: files recorded there are
+        # skipped while unchanged, anything else in the folder is new.
+        # ignore_existing only applies to the first activation.
+        if ignore_existing and not has_index:
+            snapshot = await watcher.start(include_existing=False)
+            await run_blocking(self._record_index, [
+                self._index_entry(path, signature) for path, signature in snapshot.items()
+            ], STATUS_IGNORED)
+            logger.info(f"📂 Initial scan: {len(snapshot)} existing files marked as processed (will be skipped)")
         else:
-            # Clear the processed files set to allow processing ALL files including existing ones
-            self._processed_files[self.node_id] = set()
-            logger.info(f"📂 ignore_existing=False: Cleared processed files set - will trigger on ALL files including existing ones")
+            snapshot = await watcher.start(include_existing=True, known=known)
+            gone = [path for path in known if path not in snapshot]
+            if gone:
+                await run_blocking(self._index_deleted, gone)
+            unprocessed = sum(
+                1 for path, signature in snapshot.items()
+                if path not in known or watcher.normalize(known[path]) != signature
+            )
+            logger.info(
+                f"📂 Processed-file index: {len(known) - len(gone)} known files, "
+                f"{unprocessed} unprocessed files in folder"
+            )
         
-        # Start polling loop
         try:
-            loop_count = 0
-            while self._is_monitoring:
-                await asyncio.sleep(polling_interval)
-                
-                # Check if still monitoring
+            async for events in watcher.events():
                 if not self._is_monitoring:
                     break
                 
-                loop_count += 1
-                # Log every 10 polls at INFO level, otherwise DEBUG
-                log_level = logging.INFO if loop_count % 10 == 0 else logging.DEBUG
-                logger.log(log_level, f"🔍 Polling folder (loop #{loop_count}): {watch_path}")
+                deleted = [event.path for event in events if event.deleted]
+                if deleted:
+                    # Tombstoned, so a re-uploaded file triggers again
+                    logger.debug(f"   {len(deleted)} file(s) no longer present")
+                    await run_blocking(self._index_deleted, deleted)
                 
-                # Scan for files
-                try:
-                    current_files = self._scan_folder(watch_path, file_pattern, recursive)
-                    logger.log(log_level, f"   Found {len(current_files)} total files matching pattern '{file_pattern}'")
-                except Exception as e:
-                    logger.error(f"❌ Error scanning folder: {e}", exc_info=True)
-                    # Continue polling even if one scan fails
+                new_events = [event for event in events if not event.deleted]
+                new_files = [event.path for event in new_events]
+                if not new_files:
                     continue
                 
-                # Build set of current file hashes
-                current_hashes = set()
-                for file_path in current_files:
-                    file_hash = self._get_file_hash(file_path)
-                    current_hashes.add(file_hash)
+                logger.info(f"📁 Detected {len(new_files)} new file(s)!")
                 
-                # Remove hashes for files that no longer exist (allows reprocessing if file is deleted and re-uploaded)
-                removed_hashes = self._processed_files[self.node_id] - current_hashes
-                if removed_hashes:
-                    self._processed_files[self.node_id] -= removed_hashes
-                    logger.debug(f"   Removed {len(removed_hashes)} file(s) from processed set (no longer present)")
+                # Hash before moving (streamed, off the event loop)
+                content_hashes = {}
+                if hash_files:
+                    for file_path in new_files:
+                        try:
+                            content_hashes[file_path] = await run_blocking(hash_file, file_path)
+                        except OSError as e:
+                            logger.warning(f"⚠️  Could not hash {file_path.name}: {e}")
                 
-                # Find new files
-                new_files = []
-                for file_path in current_files:
-                    file_hash = self._get_file_hash(file_path)
-                    if file_hash not in self._processed_files[self.node_id]:
-                        new_files.append(file_path)
-                        self._processed_files[self.node_id].add(file_hash)
-                
-                if len(new_files) > 0:
-                    logger.info(f"📁 Detected {len(new_files)} new file(s)!")
-                else:
-                    logger.log(log_level, f"   No new files detected")
+                # Record before firing: once fire_trigger returns the event is
+                # running or durably queued, and the run may take a long time
+                await run_blocking(self._record_index, [
+                    self._index_entry(event.path, event.signature, content_hashes.get(event.path))
+                    for event in new_events
+                ], STATUS_MOVED if move_processed_files else STATUS_TRIGGERED)
                 
-                if new_files:
-                    if trigger_mode == "per_file":
-                        # Trigger once per file
-                        for file_path in new_files:
-                            # Move file to processed folder if enabled
-                            if move_processed_files:
-                                file_path = self._move_file_to_processed(
-                                    file_path, 
-                                    watch_path, 
-                                    processed_folder_suffix
-                                )
-                            
-                            trigger_data = self._build_trigger_data(file_path)
-                            logger.info(f"🔔 Triggering workflow for: {file_path.name}")
-                            logger.debug(f"   Trigger data keys: {list(trigger_data.keys())}")
-                            logger.debug(f"   File data: {trigger_data.get('file', {})}")
-                            await self.fire_trigger(trigger_data)
-                    else:
-                        # Batch mode - trigger once with all files
-                        # Move files to processed folder if enabled
+                if trigger_mode == "per_file":
+                    # Trigger once per file
+                    for file_path in new_files:
+                        content_hash = content_hashes.get(file_path)
+                        # Move file to processed folder if enabled
                         if move_processed_files:
-                            new_files = [
-                                self._move_file_to_processed(f, watch_path, processed_folder_suffix)
-                                for f in new_files
-                            ]
+                            file_path = self._move_file_to_processed(
+                                file_path, 
+                                watch_path, 
+                                processed_folder_suffix
+                            )
                         
-                        trigger_data = self._build_batch_trigger_data(new_files)
-                        logger.info(f"🔔 Triggering workflow with {len(new_files)} files")
+                        trigger_data = self._build_trigger_data(file_path, content_hash)
+                        logger.info(f"🔔 Triggering workflow for: {file_path.name}")
+                        logger.debug(f"   Trigger data keys: {list(trigger_data.keys())}")
+                        logger.debug(f"   File data: {trigger_data.get('file', {})}")
                         await self.fire_trigger(trigger_data)
+                else:
+                    # Batch mode - trigger once with all files
+                    hashes = [content_hashes.get(f) for f in new_files]
+                    # Move files to processed folder if enabled
+                    if move_processed_files:
+                        new_files = [
+                            self._move_file_to_processed(f, watch_path, processed_folder_suffix)
+                            for f in new_files
+                        ]
+                    
+                    trigger_data = self._build_batch_trigger_data(new_files, hashes)
+                    logger.info(f"🔔 Triggering workflow with {len(new_files)} files")
+                    await self.fire_trigger(trigger_data)
         
         except asyncio.CancelledError:
             logger.info(f"⏹️ File polling loop cancelled: {self.node_id}")
             raise
         except Exception as e:
             logger.error(f"❌ Error in file polling loop {self.node_id}: {e}", exc_info=True)
+        finally:
+            watcher.close()
+    
+    # ==================== Processed-File Index ====================
     
-    def _scan_folder(self, folder: Path, pattern: str, recursive: bool) -> List[Path]:
-        """Scan folder for files matching pattern"""
+    def _load_index(self) -> Tuple[bool, Dict[Path, Signature]]:
+        """
+        (index has rows for this node, files still present when last seen)
+        
+        Database errors propagate: an unreadable index is not an empty one.
+        """
+        from app.database.session import SessionLocal
+        
+        db = SessionLocal()
         try:
-            if recursive:
-                # Recursive glob: folder/**/*.pdf
-                files = list(folder.rglob(pattern))
-            else:
-                # Non-recursive glob: folder/*.pdf
-                files = list(folder.glob(pattern))
-            
-            # Filter to only files (not directories)
-            files = [f for f in files if f.is_file()]
-            
-            return files
+            repo = ProcessedFileRepository(db)
+            repo.compact(
+                retention_days=settings.PROCESSED_FILE_RETENTION_DAYS,
+                max_entries=settings.PROCESSED_FILE_MAX_ENTRIES,
+                workflow_id=self._workflow_id,
+                node_id=self.node_id,
+            )
+            known = repo.load(self._workflow_id, self.node_id)
+            has_index = bool(known) or repo.count(self._workflow_id, self.node_id) > 0
+            return has_index, {Path(path): signature for path, signature in known.items()}
+        finally:
+            db.close()
+    
+    def _record_index(self, entries: List[Dict[str, Any]], status: str):
+        from app.database.session import SessionLocal
         
+        if not entries:
+            return
+        db = SessionLocal()
+        try:
+            ProcessedFileRepository(db).record(self._workflow_id, self.node_id, entries, status)
         except Exception as e:
-            logger.error(f"❌ Error scanning folder {folder}: {e}")
-            return []
+            logger.error(f"❌ Could not update processed-file index for {self.node_id}: {e}", exc_info=True)
+        finally:
+            db.close()
     
-    def _get_file_hash(self, file_path: Path) -> str:
-        """
-        Get unique identifier for file.
+    def _index_deleted(self, paths: List[Path]):
+        from app.database.session import SessionLocal
         
-        For network shares, uses path + size only (mtime can be unstable).
-        For local files, includes mtime to detect modifications.
-        """
+        db = SessionLocal()
         try:
-            stat = file_path.stat()
-            
-            # Check if this is a network path
-            from app.utils.network_share import NetworkShareAuth
-            is_network = NetworkShareAuth.is_unc_path(str(file_path))
-            
-            if is_network:
-                # Network shares: Use path + size only (mtime unstable)
-                # This prevents re-triggering on same file due to clock drift
-                identifier = f"{file_path}:{stat.st_size}"
-            else:
-                # Local files: Include mtime to detect modifications
-                identifier = f"{file_path}:{stat.st_mtime}:{stat.st_size}"
-            
-            return hashlib.md5(identifier.encode()).hexdigest()
+            ProcessedFileRepository(db).mark_deleted(self._workflow_id, self.node_id, [str(p) for p in paths])
         except Exception as e:
-            logger.error(f"❌ Error getting file hash for {file_path}: {e}")
-            # Fallback to just path
-            return hashlib.md5(str(file_path).encode()).hexdigest()
+            logger.error(f"❌ Could not update processed-file index for {self.node_id}: {e}", exc_info=True)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _index_entry(path: Path, signature: Signature, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "path": str(path),
+            "size_bytes": signature[0],
+            "mtime_ns": signature[1],
+            "content_hash": content_hash,
+        }
     
     def _move_file_to_processed(self, file_path: Path, watch_folder: Path, suffix: str = "_processed") -> Path:
         """
@@ -559,7 +628,7 @@ class FilePollingTriggerNode(Node, TriggerCapability):
             # Return original path if move fails - workflow will still work
             return file_path
     
-    def _build_trigger_data(self, file_path: Path) -> Dict[str, Any]:
+    def _build_trigger_data(self, file_path: Path, content_hash: Optional[str] = None) -> Dict[str, Any]:
         """
         Build trigger data dict for single file.
         
@@ -608,6 +677,7 @@ class FilePollingTriggerNode(Node, TriggerCapability):
                 "file": file_ref,  # ✅ Standardized MediaFormat for all nodes
                 "file_path": file_path_str,  # Legacy field for backward compatibility
                 "file_name": file_path.name,  # Legacy field for backward compatibility
+                "content_hash": content_hash,  # sha256 of the content (None if hashing is off)
                 "signal": "file_detected"
             }
         
@@ -617,13 +687,26 @@ class FilePollingTriggerNode(Node, TriggerCapability):
                 "file_path": str(file_path),
                 "file_name": file_path.name,
                 "file_info": {},
+                "content_hash": content_hash,
                 "signal": "file_detected"
             }
     
-    def _build_batch_trigger_data(self, files: List[Path]) -> Dict[str, Any]:
+    def _build_batch_trigger_data(self, files: List[Path], content_hashes: Optional[List[Optional[str]]] = None) -> Dict[str, Any]:
         """Build trigger data dict for batch of files"""
+        content_hashes = content_hashes or [None] * len(files)
+        return {
+            "files": [self._build_trigger_data(f, h) for f, h in zip(files, content_hashes)],
+            "file_count": len(files),
+            "signal": "files_detected"
+        }
+    
+    def merge_trigger_batch(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge batched events into the same payload as trigger_mode=batch"""
+        files = []
+        for event in events:
+            files.extend(event["files"] if "files" in event else [event])
         return {
-            "files": [self._build_trigger_data(f) for f in files],
+            "files": files,
             "file_count": len(files),
             "signal": "files_detected"
         }
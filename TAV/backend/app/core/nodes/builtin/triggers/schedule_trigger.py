@@ -4,12 +4,12 @@ Schedule Trigger Node
 Fires workflow on a schedule (cron expression or interval).
 """
 
-import asyncio
 import logging
 from typing import Dict, Any, Callable, Awaitable
 
 from app.utils.timezone import get_local_now
 
+from app.core.execution.schedule_timer import ScheduleSpec, get_schedule_timer
 from app.core.nodes import Node, NodeExecutionInput, TriggerCapability, register_node
 from app.schemas.workflow import NodeCategory
 
@@ -28,12 +28,19 @@ class ScheduleTriggerNode(Node, TriggerCapability):
     """
     Schedule trigger node.
     
-    Fires workflow at regular intervals based on configured time.
+    Fires workflow at regular intervals or on a cron expression. All
+    schedule triggers share one timer (ScheduleTimer), which also catches up
+    on fires missed while the server was down.
     
     Config:
+    - schedule_type: interval or cron
     - interval_hours: Hours between triggers (0-23)
     - interval_minutes: Minutes between triggers (0-59)
     - interval_seconds: Seconds between triggers (0-59)
+    - cron_expression: 5-field cron expression (schedule_type=cron)
+    - jitter_seconds: Random delay added to each fire
+    - misfire_policy: fire_once, fire_all or skip for missed fires
+    - misfire_grace_seconds: Lateness that still counts as on time
     
     Output:
     - signal: Universal signal to activate next node
@@ -63,6 +70,28 @@ class ScheduleTriggerNode(Node, TriggerCapability):
     def get_config_schema(cls):
         """Define configuration schema"""
         return {
+            "schedule_type": {
+                "type": "select",
+                "widget": "select",
+                "label": "Schedule Type",
+                "description": "Fire at a fixed interval or on a cron expression",
+                "required": False,
+                "default": "interval",
+                "options": [
+                    {"label": "Interval", "value": "interval"},
+                    {"label": "Cron Expression", "value": "cron"}
+                ]
+            },
+            "cron_expression": {
+                "type": "string",
+                "label": "Cron Expression",
+                "description": "minute hour day-of-month month day-of-week (server local time)",
+                "required": False,
+                "placeholder": "0 9 * * mon-fri",
+                "widget": "text",
+                "help": "Examples: */15 * * * * (every 15 minutes), 0 9 * * mon-fri (weekdays 9:00), @daily",
+                "visible_when": {"schedule_type": "cron"}
+            },
             "interval_hours": {
                 "type": "integer",
                 "label": "Hours",
@@ -71,7 +100,8 @@ class ScheduleTriggerNode(Node, TriggerCapability):
                 "default": 0,
                 "widget": "number",
                 "min": 0,
-                "max": 23
+                "max": 23,
+                "visible_when": {"schedule_type": "interval"}
             },
             "interval_minutes": {
                 "type": "integer",
@@ -81,7 +111,8 @@ class ScheduleTriggerNode(Node, TriggerCapability):
                 "default": 5,
                 "widget": "number",
                 "min": 0,
-                "max": 59
+                "max": 59,
+                "visible_when": {"schedule_type": "interval"}
             },
             "interval_seconds": {
                 "type": "integer",
@@ -91,7 +122,42 @@ class ScheduleTriggerNode(Node, TriggerCapability):
                 "default": 0,
                 "widget": "number",
                 "min": 0,
-                "max": 59
+                "max": 59,
+                "visible_when": {"schedule_type": "interval"}
+            },
+            "jitter_seconds": {
+                "type": "integer",
+                "label": "Jitter (seconds)",
+                "description": "Random delay of up to N seconds added to each fire",
+                "required": False,
+                "default": 0,
+                "widget": "number",
+                "min": 0,
+                "max": 3600,
+                "help": "Spreads out workflows scheduled for the same time"
+            },
+            "misfire_policy": {
+                "type": "select",
+                "widget": "select",
+                "label": "Missed Fires",
+                "description": "What to do with fires missed while the server was down",
+                "required": False,
+                "default": "fire_once",
+                "options": [
+                    {"label": "Run once for all missed fires", "value": "fire_once"},
+                    {"label": "Run once per missed fire", "value": "fire_all"},
+                    {"label": "Skip missed fires", "value": "skip"}
+                ]
+            },
+            "misfire_grace_seconds": {
+                "type": "integer",
+                "label": "Misfire Grace (seconds)",
+                "description": "A fire this late still runs normally",
+                "required": False,
+                "default": 60,
+                "widget": "number",
+                "min": 0,
+                "max": 86400
             }
         }
     
@@ -119,7 +185,8 @@ class ScheduleTriggerNode(Node, TriggerCapability):
         """
         Start schedule monitoring.
         
-        Runs background loop that fires at specified intervals.
+        Registers the schedule with the shared schedule timer (one timer for
+        all schedule triggers, see app/core/execution/schedule_timer.py).
         
         Args:
             workflow_id: Workflow UUID
@@ -129,13 +196,50 @@ class ScheduleTriggerNode(Node, TriggerCapability):
         self._workflow_id = workflow_id
         self._executor_callback = executor_callback
         self._is_monitoring = True
+        self._execution_count = 0
+        
+        spec = self._build_schedule_spec()
+        next_fire = await get_schedule_timer().add(workflow_id, self.node_id, spec, self._on_schedule)
+        
+        logger.info(
+            f"Schedule trigger {self.node_id} monitoring started: "
+            f"{self._describe_schedule(spec)}, next fire {next_fire.isoformat()}"
+        )
+    
+    async def stop_monitoring(self):
+        """Stop schedule monitoring."""
+        logger.info(f"Schedule trigger {self.node_id} monitoring stopped")
+        
+        self._is_monitoring = False
+        get_schedule_timer().remove(getattr(self, "_workflow_id", None), self.node_id)
+    
+    def _build_schedule_spec(self) -> ScheduleSpec:
+        """
+        Schedule from node config.
+        
+        Raises:
+            ValueError: Interval below 1 second, invalid cron expression or
+                        misfire policy
+        """
+        common = {
+            "jitter_seconds": float(self.config.get("jitter_seconds") or 0),
+            "misfire_policy": self.config.get("misfire_policy") or "fire_once",
+            "misfire_grace_seconds": float(self.config.get("misfire_grace_seconds", 60) or 0),
+        }
+        
+        if self.config.get("schedule_type", "interval") == "cron":
+            expression = (self.config.get("cron_expression") or "").strip()
+            if not expression:
+                raise ValueError(f"Schedule trigger {self.node_id} needs a cron expression")
+            try:
+                return ScheduleSpec(cron=expression, **common)
+            except ValueError as e:
+                raise ValueError(f"Schedule trigger {self.node_id}: {e}") from e
         
         # Get config and calculate total interval in seconds
         hours = self.config.get("interval_hours", 0)
         minutes = self.config.get("interval_minutes", 0)
         seconds = self.config.get("interval_seconds", 0)
-        
-        # Calculate total seconds
         interval_seconds = (hours * 3600) + (minutes * 60) + seconds
         
         # Validate interval
@@ -144,65 +248,38 @@ class ScheduleTriggerNode(Node, TriggerCapability):
                 f"Schedule trigger {self.node_id} must have at least 1 second interval "
                 f"(got {hours}h {minutes}m {seconds}s)"
             )
-        
-        logger.info(
-            f"Schedule trigger {self.node_id} monitoring started: "
-            f"interval={hours}h {minutes}m {seconds}s ({interval_seconds}s total)"
-        )
-        
-        # Start monitoring loop
-        self._monitoring_task = asyncio.create_task(
-            self._monitoring_loop(interval_seconds)
-        )
+        return ScheduleSpec(interval_seconds=interval_seconds, **common)
     
-    async def stop_monitoring(self):
-        """Stop schedule monitoring."""
-        logger.info(f"Schedule trigger {self.node_id} monitoring stopped")
-        
-        self._is_monitoring = False
-        
-        # Cancel monitoring task
-        if self._monitoring_task and not self._monitoring_task.done():
-            self._monitoring_task.cancel()
-            try:
-                await self._monitoring_task
-            except asyncio.CancelledError:
-                pass
+    @staticmethod
+    def _describe_schedule(spec: ScheduleSpec) -> str:
+        if spec.cron is not None:
+            return f"cron='{spec.cron}'"
+        return f"interval={spec.interval_seconds:g}s"
     
-    async def _monitoring_loop(self, interval_seconds: int):
+    async def _on_schedule(self, fire: Dict[str, Any]):
         """
-        Monitoring loop that fires at intervals.
+        Called by the schedule timer when the schedule is due.
         
         Args:
-            interval_seconds: Fire every N seconds
+            fire: scheduled_for, missed_count, catch_up (see ScheduleTimer)
         """
-        execution_count = 0
+        if not self._is_monitoring:
+            return
         
-        try:
-            while self._is_monitoring:
-                # Wait for next interval
-                await asyncio.sleep(interval_seconds)
-                
-                # Fire trigger with metadata
-                trigger_data = {
-                    "triggered_at": get_local_now().isoformat(),
-                    "execution_count": execution_count,
-                    "source": "schedule"
-                }
-                
-                logger.debug(f"Schedule trigger {self.node_id} firing (execution {execution_count + 1})")
-                
-                try:
-                    await self.fire_trigger(trigger_data)
-                    execution_count += 1
-                except Exception as e:
-                    logger.error(f"Schedule trigger {self.node_id} fire failed: {e}", exc_info=True)
+        # Fire trigger with metadata
+        trigger_data = {
+            "triggered_at": get_local_now().isoformat(),
+            "scheduled_for": fire["scheduled_for"].isoformat(),
+            "execution_count": self._execution_count,
+            "missed_count": fire["missed_count"],
+            "catch_up": fire["catch_up"],
+            "source": "schedule"
+        }
         
-        except asyncio.CancelledError:
-            logger.debug(f"Schedule trigger {self.node_id} monitoring loop cancelled")
-            raise
+        logger.debug(f"Schedule trigger {self.node_id} firing (execution {self._execution_count + 1})")
         
+        try:
+            await self.fire_trigger(trigger_data)
+            self._execution_count += 1
         except Exception as e:
-            logger.error(f"Schedule trigger {self.node_id} monitoring loop failed: {e}", exc_info=True)
-            raise
-
+            logger.error(f"Schedule trigger {self.node_id} fire failed: {e}", exc_info=True)
@@ -386,20 +386,58 @@ class ComputeCapability(ABC):
     """
     Mixin for heavy computation nodes (non-AI).
     
-    Marks node as requiring compute resource pool.
+    Marks node as requiring the compute resource pool and lets it run
+    CPU-bound sections in the managed process pool (off the event loop).
     Used for:
     - Video encoding
     - Large file processing
     - Data transformation
     - Complex calculations
     
+    The function passed to run_in_process must be a module-level function
+    with picklable arguments and result (see app.core.execution.compute).
+    
     Usage:
+        def _encode(path: str, fps: int) -> str:  # module level
+            ...
+        
         class VideoProcessorNode(Node, ComputeCapability):
             async def execute(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
-                # Heavy computation
-                result = await process_video(inputs["video"])
+                # Heavy computation in a worker process
+                result = await self.run_in_process(_encode, inputs.ports["video"], 30)
                 return {"output": result}
     """
+    
+    async def run_in_process(self, func, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run a CPU-bound function in the compute process pool.
+        
+        Args:
+            func: Module-level function
+            *args, **kwargs: Picklable arguments
+            timeout: Per-task timeout in seconds (default: COMPUTE_TASK_TIMEOUT)
+        
+        Returns:
+            Function result
+        """
+        from app.core.execution.compute import get_compute_pool
+        return await get_compute_pool().run(func, *args, timeout=timeout, **kwargs)
+
+
+class CoordinationCapability(ABC):
+    """
+    Mixin for nodes that only coordinate other nodes' execution.
+    
+    Such nodes take no resource pool slot themselves; the nodes they run
+    acquire their own pools. This prevents a coordinator from holding the
+    slot its own child nodes need (e.g. a map over items with
+    max_concurrent_nodes=1).
+    
+    Usage:
+        class ParallelMapNode(Node, CoordinationCapability):
+            async def execute(self, inputs):
+                return await inputs.map_runner(...)
+    """
     pass  # Marker mixin - used for resource pool assignment
 
 
@@ -411,7 +449,7 @@ def get_resource_classes(node: Any) -> List[str]:
         node: Node instance
     
     Returns:
-        List of resource class names: ["standard"], ["llm"], ["ai"], or ["llm", "ai"]
+        List of resource class names: ["standard"], ["llm"], ["ai"], ["compute"], or combinations
     
     Examples:
         >>> node = HTTPRequestNode(...)
@@ -429,15 +467,29 @@ def get_resource_classes(node: Any) -> List[str]:
         >>> node = ImageAnalyzerNode(...)  # Has both
         >>> get_resource_classes(node)
         ['llm', 'ai']
+        
+        >>> node = ExcelReaderNode(...)  # Has ComputeCapability
+        >>> get_resource_classes(node)
+        ['compute']
+        
+        >>> node = ParallelMapNode(...)  # Has CoordinationCapability
+        >>> get_resource_classes(node)
+        []
     """
+    if isinstance(node, CoordinationCapability):
+        return []
+    
     classes = []
     
     if isinstance(node, LLMCapability):
         classes.append("llm")
     
-    if isinstance(node, (AICapability, ComputeCapability)):
+    if isinstance(node, AICapability):
         classes.append("ai")
     
+    if isinstance(node, ComputeCapability):
+        classes.append("compute")
+    
     if not classes:
         classes.append("standard")
     
@@ -988,7 +1040,22 @@ class TriggerCapability(ABC):
         except Exception as e:
             logger.error(f"Error firing trigger {self.node_id}: {e}", exc_info=True)
             raise
-    
+
+    def merge_trigger_batch(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge batched trigger events into one execution's trigger data.
+
+        Used when the node's event_batching config is "batch". Override to
+        produce the payload shape the node's execute() already understands.
+
+        Args:
+            events: trigger_data of each event, oldest first
+
+        Returns:
+            {"batch": [...], "batch_size": int, "signal": "batch"}
+        """
+        return {"batch": events, "batch_size": len(events), "signal": "batch"}
+
     @property
     def is_monitoring(self) -> bool:
         """Check if trigger is currently monitoring"""
@@ -1028,7 +1095,8 @@ class PasswordProtectedFileCapability(ABC):
                 # Process document...
     """
     
-    def open_pdf_with_password(self, pdf_path: str, password: Optional[str] = None):
+    @staticmethod
+    def open_pdf_with_password(pdf_path: str, password: Optional[str] = None):
         """
         Open PDF with optional password support using PyMuPDF.
         
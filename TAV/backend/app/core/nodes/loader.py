@@ -2,14 +2,21 @@
 Node Loader - Auto-Discovery and Registration
 
 Automatically discovers and registers all node classes from the nodes directory.
+
+Discovery results are cached in a node manifest (node type → module, metadata,
+ports and config schema) keyed by the mtimes of the node sources, so a boot
+with unchanged sources registers every node without importing any node module.
 """
 
+import hashlib
 import importlib
 import inspect
+import json
 import logging
-import pkgutil
+import os
+import sys
 from pathlib import Path
-from typing import Type, List
+from typing import Dict, List, Optional, Tuple, Type
 
 from app.core.nodes.base import Node
 from app.core.nodes.registry import NodeRegistry
@@ -17,16 +24,36 @@ from app.core.nodes.registry import NodeRegistry
 logger = logging.getLogger(__name__)
 
 
-def discover_and_register_nodes() -> dict:
+NODE_DIRECTORIES = [
+    ("builtin", "app.core.nodes.builtin"),
+    ("custom", "app.core.nodes.custom"),
+]
+
+# Bump when the manifest layout changes
+MANIFEST_FORMAT = 1
+
+
+def discover_and_register_nodes(node_directories: Optional[List[Tuple[Path, str]]] = None) -> dict:
     """
     Auto-discover all node classes and register them.
     
-    Scans builtin/, custom/, business/, and analytics/ directories for:
+    Scans builtin/ (with its subdirectories) and custom/ for:
     - Classes that inherit from Node
     - Auto-registers them using class metadata (type, display_name, category, etc.)
     
     NO __init__.py imports required! Just drop a node file in a folder and it's auto-discovered.
     
+    When the node manifest (settings.NODE_MANIFEST_PATH) was built from the
+    same sources - same files, mtimes and sizes - nodes are registered from it
+    without importing their modules; NodeRegistry.get() imports a node module
+    the first time the class is needed. Otherwise every module is imported and
+    the manifest is rebuilt. Modules that failed to import are retried on
+    every discovery.
+    
+    Args:
+        node_directories: (directory, package) pairs to scan (defaults to
+                          builtin/ and custom/)
+    
     Returns:
         Dict with discovery statistics
     """
@@ -34,99 +61,66 @@ def discover_and_register_nodes() -> dict:
     
     stats = {
         "modules_scanned": 0,
+        "modules_imported": 0,
         "nodes_found": 0,
         "nodes_registered": 0,
+        "manifest": "disabled",
         "errors": []
     }
     
-    # Get the nodes package path
-    import app.core.nodes as nodes_package
-    package_path = Path(nodes_package.__file__).parent
+    if node_directories is None:
+        # Get the nodes package path
+        import app.core.nodes as nodes_package
+        package_path = Path(nodes_package.__file__).parent
+        node_directories = [(package_path / name, prefix) for name, prefix in NODE_DIRECTORIES]
     
-    # Scan all node directories (builtin subdirectories + custom)
-    node_directories = [
-        (package_path / "builtin", "app.core.nodes.builtin"),
-        (package_path / "custom", "app.core.nodes.custom"),
-    ]
+    modules = _find_node_modules(node_directories)
+    fingerprint = _sources_fingerprint(modules)
     
-    for dir_path, prefix in node_directories:
-        if not dir_path.exists():
-            logger.debug(f"Directory {dir_path} does not exist, skipping...")
-            continue
-            
-        # Recursively discover all Python modules in this directory
-        for module_info in pkgutil.walk_packages(
-            path=[str(dir_path)],
-            prefix=f"{prefix}."
-        ):
-            module_name = module_info.name
-            
-            # Skip __pycache__, __init__, and test files
-            if "__pycache__" in module_name or "__init__" in module_name or "test_" in module_name:
-                continue
-            
-            try:
-                # Import the module
-                module = importlib.import_module(module_name)
-                stats["modules_scanned"] += 1
-                
-                # Find all classes that inherit from Node
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    # Skip if not a Node subclass
-                    if not issubclass(obj, Node) or obj is Node:
-                        continue
-                    
-                    # Skip abstract classes
-                    if inspect.isabstract(obj):
-                        continue
-                    
-                    # Skip classes from other modules (imports)
-                    if obj.__module__ != module_name:
-                        continue
-                    
-                    stats["nodes_found"] += 1
-                    
-                    # Auto-register the node if not already registered
-                    node_type = getattr(obj, 'type', None)
-                    
-                    if not node_type:
-                        logger.warning(f"⚠️  Node {obj.__name__} has no 'type' attribute, skipping...")
-                        continue
-                    
-                    if NodeRegistry.is_registered(node_type):
-                        logger.debug(f"   Node {node_type} already registered, skipping...")
-                        continue
-                    
-                    # Extract metadata from class attributes
-                    display_name = getattr(obj, 'display_name', node_type)
-                    description = getattr(obj, 'description', obj.__doc__ or "")
-                    category = getattr(obj, 'category', None)
-                    icon = getattr(obj, 'icon', None)
-                    
-                    # Register the node
-                    NodeRegistry.register(
-                        node_type=node_type,
-                        node_class=obj,
-                        display_name=display_name,
-                        description=description,
-                        icon=icon,
-                        category=category,
-                    )
-                    
-                    stats["nodes_registered"] += 1
-                    logger.debug(f"   ✅ Registered: {node_type} ({obj.__name__})")
-                    
-            except Exception as e:
-                error_msg = f"Error loading module {module_name}: {e}"
-                logger.warning(f"⚠️  {error_msg}")
-                stats["errors"].append(error_msg)
+    manifest_path = _manifest_path()
+    manifest = _read_manifest(manifest_path, fingerprint) if manifest_path else None
+    
+    if manifest is not None:
+        stats["manifest"] = "hit"
+        for node_type, entry in manifest["nodes"].items():
+            stats["nodes_found"] += 1
+            NodeRegistry.register_lazy(
+                node_type=node_type,
+                module=entry["module"],
+                class_name=entry["class_name"],
+                metadata=entry["metadata"],
+                details=entry["details"],
+            )
+        # Modules that failed to import or could not be cached
+        retry = set(manifest["failed_modules"]) | set(manifest["uncached_modules"])
+        to_import = [name for name in modules if name in retry]
+        stats["modules_scanned"] = len(modules) - len(to_import)
+    else:
+        if manifest_path:
+            stats["manifest"] = "rebuilt"
+        to_import = list(modules)
+    
+    failed_modules = []
+    for module_name in to_import:
+        try:
+            _import_and_register(module_name, stats)
+        except Exception as e:
+            error_msg = f"Error loading module {module_name}: {e}"
+            logger.warning(f"⚠️  {error_msg}")
+            stats["errors"].append(error_msg)
+            failed_modules.append(module_name)
+    
+    if manifest_path and (manifest is None or failed_modules != manifest["failed_modules"]):
+        # Built from scratch, or a module started (or stopped) importing
+        _write_manifest(manifest_path, fingerprint, modules, failed_modules, manifest)
     
     # Count actually registered nodes
     stats["nodes_registered"] = len(NodeRegistry.list_types())
     
     logger.info(
         f"✅ Node discovery complete: "
-        f"Scanned {stats['modules_scanned']} modules, "
+        f"Scanned {stats['modules_scanned']} modules "
+        f"({stats['modules_imported']} imported, manifest {stats['manifest']}), "
         f"Found {stats['nodes_found']} node classes, "
         f"Registered {stats['nodes_registered']} nodes"
     )
@@ -137,6 +131,204 @@ def discover_and_register_nodes() -> dict:
     return stats
 
 
+def _find_node_modules(node_directories: List[Tuple[Path, str]]) -> Dict[str, Path]:
+    """
+    Find node modules without importing them (same rules as pkgutil.walk_packages:
+    only directories with an __init__.py are descended into).
+    
+    Returns:
+        Dict of {module_name: source_path}, sorted by module name
+    """
+    modules = {}
+    for dir_path, prefix in node_directories:
+        if not dir_path.exists():
+            logger.debug(f"Directory {dir_path} does not exist, skipping...")
+            continue
+        
+        for path in dir_path.rglob("*.py"):
+            relative = path.relative_to(dir_path).with_suffix("")
+            module_name = ".".join([prefix, *relative.parts])
+            
+            # Skip __pycache__, __init__, and test files
+            if "__pycache__" in module_name or "__init__" in module_name or "test_" in module_name:
+                continue
+            
+            packages = relative.parents
+            if not all((dir_path / package / "__init__.py").exists() for package in packages if package.parts):
+                continue
+            if not all(part.isidentifier() for part in relative.parts):
+                continue
+            
+            modules[module_name] = path
+    
+    return dict(sorted(modules.items()))
+
+
+def _sources_fingerprint(modules: Dict[str, Path]) -> str:
+    """Hash of node module names, mtimes and sizes (plus the code building the manifest)"""
+    from app.core.nodes import base, capabilities, registry
+    
+    sources = [
+        (name, path) for name, path in modules.items()
+    ] + [
+        (module.__name__, Path(module.__file__))
+        for module in (sys.modules[__name__], base, capabilities, registry)
+    ]
+    
+    digest = hashlib.sha256(str(MANIFEST_FORMAT).encode())
+    for name, path in sources:
+        try:
+            stat = path.stat()
+            digest.update(f"{name}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+        except OSError:
+            digest.update(f"{name}:missing\n".encode())
+    return digest.hexdigest()
+
+
+def _manifest_path() -> Optional[Path]:
+    from app.config import settings
+    
+    path = getattr(settings, "NODE_MANIFEST_PATH", "")
+    return Path(path) if path else None
+
+
+def _read_manifest(path: Path, fingerprint: str) -> Optional[dict]:
+    """Load the manifest if it was built from the current sources"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️  Ignoring unreadable node manifest {path}: {e}")
+        return None
+    
+    if manifest.get("format") != MANIFEST_FORMAT or manifest.get("fingerprint") != fingerprint:
+        logger.info("🔄 Node sources changed since the manifest was built, importing all node modules")
+        return None
+    return manifest
+
+
+def _import_and_register(module_name: str, stats: dict) -> None:
+    """Import a node module and register its Node classes"""
+    module = importlib.import_module(module_name)
+    stats["modules_scanned"] += 1
+    stats["modules_imported"] += 1
+    
+    # Find all classes that inherit from Node
+    for name, obj in inspect.getmembers(module, inspect.isclass):
+        # Skip if not a Node subclass
+        if not issubclass(obj, Node) or obj is Node:
+            continue
+        
+        # Skip abstract classes
+        if inspect.isabstract(obj):
+            continue
+        
+        # Skip classes from other modules (imports)
+        if obj.__module__ != module_name:
+            continue
+        
+        stats["nodes_found"] += 1
+        
+        # Auto-register the node if not already registered
+        node_type = getattr(obj, 'type', None)
+        
+        if not node_type:
+            logger.warning(f"⚠️  Node {obj.__name__} has no 'type' attribute, skipping...")
+            continue
+        
+        if NodeRegistry.is_registered(node_type):
+            logger.debug(f"   Node {node_type} already registered, skipping...")
+            continue
+        
+        # Extract metadata from class attributes
+        display_name = getattr(obj, 'display_name', node_type)
+        description = getattr(obj, 'description', obj.__doc__ or "")
+        category = getattr(obj, 'category', None)
+        icon = getattr(obj, 'icon', None)
+        
+        # Register the node
+        NodeRegistry.register(
+            node_type=node_type,
+            node_class=obj,
+            display_name=display_name,
+            description=description,
+            icon=icon,
+            category=category,
+        )
+        
+        stats["nodes_registered"] += 1
+        logger.debug(f"   ✅ Registered: {node_type} ({obj.__name__})")
+
+
+def _write_manifest(
+    path: Path,
+    fingerprint: str,
+    modules: Dict[str, Path],
+    failed_modules: List[str],
+    previous: Optional[dict],
+) -> None:
+    """
+    Write the manifest from the registry (entries of manifest nodes that were
+    not imported are carried over from the previous manifest).
+    
+    Nodes whose metadata or schema is not JSON serializable are left out, and
+    their module is imported on every discovery instead (uncached_modules).
+    """
+    nodes = {}
+    uncached = set()
+    for node_type in NodeRegistry.list_types():
+        if not NodeRegistry.is_loaded(node_type) and previous and node_type in previous["nodes"]:
+            nodes[node_type] = previous["nodes"][node_type]
+            continue
+        
+        node_class = NodeRegistry.get(node_type)
+        if node_class is None:
+            continue
+        module_name = node_class.__module__
+        if module_name not in modules:
+            continue  # Registered outside the scanned directories
+        
+        entry = {
+            "module": module_name,
+            "class_name": node_class.__name__,
+            "metadata": NodeRegistry.get_metadata(node_type),
+            "details": NodeRegistry.get_details(node_type),
+        }
+        try:
+            json.dumps(entry)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Node {node_type} cannot be cached in the manifest: {e}")
+            uncached.add(module_name)
+            continue
+        if node_class.__qualname__ != node_class.__name__:
+            uncached.add(module_name)
+            continue
+        nodes[node_type] = entry
+    
+    # A module is either fully in the manifest or imported every time
+    nodes = {t: e for t, e in nodes.items() if e["module"] not in uncached}
+    
+    manifest = {
+        "format": MANIFEST_FORMAT,
+        "fingerprint": fingerprint,
+        "failed_modules": failed_modules,
+        "uncached_modules": sorted(uncached),
+        "nodes": nodes,
+    }
+    
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+        logger.info(f"💾 Node manifest written: {len(nodes)} nodes → {path}")
+    except OSError as e:
+        logger.warning(f"⚠️  Could not write node manifest {path}: {e}")
+
+
 def get_node_port_definitions(node_class: Type[Node]) -> dict:
     """
     Extract port definitions from a node class.
@@ -183,6 +375,7 @@ def get_node_config_schema(node_class: Type[Node]) -> dict:
     Automatically injects:
     - LLM config fields for nodes with LLMCapability
     - Export config fields for nodes with ExportCapability
+    - Event batching fields for nodes with TriggerCapability
     
     Calls the class method get_config_schema().
     
@@ -317,6 +510,79 @@ def get_node_config_schema(node_class: Type[Node]) -> dict:
             
             logger.debug(f"✨ Injected Export config fields for {node_class.__name__}")
         
+        # Check if node has TriggerCapability and inject event batching config
+        from app.core.nodes.capabilities import TriggerCapability
+        if issubclass(node_class, TriggerCapability):
+            # Inject batching fields at the end (see core/execution/trigger_batching.py)
+            batching_schema = {
+                "event_batching": {
+                    "type": "select",
+                    "widget": "select",
+                    "label": "Event Batching",
+                    "description": "Combine trigger events before starting executions",
+                    "required": False,
+                    "default": "off",
+                    "options": [
+                        {"label": "Off (one execution per event)", "value": "off"},
+                        {"label": "Batch (one execution per N events or T ms)", "value": "batch"},
+                        {"label": "Debounce (collapse rapid duplicate events)", "value": "debounce"}
+                    ],
+                    "help": "Batch sends a list of events to one execution. Debounce waits until duplicates stop arriving and runs once with the latest event.",
+                    "group": "Event Batching"
+                },
+                "batch_max_items": {
+                    "type": "integer",
+                    "widget": "number",
+                    "label": "Max Events per Batch",
+                    "description": "Start the execution once this many events are collected",
+                    "required": False,
+                    "default": 100,
+                    "min": 1,
+                    "max": 10000,
+                    "show_if": {"event_batching": "batch"},
+                    "group": "Event Batching"
+                },
+                "batch_window_ms": {
+                    "type": "integer",
+                    "widget": "number",
+                    "label": "Batch Window (ms)",
+                    "description": "Start the execution this long after the first event of a batch",
+                    "required": False,
+                    "default": 1000,
+                    "min": 0,
+                    "max": 3600000,
+                    "show_if": {"event_batching": "batch"},
+                    "group": "Event Batching"
+                },
+                "debounce_ms": {
+                    "type": "integer",
+                    "widget": "number",
+                    "label": "Quiet Period (ms)",
+                    "description": "Fire once no duplicate has arrived for this long",
+                    "required": False,
+                    "default": 500,
+                    "min": 0,
+                    "max": 3600000,
+                    "show_if": {"event_batching": "debounce"},
+                    "group": "Event Batching"
+                },
+                "debounce_key": {
+                    "type": "string",
+                    "widget": "text",
+                    "label": "Duplicate Key",
+                    "description": "Trigger data field that identifies duplicates (e.g. file_path)",
+                    "required": False,
+                    "placeholder": "file_path",
+                    "help": "Leave empty to treat only identical events as duplicates.",
+                    "show_if": {"event_batching": "debounce"},
+                    "group": "Event Batching"
+                }
+            }
+            
+            schema = {**schema, **batching_schema}
+            
+            logger.debug(f"✨ Injected event batching fields for {node_class.__name__}")
+        
         return schema
     except Exception as e:
         logger.debug(f"Error extracting config schema from {node_class.__name__}: {e}")
@@ -50,11 +50,30 @@ Old text format is still supported but deprecated:
     {"type": "text", "content": "...", "metadata": {...}}  # OLD - will show warning
 
 Use extract_content() to handle both old and new formats automatically.
+
+=== LAZY FILE-BACKED MEDIA ===
+
+Large media should flow between nodes as file references, not base64:
+
+    output = VideoFormatter.from_file_path("/data/uploads/video/big.mp4")
+    # -> MediaHandle: a regular file_path MediaFormat dict (JSON-serializable)
+    #    that only stats the file; nothing is loaded into memory
+
+Consumers materialize bytes/base64 only when they need them:
+
+    raw = media_bytes(input_data)          # bytes (reads file / decodes base64)
+    b64 = media_base64(input_data)         # base64 string
+    with open_media(input_data) as f: ...  # streaming file object
+    with input_data.mmap() as view: ...    # memory-mapped (MediaHandle only)
 """
 
 import base64
+import io
 import mimetypes
-from typing import Dict, Any, Optional, Union
+import mmap
+import os
+from contextlib import contextmanager
+from typing import Dict, Any, BinaryIO, Iterator, Optional, Union
 from pathlib import Path
 import logging
 
@@ -113,6 +132,104 @@ class MediaFormat:
         )
 
 
+class MediaHandle(dict):
+    """
+    Lazy, file-backed MediaFormat.
+    
+    A dict with the standard file_path MediaFormat keys, so it serializes,
+    persists and is understood by every existing consumer exactly like
+    {"data_type": "file_path", ...}. Creating one only stats the file;
+    bytes or base64 are produced on demand by the accessors below.
+    
+    Copies made with dict(...) lose the methods but stay valid file_path
+    MediaFormats; the module-level media_bytes / media_base64 / open_media
+    helpers handle both.
+    """
+    
+    def __init__(
+        self,
+        file_path: Union[str, Path],
+        media_type: Optional[str] = None,
+        format: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        path = Path(file_path)
+        mime_type, _ = mimetypes.guess_type(str(path))
+        
+        auto_metadata: Dict[str, Any] = {"file_name": path.name}
+        if mime_type:
+            auto_metadata["mime_type"] = mime_type
+        try:
+            auto_metadata["size_bytes"] = path.stat().st_size
+        except OSError:
+            pass  # File may be created later or live on another host
+        
+        super().__init__(
+            type=media_type or _media_type_from_mime(mime_type),
+            format=format or path.suffix.lstrip('.') or "unknown",
+            data=str(path),
+            data_type="file_path",
+            metadata={**auto_metadata, **(metadata or {})}
+        )
+    
+    @property
+    def path(self) -> Path:
+        """Path of the backing file."""
+        return Path(self["data"])
+    
+    @property
+    def size_bytes(self) -> Optional[int]:
+        """File size recorded when the handle was created."""
+        return self["metadata"].get("size_bytes")
+    
+    def read_bytes(self) -> bytes:
+        """Load the whole file."""
+        return self.path.read_bytes()
+    
+    def to_base64(self) -> str:
+        """Load the file as base64 (only for consumers that require it)."""
+        return base64.b64encode(self.read_bytes()).decode('utf-8')
+    
+    def open(self) -> BinaryIO:
+        """Open the file for streaming reads."""
+        return open(self.path, "rb")
+    
+    @contextmanager
+    def mmap(self) -> Iterator[mmap.mmap]:
+        """Memory-map the file read-only (pages are loaded on access)."""
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map empty files
+                yield b""
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield mapped
+            finally:
+                mapped.close()
+    
+    def iter_chunks(self, chunk_size: int = 1024 * 1024) -> Iterator[bytes]:
+        """Read the file in chunks."""
+        with self.open() as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+def _media_type_from_mime(mime_type: Optional[str]) -> str:
+    """Map a MIME type to a MediaFormat type."""
+    if mime_type:
+        if mime_type.startswith("image/"):
+            return "image"
+        if mime_type.startswith("audio/"):
+            return "audio"
+        if mime_type.startswith("video/"):
+            return "video"
+    return "document"
+
+
 # ==================== Formatters ====================
 
 class TextFormatter:
@@ -227,18 +344,17 @@ class ImageFormatter:
             metadata: Optional metadata
         
         Returns:
-            MediaFormat dictionary
+            Lazy MediaHandle (file_path MediaFormat; the file is not read)
         """
         if not format:
             format = Path(file_path).suffix.lstrip('.') or "png"
         
-        return MediaFormat(
+        return MediaHandle(
+            file_path,
             media_type="image",
             format=format,
-            data=file_path,
-            data_type="file_path",
-            metadata=metadata or {}
-        ).to_dict()
+            metadata=metadata
+        )
 
 
 class AudioFormatter:
@@ -287,13 +403,12 @@ class AudioFormatter:
         if not format:
             format = Path(file_path).suffix.lstrip('.') or "mp3"
         
-        return MediaFormat(
+        return MediaHandle(
+            file_path,
             media_type="audio",
             format=format,
-            data=file_path,
-            data_type="file_path",
-            metadata=metadata or {}
-        ).to_dict()
+            metadata=metadata
+        )
 
 
 class VideoFormatter:
@@ -327,13 +442,12 @@ class VideoFormatter:
         if not format:
             format = Path(file_path).suffix.lstrip('.') or "mp4"
         
-        return MediaFormat(
+        return MediaHandle(
+            file_path,
             media_type="video",
             format=format,
-            data=file_path,
-            data_type="file_path",
-            metadata=metadata or {}
-        ).to_dict()
+            metadata=metadata
+        )
 
 
 class DocumentFormatter:
@@ -382,19 +496,18 @@ class DocumentFormatter:
         if not format:
             format = Path(file_path).suffix.lstrip('.') or "pdf"
         
-        return MediaFormat(
+        return MediaHandle(
+            file_path,
             media_type="document",
             format=format,
-            data=file_path,
-            data_type="file_path",
-            metadata=metadata or {}
-        ).to_dict()
+            metadata=metadata
+        )
 
 
 # ==================== Helper Functions ====================
 
 def auto_format_media(
-    data: Union[str, bytes, Dict[str, Any]],
+    data: Union[str, bytes, Path, Dict[str, Any]],
     media_type: Optional[str] = None,
     format: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -418,11 +531,17 @@ def auto_format_media(
         
         # From base64
         result = auto_format_media("iVBORw0KG...", media_type="image", format="png")
+    
+    File paths become lazy MediaHandles: the file is only stat'ed, never read.
     """
-    # If already formatted, return as-is
+    # If already formatted, return as-is (includes MediaHandle)
     if isinstance(data, dict) and "type" in data and "data" in data:
         return data
     
+    # Path objects are always file references
+    if isinstance(data, Path):
+        return MediaHandle(data, media_type=media_type, format=format)
+    
     # If bytes, convert to base64
     if isinstance(data, bytes):
         data = base64.b64encode(data).decode('utf-8')
@@ -448,24 +567,7 @@ def auto_format_media(
             format = Path(data).suffix.lstrip('.') or "unknown"
     
     elif Path(data).exists() if len(data) < 500 else False:  # File path check (avoid checking long base64 strings)
-        data_type = "file_path"
-        if not format:
-            format = Path(data).suffix.lstrip('.') or "unknown"
-        
-        if not media_type:
-            # Detect from MIME type
-            mime_type, _ = mimetypes.guess_type(data)
-            if mime_type:
-                if mime_type.startswith("image/"):
-                    media_type = "image"
-                elif mime_type.startswith("audio/"):
-                    media_type = "audio"
-                elif mime_type.startswith("video/"):
-                    media_type = "video"
-                else:
-                    media_type = "document"
-            else:
-                media_type = "document"
+        return MediaHandle(data, media_type=media_type, format=format)
     
     else:
         # Assume base64
@@ -496,11 +598,64 @@ def is_media_format(data: Any) -> bool:
     return required_fields.issubset(data.keys())
 
 
-def extract_media_data(media: Dict[str, Any]) -> str:
-    """Extract raw data from MediaFormat"""
-    if is_media_format(media):
+def extract_media_data(media: Dict[str, Any], materialize: Optional[str] = None) -> Union[str, bytes]:
+    """
+    Extract raw data from MediaFormat.
+    
+    Args:
+        media: MediaFormat dict (or raw value, returned as-is)
+        materialize: None to return "data" as stored (base64, URL or file path),
+                     "bytes" or "base64" to load the content regardless of data_type
+    
+    Returns:
+        Stored data, or materialized bytes/base64
+    """
+    if not is_media_format(media):
+        return media
+    
+    if materialize == "bytes":
+        return media_bytes(media)
+    if materialize == "base64":
+        return media_base64(media)
+    return media["data"]
+
+
+def media_bytes(media: Dict[str, Any]) -> bytes:
+    """
+    Materialize MediaFormat content as bytes.
+    
+    Raises:
+        ValueError: For URL media (fetching is the consumer's job) or unknown data types
+    """
+    data_type = media.get("data_type")
+    
+    if data_type == "file_path":
+        return Path(media["data"]).read_bytes()
+    if data_type == "base64":
+        return base64.b64decode(media["data"])
+    if data_type == "string":
+        return media["data"].encode('utf-8')
+    
+    raise ValueError(f"Cannot materialize bytes for data_type '{data_type}'")
+
+
+def media_base64(media: Dict[str, Any]) -> str:
+    """Materialize MediaFormat content as base64 (no copy if already base64)."""
+    if media.get("data_type") == "base64":
         return media["data"]
-    return media
+    return base64.b64encode(media_bytes(media)).decode('utf-8')
+
+
+def open_media(media: Dict[str, Any]) -> BinaryIO:
+    """
+    Open MediaFormat content for streaming reads.
+    
+    File-backed media is read straight from disk; inline media is wrapped
+    in a BytesIO.
+    """
+    if media.get("data_type") == "file_path":
+        return open(media["data"], "rb")
+    return io.BytesIO(media_bytes(media))
 
 
 def extract_content(data: Any) -> Union[str, Dict[str, Any]]:
@@ -2,10 +2,17 @@
 Node Registry
 
 Central registry for all node types in the system.
+
+Nodes are registered either with their class (on import, via @register_node
+or the loader) or lazily from the node manifest (see loader.py): metadata,
+ports and config schema are known up front and the node module is imported
+the first time the class is needed.
 """
 
+import importlib
 import logging
-from typing import Dict, Type, Optional, List
+import threading
+from typing import Any, Dict, Type, Optional, List
 
 from app.core.nodes.base import Node
 
@@ -22,6 +29,15 @@ class NodeRegistry:
     
     _nodes: Dict[str, Type[Node]] = {}
     _node_metadata: Dict[str, Dict[str, any]] = {}
+    # Manifest nodes whose module is not imported yet: node_type → (module, class_name)
+    _lazy_nodes: Dict[str, tuple] = {}
+    # Ports, config schema and docstring from the manifest: node_type → details
+    _node_details: Dict[str, Dict[str, Any]] = {}
+    _import_lock = threading.RLock()
+    # Bumped whenever registered nodes change (see get_version)
+    _version: int = 0
+    # (version, list_all_with_details() result)
+    _details_cache: Optional[tuple] = None
     
     @classmethod
     def register(
@@ -32,6 +48,7 @@ class NodeRegistry:
         description: Optional[str] = None,
         icon: Optional[str] = None,
         category: Optional[str] = None,
+        version: Optional[str] = None,
     ) -> None:
         """
         Register a node type.
@@ -43,6 +60,7 @@ class NodeRegistry:
             description: Node description
             icon: Icon identifier
             category: Node category (string or NodeCategory enum)
+            version: Node implementation version (bump to invalidate cached results)
         
         Example:
             NodeRegistry.register(
@@ -66,29 +84,113 @@ class NodeRegistry:
             category_str = category.value
         
         cls._nodes[node_type] = node_class
+        cls._lazy_nodes.pop(node_type, None)
+        cls._node_details.pop(node_type, None)
+        cls._version += 1
         cls._node_metadata[node_type] = {
             "display_name": display_name or node_type,
             "description": description or "",
             "icon": icon,
             "category": category_str,
             "class_name": node_class.__name__,
+            "version": version,
         }
         
         logger.info(f"✅ Registered node type: {node_type} → {node_class.__name__}")
     
+    @classmethod
+    def register_lazy(
+        cls,
+        node_type: str,
+        module: str,
+        class_name: str,
+        metadata: Dict[str, Any],
+        details: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Register a node type from the manifest without importing its module.
+        
+        Args:
+            node_type: Unique identifier for node type
+            module: Module defining the node class
+            class_name: Name of the node class in that module
+            metadata: Registry metadata (display_name, description, icon, ...)
+            details: input_ports, output_ports, config_schema and docstring
+        """
+        if node_type in cls._nodes:
+            logger.debug(f"   Node {node_type} already loaded, skipping manifest entry")
+            return
+        
+        cls._lazy_nodes[node_type] = (module, class_name)
+        cls._node_metadata[node_type] = dict(metadata)
+        if details is not None:
+            cls._node_details[node_type] = details
+        cls._version += 1
     
     @classmethod
     def get(cls, node_type: str) -> Optional[Type[Node]]:
         """
         Get node class by type.
         
+        Imports the node module on first use for nodes registered from the
+        manifest.
+        
         Args:
             node_type: Node type identifier
         
         Returns:
             Node class or None if not found
         """
-        return cls._nodes.get(node_type)
+        node_class = cls._nodes.get(node_type)
+        if node_class is None and node_type in cls._lazy_nodes:
+            node_class = cls._load(node_type)
+        return node_class
+    
+    @classmethod
+    def _load(cls, node_type: str) -> Optional[Type[Node]]:
+        """Import the module of a manifest node and register its class"""
+        with cls._import_lock:
+            if node_type in cls._nodes:
+                return cls._nodes[node_type]
+            entry = cls._lazy_nodes.get(node_type)
+            if entry is None:
+                return None
+            module_name, class_name = entry
+            
+            try:
+                module = importlib.import_module(module_name)
+            except Exception as e:
+                logger.error(f"❌ Failed to import {module_name} for node {node_type}: {e}", exc_info=True)
+                cls._forget(node_type)
+                return None
+            
+            # Importing runs @register_node, unless the module was imported before
+            if node_type in cls._nodes:
+                return cls._nodes[node_type]
+            
+            node_class = getattr(module, class_name, None)
+            if not isinstance(node_class, type) or not issubclass(node_class, Node):
+                logger.error(f"❌ Node {node_type}: {module_name}.{class_name} is not a node class")
+                cls._forget(node_type)
+                return None
+            
+            cls._nodes[node_type] = node_class
+            cls._lazy_nodes.pop(node_type, None)
+            logger.info(f"📦 Loaded node type on first use: {node_type} → {class_name}")
+            return node_class
+    
+    @classmethod
+    def _forget(cls, node_type: str) -> None:
+        cls._nodes.pop(node_type, None)
+        cls._node_metadata.pop(node_type, None)
+        cls._lazy_nodes.pop(node_type, None)
+        cls._node_details.pop(node_type, None)
+        cls._version += 1
+    
+    @classmethod
+    def is_loaded(cls, node_type: str) -> bool:
+        """Check if the class of a node type is imported"""
+        return node_type in cls._nodes
     
     @classmethod
     def get_metadata(cls, node_type: str) -> Optional[Dict[str, any]]:
@@ -98,7 +200,7 @@ class NodeRegistry:
     @classmethod
     def list_types(cls) -> List[str]:
         """List all registered node types"""
-        return list(cls._nodes.keys())
+        return list(cls._node_metadata.keys())
     
     @classmethod
     def list_all(cls) -> Dict[str, Dict[str, any]]:
@@ -110,10 +212,10 @@ class NodeRegistry:
         """
         return {
             node_type: {
-                **cls._node_metadata[node_type],
+                **metadata,
                 "node_type": node_type,
             }
-            for node_type in cls._nodes.keys()
+            for node_type, metadata in cls._node_metadata.items()
         }
     
     @classmethod
@@ -121,36 +223,63 @@ class NodeRegistry:
         """
         List all registered nodes with full metadata including ports and config schema.
         
+        Manifest nodes are described from the manifest, without importing them.
+        The result is computed once per registry version.
+        
         Returns:
             Dictionary of {node_type: detailed_metadata}
         """
-        from app.core.nodes.loader import get_node_port_definitions, get_node_config_schema
+        version = cls._version
+        cached = cls._details_cache
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
         
         detailed = {}
-        for node_type, node_class in cls._nodes.items():
-            metadata = cls._node_metadata.get(node_type, {})
-            
-            # Get port definitions
-            port_defs = get_node_port_definitions(node_class)
-            
-            # Get config schema
-            config_schema = get_node_config_schema(node_class)
-            
+        for node_type in list(cls._node_metadata.keys()):
+            details = cls.get_details(node_type)
+            if details is None:
+                continue
             detailed[node_type] = {
-                **metadata,
+                **cls._node_metadata.get(node_type, {}),
                 "node_type": node_type,
-                "input_ports": port_defs.get("input_ports", []),
-                "output_ports": port_defs.get("output_ports", []),
-                "config_schema": config_schema,
-                "docstring": node_class.__doc__ or "",
+                **details,
             }
         
-        return detailed
+        cls._details_cache = (version, detailed)
+        return dict(detailed)
+    
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Registry version, bumped whenever a node is registered, unregistered or
+        re-registered (e.g. by custom node hot-reload).
+        
+        Use it to invalidate anything derived from the registered nodes.
+        """
+        return cls._version
+    
+    @classmethod
+    def get_details(cls, node_type: str) -> Optional[Dict[str, Any]]:
+        """
+        Get ports, config schema and docstring of a node type.
+        
+        Returns:
+            Dict with input_ports, output_ports, config_schema and docstring,
+            or None if not found
+        """
+        details = cls._node_details.get(node_type)
+        if details is not None:
+            return details
+        
+        node_class = cls.get(node_type)
+        if node_class is None:
+            return None
+        return describe_node_class(node_class)
     
     @classmethod
     def is_registered(cls, node_type: str) -> bool:
         """Check if node type is registered"""
-        return node_type in cls._nodes
+        return node_type in cls._node_metadata
     
     @classmethod
     def unregister(cls, node_type: str) -> bool:
@@ -163,9 +292,8 @@ class NodeRegistry:
         Returns:
             True if unregistered, False if not found
         """
-        if node_type in cls._nodes:
-            del cls._nodes[node_type]
-            del cls._node_metadata[node_type]
+        if node_type in cls._node_metadata:
+            cls._forget(node_type)
             logger.info(f"🗑️ Unregistered node type: {node_type}")
             return True
         return False
@@ -175,9 +303,30 @@ class NodeRegistry:
         """Clear all registered nodes (used for testing)"""
         cls._nodes.clear()
         cls._node_metadata.clear()
+        cls._lazy_nodes.clear()
+        cls._node_details.clear()
+        cls._version += 1
         logger.warning("🗑️ Cleared all registered nodes")
 
 
+def describe_node_class(node_class: Type[Node]) -> Dict[str, Any]:
+    """
+    Ports, config schema and docstring of a node class, as served to the editor.
+    
+    Returns:
+        Dict with input_ports, output_ports, config_schema and docstring
+    """
+    from app.core.nodes.loader import get_node_port_definitions, get_node_config_schema
+    
+    port_defs = get_node_port_definitions(node_class)
+    return {
+        "input_ports": port_defs.get("input_ports", []),
+        "output_ports": port_defs.get("output_ports", []),
+        "config_schema": get_node_config_schema(node_class),
+        "docstring": node_class.__doc__ or "",
+    }
+
+
 # Decorator for easy registration
 def register_node(
     node_type: str,
@@ -213,6 +362,7 @@ def register_node(
             description=description,
             icon=icon,
             category=category,
+            version=version,
         )
         return node_class
     
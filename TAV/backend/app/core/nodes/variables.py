@@ -7,16 +7,73 @@ Supports three modes:
 2. Variable references - Read from shared space (e.g., "node1.phone")
 3. Template strings - Mix text and variables (e.g., "Hello {{node1.name}}")
 4. System variables - Built-in variables (e.g., "{{system.current_date}}")
+
+Templates are compiled once into segment lists (literals, pre-split variable
+paths, system variable names) and cached by template string in a bounded LRU.
 """
 
 import re
 import logging
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 from datetime import datetime
 
+from app.security.encryption import decrypt_value, is_encrypted
+
 logger = logging.getLogger(__name__)
 
 
+# System variable name → formatter (applied to a single datetime.now())
+_SYSTEM_VARIABLE_FORMATTERS: Dict[str, Callable[[datetime], str]] = {
+    'current_date': lambda now: now.strftime('%Y-%m-%d'),
+    'current_time': lambda now: now.strftime('%H:%M:%S'),
+    'current_datetime': lambda now: now.strftime('%Y-%m-%d %H:%M:%S'),
+    'timestamp': lambda now: str(int(now.timestamp())),
+    'year': lambda now: str(now.year),
+    'month': lambda now: str(now.month),
+    'day': lambda now: str(now.day),
+    'hour': lambda now: str(now.hour),
+    'minute': lambda now: str(now.minute),
+    'second': lambda now: str(now.second),
+}
+
+# Max number of compiled templates kept in memory
+TEMPLATE_CACHE_SIZE = 1024
+
+
+class SystemVariables:
+    """
+    Lazily computed system variables for one resolution.
+    
+    datetime.now() is taken on first access and each variable is formatted
+    only when requested, so all placeholders in one template see the same
+    instant and unused variables cost nothing.
+    """
+    
+    __slots__ = ("_now", "_values")
+    
+    def __init__(self):
+        self._now: Optional[datetime] = None
+        self._values: Dict[str, str] = {}
+    
+    def get(self, var_name: str) -> Optional[str]:
+        """Get a system variable value, or None if the name is unknown."""
+        value = self._values.get(var_name)
+        if value is not None:
+            return value
+        
+        formatter = _SYSTEM_VARIABLE_FORMATTERS.get(var_name)
+        if formatter is None:
+            return None
+        
+        if self._now is None:
+            self._now = datetime.now()
+        
+        value = formatter(self._now)
+        self._values[var_name] = value
+        return value
+
+
 def get_system_variable(var_name: str) -> Optional[str]:
     """
     Get value for system variables.
@@ -27,22 +84,7 @@ def get_system_variable(var_name: str) -> Optional[str]:
     Returns:
         Value of the system variable or None if not found
     """
-    now = datetime.now()
-    
-    system_vars = {
-        'current_date': now.strftime('%Y-%m-%d'),
-        'current_time': now.strftime('%H:%M:%S'),
-        'current_datetime': now.strftime('%Y-%m-%d %H:%M:%S'),
-        'timestamp': str(int(now.timestamp())),
-        'year': str(now.year),
-        'month': str(now.month),
-        'day': str(now.day),
-        'hour': str(now.hour),
-        'minute': str(now.minute),
-        'second': str(now.second),
-    }
-    
-    return system_vars.get(var_name)
+    return SystemVariables().get(var_name)
 
 
 def resolve_variable(variable_path: str, variables: Dict[str, Any]) -> Optional[Any]:
@@ -77,6 +119,25 @@ def resolve_variable(variable_path: str, variables: Dict[str, Any]) -> Optional[
         logger.warning(f"Invalid variable path format: {variable_path} (expected 'node_id.field' or deeper)")
         return None
     
+    return _resolve_path(parts, variables)
+
+
+def _resolve_path(
+    parts: List[str],
+    variables: Dict[str, Any],
+    system_variables: Optional[SystemVariables] = None
+) -> Optional[Any]:
+    """
+    Resolve a pre-split variable path (at least two parts).
+    
+    Args:
+        parts: Path parts like ["node1", "response", "full_name"]
+        variables: Workflow variables dict
+        system_variables: System variables of the current resolution (optional)
+    
+    Returns:
+        Resolved value or None if not found
+    """
     node_key = parts[0]
     field_path = parts[1:]  # ["response", "full_name"]
 
@@ -98,7 +159,7 @@ def resolve_variable(variable_path: str, variables: Dict[str, Any]) -> Optional[
         # syntax for system variables is single braces: {current_date}.
         # We treat the remainder of the path as the system variable name.
         var_name = ".".join(field_path).strip()
-        value = get_system_variable(var_name)
+        value = (system_variables or SystemVariables()).get(var_name)
         if value is not None:
             logger.debug(f"Resolved system pseudo-node '{var_name}' → {value}")
             return value
@@ -136,7 +197,6 @@ def resolve_variable(variable_path: str, variables: Dict[str, Any]) -> Optional[
             logger.debug(f"Cannot access field '{field_key}' on non-dict value at '{partial_path}'")
             return None
     
-    logger.debug(f"Resolved variable '{variable_path}' → {current_value}")
     return current_value
 
 
@@ -175,42 +235,150 @@ def resolve_template(template: str, variables: Dict[str, Any]) -> str:
     if not isinstance(template, str):
         return str(template)
     
-    # First, resolve system variables {var} (single braces)
+    compiled = compile_template(template)
+    
+    if compiled is None:
+        # Template where a {{...}} placeholder spans a system variable
+        return _resolve_template_two_pass(template, variables)
+    
+    if compiled.is_static:
+        return template
+    
+    system_variables = SystemVariables()
+    parts = []
+    
+    for kind, value, raw in compiled.segments:
+        if kind == _LITERAL:
+            parts.append(value)
+        
+        elif kind == _SYSTEM:
+            resolved_value = system_variables.get(value)
+            parts.append(raw if resolved_value is None else resolved_value)
+        
+        else:  # _NODE
+            if value is None:
+                logger.warning(f"Invalid variable path format: {raw[2:-2]} (expected 'node_id.field' or deeper)")
+                parts.append(raw)
+                continue
+            
+            resolved_value = _resolve_path(value, variables, system_variables)
+            parts.append(raw if resolved_value is None else str(resolved_value))
+    
+    resolved = "".join(parts)
+    
+    if logger.isEnabledFor(logging.DEBUG) and resolved != template:
+        logger.debug(f"Resolved template: {template} → {resolved}")
+    
+    return resolved
+
+
+# ==================== TEMPLATE COMPILATION ====================
+
+# Match {word} but NOT {{word}} - use negative lookbehind and lookahead
+_SYSTEM_PLACEHOLDER = re.compile(r'(?<!\{)\{([^{}]+)\}(?!\})')
+_NODE_PLACEHOLDER = re.compile(r'\{\{([^}]+)\}\}')
+
+# Stands in for a system variable while node placeholders are located
+_SYSTEM_SENTINEL = "\x00"
+
+# Segment kinds
+_LITERAL = 0
+_SYSTEM = 1
+_NODE = 2
+
+Segment = Tuple[int, Union[str, List[str], None], str]  # (kind, value, placeholder text)
+
+
+class CompiledTemplate(NamedTuple):
+    """Template pre-parsed into literal, system variable and node variable segments."""
+    segments: Tuple[Segment, ...]
+    is_static: bool  # True if resolution can never change the template
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> Optional[CompiledTemplate]:
+    """
+    Compile a template into segments (cached by template string).
+    
+    Mirrors the two regex passes of the original resolver: single-brace
+    system placeholders are located first, then double-brace node
+    placeholders in the result. Node variable paths are split once here.
+    
+    Args:
+        template: Template string
+    
+    Returns:
+        CompiledTemplate, or None if the template must be resolved with the
+        two-pass resolver (a {{...}} placeholder spans a system variable)
+    """
+    if _SYSTEM_SENTINEL in template:
+        return None
+    
+    # Pass 1: system placeholders. Unknown names are literal text (with the
+    # name stripped, as the two-pass resolver writes them back).
+    system_names: List[Tuple[str, str]] = []  # (name, placeholder text)
+    
     def system_replacer(match):
         var_name = match.group(1).strip()
-        value = get_system_variable(var_name)
+        if var_name in _SYSTEM_VARIABLE_FORMATTERS:
+            system_names.append((var_name, f"{{{var_name}}}"))
+            return _SYSTEM_SENTINEL
+        return f"{{{var_name}}}"
+    
+    skeleton = _SYSTEM_PLACEHOLDER.sub(system_replacer, template)
+    
+    # Pass 2: node placeholders
+    segments: List[Segment] = []
+    system_iter = iter(system_names)
+    
+    def add_literal(text: str):
+        # Split literal text around system variable sentinels
+        pieces = text.split(_SYSTEM_SENTINEL)
+        for idx, piece in enumerate(pieces):
+            if idx:
+                name, raw = next(system_iter)
+                segments.append((_SYSTEM, name, raw))
+            if piece:
+                segments.append((_LITERAL, piece, piece))
+    
+    position = 0
+    for match in _NODE_PLACEHOLDER.finditer(skeleton):
+        if _SYSTEM_SENTINEL in match.group(1):
+            return None
         
-        if value is not None:
-            logger.debug(f"Resolved system variable '{var_name}' → {value}")
-            return str(value)
-        else:
-            # Keep placeholder if system variable not found
-            logger.debug(f"System variable '{var_name}' not found, keeping placeholder")
-            return f"{{{var_name}}}"
+        add_literal(skeleton[position:match.start()])
+        
+        var_path = match.group(1).strip()
+        path_parts = var_path.split(".")
+        segments.append((_NODE, path_parts if len(path_parts) >= 2 else None, f"{{{{{var_path}}}}}"))
+        position = match.end()
+    
+    add_literal(skeleton[position:])
+    
+    is_static = all(kind == _LITERAL for kind, _, _ in segments) and skeleton == template
+    
+    return CompiledTemplate(segments=tuple(segments), is_static=is_static)
+
+
+def _resolve_template_two_pass(template: str, variables: Dict[str, Any]) -> str:
+    """Resolve a template with two regex passes (fallback for templates that cannot be compiled)."""
+    system_variables = SystemVariables()
     
-    # Resolve single braces first (system variables)
-    # Match {word} but NOT {{word}} - use negative lookbehind and lookahead
-    resolved = re.sub(r'(?<!\{)\{([^{}]+)\}(?!\})', system_replacer, template)
+    def system_replacer(match):
+        var_name = match.group(1).strip()
+        value = system_variables.get(var_name)
+        # Keep placeholder if system variable not found
+        return f"{{{var_name}}}" if value is None else value
+    
+    resolved = _SYSTEM_PLACEHOLDER.sub(system_replacer, template)
     
-    # Then resolve node variables {{...}} (double braces)
     def node_replacer(match):
         var_path = match.group(1).strip()
         value = resolve_variable(var_path, variables)
-        
-        if value is not None:
-            logger.debug(f"Resolved node variable '{var_path}' → {value}")
-            return str(value)
-        else:
-            # Keep placeholder if variable not found
-            logger.debug(f"Node variable '{var_path}' not found, keeping placeholder")
-            return f"{{{{{var_path}}}}}"
-    
-    resolved = re.sub(r'\{\{([^}]+)\}\}', node_replacer, resolved)
+        # Keep placeholder if variable not found
+        return f"{{{{{var_path}}}}}" if value is None else str(value)
     
-    if resolved != template:
-        logger.debug(f"Resolved template: {template} → {resolved}")
-    
-    return resolved
+    return _NODE_PLACEHOLDER.sub(node_replacer, resolved)
 
 
 def resolve_config_value(config_value: Any, variables: Dict[str, Any]) -> Any:
@@ -258,13 +426,11 @@ def resolve_config_value(config_value: Any, variables: Dict[str, Any]) -> Any:
         "plain text"
     """
     # Step 1: Decrypt if encrypted (must happen before any template resolution)
-    if isinstance(config_value, str):
+    if isinstance(config_value, str) and is_encrypted(config_value):
         try:
-            from app.security.encryption import decrypt_value, is_encrypted
-            if is_encrypted(config_value):
-                config_value = decrypt_value(config_value)
+            config_value = decrypt_value(config_value)
         except Exception:
-            # If decryption fails or encryption module unavailable, continue with original value
+            # If decryption fails, continue with original value
             pass
     
     # Step 2: Handle structured format (new)
@@ -292,7 +458,7 @@ def resolve_config_value(config_value: Any, variables: Dict[str, Any]) -> Any:
             return ""
     
     # Step 3: Backward compatibility - plain string with {{...}} or {...}
-    elif isinstance(config_value, str) and ("{{" in config_value or "{" in config_value):
+    elif isinstance(config_value, str) and "{" in config_value:
         return resolve_template(config_value, variables)
     
     # Step 4: Plain value - return as-is
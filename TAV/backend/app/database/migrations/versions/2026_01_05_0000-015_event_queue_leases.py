@@ -0,0 +1,61 @@
+"""Add worker lease columns to event_queue
+
+Revision ID: 015_event_queue_leases
+Revises: 014_workflow_sharing_and_settings
+Create Date: 2026-01-05
+
+Execution workers claim events from event_queue with SELECT ... FOR UPDATE
+SKIP LOCKED and hold them under a renewable lease:
+- locked_by: worker identity holding the event
+- locked_until: lease expiry (expired leases are reclaimed by other workers)
+- heartbeat_at: last lease renewal
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "015_event_queue_leases"
+down_revision = "014_workflow_sharing_and_settings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add lease columns and claim index to event_queue."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # event_queue is created by Base.metadata.create_all on fresh installs
+    if "event_queue" not in inspector.get_table_names():
+        return
+
+    existing = {col["name"] for col in inspector.get_columns("event_queue")}
+
+    with op.batch_alter_table("event_queue", schema=None) as batch_op:
+        if "locked_by" not in existing:
+            batch_op.add_column(sa.Column("locked_by", sa.String(255), nullable=True))
+        if "locked_until" not in existing:
+            batch_op.add_column(sa.Column("locked_until", sa.DateTime(timezone=True), nullable=True))
+        if "heartbeat_at" not in existing:
+            batch_op.add_column(sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+        batch_op.create_index("idx_event_queue_claim", ["status", "event_type", "scheduled_for"], unique=False)
+        batch_op.create_index("idx_event_queue_locked_until", ["locked_until"], unique=False)
+
+
+def downgrade():
+    """Remove lease columns and claim index from event_queue."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    if "event_queue" not in inspector.get_table_names():
+        return
+
+    with op.batch_alter_table("event_queue", schema=None) as batch_op:
+        batch_op.drop_index("idx_event_queue_locked_until")
+        batch_op.drop_index("idx_event_queue_claim")
+        batch_op.drop_column("heartbeat_at")
+        batch_op.drop_column("locked_until")
+        batch_op.drop_column("locked_by")
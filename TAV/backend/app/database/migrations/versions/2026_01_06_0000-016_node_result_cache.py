@@ -0,0 +1,61 @@
+"""Create node_result_cache table
+
+Revision ID: 016_node_result_cache
+Revises: 015_event_queue_leases
+Create Date: 2026-01-06
+
+Memoized node outputs keyed by SHA-256 of (node type, node version,
+resolved config, inputs). Nodes opt in with cache_results; a cache hit
+skips the node and marks its result as cached.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "016_node_result_cache"
+down_revision = "015_event_queue_leases"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create node_result_cache table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # Created by Base.metadata.create_all on fresh installs
+    if "node_result_cache" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "node_result_cache",
+        sa.Column("cache_key", sa.String(64), nullable=False),
+        sa.Column("node_type", sa.String(100), nullable=False),
+        sa.Column("workflow_id", sa.String(36), nullable=True),
+        sa.Column("node_id", sa.String(255), nullable=True),
+        sa.Column("outputs", sa.JSON, nullable=False),
+        sa.Column("size_bytes", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("cache_key"),
+        sa.ForeignKeyConstraint(["workflow_id"], ["workflows.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_node_result_cache_node_type", "node_result_cache", ["node_type"])
+    op.create_index("ix_node_result_cache_workflow_id", "node_result_cache", ["workflow_id"])
+    op.create_index("ix_node_result_cache_last_used_at", "node_result_cache", ["last_used_at"])
+    op.create_index("ix_node_result_cache_expires_at", "node_result_cache", ["expires_at"])
+    op.create_index("idx_node_result_cache_workflow_node", "node_result_cache", ["workflow_id", "node_id"])
+
+
+def downgrade():
+    """Drop node_result_cache table."""
+    op.drop_index("idx_node_result_cache_workflow_node", table_name="node_result_cache")
+    op.drop_index("ix_node_result_cache_expires_at", table_name="node_result_cache")
+    op.drop_index("ix_node_result_cache_last_used_at", table_name="node_result_cache")
+    op.drop_index("ix_node_result_cache_workflow_id", table_name="node_result_cache")
+    op.drop_index("ix_node_result_cache_node_type", table_name="node_result_cache")
+    op.drop_table("node_result_cache")
@@ -0,0 +1,61 @@
+"""Create processed_files table
+
+Revision ID: 017_processed_files
+Revises: 016_node_result_cache
+Create Date: 2026-01-07
+
+Durable processed-file index for file polling triggers (path, size, mtime,
+content hash, status per trigger node), replacing the in-memory set that
+was lost on restart.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "017_processed_files"
+down_revision = "016_node_result_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create processed_files table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # Created by Base.metadata.create_all on fresh installs
+    if "processed_files" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "processed_files",
+        sa.Column("id", sa.Integer, autoincrement=True, nullable=False),
+        sa.Column("workflow_id", sa.String(36), nullable=True),
+        sa.Column("node_id", sa.String(255), nullable=False),
+        sa.Column("path_hash", sa.String(64), nullable=False),
+        sa.Column("path", sa.Text, nullable=False),
+        sa.Column("size_bytes", sa.BigInteger, nullable=False),
+        sa.Column("mtime_ns", sa.BigInteger, nullable=False),
+        sa.Column("content_hash", sa.String(64), nullable=True),
+        sa.Column("status", sa.String(20), nullable=False, server_default="triggered"),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["workflow_id"], ["workflows.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "idx_processed_files_lookup", "processed_files",
+        ["workflow_id", "node_id", "path_hash"], unique=True
+    )
+    op.create_index("idx_processed_files_status_updated", "processed_files", ["status", "updated_at"])
+    op.create_index("ix_processed_files_updated_at", "processed_files", ["updated_at"])
+
+
+def downgrade():
+    """Drop processed_files table."""
+    op.drop_index("ix_processed_files_updated_at", table_name="processed_files")
+    op.drop_index("idx_processed_files_status_updated", table_name="processed_files")
+    op.drop_index("idx_processed_files_lookup", table_name="processed_files")
+    op.drop_table("processed_files")
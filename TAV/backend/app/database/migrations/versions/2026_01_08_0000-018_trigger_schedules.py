@@ -0,0 +1,53 @@
+"""Create trigger_schedules table
+
+Revision ID: 018_trigger_schedules
+Revises: 017_processed_files
+Create Date: 2026-01-08
+
+Last/next fire time per schedule trigger node, used by the shared schedule
+timer to catch up on fires missed while the server was down.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "018_trigger_schedules"
+down_revision = "017_processed_files"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create trigger_schedules table."""
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+
+    # Created by Base.metadata.create_all on fresh installs
+    if "trigger_schedules" in inspector.get_table_names():
+        return
+
+    op.create_table(
+        "trigger_schedules",
+        sa.Column("id", sa.Integer, autoincrement=True, nullable=False),
+        sa.Column("workflow_id", sa.String(36), nullable=True),
+        sa.Column("node_id", sa.String(255), nullable=False),
+        sa.Column("schedule_key", sa.String(255), nullable=False),
+        sa.Column("last_fire_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("next_fire_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("fire_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["workflow_id"], ["workflows.id"], ondelete="CASCADE"),
+    )
+    op.create_index(
+        "idx_trigger_schedules_node", "trigger_schedules",
+        ["workflow_id", "node_id"], unique=True
+    )
+
+
+def downgrade():
+    """Drop trigger_schedules table."""
+    op.drop_index("idx_trigger_schedules_node", table_name="trigger_schedules")
+    op.drop_table("trigger_schedules")
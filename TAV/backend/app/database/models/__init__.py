@@ -15,6 +15,9 @@ from app.database.models.email_interaction import EmailInteraction
 from app.database.models.credential import Credential
 from app.database.models.workflow_state import WorkflowState
 from app.database.models.execution_iteration import ExecutionIteration
+from app.database.models.node_result_cache import NodeResultCacheEntry
+from app.database.models.processed_file import ProcessedFile
+from app.database.models.trigger_schedule import TriggerSchedule
 
 __all__ = [
     "Setting",
@@ -33,4 +36,7 @@ __all__ = [
     "Credential",
     "WorkflowState",
     "ExecutionIteration",
+    "NodeResultCacheEntry",
+    "ProcessedFile",
+    "TriggerSchedule",
 ]
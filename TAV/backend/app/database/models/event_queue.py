@@ -57,9 +57,18 @@ class EventQueue(Base):
     scheduled_for = Column(DateTime(timezone=True), default=get_current_timestamp, nullable=False, index=True)  # When to process
     processed_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Lease (set while a worker holds the event in 'processing')
+    # A lease that is not renewed by heartbeats before locked_until expires
+    # makes the event claimable again by another worker.
+    locked_by = Column(String(255), nullable=True)  # Worker identity (host:pid:suffix)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    
     # Composite index for efficient queue polling
     __table_args__ = (
         Index('idx_event_queue_status_priority', 'status', 'priority'),
+        Index('idx_event_queue_claim', 'status', 'event_type', 'scheduled_for'),
+        Index('idx_event_queue_locked_until', 'locked_until'),
         Index('idx_event_queue_workflow_id', 'workflow_id'),
         Index('idx_event_queue_event_type', 'event_type'),
         Index('idx_event_queue_scheduled_for', 'scheduled_for'),
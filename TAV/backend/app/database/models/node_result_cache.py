@@ -0,0 +1,53 @@
+"""
+Node Result Cache Model
+
+Memoized node outputs, reused across executions when a node runs again
+with identical type, version, resolved config and inputs.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, Index, JSON, ForeignKey
+
+from app.database.base import Base, get_current_timestamp
+
+
+class NodeResultCacheEntry(Base):
+    """
+    Cached outputs of one node run.
+
+    The key is a SHA-256 over (node type, node version, resolved config,
+    inputs). Entries expire after their TTL and are evicted least recently
+    used first when the cache exceeds its size limit.
+    """
+    __tablename__ = "node_result_cache"
+
+    cache_key = Column(String(64), primary_key=True, nullable=False)
+
+    node_type = Column(String(100), nullable=False, index=True)
+
+    # Workflow that produced the entry (for per-workflow invalidation)
+    workflow_id = Column(
+        String(36),
+        ForeignKey('workflows.id', ondelete='CASCADE'),
+        nullable=True,
+        index=True
+    )
+    node_id = Column(String(255), nullable=True)
+
+    # Cached outputs (port → value)
+    outputs = Column(JSON, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+
+    # Usage
+    hit_count = Column(Integer, nullable=False, default=0)
+
+    # Lifecycle
+    created_at = Column(DateTime(timezone=True), default=get_current_timestamp, nullable=False)
+    last_used_at = Column(DateTime(timezone=True), default=get_current_timestamp, nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)  # None = no TTL
+
+    __table_args__ = (
+        Index('idx_node_result_cache_workflow_node', 'workflow_id', 'node_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<NodeResultCacheEntry(key='{self.cache_key[:12]}', node_type='{self.node_type}', hits={self.hit_count})>"
@@ -0,0 +1,55 @@
+"""
+Processed File Model
+
+Durable index of files a file polling trigger has already seen, so a
+restart resumes without firing the workflow again for the same files.
+"""
+
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index, ForeignKey, Text
+
+from app.database.base import Base, get_current_timestamp
+
+
+class ProcessedFile(Base):
+    """
+    One file seen by one trigger node.
+
+    Looked up by (workflow_id, node_id, path_hash); path_hash is the SHA-256
+    of the absolute path so the unique index stays small for long paths.
+    A file counts as already processed while its size and mtime match.
+
+    Status:
+    - ignored: present when the trigger was first activated (ignore_existing)
+    - triggered: fired the workflow
+    - moved: fired and moved to the processed folder
+    - deleted: no longer in the watch folder (kept until compaction)
+    """
+    __tablename__ = "processed_files"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    workflow_id = Column(
+        String(36),
+        ForeignKey('workflows.id', ondelete='CASCADE'),
+        nullable=True
+    )
+    node_id = Column(String(255), nullable=False)
+
+    path_hash = Column(String(64), nullable=False)
+    path = Column(Text, nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+
+    status = Column(String(20), nullable=False, default="triggered")
+
+    first_seen_at = Column(DateTime(timezone=True), default=get_current_timestamp, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=get_current_timestamp, nullable=False, index=True)
+
+    __table_args__ = (
+        Index('idx_processed_files_lookup', 'workflow_id', 'node_id', 'path_hash', unique=True),
+        Index('idx_processed_files_status_updated', 'status', 'updated_at'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProcessedFile(node_id='{self.node_id}', path='{self.path}', status='{self.status}')>"
@@ -0,0 +1,45 @@
+"""
+Trigger Schedule Model
+
+Last and next fire time of each active schedule trigger, so the shared
+schedule timer can catch up on fires missed while the server was down.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime, Index, ForeignKey
+
+from app.database.base import Base, get_current_timestamp
+
+
+class TriggerSchedule(Base):
+    """
+    Fire times of one schedule trigger node.
+
+    schedule_key identifies the schedule (interval or cron expression); when
+    the node's schedule changes the stored times are ignored instead of
+    being caught up. Rows are removed when the workflow is deactivated by
+    the user (not on shutdown).
+    """
+    __tablename__ = "trigger_schedules"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    workflow_id = Column(
+        String(36),
+        ForeignKey('workflows.id', ondelete='CASCADE'),
+        nullable=True
+    )
+    node_id = Column(String(255), nullable=False)
+
+    schedule_key = Column(String(255), nullable=False)
+    last_fire_at = Column(DateTime(timezone=True), nullable=True)  # Last scheduled (not jittered) fire time
+    next_fire_at = Column(DateTime(timezone=True), nullable=True)
+    fire_count = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), default=get_current_timestamp, nullable=False)
+
+    __table_args__ = (
+        Index('idx_trigger_schedules_node', 'workflow_id', 'node_id', unique=True),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TriggerSchedule(node_id='{self.node_id}', next_fire_at='{self.next_fire_at}')>"
@@ -107,6 +107,32 @@ class CredentialRepository:
             logger.error(f"Error getting credential {credential_id}: {e}")
             return None
     
+    def get_by_ids(self, credential_ids: List[int], user_id: int) -> List[Credential]:
+        """
+        Get several credentials owned by a user in one query.
+        
+        Args:
+            credential_ids: Credential IDs
+            user_id: User ID (for ownership check)
+            
+        Returns:
+            List of found Credential objects (missing IDs are omitted)
+        """
+        if not credential_ids:
+            return []
+        
+        try:
+            return self.db.query(Credential).filter(
+                and_(
+                    Credential.id.in_(list(credential_ids)),
+                    Credential.user_id == user_id
+                )
+            ).all()
+            
+        except Exception as e:
+            logger.error(f"Error getting credentials {list(credential_ids)}: {e}")
+            return []
+    
     def list_by_user(
         self,
         user_id: int,
@@ -296,6 +322,32 @@ class CredentialRepository:
             self.db.rollback()
             return False
     
+    def update_last_used_many(self, credential_ids: List[int]) -> int:
+        """
+        Update the last_used_at timestamp for several credentials at once.
+        
+        Args:
+            credential_ids: Credential IDs
+            
+        Returns:
+            Number of credentials updated
+        """
+        if not credential_ids:
+            return 0
+        
+        try:
+            updated = self.db.query(Credential).filter(
+                Credential.id.in_(list(credential_ids))
+            ).update({Credential.last_used_at: get_local_now()}, synchronize_session=False)
+            self.db.commit()
+            
+            return updated
+            
+        except Exception as e:
+            logger.error(f"Error updating last_used for credentials {list(credential_ids)}: {e}")
+            self.db.rollback()
+            return 0
+    
     def exists(
         self,
         user_id: int,
@@ -0,0 +1,407 @@
+"""
+Event Queue Repository
+
+Queue operations on the event_queue table: enqueue, lease-based claiming,
+heartbeats, completion and failure.
+
+Claiming uses SELECT ... FOR UPDATE SKIP LOCKED so concurrent workers on
+PostgreSQL never block each other or pick the same row. On SQLite the lock
+clause is not rendered, so every claim is additionally guarded by a
+conditional UPDATE that only succeeds if the row is still claimable.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session
+
+from app.database.models.event_queue import EventQueue
+from app.database.models.execution import Execution
+from app.schemas.workflow import ExecutionStatus
+from app.utils.timezone import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+# Event statuses
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+class EventQueueRepository:
+    """
+    Repository for event_queue database operations.
+
+    All methods commit their own changes so callers can share one session
+    per worker loop without holding row locks across awaits.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def enqueue(
+        self,
+        event_type: str,
+        event_data: Dict[str, Any],
+        workflow_id: Optional[str] = None,
+        priority: int = 5,
+        scheduled_for: Optional[datetime] = None,
+        max_retries: int = 3
+    ) -> EventQueue:
+        """
+        Add an event to the queue.
+
+        Args:
+            event_type: Event type (e.g., workflow.execute)
+            event_data: JSON-serializable payload
+            workflow_id: Related workflow (optional)
+            priority: 1=highest, 10=lowest
+            scheduled_for: Earliest processing time (default: now)
+            max_retries: Lease expiries tolerated before the event is failed
+
+        Returns:
+            Created EventQueue row
+        """
+        now = get_local_now()
+        event = EventQueue(
+            event_type=event_type,
+            workflow_id=workflow_id,
+            priority=priority,
+            event_data=event_data,
+            status=STATUS_PENDING,
+            max_retries=max_retries,
+            created_at=now,
+            scheduled_for=scheduled_for or now,
+        )
+        self.db.add(event)
+        self.db.commit()
+        self.db.refresh(event)
+
+        logger.debug(f"📥 Enqueued {event_type} event {event.id} (priority={priority})")
+        return event
+
+    def get_by_id(self, event_id: str) -> Optional[EventQueue]:
+        """Get event by ID."""
+        return self.db.query(EventQueue).filter(EventQueue.id == event_id).first()
+
+    def claim(
+        self,
+        worker_id: str,
+        event_types: Iterable[str],
+        limit: int = 1,
+        lease_seconds: int = 60,
+        workflow_id: Optional[str] = None
+    ) -> List[EventQueue]:
+        """
+        Claim up to `limit` due events for a worker.
+
+        Claimable events are pending events whose scheduled_for has passed,
+        and processing events whose lease has expired (their worker died).
+        Reclaiming an expired lease counts as a retry; events past
+        max_retries are marked failed instead of being handed out again,
+        together with the execution they carry (if any).
+
+        Args:
+            worker_id: Identity of the claiming worker
+            event_types: Event types this worker handles
+            limit: Max events to claim
+            lease_seconds: Lease duration
+            workflow_id: Only claim events of this workflow (optional)
+
+        Returns:
+            List of claimed events (status=processing, locked_by=worker_id)
+        """
+        now = get_local_now()
+        event_types = list(event_types)
+
+        claimable = or_(
+            and_(
+                EventQueue.status == STATUS_PENDING,
+                EventQueue.scheduled_for <= now,
+            ),
+            and_(
+                EventQueue.status == STATUS_PROCESSING,
+                EventQueue.locked_until < now,
+            ),
+        )
+
+        if workflow_id is not None:
+            claimable = and_(EventQueue.workflow_id == workflow_id, claimable)
+
+        candidates = (
+            self.db.query(EventQueue.id, EventQueue.status, EventQueue.retry_count, EventQueue.max_retries)
+            .filter(EventQueue.event_type.in_(event_types), claimable)
+            .order_by(EventQueue.priority.asc(), EventQueue.scheduled_for.asc(), EventQueue.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        claimed_ids = []
+        for event_id, status, retry_count, max_retries in candidates:
+            is_reclaim = status == STATUS_PROCESSING
+
+            if is_reclaim and retry_count >= max_retries:
+                error_message = "Lease expired too many times (worker lost)"
+                given_up = self.db.query(EventQueue).filter(
+                    EventQueue.id == event_id,
+                    EventQueue.status == STATUS_PROCESSING,
+                    EventQueue.locked_until < now,
+                ).update({
+                    EventQueue.status: STATUS_FAILED,
+                    EventQueue.error_message: error_message,
+                    EventQueue.processed_at: now,
+                    EventQueue.locked_by: None,
+                    EventQueue.locked_until: None,
+                }, synchronize_session=False)
+                if given_up:
+                    self._fail_execution_of(event_id, error_message, now)
+                logger.warning(f"❌ Event {event_id} exceeded {max_retries} lease expiries, marked failed")
+                continue
+
+            # Conditional update: only wins if the row is still claimable
+            updated = self.db.query(EventQueue).filter(
+                EventQueue.id == event_id,
+                claimable,
+            ).update({
+                EventQueue.status: STATUS_PROCESSING,
+                EventQueue.locked_by: worker_id,
+                EventQueue.locked_until: now + timedelta(seconds=lease_seconds),
+                EventQueue.heartbeat_at: now,
+                EventQueue.retry_count: EventQueue.retry_count + (1 if is_reclaim else 0),
+            }, synchronize_session=False)
+
+            if updated:
+                claimed_ids.append(event_id)
+                if is_reclaim:
+                    logger.warning(f"♻️ Reclaimed event {event_id} from expired lease (retry {retry_count + 1})")
+
+        self.db.commit()
+
+        if not claimed_ids:
+            return []
+
+        events = self.db.query(EventQueue).filter(EventQueue.id.in_(claimed_ids)).all()
+        order = {event_id: idx for idx, event_id in enumerate(claimed_ids)}
+        return sorted(events, key=lambda e: order[e.id])
+
+    def _fail_execution_of(self, event_id: str, error_message: str, now: datetime):
+        """Fail the unfinished execution an event carries (not committed)."""
+        event_data = self.db.query(EventQueue.event_data).filter(EventQueue.id == event_id).scalar()
+        execution_id = (event_data or {}).get("execution_id")
+        if not execution_id:
+            return
+
+        failed = self.db.query(Execution).filter(
+            Execution.id == execution_id,
+            Execution.status.in_([ExecutionStatus.PENDING, ExecutionStatus.RUNNING]),
+        ).update({
+            Execution.status: ExecutionStatus.FAILED,
+            Execution.error_message: error_message,
+            Execution.completed_at: now,
+        }, synchronize_session=False)
+        if failed:
+            logger.warning(f"❌ Execution {execution_id} of event {event_id} marked failed")
+
+    def heartbeat(self, worker_id: str, event_ids: Iterable[str], lease_seconds: int = 60) -> int:
+        """
+        Renew leases held by a worker.
+
+        Args:
+            worker_id: Worker identity
+            event_ids: Events currently being processed by the worker
+            lease_seconds: New lease duration from now
+
+        Returns:
+            Number of leases renewed (lower than requested means a lease was lost)
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return 0
+
+        now = get_local_now()
+        renewed = self.db.query(EventQueue).filter(
+            EventQueue.id.in_(event_ids),
+            EventQueue.locked_by == worker_id,
+            EventQueue.status == STATUS_PROCESSING,
+        ).update({
+            EventQueue.locked_until: now + timedelta(seconds=lease_seconds),
+            EventQueue.heartbeat_at: now,
+        }, synchronize_session=False)
+        self.db.commit()
+        return renewed
+
+    def lost_leases(self, worker_id: str, event_ids: Iterable[str]) -> List[str]:
+        """
+        Find events a worker believes it is processing but no longer holds.
+
+        Args:
+            worker_id: Worker identity
+            event_ids: Events currently being processed by the worker
+
+        Returns:
+            IDs of events reclaimed by another worker or already released
+        """
+        event_ids = list(event_ids)
+        if not event_ids:
+            return []
+
+        held = {
+            row[0] for row in self.db.query(EventQueue.id).filter(
+                EventQueue.id.in_(event_ids),
+                EventQueue.locked_by == worker_id,
+                EventQueue.status == STATUS_PROCESSING,
+            ).all()
+        }
+        return [event_id for event_id in event_ids if event_id not in held]
+
+    def complete(self, event_id: str, worker_id: str, error_message: Optional[str] = None) -> bool:
+        """
+        Mark a claimed event as completed and release its lease.
+
+        Args:
+            event_id: Event ID
+            worker_id: Worker holding the lease
+            error_message: Optional note (e.g., the execution failed but the job ran)
+
+        Returns:
+            True if the worker still held the lease
+        """
+        updated = self.db.query(EventQueue).filter(
+            EventQueue.id == event_id,
+            EventQueue.locked_by == worker_id,
+        ).update({
+            EventQueue.status: STATUS_COMPLETED,
+            EventQueue.processed_at: get_local_now(),
+            EventQueue.error_message: error_message,
+            EventQueue.locked_by: None,
+            EventQueue.locked_until: None,
+        }, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    def fail(
+        self,
+        event_id: str,
+        worker_id: str,
+        error_message: str,
+        retry_delay_seconds: Optional[float] = None
+    ) -> bool:
+        """
+        Release a claimed event after a failure.
+
+        If retry_delay_seconds is given and retries remain, the event goes
+        back to pending and becomes due after the delay; otherwise it is
+        marked failed.
+
+        Args:
+            event_id: Event ID
+            worker_id: Worker holding the lease
+            error_message: Failure description
+            retry_delay_seconds: Delay before the event is retried (None = no retry)
+
+        Returns:
+            True if the worker still held the lease
+        """
+        event = self.get_by_id(event_id)
+        if not event or event.locked_by != worker_id:
+            return False
+
+        now = get_local_now()
+        event.error_message = error_message
+        event.locked_by = None
+        event.locked_until = None
+
+        if retry_delay_seconds is not None and event.retry_count < event.max_retries:
+            event.status = STATUS_PENDING
+            event.retry_count += 1
+            event.scheduled_for = now + timedelta(seconds=retry_delay_seconds)
+        else:
+            event.status = STATUS_FAILED
+            event.processed_at = now
+
+        self.db.commit()
+        return True
+
+    def get_depth(self, event_type: Optional[str] = None) -> Dict[str, int]:
+        """
+        Count events by status.
+
+        Args:
+            event_type: Restrict to one event type (optional)
+
+        Returns:
+            Dict of status → count
+        """
+        query = self.db.query(EventQueue.status, func.count(EventQueue.id))
+        if event_type:
+            query = query.filter(EventQueue.event_type == event_type)
+        return {status: count for status, count in query.group_by(EventQueue.status).all()}
+
+    def get_backlog(self, event_type: str) -> Dict[Optional[str], Dict[str, Any]]:
+        """
+        Pending events per workflow.
+
+        Args:
+            event_type: Event type
+
+        Returns:
+            Dict of workflow_id → {"pending": int, "oldest_at": datetime}
+        """
+        rows = (
+            self.db.query(EventQueue.workflow_id, func.count(EventQueue.id), func.min(EventQueue.created_at))
+            .filter(EventQueue.event_type == event_type, EventQueue.status == STATUS_PENDING)
+            .group_by(EventQueue.workflow_id)
+            .all()
+        )
+        return {workflow_id: {"pending": count, "oldest_at": oldest_at} for workflow_id, count, oldest_at in rows}
+
+    def _pending_query(self, event_type: str, workflow_id: Optional[str]):
+        return self.db.query(EventQueue).filter(
+            EventQueue.event_type == event_type,
+            EventQueue.workflow_id == workflow_id,
+            EventQueue.status == STATUS_PENDING,
+        )
+
+    def newest_pending(self, event_type: str, workflow_id: Optional[str]) -> Optional[EventQueue]:
+        """Most recently scheduled pending event of a workflow."""
+        return (
+            self._pending_query(event_type, workflow_id)
+            .order_by(EventQueue.scheduled_for.desc(), EventQueue.created_at.desc())
+            .first()
+        )
+
+    def delete_pending(self, event_type: str, workflow_id: Optional[str], limit: Optional[int] = None) -> int:
+        """
+        Delete pending events of a workflow, oldest first.
+
+        Args:
+            event_type: Event type
+            workflow_id: Workflow
+            limit: Max events to delete (None = all)
+
+        Returns:
+            Number of events deleted
+        """
+        query = self._pending_query(event_type, workflow_id)
+        if limit is not None:
+            ids = [
+                event_id for (event_id,) in query.with_entities(EventQueue.id)
+                .order_by(EventQueue.scheduled_for.asc(), EventQueue.created_at.asc())
+                .limit(limit)
+                .all()
+            ]
+            query = self.db.query(EventQueue).filter(EventQueue.id.in_(ids))
+        deleted = query.delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
@@ -0,0 +1,205 @@
+"""
+Processed File Repository
+
+Durable processed-file index for file polling triggers (processed_files
+table): load a trigger node's index at startup, record fired/ignored files,
+tombstone deleted ones and compact old rows.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database.models.processed_file import ProcessedFile
+from app.utils.timezone import get_local_now
+
+logger = logging.getLogger(__name__)
+
+
+# Statuses
+STATUS_IGNORED = "ignored"
+STATUS_TRIGGERED = "triggered"
+STATUS_MOVED = "moved"
+STATUS_DELETED = "deleted"
+
+# Files no longer in the watch folder - safe to compact
+INACTIVE_STATUSES = (STATUS_MOVED, STATUS_DELETED)
+
+_CHUNK = 500
+
+
+def path_hash(path: str) -> str:
+    """Lookup key for a file path"""
+    return hashlib.sha256(path.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+class ProcessedFileRepository:
+    """
+    Repository for processed_files database operations.
+
+    Rows are scoped to (workflow_id, node_id). All methods commit their own
+    changes.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def load(self, workflow_id: Optional[str], node_id: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Files still in the watch folder when last seen.
+
+        Returns:
+            Dict of path → (size_bytes, mtime_ns)
+        """
+        rows = self.db.query(
+            ProcessedFile.path, ProcessedFile.size_bytes, ProcessedFile.mtime_ns
+        ).filter(
+            ProcessedFile.workflow_id == workflow_id,
+            ProcessedFile.node_id == node_id,
+            ProcessedFile.status.notin_(INACTIVE_STATUSES),
+        ).all()
+        return {path: (size, mtime_ns) for path, size, mtime_ns in rows}
+
+    def count(self, workflow_id: Optional[str], node_id: str) -> int:
+        """Total rows (any status) for a trigger node"""
+        return self.db.query(func.count(ProcessedFile.id)).filter(
+            ProcessedFile.workflow_id == workflow_id,
+            ProcessedFile.node_id == node_id,
+        ).scalar() or 0
+
+    def record(
+        self,
+        workflow_id: Optional[str],
+        node_id: str,
+        files: Iterable[Dict],
+        status: str = STATUS_TRIGGERED
+    ) -> int:
+        """
+        Insert or update files.
+
+        Args:
+            workflow_id: Workflow of the trigger node
+            node_id: Trigger node
+            files: Dicts with path, size_bytes, mtime_ns and optional content_hash
+            status: Status to store
+
+        Returns:
+            Number of files recorded
+        """
+        files = list(files)
+        now = get_local_now()
+        for start in range(0, len(files), _CHUNK):
+            chunk = {path_hash(f["path"]): f for f in files[start:start + _CHUNK]}
+            existing = {
+                row.path_hash: row
+                for row in self.db.query(ProcessedFile).filter(
+                    ProcessedFile.workflow_id == workflow_id,
+                    ProcessedFile.node_id == node_id,
+                    ProcessedFile.path_hash.in_(list(chunk)),
+                )
+            }
+            for key, f in chunk.items():
+                row = existing.get(key)
+                if row is None:
+                    row = ProcessedFile(
+                        workflow_id=workflow_id, node_id=node_id, path_hash=key,
+                        path=f["path"], first_seen_at=now,
+                    )
+                    self.db.add(row)
+                row.size_bytes = f["size_bytes"]
+                row.mtime_ns = f["mtime_ns"]
+                row.content_hash = f.get("content_hash") or row.content_hash
+                row.status = status
+                row.updated_at = now
+            self.db.commit()
+        return len(files)
+
+    def mark_deleted(self, workflow_id: Optional[str], node_id: str, paths: Iterable[str]) -> int:
+        """Tombstone files that left the watch folder (moved files keep their status)"""
+        keys = [path_hash(path) for path in paths]
+        updated = 0
+        for start in range(0, len(keys), _CHUNK):
+            updated += self.db.query(ProcessedFile).filter(
+                ProcessedFile.workflow_id == workflow_id,
+                ProcessedFile.node_id == node_id,
+                ProcessedFile.path_hash.in_(keys[start:start + _CHUNK]),
+                ProcessedFile.status.notin_(INACTIVE_STATUSES),
+            ).update({"status": STATUS_DELETED, "updated_at": get_local_now()}, synchronize_session=False)
+        self.db.commit()
+        return updated
+
+    def compact(
+        self,
+        retention_days: int,
+        max_entries: int,
+        workflow_id: Optional[str] = None,
+        node_id: Optional[str] = None
+    ) -> int:
+        """
+        Delete rows of files that are gone.
+
+        - moved/deleted rows older than retention_days
+        - then the oldest moved/deleted rows of any trigger node above
+          max_entries (rows of files still present are never removed, that
+          would fire the workflow for them again)
+
+        Args:
+            retention_days: Age limit for moved/deleted rows (0 = no age limit)
+            max_entries: Row limit per trigger node (0 = unlimited)
+            workflow_id, node_id: Only compact this trigger node (default: all)
+
+        Returns:
+            Number of rows deleted
+        """
+        scope = []
+        if node_id is not None:
+            scope = [ProcessedFile.workflow_id == workflow_id, ProcessedFile.node_id == node_id]
+
+        deleted = 0
+        if retention_days:
+            cutoff = get_local_now() - timedelta(days=retention_days)
+            deleted += self.db.query(ProcessedFile).filter(
+                *scope,
+                ProcessedFile.status.in_(INACTIVE_STATUSES),
+                ProcessedFile.updated_at < cutoff,
+            ).delete(synchronize_session=False)
+            self.db.commit()
+
+        if max_entries:
+            oversized = self.db.query(
+                ProcessedFile.workflow_id, ProcessedFile.node_id, func.count(ProcessedFile.id)
+            ).filter(*scope).group_by(
+                ProcessedFile.workflow_id, ProcessedFile.node_id
+            ).having(func.count(ProcessedFile.id) > max_entries).all()
+
+            for scope_workflow_id, scope_node_id, total in oversized:
+                excess = total - max_entries
+                ids = [row_id for (row_id,) in self.db.query(ProcessedFile.id).filter(
+                    ProcessedFile.workflow_id == scope_workflow_id,
+                    ProcessedFile.node_id == scope_node_id,
+                    ProcessedFile.status.in_(INACTIVE_STATUSES),
+                ).order_by(ProcessedFile.updated_at.asc()).limit(excess)]
+                for start in range(0, len(ids), _CHUNK):
+                    deleted += self.db.query(ProcessedFile).filter(
+                        ProcessedFile.id.in_(ids[start:start + _CHUNK])
+                    ).delete(synchronize_session=False)
+                self.db.commit()
+                if len(ids) < excess:
+                    logger.warning(
+                        f"⚠️  Processed-file index for trigger {scope_node_id} holds "
+                        f"{total - len(ids)} files still in its watch folder (limit {max_entries})"
+                    )
+
+        if deleted:
+            logger.info(f"🧹 Compacted {deleted} processed-file index rows")
+        return deleted
@@ -0,0 +1,101 @@
+"""
+Trigger Schedule Repository
+
+Fire times of schedule trigger nodes (trigger_schedules table): load them
+when a schedule is registered, save them in batches after the schedule
+timer dispatches, and forget them when a workflow is deactivated.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.database.models.trigger_schedule import TriggerSchedule
+from app.utils.timezone import get_local_now, get_local_timezone
+
+logger = logging.getLogger(__name__)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """SQLite returns naive datetimes - they were stored in local time"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=get_local_timezone())
+    return value
+
+
+class TriggerScheduleRepository:
+    """
+    Repository for trigger_schedules database operations.
+
+    Rows are scoped to (workflow_id, node_id). All methods commit their own
+    changes.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize repository.
+
+        Args:
+            db: SQLAlchemy database session
+        """
+        self.db = db
+
+    def get(self, workflow_id: Optional[str], node_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored fire times of a schedule trigger node.
+
+        Returns:
+            Dict with schedule_key, last_fire_at, next_fire_at, fire_count
+            (None when the node has no row)
+        """
+        row = self.db.query(TriggerSchedule).filter(
+            TriggerSchedule.workflow_id == workflow_id,
+            TriggerSchedule.node_id == node_id,
+        ).first()
+        if row is None:
+            return None
+        return {
+            "schedule_key": row.schedule_key,
+            "last_fire_at": _aware(row.last_fire_at),
+            "next_fire_at": _aware(row.next_fire_at),
+            "fire_count": row.fire_count,
+        }
+
+    def save_many(self, states: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or update fire times in one transaction.
+
+        Args:
+            states: Dicts with workflow_id, node_id, schedule_key,
+                    last_fire_at, next_fire_at, fire_count
+
+        Returns:
+            Number of rows saved
+        """
+        states = list(states)
+        now = get_local_now()
+        for state in states:
+            row = self.db.query(TriggerSchedule).filter(
+                TriggerSchedule.workflow_id == state["workflow_id"],
+                TriggerSchedule.node_id == state["node_id"],
+            ).first()
+            if row is None:
+                row = TriggerSchedule(workflow_id=state["workflow_id"], node_id=state["node_id"])
+                self.db.add(row)
+            row.schedule_key = state["schedule_key"]
+            row.last_fire_at = state.get("last_fire_at")
+            row.next_fire_at = state.get("next_fire_at")
+            row.fire_count = state.get("fire_count", 0)
+            row.updated_at = now
+        self.db.commit()
+        return len(states)
+
+    def delete_for_workflow(self, workflow_id: str) -> int:
+        """Forget the fire times of a workflow's schedule triggers"""
+        deleted = self.db.query(TriggerSchedule).filter(
+            TriggerSchedule.workflow_id == workflow_id
+        ).delete(synchronize_session=False)
+        self.db.commit()
+        return deleted
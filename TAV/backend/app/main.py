@@ -2,6 +2,7 @@
 TAV Engine - Main FastAPI Application Entry Point
 """
 
+import asyncio
 import logging
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -223,7 +224,40 @@ async def startup_event():
         logger.info("🧹 Cleaning up orphaned executions from previous session...")
         db = SessionLocal()
         try:
-            cleanup_orphaned_executions_on_startup(db)
+            recovery = cleanup_orphaned_executions_on_startup(db)
+            
+            # Resume interrupted executions from their durable checkpoint
+            if recovery["resume"]:
+                from app.database.models import Execution
+                from app.core.execution.worker import is_queue_backend, enqueue_resume
+                from app.core.execution.orchestrator import WorkflowOrchestrator
+                
+                async def resume_background(execution_id: str):
+                    """Background task to resume an interrupted execution"""
+                    resume_db = SessionLocal()
+                    try:
+                        await WorkflowOrchestrator(resume_db).resume_execution(execution_id)
+                    except Exception as e:
+                        logger.error(f"❌ Failed to resume execution {execution_id}: {e}", exc_info=True)
+                    finally:
+                        resume_db.close()
+                
+                for execution_id in recovery["resume"]:
+                    if is_queue_backend():
+                        workflow_id = db.query(Execution.workflow_id).filter(Execution.id == execution_id).scalar()
+                        enqueue_resume(db, execution_id, workflow_id)
+                    else:
+                        asyncio.create_task(resume_background(execution_id))
+                
+                logger.info(f"♻️ Resuming {len(recovery['resume'])} interrupted execution(s)")
+            
+            # Stop hibernated executions at their deadline
+            from app.core.execution.hibernation import schedule_hibernated_deadlines
+            schedule_hibernated_deadlines(db)
+            
+            # Seed node duration estimates used for critical path scheduling
+            from app.core.execution.scheduling import load_duration_history
+            load_duration_history(db)
         finally:
             db.close()
             
@@ -245,6 +279,42 @@ async def startup_event():
             """Callback for triggers to spawn executions"""
             db = SessionLocal()
             try:
+                from app.core.execution.worker import is_queue_backend, enqueue_execution
+                
+                if is_queue_backend():
+                    # Queue mode: create PENDING record and hand it to a worker
+                    from uuid import uuid4
+                    from app.database.models import Execution, Workflow
+                    from app.schemas.workflow import ExecutionStatus
+                    from app.utils.timezone import get_local_now
+                    
+                    workflow_db = db.query(Workflow).filter(Workflow.id == workflow_id).first()
+                    if not workflow_db:
+                        raise ValueError(f"Workflow not found: {workflow_id}")
+                    
+                    execution_id = str(uuid4())
+                    db.add(Execution(
+                        id=execution_id,
+                        workflow_id=workflow_id,
+                        status=ExecutionStatus.PENDING,
+                        execution_source=execution_source,
+                        trigger_data=trigger_data or {},
+                        started_at=get_local_now(),
+                        execution_mode=ExecutionMode.PARALLEL,
+                        workflow_snapshot=workflow_db.workflow_data
+                    ))
+                    db.commit()
+                    
+                    enqueue_execution(
+                        db,
+                        execution_id=execution_id,
+                        workflow_id=workflow_id,
+                        trigger_data=trigger_data,
+                        execution_source=execution_source,
+                        execution_mode=ExecutionMode.PARALLEL
+                    )
+                    return execution_id
+                
                 orchestrator = WorkflowOrchestrator(db)
                 execution_id = await orchestrator.execute_workflow(
                     workflow_id=workflow_id,
@@ -273,6 +343,19 @@ async def startup_event():
         # Don't crash the app, but triggers won't work
         app.state.trigger_manager = None
     
+    # Warm compute worker processes (CPU-bound nodes run there)
+    if settings.COMPUTE_WARM_WORKERS:
+        try:
+            from app.core.execution.compute import get_compute_pool
+            await get_compute_pool().warm()
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to warm compute pool (workers start on first use): {e}")
+    
+    # Debug: report nodes that block the event loop
+    if settings.LOOP_STALL_DETECTION:
+        from app.core.execution.blocking import start_stall_detector
+        start_stall_detector()
+    
     logger.info("✅ TAV Engine startup complete")
 
 
@@ -290,6 +373,28 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"❌ Error during TriggerManager shutdown: {e}", exc_info=True)
     
+    # Wait for schedule fires already dispatched (before the blocking pool goes)
+    try:
+        from app.core.execution.schedule_timer import shutdown_schedule_timer
+        await shutdown_schedule_timer()
+    except Exception as e:
+        logger.error(f"❌ Error during schedule timer shutdown: {e}", exc_info=True)
+    
+    # Stop compute worker processes
+    try:
+        from app.core.execution.compute import shutdown_compute_pool
+        shutdown_compute_pool()
+    except Exception as e:
+        logger.error(f"❌ Error during compute pool shutdown: {e}", exc_info=True)
+    
+    # Stop blocking I/O threads and the stall detector
+    try:
+        from app.core.execution.blocking import shutdown_blocking_pool, stop_stall_detector
+        stop_stall_detector()
+        shutdown_blocking_pool()
+    except Exception as e:
+        logger.error(f"❌ Error during blocking pool shutdown: {e}", exc_info=True)
+    
     logger.info("✅ TAV Engine shutdown complete")
 
 
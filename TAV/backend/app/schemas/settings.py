@@ -34,6 +34,12 @@ class ExecutionSettings(BaseModel):
         le=200,
         description="Max total workflow runs system-wide"
     )
+    max_queued_runs_global: int = Field(
+        default=100, 
+        ge=0, 
+        le=10000,
+        description="Max manual/API runs waiting for a slot (beyond this: HTTP 429)"
+    )
     max_concurrent_runs_per_workflow: int = Field(
         default=20, 
         ge=1, 
@@ -46,6 +52,11 @@ class ExecutionSettings(BaseModel):
         le=10000,
         description="Max queued executions per workflow"
     )
+    trigger_overflow_policy: Literal["spill", "drop_oldest", "drop_newest", "coalesce"] = Field(
+        default="spill",
+        description="Trigger events beyond max_queue_depth_per_workflow: keep queuing (spill), "
+                    "drop the oldest or the new event, or merge into the newest queued event"
+    )
     
     # Timeouts & Limits (seconds)
     default_timeout: int = Field(
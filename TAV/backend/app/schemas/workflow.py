@@ -140,6 +140,10 @@ class NodePort(BaseModel):
         default=False,
         description="Hidden ports (for framework-injected data)"
     )
+    streaming: bool = Field(
+        default=False,
+        description="Output: may carry an async iterator of chunks. Input: accepts chunks incrementally instead of a list"
+    )
     metadata: Dict[str, Any] = Field(
         default_factory=dict,
         description="Additional port metadata"
@@ -161,6 +165,7 @@ class NodePort(BaseModel):
                 "default_value": None,
                 "validation": None,
                 "hidden": False,
+                "streaming": False,
                 "metadata": {}
             }
         }
@@ -207,6 +212,24 @@ class NodeConfiguration(BaseModel):
         description="Custom variable name for shared state (defaults to node name if not provided)"
     )
     
+    # Result caching (reuse outputs across executions for identical inputs)
+    cache_results: bool = Field(
+        default=False,
+        description="Reuse outputs from an earlier run with the same config and inputs (opt-in)"
+    )
+    cache_ttl: Optional[int] = Field(
+        default=None,
+        description="Cached result lifetime in seconds (defaults to the workflow's result_cache_ttl)"
+    )
+
+    # Scheduling (order among ready nodes competing for the same resource pool)
+    priority: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=10,
+        description="Scheduling priority, 1=highest, 10=lowest (defaults to the workflow's priority)"
+    )
+
     # Visual positioning (for editors)
     position: Dict[str, float] = Field(
         default_factory=lambda: {"x": 0, "y": 0},
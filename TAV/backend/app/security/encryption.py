@@ -6,28 +6,52 @@ Uses Fernet (symmetric encryption) from cryptography library.
 """
 
 from cryptography.fernet import Fernet
+from functools import lru_cache
 from typing import Optional
 import base64
 import hashlib
 
 
-def _get_fernet_key() -> bytes:
+def _get_fernet_key(encryption_key: Optional[str] = None) -> bytes:
     """
     Get Fernet-compatible key from ENCRYPTION_KEY.
     
     Fernet requires a 32-byte base64-encoded key.
     We hash the ENCRYPTION_KEY to ensure it's the right format.
+    
+    Args:
+        encryption_key: Raw key (defaults to settings.ENCRYPTION_KEY)
     """
-    from app.config import settings
+    if encryption_key is None:
+        from app.config import settings
+        encryption_key = settings.ENCRYPTION_KEY
     
     # Hash the encryption key to get consistent 32 bytes
-    key_bytes = settings.ENCRYPTION_KEY.encode('utf-8')
+    key_bytes = encryption_key.encode('utf-8')
     hashed = hashlib.sha256(key_bytes).digest()
     
     # Fernet needs base64-encoded 32 bytes
     return base64.urlsafe_b64encode(hashed)
 
 
+@lru_cache(maxsize=4)
+def _get_cipher(encryption_key: str) -> Fernet:
+    """
+    Build (and cache) the Fernet cipher for an encryption key.
+    
+    Keyed on the raw ENCRYPTION_KEY so the key derivation runs once per
+    process, while a changed key still gets a fresh cipher.
+    """
+    return Fernet(_get_fernet_key(encryption_key))
+
+
+def _get_fernet() -> Fernet:
+    """Get the process-cached Fernet cipher for the current ENCRYPTION_KEY."""
+    from app.config import settings
+    
+    return _get_cipher(settings.ENCRYPTION_KEY)
+
+
 def encrypt_value(value: str) -> str:
     """
     Encrypt a string value.
@@ -47,7 +71,7 @@ def encrypt_value(value: str) -> str:
         return value
     
     try:
-        fernet = Fernet(_get_fernet_key())
+        fernet = _get_fernet()
         encrypted_bytes = fernet.encrypt(value.encode('utf-8'))
         return encrypted_bytes.decode('utf-8')
     except Exception as e:
@@ -74,7 +98,7 @@ def decrypt_value(encrypted_value: str) -> str:
         return encrypted_value
     
     try:
-        fernet = Fernet(_get_fernet_key())
+        fernet = _get_fernet()
         decrypted_bytes = fernet.decrypt(encrypted_value.encode('utf-8'))
         return decrypted_bytes.decode('utf-8')
     except Exception as e:
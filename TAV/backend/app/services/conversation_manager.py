@@ -1853,7 +1853,6 @@ class WeatherFetchNode(Node):
         """
         try:
             from app.core.nodes.registry import NodeRegistry
-            from app.core.nodes.loader import get_node_port_definitions
 
             query = (user_message or "").lower()
             tokens = [t for t in re.split(r"[^a-z0-9_]+", query) if len(t) >= 3]
@@ -1899,9 +1898,8 @@ class WeatherFetchNode(Node):
 
             out: List[Dict[str, Any]] = []
             for node_type in picked_types[:limit]:
-                node_cls = NodeRegistry.get(node_type)
                 meta = NodeRegistry.get_metadata(node_type) or {}
-                ports = get_node_port_definitions(node_cls) if node_cls else {"input_ports": [], "output_ports": []}
+                ports = NodeRegistry.get_details(node_type) or {"input_ports": [], "output_ports": []}
                 out.append(
                     {
                         "node_type": node_type,
@@ -330,6 +330,42 @@ class CredentialManager:
             logger.error(f"Error getting credential data {credential_id}: {e}")
             return None
     
+    def get_credentials_data(
+        self,
+        credential_ids: List[int],
+        user_id: int
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get decrypted data for several credentials in one query.
+        
+        Used by the executor to prefetch every credential a workflow
+        references. Inactive, missing or undecryptable credentials are omitted.
+        
+        Args:
+            credential_ids: Credential IDs
+            user_id: User ID (for ownership check)
+            
+        Returns:
+            Dictionary of credential_id → decrypted credential data
+        """
+        result: Dict[int, Dict[str, Any]] = {}
+        
+        credentials = [
+            c for c in self.repository.get_by_ids(credential_ids, user_id)
+            if c.is_active
+        ]
+        
+        for credential in credentials:
+            try:
+                result[credential.id] = self._decrypt_credential_data(credential)
+            except Exception as e:
+                logger.error(f"Error getting credential data {credential.id}: {e}")
+        
+        # Update last_used timestamps in one statement
+        self.repository.update_last_used_many(list(result.keys()))
+        
+        return result
+    
     def test_credential(
         self,
         credential_id: int,
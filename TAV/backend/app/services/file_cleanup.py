@@ -313,6 +313,23 @@ def run_cleanup_job(db: Session) -> Dict[str, Any]:
         orphaned_stats = cleanup_service.cleanup_orphaned_files()
         stats["orphaned_files_removed"] = orphaned_stats["files_removed"]
         
+        # Cleanup node output artifacts no execution references anymore
+        from app.core.execution.artifacts import get_artifact_store
+        artifact_stats = get_artifact_store().cleanup_unreferenced()
+        stats["node_output_artifacts_removed"] = artifact_stats["files_removed"]
+        
+        # Cleanup expired node result cache entries
+        from app.core.execution.result_cache import get_result_cache
+        stats["node_cache_entries_removed"] = get_result_cache().cleanup_expired()
+        
+        # Compact the processed-file index of file polling triggers
+        from app.config import settings
+        from app.database.repositories.processed_file import ProcessedFileRepository
+        stats["processed_file_rows_removed"] = ProcessedFileRepository(db).compact(
+            retention_days=settings.PROCESSED_FILE_RETENTION_DAYS,
+            max_entries=settings.PROCESSED_FILE_MAX_ENTRIES,
+        )
+        
         # Cleanup empty directories
         cleanup_service.cleanup_empty_directories()
         
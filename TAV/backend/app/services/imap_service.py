@@ -3,19 +3,49 @@ IMAP Service - Email reading with multi-provider support
 
 Handles email reading through various providers (Gmail, Outlook, Yahoo, etc.)
 with automatic IMAP configuration.
+
+Two ways to read a mailbox:
+- IMAPService.fetch_emails: one-shot connect, search, fetch full messages
+- IMAPMailbox: persistent connection with IDLE push and UID-incremental
+  fetching (headers and BODYSTRUCTURE first, attachments on demand)
 """
 
 import asyncio
+import base64
+import binascii
+import functools
 import logging
 import imaplib
 import email
+import quopri
+import re
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.header import decode_header
-from typing import Dict, Any, Optional, List
+from email.parser import BytesHeaderParser
+from itertools import takewhile
+from typing import Dict, Any, Optional, List, Tuple, Callable
 from pathlib import Path
 
+from app.core.execution.blocking import run_blocking
+
 logger = logging.getLogger(__name__)
 
 
+# Socket timeout for regular IMAP commands
+IMAP_TIMEOUT_SECONDS = 30
+
+# Re-issue IDLE before servers drop it (RFC 2177: at least every 29 minutes)
+IMAP_IDLE_REFRESH_SECONDS = 25 * 60
+
+# Extra wait for the server to answer DONE before the connection counts as dead
+IMAP_IDLE_GRACE_SECONDS = 30
+
+# Headers fetched up front (BODY.PEEK, so messages are not marked as read)
+IMAP_HEADER_FIELDS = "SUBJECT FROM TO CC DATE MESSAGE-ID"
+
+
 # Provider configurations with automatic IMAP settings
 EMAIL_IMAP_PROVIDERS = {
     "gmail": {
@@ -51,6 +81,29 @@ EMAIL_IMAP_PROVIDERS = {
 }
 
 
+def build_search_criteria(
+    only_unread: bool = True,
+    filter_sender: Optional[str] = None,
+    filter_subject: Optional[str] = None
+) -> List[str]:
+    """
+    Build IMAP SEARCH criteria from the usual email filters.
+
+    Returns:
+        List of search keys (['ALL'] when no filter is set)
+    """
+    criteria = []
+    if only_unread:
+        criteria.append('UNSEEN')
+    if filter_sender:
+        criteria.extend(['FROM', f'"{filter_sender}"'])
+    if filter_subject:
+        criteria.extend(['SUBJECT', f'"{filter_subject}"'])
+    if not criteria:
+        criteria.append('ALL')
+    return criteria
+
+
 class IMAPService:
     """
     Service for reading emails through various IMAP providers.
@@ -141,9 +194,7 @@ class IMAPService:
             final_imap_port = provider_config["imap_port"]
         
         # Run IMAP operations in executor (blocking operations)
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
+        return await run_blocking(
             self._fetch_emails_sync,
             email_address,
             password,
@@ -192,15 +243,7 @@ class IMAPService:
                 return []
             
             # Build search criteria
-            search_criteria = []
-            if only_unread:
-                search_criteria.append('UNSEEN')
-            if filter_sender:
-                search_criteria.extend(['FROM', f'"{filter_sender}"'])
-            if filter_subject:
-                search_criteria.extend(['SUBJECT', f'"{filter_subject}"'])
-            if not search_criteria:
-                search_criteria.append('ALL')
+            search_criteria = build_search_criteria(only_unread, filter_sender, filter_subject)
             
             logger.debug(f"🔍 Search criteria: {search_criteria}")
             
@@ -419,9 +462,7 @@ class IMAPService:
             final_imap_port = provider_config["imap_port"]
         
         # Run test in executor
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
+        return await run_blocking(
             self._test_connection_sync,
             email_address,
             password,
@@ -520,6 +561,663 @@ class IMAPService:
                     "help": "Please check your configuration and try again"
                 }
 
+    async def fetch_attachment(
+        self,
+        email_address: str,
+        password: str,
+        uid: int,
+        section: str,
+        encoding: Optional[str] = None,
+        provider: str = "gmail",
+        imap_server: Optional[str] = None,
+        imap_port: Optional[int] = None,
+        folder_name: str = "INBOX",
+        uidvalidity: Optional[int] = None
+    ) -> bytes:
+        """
+        Download one attachment of an email fetched through IMAPMailbox.
+
+        Emails from the persistent mode only carry attachment metadata; the
+        attachment dicts hold the uid, section and encoding to pass here.
+
+        Args:
+            email_address: Email address
+            password: Email password or app-specific password
+            uid: Message UID
+            section: MIME part (e.g. "2" or "1.2")
+            encoding: Content-Transfer-Encoding of the part (decoded when given)
+            provider: Provider name
+            imap_server: Custom IMAP server (for custom provider)
+            imap_port: Custom IMAP port (for custom provider)
+            folder_name: Folder of the message
+            uidvalidity: UIDVALIDITY the uid belongs to (checked when given)
+
+        Returns:
+            Attachment content
+        """
+        provider_config = self.get_provider_config(provider)
+        if provider == "custom":
+            if not imap_server:
+                raise ValueError("Custom provider requires imap_server")
+            final_imap_server = imap_server
+            final_imap_port = imap_port or 993
+        else:
+            final_imap_server = provider_config["imap_server"]
+            final_imap_port = provider_config["imap_port"]
+
+        mailbox = IMAPMailbox(final_imap_server, final_imap_port, email_address, password, folder_name)
+        return await run_blocking(
+            mailbox.fetch_attachment_once, uid, section, encoding, uidvalidity
+        )
+
+
+class _Atom(str):
+    """Unquoted IMAP atom (tells NIL apart from the string "NIL")"""
+
+
+_LITERAL_RE = re.compile(rb"\{(\d+)\}\r?\n?$")
+_IDLE_EVENT_RE = re.compile(rb"\* \d+ (EXISTS|RECENT)", re.IGNORECASE)
+_ATOM_END = b' ()"\r\n\t'
+
+
+def _feed_tokens(text: bytes, stack: List[list]) -> None:
+    """Tokenize IMAP response text into the nested list on top of stack"""
+    i, length = 0, len(text)
+    while i < length:
+        char = text[i:i + 1]
+        if char in (b" ", b"\r", b"\n", b"\t"):
+            i += 1
+        elif char == b"(":
+            child: list = []
+            stack[-1].append(child)
+            stack.append(child)
+            i += 1
+        elif char == b")":
+            if len(stack) > 1:
+                stack.pop()
+            i += 1
+        elif char == b'"':
+            j, buf = i + 1, bytearray()
+            while j < length and text[j:j + 1] != b'"':
+                if text[j:j + 1] == b"\\":
+                    j += 1
+                buf += text[j:j + 1]
+                j += 1
+            stack[-1].append(buf.decode("utf-8", errors="replace"))
+            i = j + 1
+        else:
+            # Atoms may contain bracketed sections: BODY[HEADER.FIELDS (FROM)]
+            j, depth = i, 0
+            while j < length:
+                current = text[j:j + 1]
+                if current == b"[":
+                    depth += 1
+                elif current == b"]":
+                    depth -= 1
+                elif depth <= 0 and current in _ATOM_END:
+                    break
+                j += 1
+            atom = text[i:j].decode("utf-8", errors="replace")
+            stack[-1].append(None if atom.upper() == "NIL" else _Atom(atom))
+            i = j
+
+
+def _parse_fetch_response(data: List[Any]) -> Dict[int, Dict[str, Any]]:
+    """
+    Parse imaplib FETCH data into per-message item dicts.
+
+    imaplib returns literals as (text, literal) tuples followed by the
+    trailing text, so the pieces are fed into one token stream.
+
+    Returns:
+        Dict of UID → {item name (upper case) → value}
+    """
+    root: list = []
+    stack = [root]
+    for item in data:
+        if isinstance(item, tuple):
+            text, literal = item[0], item[1]
+            match = _LITERAL_RE.search(text)
+            _feed_tokens(text[:match.start()] if match else text, stack)
+            stack[-1].append(literal)
+        elif item:
+            _feed_tokens(item, stack)
+
+    messages: Dict[int, Dict[str, Any]] = {}
+    for entry in root:
+        if not isinstance(entry, list):
+            continue
+        items = {str(entry[k]).upper(): entry[k + 1] for k in range(0, len(entry) - 1, 2)}
+        if "UID" in items:
+            messages[int(items["UID"])] = items
+    return messages
+
+
+def _text(value: Any) -> str:
+    """IMAP string (quoted, literal or NIL) as str"""
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _params(value: Any) -> Dict[str, str]:
+    """IMAP parameter list ("NAME" "value" ...) as dict with lower-case keys"""
+    if not isinstance(value, list):
+        return {}
+    return {_text(value[k]).lower(): _text(value[k + 1]) for k in range(0, len(value) - 1, 2)}
+
+
+def _walk_structure(node: list, section: str = "") -> List[Dict[str, Any]]:
+    """
+    Flatten a BODYSTRUCTURE into its leaf parts.
+
+    Returns:
+        Part dicts: section, content_type, charset, encoding, size,
+        disposition, filename
+    """
+    if node and isinstance(node[0], list):
+        parts = []
+        children = takewhile(lambda child: isinstance(child, list), node)
+        for index, child in enumerate(children, 1):
+            parts.extend(_walk_structure(child, f"{section}.{index}" if section else str(index)))
+        return parts
+
+    maintype = _text(node[0]).lower()
+    subtype = _text(node[1]).lower() if len(node) > 1 else ""
+    params = _params(node[2] if len(node) > 2 else None)
+
+    # Extension data follows the type-specific fields
+    if maintype == "text":
+        disposition_index = 9
+    elif (maintype, subtype) == ("message", "rfc822"):
+        disposition_index = 11
+    else:
+        disposition_index = 8
+    disposition = node[disposition_index] if len(node) > disposition_index else None
+    disposition_type, disposition_params = "", {}
+    if isinstance(disposition, list) and disposition:
+        disposition_type = _text(disposition[0]).lower()
+        disposition_params = _params(disposition[1] if len(disposition) > 1 else None)
+
+    size = node[6] if len(node) > 6 else None
+    return [{
+        "section": section or "1",
+        "content_type": f"{maintype}/{subtype}",
+        "charset": params.get("charset"),
+        "encoding": _text(node[5]).lower() if len(node) > 5 else "7bit",
+        "size": int(size) if size is not None else 0,
+        "disposition": disposition_type,
+        "filename": disposition_params.get("filename") or params.get("name"),
+    }]
+
+
+def decode_part(data: bytes, encoding: Optional[str]) -> bytes:
+    """Undo a part's Content-Transfer-Encoding"""
+    encoding = (encoding or "").lower()
+    try:
+        if encoding == "base64":
+            return base64.decodebytes(data)
+        if encoding == "quoted-printable":
+            return quopri.decodestring(data)
+    except (binascii.Error, ValueError) as e:
+        logger.warning(f"⚠️ Could not decode {encoding} part: {e}")
+    return data
+
+
+def _decode_text(data: bytes, encoding: Optional[str], charset: Optional[str]) -> str:
+    """Decode a text part to str"""
+    data = decode_part(data, encoding)
+    try:
+        return data.decode(charset or "utf-8", errors="ignore")
+    except LookupError:
+        return data.decode("utf-8", errors="ignore")
+
+
+class IMAPMailbox:
+    """
+    Persistent IMAP connection to one folder.
+
+    Instead of reconnecting and searching the whole folder on every poll,
+    the connection stays open and only messages above the last seen UID are
+    fetched (valid while the folder's UIDVALIDITY is unchanged). New
+    messages are announced through IDLE when the server supports it.
+
+    Messages are fetched in two steps: headers, flags and BODYSTRUCTURE for
+    all new UIDs, then only the text parts. Attachments are listed with
+    their section and downloaded on demand (fetch_part /
+    IMAPService.fetch_attachment). All fetches use BODY.PEEK, so messages
+    are not marked as read implicitly.
+
+    Threading:
+    - imaplib is not thread-safe: the connection is only used from the
+      mailbox's own worker thread (run()), which also keeps long IDLE waits
+      off the shared blocking pool
+    - interrupt() and abort() may be called from any thread
+
+    Example:
+        mailbox = IMAPMailbox("imap.gmail.com", 993, "user@gmail.com", "app_password")
+        await mailbox.run(mailbox.connect)
+        emails, last_uid, more = await mailbox.run(mailbox.fetch_new, 0, ["UNSEEN"], 10)
+        changed = await mailbox.run(mailbox.idle, 300)
+        await mailbox.aclose()
+    """
+
+    def __init__(
+        self,
+        imap_server: str,
+        imap_port: int,
+        email_address: str,
+        password: str,
+        folder_name: str = "INBOX",
+        use_ssl: bool = True,
+        timeout: float = IMAP_TIMEOUT_SECONDS
+    ):
+        """
+        Initialize mailbox (does not connect).
+
+        Args:
+            imap_server: IMAP server host
+            imap_port: IMAP server port
+            email_address: Login
+            password: Password or app-specific password
+            folder_name: Folder to select
+            use_ssl: Connect with IMAP over SSL
+            timeout: Socket timeout for regular commands
+        """
+        self.imap_server = imap_server
+        self.imap_port = imap_port
+        self.email_address = email_address
+        self.password = password
+        self.folder_name = folder_name
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+
+        self.uidvalidity: Optional[int] = None
+        self.uidnext: Optional[int] = None
+        self.capabilities: Tuple[str, ...] = ()
+
+        self._conn: Optional[imaplib.IMAP4] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # IDLE state (guarded by _lock, shared with interrupt())
+        self._lock = threading.Lock()
+        self._idle_counter = 0
+        self._idle_supported = True
+        self._idling = False
+        self._idle_ready = False
+        self._done_requested = False
+        self._done_sent = False
+        self._closing = False
+
+    # ------------------------------------------------------------------
+    # Threading
+    # ------------------------------------------------------------------
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking mailbox method on the mailbox's worker thread"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tav-imap")
+        call = functools.partial(func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    async def aclose(self, timeout: float = 5.0):
+        """End IDLE, log out and stop the worker thread (forces the socket closed if the server hangs)"""
+        with self._lock:
+            self._closing = True
+        self.interrupt()
+        if self._executor is not None:
+            try:
+                await asyncio.wait_for(self.run(self.logout), timeout)
+            except Exception:
+                self.abort()
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        else:
+            self.logout()
+
+    # ------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def supports_idle(self) -> bool:
+        return self._idle_supported and "IDLE" in self.capabilities
+
+    def connect(self):
+        """Connect, log in and select the folder"""
+        logger.info(f"📧 Connecting to IMAP server: {self.imap_server}:{self.imap_port}")
+        if self.use_ssl:
+            conn = imaplib.IMAP4_SSL(self.imap_server, self.imap_port, timeout=self.timeout)
+        else:
+            conn = imaplib.IMAP4(self.imap_server, self.imap_port, timeout=self.timeout)
+        try:
+            conn.login(self.email_address, self.password)
+            typ, data = conn.capability()
+            if typ == "OK" and data and data[0]:
+                self.capabilities = tuple(_text(data[0]).upper().split())
+            else:
+                self.capabilities = tuple(c.upper() for c in conn.capabilities)
+        except Exception:
+            try:
+                conn.shutdown()
+            except Exception:
+                pass
+            raise
+        self._conn = conn
+        self.select()
+
+    def select(self):
+        """Select the folder and read UIDVALIDITY / UIDNEXT"""
+        conn = self._require_connection()
+        typ, data = conn.select(self.folder_name)
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"Failed to select folder {self.folder_name}: {_text(data[0] if data else '')}")
+
+        self.uidvalidity = self._response_int("UIDVALIDITY")
+        self.uidnext = self._response_int("UIDNEXT")
+        if self.uidnext is None:
+            # UIDNEXT is optional in SELECT responses
+            typ, data = conn.uid("SEARCH", "ALL")
+            uids = [int(uid) for uid in data[0].split()] if typ == "OK" and data and data[0] else []
+            self.uidnext = max(uids, default=0) + 1
+        logger.debug(f"📁 Selected {self.folder_name} (UIDVALIDITY {self.uidvalidity}, UIDNEXT {self.uidnext})")
+
+    def logout(self):
+        """Log out and close the connection (errors ignored)"""
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.logout()
+        except Exception:
+            try:
+                conn.shutdown()
+            except Exception:
+                pass
+
+    def abort(self):
+        """Unblock the worker thread by shutting the socket down (any thread)"""
+        conn = self._conn
+        sock = getattr(conn, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _require_connection(self) -> imaplib.IMAP4:
+        if self._conn is None:
+            raise imaplib.IMAP4.abort("IMAP mailbox is not connected")
+        return self._conn
+
+    def _response_int(self, code: str) -> Optional[int]:
+        _, data = self._conn.response(code)
+        if data and data[-1] is not None:
+            try:
+                return int(data[-1])
+            except ValueError:
+                return None
+        return None
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def search_uids(self, after_uid: int, criteria: Optional[List[str]] = None) -> List[int]:
+        """UIDs above after_uid matching the search criteria, ascending"""
+        conn = self._require_connection()
+        keys = [key for key in (criteria or []) if key != "ALL"]
+        typ, data = conn.uid("SEARCH", "UID", f"{after_uid + 1}:*", *keys)
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"IMAP search failed: {typ}")
+        # "n:*" always includes the highest UID, even when it is below n
+        uids = {int(uid) for uid in (data[0] or b"").split()} if data else set()
+        return sorted(uid for uid in uids if uid > after_uid)
+
+    def fetch_new(
+        self,
+        after_uid: int,
+        criteria: Optional[List[str]] = None,
+        limit: int = 10
+    ) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Fetch messages above after_uid (oldest first).
+
+        Args:
+            after_uid: Last UID already seen
+            criteria: Extra search keys (see build_search_criteria)
+            limit: Maximum messages to fetch
+
+        Returns:
+            (emails, new last seen UID, more messages waiting)
+        """
+        uids = self.search_uids(after_uid, criteria)
+        batch = uids[:max(1, limit)]
+        emails = self.fetch_messages(batch)
+        return emails, (batch[-1] if batch else after_uid), len(uids) > len(batch)
+
+    def fetch_messages(self, uids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Fetch messages by UID without downloading attachments.
+
+        Returns:
+            Email dicts (same keys as IMAPService.fetch_emails, plus uid,
+            uidvalidity, folder, size and flags; attachments carry the
+            uid/section/encoding for fetch_part)
+        """
+        if not uids:
+            return []
+        conn = self._require_connection()
+        typ, data = conn.uid(
+            "FETCH",
+            ",".join(str(uid) for uid in uids),
+            f"(UID FLAGS RFC822.SIZE BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS ({IMAP_HEADER_FIELDS})])"
+        )
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"IMAP fetch failed: {typ}")
+
+        messages = _parse_fetch_response(data)
+        emails = []
+        for uid in uids:
+            items = messages.get(uid)
+            if not items or "BODYSTRUCTURE" not in items:
+                logger.warning(f"⚠️ Message UID {uid} missing from FETCH response")
+                continue
+            try:
+                emails.append(self._build_email(uid, items))
+            except Exception as e:
+                logger.error(f"❌ Error processing email UID {uid}: {e}")
+        logger.info(f"✅ Fetched {len(emails)} email(s) from {self.folder_name}")
+        return emails
+
+    def fetch_part(self, uid: int, section: str, encoding: Optional[str] = None) -> bytes:
+        """Download one MIME part (decoded when encoding is given)"""
+        conn = self._require_connection()
+        typ, data = conn.uid("FETCH", str(uid), f"(UID BODY.PEEK[{section}])")
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"IMAP fetch failed: {typ}")
+        items = _parse_fetch_response(data).get(uid, {})
+        raw = items.get(f"BODY[{section}]")
+        if raw is None:
+            raise KeyError(f"Part {section} of message UID {uid} not found")
+        raw = raw if isinstance(raw, bytes) else _text(raw).encode("utf-8")
+        return decode_part(raw, encoding) if encoding else raw
+
+    def fetch_attachment_once(
+        self,
+        uid: int,
+        section: str,
+        encoding: Optional[str] = None,
+        uidvalidity: Optional[int] = None
+    ) -> bytes:
+        """Connect, download one part and log out (used by IMAPService.fetch_attachment)"""
+        self.connect()
+        try:
+            if uidvalidity is not None and uidvalidity != self.uidvalidity:
+                raise ValueError(
+                    f"UIDVALIDITY of {self.folder_name} changed ({uidvalidity} → {self.uidvalidity}), "
+                    "message UIDs are no longer valid"
+                )
+            return self.fetch_part(uid, section, encoding)
+        finally:
+            self.logout()
+
+    def mark_seen(self, uids: List[int]):
+        """Set \\Seen on messages"""
+        if uids:
+            self._require_connection().uid("STORE", ",".join(str(uid) for uid in uids), "+FLAGS", "(\\Seen)")
+
+    def _build_email(self, uid: int, items: Dict[str, Any]) -> Dict[str, Any]:
+        """Email dict from the first FETCH plus the text parts"""
+        service = get_imap_service()
+        header_key = next((key for key in items if key.startswith("BODY[HEADER")), None)
+        raw_headers = items.get(header_key) if header_key else None
+        headers = BytesHeaderParser().parsebytes(
+            raw_headers if isinstance(raw_headers, bytes) else _text(raw_headers).encode("utf-8")
+        )
+
+        plain = html = None
+        attachments = []
+        for part in _walk_structure(items["BODYSTRUCTURE"]):
+            is_text = part["content_type"] in ("text/plain", "text/html")
+            if part["disposition"] == "attachment" or (part["filename"] and not is_text):
+                attachments.append({
+                    "filename": service._decode_header(part["filename"] or f"part-{part['section']}"),
+                    "content_type": part["content_type"],
+                    "size": part["size"],
+                    "uid": uid,
+                    "section": part["section"],
+                    "encoding": part["encoding"],
+                })
+            elif part["content_type"] == "text/plain" and plain is None:
+                plain = part
+            elif part["content_type"] == "text/html" and html is None:
+                html = part
+
+        texts = self._fetch_texts(uid, [part for part in (plain, html) if part])
+        flags = items.get("FLAGS") or []
+        return {
+            "subject": service._decode_header(headers.get("Subject", "")),
+            "sender": service._decode_header(headers.get("From", "")),
+            "to": service._decode_header(headers.get("To", "")),
+            "cc": service._decode_header(headers.get("Cc", "")),
+            "content": texts.get(plain["section"], "") if plain else "",
+            "html_content": texts.get(html["section"], "") if html else "",
+            "received_date": headers.get("Date", ""),
+            "message_id": headers.get("Message-ID", ""),
+            "attachments": attachments,
+            "uid": uid,
+            "uidvalidity": self.uidvalidity,
+            "folder": self.folder_name,
+            "size": int(items["RFC822.SIZE"]) if items.get("RFC822.SIZE") is not None else None,
+            "flags": [_text(flag) for flag in flags] if isinstance(flags, list) else [],
+        }
+
+    def _fetch_texts(self, uid: int, parts: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Fetch and decode text parts in one command (section → text)"""
+        if not parts:
+            return {}
+        conn = self._require_connection()
+        sections = " ".join(f"BODY.PEEK[{part['section']}]" for part in parts)
+        typ, data = conn.uid("FETCH", str(uid), f"(UID {sections})")
+        if typ != "OK":
+            raise imaplib.IMAP4.error(f"IMAP fetch failed: {typ}")
+        items = _parse_fetch_response(data).get(uid, {})
+        texts = {}
+        for part in parts:
+            raw = items.get(f"BODY[{part['section']}]")
+            if raw is None:
+                continue
+            raw = raw if isinstance(raw, bytes) else _text(raw).encode("utf-8")
+            texts[part["section"]] = _decode_text(raw, part["encoding"], part["charset"])
+        return texts
+
+    # ------------------------------------------------------------------
+    # IDLE
+    # ------------------------------------------------------------------
+
+    def idle(self, timeout: float = IMAP_IDLE_REFRESH_SECONDS) -> bool:
+        """
+        Wait for new messages with IDLE.
+
+        Returns after the server announces new messages (EXISTS/RECENT),
+        after timeout, or when interrupt() is called.
+
+        Args:
+            timeout: Seconds before IDLE is ended (re-issue it to keep waiting)
+
+        Returns:
+            True when new messages were announced
+        """
+        conn = self._require_connection()
+        self._idle_counter += 1
+        tag = b"IDLE%d" % self._idle_counter
+        with self._lock:
+            if self._closing:
+                return False
+            self._idling, self._idle_ready = True, False
+            self._done_requested = self._done_sent = False
+            conn.send(tag + b" IDLE\r\n")
+
+        timer = threading.Timer(timeout, self.interrupt)
+        timer.daemon = True
+        conn.sock.settimeout(timeout + IMAP_IDLE_GRACE_SECONDS)
+        changed = False
+        try:
+            timer.start()
+            while True:
+                line = conn.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("connection closed during IDLE")
+                if line.startswith(tag + b" "):
+                    status = line[len(tag) + 1:].split(b" ", 1)[0].upper()
+                    if status != b"OK":
+                        logger.warning(f"⚠️ IMAP server rejected IDLE, falling back to polling: {_text(line).strip()}")
+                        self._idle_supported = False
+                    return changed
+                if line.startswith(b"+"):
+                    with self._lock:
+                        self._idle_ready = True
+                        if self._done_requested:
+                            self._send_done()
+                elif line.upper().startswith(b"* BYE"):
+                    raise imaplib.IMAP4.abort(f"server closed connection: {_text(line).strip()}")
+                elif _IDLE_EVENT_RE.match(line):
+                    changed = True
+                    self.interrupt()
+        finally:
+            timer.cancel()
+            with self._lock:
+                self._idling = False
+            if self._conn is conn and conn.sock is not None:
+                try:
+                    conn.sock.settimeout(self.timeout)
+                except OSError:
+                    pass
+
+    def interrupt(self):
+        """End a running IDLE (any thread; no-op when not idling)"""
+        with self._lock:
+            if not self._idling or self._done_sent:
+                return
+            self._done_requested = True
+            if self._idle_ready:
+                self._send_done()
+
+    def _send_done(self):
+        # Caller holds _lock
+        self._done_sent = True
+        try:
+            self._conn.send(b"DONE\r\n")
+        except (OSError, AttributeError):
+            pass
+
 
 # Singleton instance
 _imap_service = None
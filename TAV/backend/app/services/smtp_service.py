@@ -5,7 +5,6 @@ Handles email sending through various providers (Gmail, Outlook, Yahoo, etc.)
 with automatic SMTP configuration.
 """
 
-import asyncio
 import logging
 import smtplib
 from email.mime.multipart import MIMEMultipart
@@ -15,6 +14,8 @@ from email import encoders
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
+from app.core.execution.blocking import run_blocking
+
 logger = logging.getLogger(__name__)
 
 
@@ -182,8 +183,7 @@ class SMTPService:
                 }
             
             # Run blocking SMTP in thread pool
-            result = await asyncio.get_running_loop().run_in_executor(
-                None,
+            result = await run_blocking(
                 self._send_sync,
                 to_addresses,
                 subject,
@@ -0,0 +1,147 @@
+"""
+Cron expression parsing
+
+Standard 5-field cron expressions (minute hour day-of-month month
+day-of-week) evaluated in wall-clock time of the datetime passed in:
+
+- *, lists (1,15), ranges (1-5), steps (*/15, 8-18/2)
+- month and weekday names (jan-dec, sun-sat); weekday 0 and 7 are Sunday
+- @yearly, @annually, @monthly, @weekly, @daily, @midnight, @hourly
+- when both day-of-month and day-of-week are restricted, either may match
+  (classic cron behaviour)
+
+parse_cron() caches parsed expressions, so schedules sharing an expression
+parse it once.
+"""
+
+import functools
+from datetime import datetime, timedelta
+from typing import FrozenSet, Tuple
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+_MONTH_NAMES = {name: i for i, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], 1
+)}
+_WEEKDAY_NAMES = {name: i for i, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# (name, min, max, names)
+_FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, _MONTH_NAMES),
+    ("day of week", 0, 7, _WEEKDAY_NAMES),
+)
+
+# No match within this many years means the expression never fires (e.g. Feb 30)
+_SEARCH_YEARS = 5
+
+
+def _parse_value(value: str, names: dict, field: str) -> int:
+    lowered = value.lower()
+    if lowered in names:
+        return names[lowered]
+    if not value.isdigit():
+        raise ValueError(f"Invalid {field} value '{value}'")
+    return int(value)
+
+
+def _parse_field(text: str, field: str, low: int, high: int, names: dict) -> Tuple[FrozenSet[int], bool]:
+    """Parse one field into its allowed values (and whether it was '*')"""
+    values = set()
+    for item in text.split(","):
+        base, _, step_text = item.partition("/")
+        step = 1
+        if step_text:
+            if not step_text.isdigit() or int(step_text) < 1:
+                raise ValueError(f"Invalid {field} step '{step_text}'")
+            step = int(step_text)
+
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            first, _, last = base.partition("-")
+            start, end = _parse_value(first, names, field), _parse_value(last, names, field)
+        else:
+            start = _parse_value(base, names, field)
+            end = high if step_text else start
+
+        if not (low <= start <= high and low <= end <= high) or start > end:
+            raise ValueError(f"{field.capitalize()} '{item}' out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values), text == "*"
+
+
+class CronExpression:
+    """Parsed cron expression"""
+
+    __slots__ = ("expression", "minutes", "hours", "days", "months", "weekdays", "any_day", "any_weekday")
+
+    def __init__(self, expression: str):
+        """
+        Parse a cron expression.
+
+        Raises:
+            ValueError: Invalid expression
+        """
+        self.expression = expression.strip()
+        text = MACROS.get(self.expression.lower(), self.expression)
+        parts = text.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields (minute hour day month weekday), got '{expression}'")
+
+        parsed = [_parse_field(part, *field) for part, field in zip(parts, _FIELDS)]
+        (self.minutes, _), (self.hours, _), (self.days, self.any_day), (self.months, _), (weekdays, self.any_weekday) = parsed
+        # 7 is Sunday too
+        self.weekdays = frozenset(0 if day == 7 else day for day in weekdays)
+
+    def _day_matches(self, moment: datetime) -> bool:
+        weekday = (moment.weekday() + 1) % 7  # Python: Monday=0, cron: Sunday=0
+        day_ok = moment.day in self.days
+        weekday_ok = weekday in self.weekdays
+        if self.any_day:
+            return weekday_ok
+        if self.any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """
+        First fire time strictly after a moment (same tzinfo as the input).
+
+        Raises:
+            ValueError: The expression matches no date within 5 years
+        """
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=366 * _SEARCH_YEARS)
+        while moment <= limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression '{self.expression}' never fires")
+
+    def __repr__(self) -> str:
+        return f"CronExpression('{self.expression}')"
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_cron(expression: str) -> CronExpression:
+    """Parse a cron expression (cached per expression)"""
+    return CronExpression(expression)
@@ -0,0 +1,436 @@
+"""
+Folder Watching for File Triggers
+
+The file polling trigger and file listener used to glob the whole watch
+folder every interval and stat every file. FolderWatcher replaces that:
+
+- Linux: inotify (via libc, no extra dependency) reports creates, writes,
+  moves and deletes as they happen, so detection takes milliseconds and an
+  idle folder costs no CPU. Subfolders are watched when recursive.
+- Everywhere else, network shares (UNC paths), and when inotify is not
+  available or the watch limit is reached: polling with os.scandir, which
+  gets sizes and mtimes without a stat call per file on Windows.
+
+Either way a file is reported only once it is stable: its size and mtime
+have not changed for settle_seconds, so half-copied files are not picked
+up. On network shares only the size is compared - their mtimes are not
+stable (server clock drift) and would re-trigger unchanged files. Content hashes are computed afterwards with hash_file(), which streams
+the file in chunks instead of reading it into memory.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import fnmatch
+import hashlib
+import logging
+import os
+import stat
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.core.execution.blocking import run_blocking
+from app.utils.network_share import NetworkShareAuth
+
+logger = logging.getLogger(__name__)
+
+
+# (size, mtime_ns) - mtime_ns is 0 for files on network shares
+Signature = Tuple[int, int]
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+@dataclass
+class FileEvent:
+    """A stable new/changed file, or a file that disappeared"""
+    path: Path
+    size: Optional[int] = None
+    mtime_ns: Optional[int] = None
+    deleted: bool = False
+    signature: Optional[Signature] = None  # As compared by the watcher (and stored in indexes)
+
+    @property
+    def mtime(self) -> Optional[float]:
+        return self.mtime_ns / 1e9 if self.mtime_ns is not None else None
+
+
+def hash_file(path: Path, algorithm: str = "sha256", chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """
+    Hash a file's content, reading it in chunks.
+
+    Memory use is one chunk regardless of file size. Blocking - call via
+    run_blocking() from the event loop.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _Inotify:
+    """Thin wrapper over the inotify syscalls (Linux only)"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches: Dict[int, Path] = {}  # wd → directory
+
+    def add_watch(self, directory: Path) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), WATCH_MASK | IN_ONLYDIR)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"inotify_add_watch failed for {directory}: {os.strerror(errno)}")
+        self.watches[wd] = directory
+        return wd
+
+    def read_events(self) -> List[Tuple[Optional[Path], int, str]]:
+        """Drain pending events as (directory, mask, name)"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                directory = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                events.append((directory, mask, name))
+
+    def close(self):
+        try:
+            os.close(self.fd)
+        except OSError:
+            pass
+
+
+class FolderWatcher:
+    """
+    Reports stable new/changed files and deletions in a folder.
+
+    Usage:
+        watcher = FolderWatcher(path, "*.pdf", settle_seconds=1.0)
+        await watcher.start(include_existing=False)
+        try:
+            async for events in watcher.events():
+                ...
+        finally:
+            watcher.close()
+    """
+
+    def __init__(
+        self,
+        folder: Path,
+        pattern: str = "*",
+        recursive: bool = False,
+        poll_interval: float = 10.0,
+        settle_seconds: float = 1.0,
+        use_inotify: bool = True,
+    ):
+        self.folder = Path(folder)
+        self.pattern = pattern or "*"
+        self.recursive = recursive
+        self.poll_interval = max(0.05, float(poll_interval))
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self.use_inotify = use_inotify
+        self.backend: Optional[str] = None
+        # Network share mtimes drift with the server clock: compare sizes only
+        self.size_only = NetworkShareAuth.is_unc_path(str(self.folder))
+
+        self._reported: Dict[Path, Signature] = {}  # last reported (or ignored) signature
+        self._pending: Dict[Path, Tuple[Signature, float]] = {}  # candidate → (signature, unchanged since)
+        self._deleted: List[Path] = []
+        self._inotify: Optional[_Inotify] = None
+        self._raw_events: List[Tuple[Optional[Path], int, str]] = []
+        self._wakeup = asyncio.Event()
+        self._rescan_needed = False
+        self._last_scan = 0.0
+
+    # ==================== Lifecycle ====================
+
+    async def start(
+        self,
+        include_existing: bool = False,
+        known: Optional[Dict[Path, Signature]] = None
+    ) -> Dict[Path, Signature]:
+        """
+        Pick a backend and take the initial snapshot.
+
+        Args:
+            include_existing: Report files already in the folder (once stable)
+                              instead of treating them as seen
+            known: Files reported before (e.g. from a persistent index); with
+                   include_existing they are skipped while their signature
+                   is unchanged
+
+        Returns:
+            The initial snapshot (path → signature)
+        """
+        if self.use_inotify and self._inotify_supported():
+            try:
+                self._start_inotify()
+                self.backend = "inotify"
+            except OSError as e:
+                logger.warning(f"⚠️  inotify unavailable for {self.folder} ({e}), falling back to polling")
+                self._stop_inotify()
+        if self.backend is None:
+            self.backend = "polling"
+
+        snapshot = await run_blocking(self.scan)
+        self._last_scan = time.monotonic()
+        if include_existing:
+            # Existing files count as stable if they do not change before the first check
+            known = {path: self.normalize(signature) for path, signature in (known or {}).items()}
+            since = time.monotonic() - self.settle_seconds
+            for path, signature in snapshot.items():
+                if known.get(path) == signature:
+                    self._reported[path] = signature
+                else:
+                    self._pending[path] = (signature, since)
+        else:
+            self._reported = dict(snapshot)
+
+        logger.info(
+            f"👁️ Watching {self.folder} with {self.backend} "
+            f"({len(snapshot)} existing files, settle {self.settle_seconds}s)"
+        )
+        return snapshot
+
+    def close(self):
+        self._stop_inotify()
+
+    async def events(self) -> AsyncIterator[List[FileEvent]]:
+        """Yield batches of events until cancelled"""
+        while True:
+            await self._wait()
+            raw_events, self._raw_events = self._raw_events, []
+            batch = await run_blocking(self._collect, raw_events)
+            if batch:
+                yield batch
+
+    # ==================== Scanning ====================
+
+    def scan(self) -> Dict[Path, Signature]:
+        """Every matching file with its signature (os.scandir, no glob)"""
+        found: Dict[Path, Signature] = {}
+        stack = [self.folder]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.recursive:
+                                    stack.append(Path(entry.path))
+                            elif entry.is_file() and self._matches(entry.name):
+                                found[Path(entry.path)] = self._make_signature(entry.stat())
+                        except OSError:
+                            continue
+            except OSError as e:
+                logger.debug(f"Cannot scan {directory}: {e}")
+        return found
+
+    def _matches(self, name: str) -> bool:
+        return fnmatch.fnmatch(name, self.pattern)
+
+    def normalize(self, signature: Signature) -> Signature:
+        """A signature as this watcher compares it (mtime dropped on network shares)"""
+        return (signature[0], 0) if self.size_only else (signature[0], signature[1])
+
+    def _make_signature(self, st: os.stat_result) -> Signature:
+        return (st.st_size, 0 if self.size_only else st.st_mtime_ns)
+
+    def _signature(self, path: Path) -> Optional[Signature]:
+        st = self._stat(path)
+        return self._make_signature(st) if st is not None else None
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[os.stat_result]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return st
+
+    # ==================== Change Detection ====================
+
+    async def _wait(self):
+        """Sleep until an inotify event, a settle deadline or the next poll"""
+        now = time.monotonic()
+        if self.backend == "polling":
+            deadline = self._last_scan + self.poll_interval
+        else:
+            # inotify: no periodic scan, only settle checks
+            deadline = now + 3600
+        if self._pending:
+            earliest = min(since for _, since in self._pending.values()) + self.settle_seconds
+            deadline = min(deadline, max(earliest, now + 0.01))
+        timeout = max(0.0, deadline - now)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    def _collect(self, raw_events: List[Tuple[Optional[Path], int, str]]) -> List[FileEvent]:
+        """Fold in changes and return files that settled plus deletions"""
+        now = time.monotonic()
+        if raw_events:
+            self._process_inotify(raw_events)
+        if self._rescan_needed or (self.backend == "polling" and now - self._last_scan >= self.poll_interval):
+            self._apply_scan(self.scan())
+            self._rescan_needed = False
+            self._last_scan = now
+
+        events = [FileEvent(path=path, deleted=True) for path in self._deleted]
+        self._deleted = []
+
+        for path, (signature, since) in list(self._pending.items()):
+            if now - since < self.settle_seconds:
+                continue
+            st = self._stat(path)
+            current = self._make_signature(st) if st is not None else None
+            if current is None:
+                del self._pending[path]
+            elif current != signature:
+                # Still being written
+                self._pending[path] = (current, now)
+            else:
+                del self._pending[path]
+                if self._reported.get(path) != current:
+                    self._reported[path] = current
+                    events.append(FileEvent(path=path, size=st.st_size, mtime_ns=st.st_mtime_ns, signature=current))
+        return events
+
+    def _apply_scan(self, snapshot: Dict[Path, Signature]):
+        now = time.monotonic()
+        for path, signature in snapshot.items():
+            self._touch(path, signature, now)
+        for path in list(self._reported):
+            if path not in snapshot:
+                self._forget(path)
+        for path in list(self._pending):
+            if path not in snapshot:
+                del self._pending[path]
+
+    def _touch(self, path: Path, signature: Signature, now: float):
+        if self._reported.get(path) == signature:
+            self._pending.pop(path, None)
+            return
+        pending = self._pending.get(path)
+        if pending is None or pending[0] != signature:
+            self._pending[path] = (signature, now)
+
+    def _forget(self, path: Path):
+        self._pending.pop(path, None)
+        if self._reported.pop(path, None) is not None:
+            self._deleted.append(path)
+
+    # ==================== inotify ====================
+
+    def _inotify_supported(self) -> bool:
+        return sys.platform.startswith("linux") and not self.size_only
+
+    def _start_inotify(self):
+        self._inotify = _Inotify()
+        self._add_watches(self.folder)
+        asyncio.get_running_loop().add_reader(self._inotify.fd, self._on_inotify_readable)
+
+    def _stop_inotify(self):
+        if self._inotify is None:
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self._inotify.fd)
+        except (RuntimeError, ValueError):
+            pass
+        self._inotify.close()
+        self._inotify = None
+
+    def _on_inotify_readable(self):
+        # Read on the loop thread (non-blocking) so the fd stops signalling
+        self._raw_events.extend(self._inotify.read_events())
+        self._wakeup.set()
+
+    def _add_watches(self, directory: Path):
+        self._inotify.add_watch(directory)
+        if not self.recursive:
+            return
+        for root, dirs, _files in os.walk(directory):
+            for name in dirs:
+                self._inotify.add_watch(Path(root) / name)
+
+    def _process_inotify(self, raw_events: List[Tuple[Optional[Path], int, str]]):
+        now = time.monotonic()
+        for directory, mask, name in raw_events:
+            if mask & IN_Q_OVERFLOW:
+                logger.warning(f"⚠️  inotify queue overflow for {self.folder}, rescanning")
+                self._rescan_needed = True
+                continue
+            if directory is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF) and directory == self.folder:
+                logger.warning(f"⚠️  Watch folder {self.folder} was removed or moved")
+                continue
+            if not name:
+                continue
+
+            path = directory / name
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land before the watch exists, so scan the new folder too
+                    try:
+                        self._add_watches(path)
+                    except OSError as e:
+                        logger.warning(f"⚠️  Cannot watch {path}: {e}")
+                    self._rescan_needed = True
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    for known in [p for p in self._reported if directory / name in p.parents]:
+                        self._forget(known)
+                continue
+
+            if not self._matches(name):
+                continue
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self._forget(path)
+                continue
+            signature = self._signature(path)
+            if signature is not None:
+                self._touch(path, signature, now)
@@ -10,6 +10,7 @@ os.environ.setdefault("ENCRYPTION_KEY", "test-encryption-key-32-characters!")
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
 os.environ.setdefault("ENVIRONMENT", "testing")
 os.environ.setdefault("REDIS_URL", "redis://localhost:6379/1")
+os.environ.setdefault("NODE_MANIFEST_PATH", "")  # Import node modules at discovery, no manifest file
 
 # Add backend directory to path
 backend_path = Path(__file__).parent.parent
@@ -0,0 +1,28 @@
+"""
+Shared fixtures for unit tests
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database.base import Base
+
+
+@pytest.fixture
+def session_factory():
+    """Session factory over a shared in-memory database, also used as SessionLocal"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    with patch("app.database.session.SessionLocal", factory):
+        yield factory
+    Base.metadata.drop_all(engine)
+    engine.dispose()
@@ -0,0 +1,138 @@
+"""
+Unit tests for admission control of manual/API executions
+
+Covers immediate admission, FIFO and priority queue order, rejection with
+Retry-After, cancellation, queue timeouts and stats.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.execution.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    AdmissionCancelled,
+)
+
+
+def _settings(**overrides):
+    values = dict(
+        max_concurrent_runs_global=1,
+        max_queued_runs_global=10,
+        use_priority_queue=True,
+        queue_timeout=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestAdmission:
+
+    @pytest.mark.asyncio
+    async def test_admits_while_slots_free(self):
+        controller = AdmissionController(max_in_flight=2)
+
+        first = controller.reserve("exec-1", "wf")
+        second = controller.reserve("exec-2", "wf")
+        third = controller.reserve("exec-3", "wf")
+
+        assert first.admitted and second.admitted
+        assert not third.admitted
+        assert controller.position("exec-3") == 1
+
+    @pytest.mark.asyncio
+    async def test_release_admits_next(self):
+        controller = AdmissionController(max_in_flight=1)
+        controller.reserve("exec-1", "wf")
+        queued = controller.reserve("exec-2", "wf")
+
+        waiter = asyncio.create_task(controller.wait(queued))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        controller.release("exec-1")
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert queued.admitted
+        assert list(controller.in_flight) == ["exec-2"]
+
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        controller = AdmissionController(max_in_flight=1, priority_queue=True)
+        controller.reserve("running", "wf")
+        controller.reserve("low", "wf", priority=9)
+        controller.reserve("default", "wf")
+        controller.reserve("urgent", "wf", priority=1)
+
+        assert [entry["execution_id"] for entry in controller.stats()["queue"]] == ["urgent", "default", "low"]
+
+        controller.release("running")
+        assert "urgent" in controller.in_flight
+
+    @pytest.mark.asyncio
+    async def test_fifo_order(self):
+        controller = AdmissionController(max_in_flight=1)
+        controller.configure(_settings(use_priority_queue=False))
+        controller.reserve("running", "wf")
+        controller.reserve("low", "wf", priority=9)
+        controller.reserve("urgent", "wf", priority=1)
+
+        assert controller.position("low") == 1
+        assert controller.stats()["order"] == "fifo"
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        controller = AdmissionController()
+        controller.configure(_settings(max_queued_runs_global=1))
+        controller.reserve("exec-1", "wf")
+        controller.reserve("exec-2", "wf")
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.reserve("exec-3", "wf")
+
+        assert rejected.value.queued == 1
+        # Default 10s per run, one queued ahead plus the new request
+        assert rejected.value.retry_after == 20
+        assert controller.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancel_workflow_wakes_waiters(self):
+        controller = AdmissionController(max_in_flight=1)
+        controller.reserve("exec-1", "wf-a")
+        queued_a = controller.reserve("exec-2", "wf-a")
+        controller.reserve("exec-3", "wf-b")
+
+        waiter = asyncio.create_task(controller.wait(queued_a))
+        await asyncio.sleep(0)
+
+        assert controller.cancel_workflow("wf-a") == ["exec-2"]
+        with pytest.raises(AdmissionCancelled):
+            await waiter
+        assert controller.position("exec-3") == 1
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_leaves_queue(self):
+        controller = AdmissionController(max_in_flight=1)
+        controller.reserve("exec-1", "wf")
+        queued = controller.reserve("exec-2", "wf")
+
+        with pytest.raises(asyncio.TimeoutError):
+            await controller.wait(queued, timeout=0.01)
+
+        assert controller.queue == {}
+        controller.release("exec-1")
+        assert controller.in_flight == {}
+
+    @pytest.mark.asyncio
+    async def test_raising_limit_admits_queued(self):
+        controller = AdmissionController()
+        controller.configure(_settings())
+        controller.reserve("exec-1", "wf")
+        queued = controller.reserve("exec-2", "wf")
+
+        controller.configure(_settings(max_concurrent_runs_global=2))
+
+        assert queued.admitted
+        assert controller.stats()["in_flight"] == 2
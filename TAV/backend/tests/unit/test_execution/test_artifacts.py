@@ -0,0 +1,165 @@
+"""
+Unit tests for the node output ArtifactStore
+
+Uses a temporary directory for storage and an in-memory database for the
+execution_results index.
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.database.models.execution import Execution
+from app.database.models.execution_result import ExecutionResult
+from app.database.models.workflow import Workflow
+from app.api.v1.endpoints.executions import get_execution_artifact
+from app.core.execution.artifacts import ArtifactStore, is_artifact_ref, ARTIFACT_REF_KEY
+from app.core.execution.context import NodeExecutionResult
+from app.schemas.user import JWTUser
+
+
+@pytest.fixture
+def store(tmp_path, session_factory):
+    return ArtifactStore(base_path=tmp_path / "node_outputs", session_factory=session_factory)
+
+
+class TestSpillOutputs:
+
+    def test_small_outputs_stay_inline(self, store):
+        outputs = {"text": "hello", "count": 3, "rows": [1, 2, 3]}
+
+        assert store.spill_outputs(outputs, "exec-1", max_inline_bytes=1024) is outputs
+
+    def test_large_value_replaced_by_reference(self, store):
+        rows = [{"id": i, "name": f"row-{i}"} for i in range(200)]
+        outputs = {"rows": rows, "count": 200}
+
+        stored = store.spill_outputs(outputs, "exec-1", max_inline_bytes=1024, node_id="csv")
+
+        assert is_artifact_ref(stored["rows"])
+        assert stored["count"] == 200
+        assert stored["rows"]["size_bytes"] > 1024
+        assert len(stored["rows"]["preview"]) <= 200
+        # Original outputs untouched
+        assert outputs["rows"] is rows
+        assert store.get(stored["rows"]) == rows
+
+    def test_zero_threshold_disables_spilling(self, store):
+        outputs = {"blob": "x" * 10000}
+
+        assert store.spill_outputs(outputs, "exec-1", max_inline_bytes=0) is outputs
+
+    def test_identical_values_share_one_file(self, store, session_factory):
+        blob = "y" * 5000
+
+        first = store.spill_outputs({"a": blob}, "exec-1", max_inline_bytes=100)["a"]
+        second = store.spill_outputs({"b": blob}, "exec-2", max_inline_bytes=100)["b"]
+
+        assert first[ARTIFACT_REF_KEY] == second[ARTIFACT_REF_KEY]
+        assert len(list(store.base_path.rglob("*.json"))) == 1
+
+        db = session_factory()
+        try:
+            assert db.query(ExecutionResult).filter(ExecutionResult.result_type == "artifact").count() == 2
+        finally:
+            db.close()
+
+    def test_reference_scoped_to_execution(self, store):
+        ref = store.spill_outputs({"a": "z" * 5000}, "exec-1", max_inline_bytes=100)["a"]
+        key = ref[ARTIFACT_REF_KEY]
+
+        assert store.is_referenced_by(key, "exec-1")
+        assert not store.is_referenced_by(key, "exec-2")
+
+    def test_invalid_key_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.get("../../etc/passwd")
+
+
+class TestResolve:
+
+    def test_resolve_outputs(self, store):
+        stored = store.spill_outputs({"a": "q" * 5000, "b": 1}, "exec-1", max_inline_bytes=100)
+
+        assert store.resolve_outputs(stored) == {"a": "q" * 5000, "b": 1}
+
+    def test_node_result_persists_references(self, store):
+        outputs = {"a": "q" * 5000}
+        stored = store.spill_outputs(outputs, "exec-1", max_inline_bytes=100)
+
+        result = NodeExecutionResult(node_id="n1", success=True, outputs=outputs, stored_outputs=stored)
+
+        assert is_artifact_ref(result.to_dict()["outputs"]["a"])
+        assert result.outputs["a"] == "q" * 5000
+
+
+class TestCleanup:
+
+    def test_unreferenced_artifacts_removed(self, store, session_factory):
+        ref = store.spill_outputs({"a": "w" * 5000}, "exec-1", max_inline_bytes=100)["a"]
+        path = store._path_for(ref[ARTIFACT_REF_KEY])
+        old = time.time() - 7200
+        os.utime(path, (old, old))
+
+        # Still referenced
+        assert store.cleanup_unreferenced()["files_removed"] == 0
+
+        db = session_factory()
+        try:
+            db.query(ExecutionResult).delete()
+            db.commit()
+        finally:
+            db.close()
+
+        assert store.cleanup_unreferenced()["files_removed"] == 1
+        assert not path.exists()
+
+    def test_recent_files_kept(self, store, session_factory):
+        ref = store.spill_outputs({"a": "w" * 5000}, "exec-1", max_inline_bytes=100)["a"]
+
+        db = session_factory()
+        try:
+            db.query(ExecutionResult).delete()
+            db.commit()
+        finally:
+            db.close()
+
+        assert store.cleanup_unreferenced()["files_removed"] == 0
+        assert store._path_for(ref[ARTIFACT_REF_KEY]).exists()
+
+
+class TestArtifactEndpoint:
+
+    @pytest.fixture
+    def db(self, session_factory):
+        db = session_factory()
+        db.add(Workflow(id="wf-artifacts", name="Artifacts", owner_id=1, workflow_data={}))
+        db.add(Execution(id="exec-1", workflow_id="wf-artifacts", status="completed"))
+        db.commit()
+        yield db
+        db.close()
+
+    async def _get(self, store, db, key, user_id):
+        user = JWTUser(id=user_id, user_name=f"user-{user_id}")
+        with patch("app.core.execution.artifacts.get_artifact_store", return_value=store):
+            return await get_execution_artifact("exec-1", key, db=db, current_user=user)
+
+    @pytest.mark.asyncio
+    async def test_owner_reads_artifact(self, store, db):
+        ref = store.spill_outputs({"a": "v" * 5000}, "exec-1", max_inline_bytes=100)["a"]
+
+        response = await self._get(store, db, ref[ARTIFACT_REF_KEY], user_id=1)
+
+        assert response["value"] == "v" * 5000
+
+    @pytest.mark.asyncio
+    async def test_other_users_forbidden(self, store, db):
+        ref = store.spill_outputs({"a": "v" * 5000}, "exec-1", max_inline_bytes=100)["a"]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await self._get(store, db, ref[ARTIFACT_REF_KEY], user_id=2)
+
+        assert exc_info.value.status_code == 403
@@ -0,0 +1,121 @@
+"""
+Unit tests for the blocking thread pool and event loop stall detector
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.execution.blocking import BlockingPool, LoopStallDetector, blocking, run_blocking
+from app.core.nodes.base import Node
+from app.schemas.workflow import NodeConfiguration
+
+
+class TestBlockingPool:
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_loop_thread(self):
+        assert await run_blocking(threading.get_ident) != threading.get_ident()
+
+    @pytest.mark.asyncio
+    async def test_thread_bound(self):
+        pool = BlockingPool(max_threads=2)
+        in_flight = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def work():
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.02)
+            with lock:
+                in_flight["now"] -= 1
+
+        try:
+            await asyncio.gather(*(pool.run(work) for _ in range(8)))
+        finally:
+            pool.shutdown()
+
+        assert in_flight["max"] == 2
+
+    @pytest.mark.asyncio
+    async def test_loop_stays_responsive(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(run_blocking(time.sleep, 0.2), ticker())
+
+        assert len(ticks) == 5 and ticks[-1] - ticks[0] < 0.2
+
+
+class SleepyNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return []
+
+    @blocking
+    def execute(self, input_data):
+        time.sleep(0.05)
+        return {"thread": threading.get_ident()}
+
+    async def stall(self):
+        time.sleep(0.3)
+
+
+class TestBlockingDecorator:
+
+    @pytest.mark.asyncio
+    async def test_decorated_execute_is_awaitable(self):
+        node = SleepyNode(NodeConfiguration(node_id="sleepy", node_type="sleepy", name="Sleepy"))
+
+        outputs = await node.execute(None)
+
+        assert outputs["thread"] != threading.get_ident()
+
+    def test_rejects_coroutine_functions(self):
+        with pytest.raises(TypeError):
+            @blocking
+            async def already_async():
+                pass
+
+
+class TestLoopStallDetector:
+
+    @pytest.mark.asyncio
+    async def test_reports_blocking_node_with_stack(self):
+        node = SleepyNode(NodeConfiguration(node_id="sleepy", node_type="sleepy", name="Sleepy"))
+        detector = LoopStallDetector(asyncio.get_running_loop(), threshold=0.1, interval=0.02)
+        detector.start()
+        try:
+            await asyncio.sleep(0.05)
+            await node.stall()
+            await asyncio.sleep(0.1)
+        finally:
+            detector.stop()
+
+        assert len(detector.reports) == 1
+        report = detector.reports[0]
+        assert report["node"] == "sleepy (sleepy)"
+        assert "in stall" in report["stack"]
+        assert report["duration"] >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_quiet_when_loop_is_free(self):
+        detector = LoopStallDetector(asyncio.get_running_loop(), threshold=0.1, interval=0.02)
+        detector.start()
+        try:
+            await run_blocking(time.sleep, 0.3)
+        finally:
+            detector.stop()
+
+        assert len(detector.reports) == 0
@@ -0,0 +1,76 @@
+"""
+Unit tests for the compute process pool
+
+Uses standard library functions as tasks so spawned workers can import
+them without the test module.
+"""
+
+import asyncio
+import math
+import os
+import time
+
+import pytest
+
+from app.core.execution.compute import ComputePool
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.nodes.base import Node
+from app.core.nodes.capabilities import ComputeCapability, get_resource_classes
+from app.schemas.workflow import NodeConfiguration
+
+
+@pytest.fixture
+def pool():
+    pool = ComputePool(max_workers=2, task_timeout=30)
+    yield pool
+    pool.shutdown(wait=False)
+
+
+class TestComputePool:
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self, pool):
+        await pool.warm()
+
+        assert await pool.run(math.factorial, 20) == math.factorial(20)
+        assert await pool.run(os.getpid) != os.getpid()
+
+    @pytest.mark.asyncio
+    async def test_timeout_recycles_pool(self, pool):
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.run(time.sleep, 10, timeout=0.5)
+
+        # A fresh pool serves the next task
+        assert await pool.run(math.factorial, 5) == 120
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_function_rejected(self, pool):
+        with pytest.raises(TypeError, match="module-level"):
+            await pool.run(lambda: 1)
+
+    def test_worker_count_defaults_to_cpus(self):
+        assert ComputePool(max_workers=0).max_workers == (os.cpu_count() or 1)
+
+
+class HeavyNode(Node, ComputeCapability):
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return []
+
+    async def execute(self, input_data):
+        return {}
+
+
+class TestComputeResourceClass:
+
+    def test_compute_capability_maps_to_compute_pool(self):
+        node = HeavyNode(NodeConfiguration(node_id="heavy", node_type="heavy", name="Heavy"))
+        executor = ParallelExecutor({"max_concurrent_nodes": 5, "ai_concurrent_limit": 1, "compute_concurrent_limit": 3})
+
+        assert get_resource_classes(node) == ["compute"]
+        assert executor._get_semaphores(["compute"]) == [executor.compute_pool]
+        assert executor.compute_pool._value == 3
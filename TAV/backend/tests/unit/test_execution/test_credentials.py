@@ -0,0 +1,131 @@
+"""
+Unit tests for the per-execution CredentialResolver
+
+Credentials are created through CredentialManager in an in-memory database,
+so the tests exercise the real encryption and batch lookup path.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from app.core.execution.credentials import CredentialResolver, find_credential_ids
+from app.services.credential_manager import CredentialManager
+from app.schemas.credential import CredentialCreate, AuthType
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration
+
+
+USER_ID = 1
+
+
+def _create_credential(session_factory, name, api_key, user_id=USER_ID):
+    db = session_factory()
+    try:
+        return CredentialManager(db).create_credential(
+            user_id,
+            CredentialCreate(
+                name=name,
+                service_type="test",
+                auth_type=AuthType.API_KEY,
+                credential_data={"api_key": api_key},
+            ),
+        ).id
+    finally:
+        db.close()
+
+
+def _node(node_id, config):
+    return NodeConfiguration(node_id=node_id, node_type="test_node", name=node_id, config=config)
+
+
+def _workflow(*nodes):
+    return WorkflowDefinition(name="Credential Test", nodes=list(nodes), connections=[])
+
+
+class TestFindCredentialIds:
+
+    def test_matches_credential_fields(self):
+        config = {"credential_id": "3", "smtp_credential_id": 7, "other": 9}
+        assert find_credential_ids(config) == {3, 7}
+
+    def test_ignores_empty_and_invalid(self):
+        assert find_credential_ids({"credential_id": None, "x_credential_id": "abc"}) == set()
+        assert find_credential_ids(None) == set()
+
+
+class TestCredentialResolver:
+
+    def test_prefetch_loads_all_references_in_one_query(self, session_factory):
+        first = _create_credential(session_factory, "first", "key-1")
+        second = _create_credential(session_factory, "second", "key-2")
+        workflow = _workflow(
+            _node("a", {"credential_id": first}),
+            _node("b", {"llm_credential_id": second}),
+        )
+        resolver = CredentialResolver(USER_ID, session_factory=session_factory)
+
+        with patch.object(
+            CredentialManager, "get_credentials_data", autospec=True,
+            side_effect=CredentialManager.get_credentials_data
+        ) as batch:
+            assert resolver.prefetch(workflow) == 2
+            assert resolver.resolve(workflow.nodes[0]) == {first: {"api_key": "key-1"}}
+            assert resolver.resolve(workflow.nodes[1]) == {second: {"api_key": "key-2"}}
+
+        batch.assert_called_once()
+
+    def test_unknown_reference_is_loaded_once(self, session_factory):
+        cred_id = _create_credential(session_factory, "late", "key-late")
+        resolver = CredentialResolver(USER_ID, session_factory=session_factory)
+        node = _node("agent", {"credential_id": cred_id, "backup_credential_id": 999})
+
+        with patch.object(
+            CredentialManager, "get_credentials_data", autospec=True,
+            side_effect=CredentialManager.get_credentials_data
+        ) as batch:
+            assert resolver.resolve(node) == {cred_id: {"api_key": "key-late"}}
+            assert resolver.resolve(node) == {cred_id: {"api_key": "key-late"}}
+
+        batch.assert_called_once()
+
+    def test_failed_query_does_not_mark_credentials_missing(self, session_factory):
+        cred_id = _create_credential(session_factory, "first", "key-1")
+        workflow = _workflow(_node("a", {"credential_id": cred_id}))
+        resolver = CredentialResolver(USER_ID, session_factory=session_factory)
+
+        with patch.object(CredentialManager, "get_credentials_data", side_effect=RuntimeError("db down")):
+            with pytest.raises(RuntimeError):
+                resolver.prefetch(workflow)
+
+        assert resolver.resolve(workflow.nodes[0]) == {cred_id: {"api_key": "key-1"}}
+
+    def test_other_users_credentials_are_not_served(self, session_factory):
+        cred_id = _create_credential(session_factory, "foreign", "key-x", user_id=2)
+        resolver = CredentialResolver(USER_ID, session_factory=session_factory)
+
+        assert resolver.resolve(_node("a", {"credential_id": cred_id})) is None
+
+    def test_no_user_means_no_credentials(self, session_factory):
+        cred_id = _create_credential(session_factory, "first", "key-1")
+        resolver = CredentialResolver(None, session_factory=session_factory)
+
+        assert resolver.resolve(_node("a", {"credential_id": cred_id})) is None
+
+    def test_nodes_get_independent_copies(self, session_factory):
+        cred_id = _create_credential(session_factory, "first", "key-1")
+        resolver = CredentialResolver(USER_ID, session_factory=session_factory)
+        node = _node("a", {"credential_id": cred_id})
+
+        resolver.resolve(node)[cred_id]["api_key"] = "tampered"
+
+        assert resolver.resolve(node)[cred_id]["api_key"] == "key-1"
+
+    def test_clear_wipes_cached_data(self, session_factory):
+        cred_id = _create_credential(session_factory, "first", "key-1")
+        resolver = CredentialResolver(USER_ID, session_factory=session_factory)
+        resolver.prefetch(_workflow(_node("a", {"credential_id": cred_id})))
+        cached = resolver._cache[cred_id]
+
+        resolver.clear()
+
+        assert cached == {}
+        assert resolver._cache == {}
@@ -0,0 +1,272 @@
+"""
+Unit tests for hibernation of paused executions
+
+Covers the pause deadline heap, hibernating a paused executor to the
+database, rehydrating it on an interaction response and deadline expiry.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+
+from app.database.models.execution import Execution
+from app.database.models.workflow import Workflow
+from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.execution.hibernation import (
+    PauseTimers, ExecutionHibernated, HIBERNATION_KEY, ACTION_EXPIRE, ACTION_HIBERNATE,
+    hibernate_execution, rehydrate_execution, expire_paused_execution, get_pause_deadline
+)
+from app.core.execution.orchestrator import WorkflowOrchestrator, register_execution, get_active_executor
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, Connection, PortType
+from app.utils.timezone import get_local_now
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+class TestPauseTimers:
+
+    @pytest.mark.asyncio
+    async def test_fires_in_deadline_order_and_skips_cancelled(self):
+        timers = PauseTimers(hibernate_after=0, pause_timeout=60)
+        fired = []
+
+        async def fire(execution_id, action):
+            fired.append(execution_id)
+
+        now = get_local_now()
+        with patch.object(timers, "_fire", new=fire):
+            timers.schedule("late", ACTION_EXPIRE, now + timedelta(milliseconds=60))
+            timers.schedule("early", ACTION_EXPIRE, now + timedelta(milliseconds=20))
+            timers.schedule("cancelled", ACTION_EXPIRE, now + timedelta(milliseconds=40))
+            timers.cancel("cancelled")
+            await asyncio.sleep(0.15)
+
+        assert fired == ["early", "late"]
+        assert timers.pending() == []
+
+    @pytest.mark.asyncio
+    async def test_reschedule_replaces_entry(self):
+        timers = PauseTimers(hibernate_after=0, pause_timeout=60)
+        fired = []
+
+        async def fire(execution_id, action):
+            fired.append(execution_id)
+
+        with patch.object(timers, "_fire", new=fire):
+            timers.schedule("exec", ACTION_EXPIRE, get_local_now() + timedelta(milliseconds=20))
+            timers.schedule("exec", ACTION_EXPIRE, get_local_now() + timedelta(seconds=60))
+            await asyncio.sleep(0.08)
+
+        assert fired == []
+        assert timers.pending() == [("exec", ACTION_EXPIRE)]
+
+    def test_deadline_prefers_interaction_expiry(self):
+        expires = get_local_now() + timedelta(hours=2)
+        pending = {"a": {"expires_at": (expires + timedelta(hours=1)).isoformat()}, "b": {"expires_at": expires.isoformat()}}
+
+        assert get_pause_deadline(pending, 1800) == expires
+        assert get_pause_deadline({"a": {}}, 1800) > get_local_now() + timedelta(seconds=1790)
+
+
+# ==================== Executor ====================
+
+RUNS: Dict[str, int] = {}
+
+
+class StepNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "input", "type": PortType.UNIVERSAL, "required": False}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        RUNS[self.node_id] = RUNS.get(self.node_id, 0) + 1
+        return {"output": f"{input_data.ports.get('input') or ''}{self.node_id}"}
+
+
+class ApprovalNode(StepNode):
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        RUNS[self.node_id] = RUNS.get(self.node_id, 0) + 1
+        return {
+            "_await": "human_input",
+            "interaction_id": "int-1",
+            "interaction_type": "test_approval",
+            "expires_at": (get_local_now() + timedelta(days=2)).isoformat(),
+        }
+
+
+@pytest.fixture
+def hitl_nodes():
+    NodeRegistry.register("test_hibernate_step", StepNode)
+    NodeRegistry.register("test_hibernate_approval", ApprovalNode)
+    RUNS.clear()
+    yield
+    NodeRegistry.unregister("test_hibernate_step")
+    NodeRegistry.unregister("test_hibernate_approval")
+
+
+def _workflow() -> WorkflowDefinition:
+    return WorkflowDefinition(
+        workflow_id="wf-hibernate",
+        name="Hibernate",
+        nodes=[
+            NodeConfiguration(node_id="a", node_type="test_hibernate_step", name="a"),
+            NodeConfiguration(node_id="approval", node_type="test_hibernate_approval", name="approval"),
+            NodeConfiguration(node_id="c", node_type="test_hibernate_step", name="c"),
+        ],
+        connections=[
+            Connection(source_node_id="a", source_port="output", target_node_id="approval", target_port="input"),
+            Connection(source_node_id="approval", source_port="output", target_node_id="c", target_port="input"),
+        ],
+    )
+
+
+async def _start_paused(db):
+    """Run the workflow until it pauses at the approval node"""
+    workflow = _workflow()
+    db.add(Workflow(id="wf-hibernate", name="Hibernate", owner_id=1, workflow_data=workflow.model_dump(mode="json")))
+    db.add(Execution(
+        id="exec-hibernate", workflow_id="wf-hibernate", status="running", execution_mode="parallel",
+        started_at=get_local_now(), workflow_snapshot=workflow.model_dump(mode="json"), node_results={},
+    ))
+    db.commit()
+
+    executor = ParallelExecutor({"max_retries": 0})
+    context = ExecutionContext(
+        workflow_id="wf-hibernate", execution_id="exec-hibernate", execution_mode=ExecutionMode.PARALLEL
+    )
+    register_execution("exec-hibernate", "wf-hibernate", executor)
+    task = asyncio.create_task(executor.execute_workflow(workflow, build_execution_graph(workflow), context))
+
+    for _ in range(100):
+        if executor.paused and not executor.active_tasks:
+            break
+        await asyncio.sleep(0.01)
+    return executor, task
+
+
+def _respond(executor):
+    """What an interaction response does to a paused executor"""
+    executor.context.node_outputs["approval"] = {"output": "approved:"}
+    executor.context.pending_interactions.pop("approval", None)
+    executor.graph.mark_node_completed("approval")
+    executor.resume()
+
+
+class TestHibernation:
+
+    @pytest.mark.asyncio
+    async def test_resume_in_memory_runs_dependents(self, hitl_nodes, db):
+        executor, task = await _start_paused(db)
+
+        _respond(executor)
+        await asyncio.wait_for(task, timeout=5)
+
+        assert RUNS == {"a": 1, "approval": 1, "c": 1}
+        assert executor.context.node_outputs["c"] == {"output": "approved:c"}
+
+    @pytest.mark.asyncio
+    async def test_hibernate_then_rehydrate(self, hitl_nodes, db):
+        executor, task = await _start_paused(db)
+
+        hibernate_execution(executor, get_local_now() + timedelta(days=2))
+        with pytest.raises(ExecutionHibernated):
+            await asyncio.wait_for(task, timeout=5)
+
+        db.expire_all()
+        execution = db.get(Execution, "exec-hibernate")
+        assert execution.status == "paused"
+        assert execution.execution_metadata[HIBERNATION_KEY]["awaiting_nodes"] == ["approval"]
+        assert get_active_executor("wf-hibernate") is None
+
+        rehydrated = await rehydrate_execution("exec-hibernate")
+        assert rehydrated.paused and rehydrated.context.pending_interactions.keys() == {"approval"}
+
+        _respond(rehydrated)
+        for _ in range(100):
+            db.expire_all()
+            if db.get(Execution, "exec-hibernate").status == "completed":
+                break
+            await asyncio.sleep(0.02)
+
+        execution = db.get(Execution, "exec-hibernate")
+        assert execution.status == "completed"
+        assert HIBERNATION_KEY not in execution.execution_metadata
+        assert RUNS == {"a": 1, "approval": 1, "c": 1}
+        assert execution.node_results["c"]["outputs"] == {"output": "approved:c"}
+
+    @pytest.mark.asyncio
+    async def test_hibernate_timer_evicts_paused_executor(self, hitl_nodes, db):
+        executor, task = await _start_paused(db)
+        timers = PauseTimers(hibernate_after=60, pause_timeout=60)
+
+        await timers._fire("exec-hibernate", ACTION_HIBERNATE)
+
+        with pytest.raises(ExecutionHibernated):
+            await asyncio.wait_for(task, timeout=5)
+        assert ("exec-hibernate", ACTION_EXPIRE) in timers.pending()
+
+    @pytest.mark.asyncio
+    async def test_failed_checkpoint_keeps_execution_in_memory(self, hitl_nodes, db):
+        executor, task = await _start_paused(db)
+        timers = PauseTimers(hibernate_after=60, pause_timeout=60)
+
+        with patch.object(executor, "_write_checkpoint", side_effect=RuntimeError("db down")):
+            await timers._fire("exec-hibernate", ACTION_HIBERNATE)
+
+        assert not executor.hibernated and not task.done()
+        assert get_active_executor("wf-hibernate") is executor
+        assert ("exec-hibernate", ACTION_HIBERNATE) in timers.pending()
+
+        db.expire_all()
+        assert db.get(Execution, "exec-hibernate").status == "running"
+
+        _respond(executor)
+        await asyncio.wait_for(task, timeout=5)
+        assert executor.context.node_outputs["c"] == {"output": "approved:c"}
+
+    @pytest.mark.asyncio
+    async def test_user_stops_hibernated_execution(self, hitl_nodes, db):
+        executor, task = await _start_paused(db)
+        hibernate_execution(executor, get_local_now() + timedelta(days=2))
+        with pytest.raises(ExecutionHibernated):
+            await task
+
+        assert await WorkflowOrchestrator(db).cancel_execution("exec-hibernate")
+
+        db.expire_all()
+        execution = db.get(Execution, "exec-hibernate")
+        assert execution.status == "stopped"
+        assert HIBERNATION_KEY not in execution.execution_metadata
+        assert execution.node_results["a"]["outputs"] == {"output": "a"}
+        assert db.get(Workflow, "wf-hibernate").status == "stopped"
+
+    @pytest.mark.asyncio
+    async def test_expire_stops_hibernated_execution(self, hitl_nodes, db):
+        executor, task = await _start_paused(db)
+        hibernate_execution(executor, get_local_now())
+        with pytest.raises(ExecutionHibernated):
+            await task
+
+        assert await expire_paused_execution("exec-hibernate")
+
+        db.expire_all()
+        execution = db.get(Execution, "exec-hibernate")
+        assert execution.status == "stopped"
+        assert db.get(Workflow, "wf-hibernate").status != "paused"
+        assert await rehydrate_execution("exec-hibernate") is None
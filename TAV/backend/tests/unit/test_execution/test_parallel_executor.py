@@ -539,3 +539,129 @@ class TestIsBranchBlocked:
         """Test that no result means not blocked"""
         assert executor._is_branch_blocked("false", None) is False
 
+
+
+class TestOutputRelease:
+    """Test reference-counted release of intermediate outputs"""
+    
+    @staticmethod
+    def _chain_graph():
+        """node-1 → node-2 → node-3, node-1 → node-3"""
+        graph = ExecutionGraph(workflow_id="test")
+        graph.nodes["node-1"] = NodeDependencies(node_id="node-1")
+        graph.nodes["node-2"] = NodeDependencies(node_id="node-2", input_connections=[
+            {"source_node_id": "node-1", "source_port": "output", "target_port": "input"}
+        ])
+        graph.nodes["node-3"] = NodeDependencies(node_id="node-3", input_connections=[
+            {"source_node_id": "node-2", "source_port": "output", "target_port": "input"},
+            {"source_node_id": "node-1", "source_port": "output", "target_port": "extra"}
+        ])
+        return graph
+    
+    @staticmethod
+    def _workflow(shared=()):
+        return WorkflowDefinition(
+            workflow_id="test",
+            name="Test",
+            nodes=[
+                NodeConfiguration(
+                    node_id=node_id, node_type="test", name=node_id,
+                    share_output_to_variables=node_id in shared
+                )
+                for node_id in ("node-1", "node-2", "node-3")
+            ],
+            connections=[]
+        )
+    
+    @staticmethod
+    def _complete(graph, context, node_id):
+        outputs = {"output": f"{node_id} data"}
+        context.node_outputs[node_id] = outputs
+        context.node_results[node_id] = NodeExecutionResult(node_id=node_id, success=True, outputs=outputs)
+        graph.completed_nodes.add(node_id)
+    
+    def test_consumers_counted(self, executor):
+        """Test that sink nodes are not tracked and tool connections are ignored"""
+        graph = self._chain_graph()
+        graph.nodes["node-3"].input_connections.append(
+            {"source_node_id": "node-2", "source_port": "tool", "target_port": "tools"}
+        )
+        
+        executor._init_output_release(self._workflow(), graph)
+        
+        assert executor.pending_consumers == {"node-1": {"node-2", "node-3"}, "node-2": {"node-3"}}
+    
+    @pytest.mark.asyncio
+    async def test_released_after_last_consumer(self, executor, execution_context):
+        """Test that outputs stay until every consumer finished"""
+        graph = self._chain_graph()
+        executor._init_output_release(self._workflow(), graph)
+        
+        self._complete(graph, execution_context, "node-1")
+        self._complete(graph, execution_context, "node-2")
+        await executor._release_consumed_outputs(graph, execution_context)
+        
+        assert "node-1" in execution_context.node_outputs
+        assert "node-2" in execution_context.node_outputs
+        
+        self._complete(graph, execution_context, "node-3")
+        await executor._release_consumed_outputs(graph, execution_context)
+        
+        assert set(execution_context.node_outputs) == {"node-3"}
+        assert executor.released_outputs == {"node-1", "node-2"}
+        # Node results keep their outputs for persistence
+        assert execution_context.node_results["node-1"].to_dict()["outputs"] == {"output": "node-1 data"}
+    
+    @pytest.mark.asyncio
+    async def test_skipped_and_failed_consumers_count_as_finished(self, executor, execution_context):
+        """Test that consumers which never run do not pin outputs"""
+        graph = self._chain_graph()
+        executor._init_output_release(self._workflow(), graph)
+        
+        self._complete(graph, execution_context, "node-1")
+        graph.failed_nodes.add("node-2")
+        graph.skipped_nodes.add("node-3")
+        await executor._release_consumed_outputs(graph, execution_context)
+        
+        assert "node-1" not in execution_context.node_outputs
+    
+    @pytest.mark.asyncio
+    async def test_shared_outputs_kept(self, executor, execution_context):
+        """Test that outputs shared to variables are never released"""
+        graph = self._chain_graph()
+        executor._init_output_release(self._workflow(shared=("node-1",)), graph)
+        
+        for node_id in ("node-1", "node-2", "node-3"):
+            self._complete(graph, execution_context, node_id)
+        await executor._release_consumed_outputs(graph, execution_context)
+        
+        assert set(execution_context.node_outputs) == {"node-1", "node-3"}
+    
+    def test_disabled_for_loops_and_by_config(self, execution_config):
+        """Test that looping workflows and release_intermediate_outputs=False keep everything"""
+        graph = self._chain_graph()
+        graph.has_loops = True
+        executor = ParallelExecutor(execution_config)
+        executor._init_output_release(self._workflow(), graph)
+        assert executor.pending_consumers == {}
+        
+        executor = ParallelExecutor({**execution_config, "release_intermediate_outputs": False})
+        executor._init_output_release(self._workflow(), self._chain_graph())
+        assert executor.pending_consumers == {}
+    
+    @pytest.mark.asyncio
+    async def test_large_released_outputs_spilled(self, executor, execution_context):
+        """Test that large released values are persisted as artifact references"""
+        graph = self._chain_graph()
+        executor._init_output_release(self._workflow(), graph)
+        for node_id in ("node-1", "node-2", "node-3"):
+            self._complete(graph, execution_context, node_id)
+        
+        store = Mock()
+        store.spill_outputs.side_effect = lambda outputs, **kwargs: {"output": {"$artifact": "ab" * 32}}
+        with patch("app.core.execution.executor.parallel.get_artifact_store", return_value=store):
+            await executor._release_consumed_outputs(graph, execution_context)
+        
+        assert store.spill_outputs.call_count == 2
+        assert store.spill_outputs.call_args.kwargs["max_inline_bytes"] == 4096
+        assert execution_context.node_results["node-1"].outputs == {"output": {"$artifact": "ab" * 32}}
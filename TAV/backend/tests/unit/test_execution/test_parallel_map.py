@@ -0,0 +1,187 @@
+"""
+Unit tests for parallel map execution
+
+Covers ParallelExecutor._run_map (ordering, concurrency bound, error
+policies, streamed items) and the Parallel Map node end to end.
+"""
+
+import asyncio
+import random
+from typing import Any, Dict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.capabilities import get_resource_classes
+from app.core.nodes.registry import NodeRegistry
+from app.core.nodes.builtin.control.parallel_map import ParallelMapNode
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, Connection, PortType
+
+
+IN_FLIGHT = {"now": 0, "max": 0}
+
+
+class SquareNode(Node):
+    """Squares its input after a random delay; fails on negative numbers"""
+
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "input", "type": PortType.UNIVERSAL}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        IN_FLIGHT["now"] += 1
+        IN_FLIGHT["max"] = max(IN_FLIGHT["max"], IN_FLIGHT["now"])
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))
+            value = input_data.ports["input"]
+            if value < 0:
+                raise ValueError(f"negative item {value}")
+            return {"output": value * value, "index": input_data.variables["map_index"]}
+        finally:
+            IN_FLIGHT["now"] -= 1
+
+
+class ListSourceNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "items", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        return {"items": input_data.config["items"]}
+
+
+@pytest.fixture
+def map_nodes():
+    NodeRegistry.register("test_square", SquareNode)
+    NodeRegistry.register("test_list_source", ListSourceNode)
+    NodeRegistry.register("parallel_map", ParallelMapNode)
+    IN_FLIGHT.update(now=0, max=0)
+    yield
+    NodeRegistry.unregister("test_square")
+    NodeRegistry.unregister("test_list_source")
+
+
+def _workflow(items, **map_config):
+    return WorkflowDefinition(
+        workflow_id="wf",
+        name="Map",
+        nodes=[
+            NodeConfiguration(node_id="source", node_type="test_list_source", name="Source", config={"items": items}),
+            NodeConfiguration(node_id="map", node_type="parallel_map", name="Map", config=map_config),
+            NodeConfiguration(node_id="square", node_type="test_square", name="Square"),
+        ],
+        connections=[
+            Connection(source_node_id="source", source_port="items", target_node_id="map", target_port="items"),
+            Connection(source_node_id="square", source_port="output", target_node_id="map", target_port="tools"),
+        ],
+    )
+
+
+def _context():
+    return ExecutionContext(
+        workflow_id="wf", execution_id="exec-map", execution_source="manual",
+        execution_mode=ExecutionMode.PARALLEL
+    )
+
+
+def _executor(max_concurrent_nodes=5):
+    return ParallelExecutor({"max_concurrent_nodes": max_concurrent_nodes, "ai_concurrent_limit": 1, "max_retries": 0})
+
+
+async def _map(items, **options):
+    workflow = _workflow([])
+    return await _executor()._run_map(
+        "map", "square", items, workflow, build_execution_graph(workflow), _context(), **options
+    )
+
+
+class TestRunMap:
+
+    @pytest.mark.asyncio
+    async def test_results_in_item_order(self, map_nodes):
+        summary = await _map(list(range(20)), concurrency=5)
+
+        assert [r["output"] for r in summary["results"]] == [i * i for i in range(20)]
+        assert [r["index"] for r in summary["results"]] == list(range(20))
+        assert summary["count"] == 20 and summary["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bound(self, map_nodes):
+        await _map(list(range(30)), concurrency=3)
+
+        assert 1 < IN_FLIGHT["max"] <= 3
+
+    @pytest.mark.asyncio
+    async def test_resource_pool_bound(self, map_nodes):
+        workflow = _workflow([])
+        await _executor(max_concurrent_nodes=2)._run_map(
+            "map", "square", list(range(20)), workflow, build_execution_graph(workflow), _context(),
+            concurrency=10
+        )
+
+        assert IN_FLIGHT["max"] <= 2
+
+    @pytest.mark.asyncio
+    async def test_fail_policy_raises(self, map_nodes):
+        with pytest.raises(RuntimeError, match="negative item -1"):
+            await _map([1, 2, -1, 4], error_policy="fail")
+
+    @pytest.mark.asyncio
+    async def test_skip_policy_drops_failed(self, map_nodes):
+        summary = await _map([1, -2, 3], error_policy="skip")
+
+        assert [r["output"] for r in summary["results"]] == [1, 9]
+        assert summary["errors"] == [{"index": 1, "error": "negative item -2"}]
+
+    @pytest.mark.asyncio
+    async def test_collect_policy_keeps_positions(self, map_nodes):
+        summary = await _map([1, -2, 3], error_policy="collect")
+
+        assert summary["results"][1] is None
+        assert summary["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_streamed_items(self, map_nodes):
+        async def items():
+            for i in range(5):
+                yield i
+
+        summary = await _map(items(), concurrency=2)
+
+        assert [r["output"] for r in summary["results"]] == [0, 1, 4, 9, 16]
+
+
+class TestParallelMapNode:
+
+    def test_takes_no_pool_slot(self):
+        node = ParallelMapNode(NodeConfiguration(node_id="map", node_type="parallel_map", name="Map"))
+
+        assert get_resource_classes(node) == []
+
+    @pytest.mark.asyncio
+    async def test_end_to_end(self, map_nodes):
+        workflow = _workflow([1, 2, 3, 4], concurrency=2, output_port="output")
+        context = _context()
+
+        # One pool slot: the map node must not hold it while its items wait
+        with patch("app.database.session.SessionLocal", MagicMock()):
+            await _executor(max_concurrent_nodes=1).execute_workflow(
+                workflow, build_execution_graph(workflow), context
+            )
+
+        assert context.node_outputs["map"]["results"] == [1, 4, 9, 16]
+        assert context.node_outputs["map"]["count"] == 4
+        # The per-item node only runs through the map
+        assert "square" not in context.node_outputs
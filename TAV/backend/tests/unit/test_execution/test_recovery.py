@@ -0,0 +1,331 @@
+"""
+Unit tests for crash recovery
+
+Covers the durable checkpoint written by the executor, resuming an
+interrupted execution from it, and the startup recovery policies.
+"""
+
+from typing import Any, Dict
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints.executions import recover_execution
+from app.database.models.execution import Execution
+from app.database.models.workflow import Workflow
+from app.core.execution.cleanup import cleanup_orphaned_executions_on_startup
+from app.core.execution.context import ExecutionContext, ExecutionMode, NodeExecutionResult
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.execution.orchestrator import WorkflowOrchestrator
+from app.core.execution.recovery import CHECKPOINT_KEY, RECOVERY_KEY
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.user import JWTUser
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, Connection, PortType
+from app.utils.timezone import get_local_now
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+RUNS: Dict[str, int] = {}
+
+
+class StepNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "input", "type": PortType.UNIVERSAL, "required": False}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        RUNS[self.node_id] = RUNS.get(self.node_id, 0) + 1
+        return {"output": f"{input_data.ports.get('input') or ''}{self.node_id}"}
+
+
+@pytest.fixture
+def step_node():
+    NodeRegistry.register("test_recovery_step", StepNode)
+    RUNS.clear()
+    yield
+    NodeRegistry.unregister("test_recovery_step")
+
+
+def _workflow() -> WorkflowDefinition:
+    return WorkflowDefinition(
+        workflow_id="wf-recovery",
+        name="Recovery",
+        nodes=[
+            NodeConfiguration(node_id=node_id, node_type="test_recovery_step", name=node_id)
+            for node_id in ("a", "b", "c")
+        ],
+        connections=[
+            Connection(source_node_id="a", source_port="output", target_node_id="b", target_port="input"),
+            Connection(source_node_id="b", source_port="output", target_node_id="c", target_port="input"),
+        ],
+    )
+
+
+def _interrupted_execution(db, node_results=None, checkpoint=None, status="running", snapshot=True) -> Execution:
+    """Create the records a crashed server leaves behind"""
+    workflow = _workflow()
+    db.add(Workflow(id="wf-recovery", name="Recovery", owner_id=1, workflow_data=workflow.model_dump(mode="json")))
+    execution = Execution(
+        id="exec-recovery",
+        workflow_id="wf-recovery",
+        status=status,
+        execution_source="manual",
+        execution_mode="parallel",
+        started_at=get_local_now(),
+        workflow_snapshot=workflow.model_dump(mode="json") if snapshot else None,
+        node_results=node_results or {},
+        execution_metadata={CHECKPOINT_KEY: checkpoint} if checkpoint else {},
+    )
+    db.add(execution)
+    db.commit()
+    return execution
+
+
+def _completed(node_id: str, output: str) -> Dict[str, Any]:
+    now = get_local_now()
+    return NodeExecutionResult(
+        node_id=node_id, success=True, outputs={"output": output}, started_at=now, completed_at=now
+    ).to_dict()
+
+
+class TestCheckpoint:
+
+    @pytest.mark.asyncio
+    async def test_executor_persists_checkpoint(self, step_node, db):
+        _interrupted_execution(db)
+        workflow = _workflow()
+        context = ExecutionContext(
+            workflow_id="wf-recovery", execution_id="exec-recovery", execution_mode=ExecutionMode.PARALLEL
+        )
+        context.variables["counter"] = 3
+        context.variables["live_object"] = object()
+
+        await ParallelExecutor({"max_retries": 0}).execute_workflow(workflow, build_execution_graph(workflow), context)
+
+        db.expire_all()
+        execution = db.get(Execution, "exec-recovery")
+        checkpoint = execution.execution_metadata[CHECKPOINT_KEY]
+        assert set(execution.node_results) == {"a", "b", "c"}
+        assert checkpoint["variables"] == {"counter": 3}
+        assert checkpoint["skipped_nodes"] == [] and checkpoint["paused"] is False
+
+    @pytest.mark.asyncio
+    async def test_checkpoint_writes_coalesced(self, step_node, db):
+        _interrupted_execution(db)
+        workflow = _workflow()
+        context = ExecutionContext(
+            workflow_id="wf-recovery", execution_id="exec-recovery", execution_mode=ExecutionMode.PARALLEL
+        )
+        executor = ParallelExecutor({"max_retries": 0, "checkpoint_interval": 60})
+
+        with patch.object(executor, "_write_checkpoint", wraps=executor._write_checkpoint) as write:
+            await executor.execute_workflow(workflow, build_execution_graph(workflow), context)
+
+        # First batch written immediately, the rest flushed once when the run ends
+        assert write.call_count == 2
+        db.expire_all()
+        assert set(db.get(Execution, "exec-recovery").node_results) == {"a", "b", "c"}
+
+    @pytest.mark.asyncio
+    async def test_node_results_only_written_by_checkpoint_writer(self, step_node, db):
+        _interrupted_execution(db)
+        workflow = _workflow()
+        context = ExecutionContext(
+            workflow_id="wf-recovery", execution_id="exec-recovery", execution_mode=ExecutionMode.PARALLEL
+        )
+        executor = ParallelExecutor({"max_retries": 0, "durable_checkpoints": False})
+
+        await executor.execute_workflow(workflow, build_execution_graph(workflow), context)
+
+        db.expire_all()
+        assert db.get(Execution, "exec-recovery").node_results == {}
+
+    @pytest.mark.asyncio
+    async def test_abandoned_execution_writes_no_checkpoint(self, db):
+        _interrupted_execution(db)
+        workflow = _workflow()
+        context = ExecutionContext(workflow_id="wf-recovery", execution_id="exec-recovery")
+        context.node_results["a"] = NodeExecutionResult(node_id="a", success=True, outputs={"output": "a"})
+        executor = ParallelExecutor({})
+
+        await executor.abandon()
+        await executor._persist_checkpoint(build_execution_graph(workflow), context)
+
+        db.expire_all()
+        assert "a" not in (db.get(Execution, "exec-recovery").node_results or {})
+
+    def test_checkpoint_serializes_only_changed_results(self):
+        workflow = _workflow()
+        graph = build_execution_graph(workflow)
+        context = ExecutionContext(workflow_id="wf-recovery", execution_id="exec-recovery")
+        for node_id in ("a", "b"):
+            context.node_results[node_id] = NodeExecutionResult(node_id=node_id, success=True, outputs={"output": node_id})
+        executor = ParallelExecutor({})
+        executor._capture_checkpoint(graph, context)
+
+        context.node_results["c"] = NodeExecutionResult(node_id="c", success=True, outputs={"output": "c"})
+        del context.node_results["a"]
+        with patch.object(NodeExecutionResult, "to_dict", autospec=True, side_effect=lambda result: {"id": result.node_id}) as to_dict:
+            node_results, captured = executor._capture_checkpoint(graph, context)
+
+        assert to_dict.call_count == 1
+        assert node_results["c"] == {"id": "c"} and set(node_results) == {"b", "c"}
+        assert captured["skipped_nodes"] == []
+
+    def test_result_round_trip(self):
+        result = NodeExecutionResult(
+            node_id="a", success=True, outputs={"output": 1}, started_at=get_local_now(),
+            completed_at=get_local_now(), metadata={"k": "v"}, cached=True
+        )
+
+        assert NodeExecutionResult.from_dict(result.to_dict()) == result
+
+
+class TestResumeExecution:
+
+    @pytest.mark.asyncio
+    async def test_resumes_incomplete_frontier(self, step_node, db):
+        _interrupted_execution(
+            db,
+            node_results={
+                "a": _completed("a", "a"),
+                "b": {"node_id": "b", "success": False, "outputs": {}, "metadata": {"status": "executing"}},
+            },
+            checkpoint={"variables": {"counter": 3}, "skipped_nodes": []},
+        )
+
+        execution_id = await WorkflowOrchestrator(db).resume_execution("exec-recovery")
+
+        execution = db.get(Execution, execution_id)
+        assert execution_id == "exec-recovery"
+        assert execution.status == "completed"
+        assert RUNS == {"b": 1, "c": 1}
+        assert execution.node_results["c"]["outputs"] == {"output": "abc"}
+        assert execution.execution_metadata["resume_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_skipped_branches_stay_skipped(self, step_node, db):
+        _interrupted_execution(
+            db,
+            node_results={"a": _completed("a", "a")},
+            checkpoint={"skipped_nodes": ["b"]},
+        )
+
+        await WorkflowOrchestrator(db).resume_execution("exec-recovery")
+
+        assert RUNS == {}
+        assert db.get(Execution, "exec-recovery").status == "completed"
+
+    def test_restores_variables_and_pending_interactions(self, step_node, db):
+        execution = _interrupted_execution(
+            db,
+            node_results={
+                "a": _completed("a", "a"),
+                "b": {
+                    "node_id": "b", "success": True, "outputs": {"_await": "human_input"},
+                    "metadata": {"awaiting_interaction": True},
+                },
+            },
+            checkpoint={
+                "variables": {"_loop_iteration": 2},
+                "loop_iteration": 2,
+                "awaiting_nodes": ["b"],
+                "pending_interactions": {"b": {"_await": "human_input"}},
+            },
+        )
+
+        graph, context, awaiting = WorkflowOrchestrator(db)._build_resume_state(execution, _workflow())
+
+        assert awaiting == {"b"}
+        assert graph.completed_nodes == {"a"}
+        assert graph.nodes["b"].phase.value == "awaiting_interaction"
+        assert context.variables["_loop_iteration"] == 2 and context.loop_iteration == 2
+        assert context.pending_interactions == {"b": {"_await": "human_input"}}
+        assert context.node_outputs["a"] == {"output": "a"}
+
+    @pytest.mark.asyncio
+    async def test_rejects_finished_execution(self, db):
+        _interrupted_execution(db, status="completed")
+
+        with pytest.raises(ValueError):
+            await WorkflowOrchestrator(db).resume_execution("exec-recovery")
+
+
+class TestStartupPolicy:
+
+    def test_resume_keeps_execution_running(self, db):
+        _interrupted_execution(db)
+
+        outcome = cleanup_orphaned_executions_on_startup(db, policy="resume")
+
+        assert outcome["resume"] == ["exec-recovery"]
+        assert db.get(Execution, "exec-recovery").status == "running"
+
+    def test_fail(self, db):
+        _interrupted_execution(db)
+
+        outcome = cleanup_orphaned_executions_on_startup(db, policy="fail")
+
+        execution = db.get(Execution, "exec-recovery")
+        assert outcome["failed"] == ["exec-recovery"]
+        assert execution.status == "failed"
+        assert execution.error_message == "Execution interrupted by server restart"
+
+    def test_ask_pauses_for_decision(self, db):
+        _interrupted_execution(db, checkpoint={"skipped_nodes": []})
+
+        outcome = cleanup_orphaned_executions_on_startup(db, policy="ask")
+
+        execution = db.get(Execution, "exec-recovery")
+        assert outcome["awaiting_decision"] == ["exec-recovery"]
+        assert execution.status == "paused"
+        assert execution.execution_metadata[RECOVERY_KEY]["has_checkpoint"] is True
+        assert CHECKPOINT_KEY in execution.execution_metadata
+
+    def test_without_snapshot_fails(self, db):
+        _interrupted_execution(db, snapshot=False)
+
+        outcome = cleanup_orphaned_executions_on_startup(db, policy="resume")
+
+        assert outcome["failed"] == ["exec-recovery"]
+
+
+class TestRecoverEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_other_user_cannot_recover(self, db):
+        _interrupted_execution(db)
+        cleanup_orphaned_executions_on_startup(db, policy="ask")
+
+        with pytest.raises(HTTPException) as exc:
+            await recover_execution(
+                "exec-recovery", action="fail", db=db, current_user=JWTUser(id=2, user_name="user-2")
+            )
+
+        assert exc.value.status_code == 403
+        db.expire_all()
+        assert db.get(Execution, "exec-recovery").status == "paused"
+
+    @pytest.mark.asyncio
+    async def test_owner_can_fail(self, db):
+        _interrupted_execution(db)
+        cleanup_orphaned_executions_on_startup(db, policy="ask")
+
+        response = await recover_execution(
+            "exec-recovery", action="fail", db=db, current_user=JWTUser(id=1, user_name="user-1")
+        )
+
+        assert response == {"execution_id": "exec-recovery", "status": "failed"}
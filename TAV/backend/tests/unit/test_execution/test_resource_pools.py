@@ -0,0 +1,218 @@
+"""
+Unit tests for the global resource pools
+
+Covers the process-wide capacity bound, weighted fair sharing between
+workflows, reservations, caps and executor integration.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.execution.resource_pools import FairPool, ResourcePools
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, PortType
+
+
+async def _hold(pool: FairPool, flow_id: str, execution_id: str, log: List[str], release: asyncio.Event, key=(5, 0.0)):
+    async with pool.slot(flow_id, execution_id, key):
+        log.append(flow_id)
+        await release.wait()
+
+
+async def _drain(pool: FairPool, waiters: Dict[str, int]) -> List[str]:
+    """Queue `count` one-shot acquirers per flow behind a full pool, return grant order"""
+    order: List[str] = []
+    blocker = asyncio.Event()
+    blockers = [asyncio.create_task(_hold(pool, "blocker", "b", [], blocker)) for _ in range(pool.capacity)]
+    await asyncio.sleep(0)
+
+    async def one(flow_id: str, index: int):
+        async with pool.slot(flow_id, f"{flow_id}-{index}"):
+            order.append(flow_id)
+            await asyncio.sleep(0)
+
+    tasks = [asyncio.create_task(one(flow_id, i)) for flow_id, count in waiters.items() for i in range(count)]
+    await asyncio.sleep(0)
+    blocker.set()
+    await asyncio.gather(*blockers, *tasks)
+    return order
+
+
+class TestFairPool:
+
+    @pytest.mark.asyncio
+    async def test_bounds_total_slots_across_flows(self):
+        pool = FairPool("llm", 2)
+        log: List[str] = []
+        release = asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(pool, f"wf-{i}", f"exec-{i}", log, release)) for i in range(5)]
+        await asyncio.sleep(0.01)
+
+        assert len(log) == 2 and pool.in_use == 2
+        assert pool.stats()["waiting"] == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert pool.in_use == 0 and pool.flows == {}
+
+    @pytest.mark.asyncio
+    async def test_equal_weights_alternate(self):
+        pool = FairPool("llm", 1)
+
+        order = await _drain(pool, {"bulk": 6, "interactive": 2})
+
+        # The interactive workflow does not wait behind the whole bulk backlog
+        assert order[:4] == ["bulk", "interactive", "bulk", "interactive"]
+
+    @pytest.mark.asyncio
+    async def test_weighted_share(self):
+        pool = FairPool("llm", 1)
+        pool.register("heavy", weight=3.0)
+        pool.register("light", weight=1.0)
+
+        order = await _drain(pool, {"heavy": 9, "light": 9})
+
+        assert order[:8].count("heavy") == 6
+        assert order[:8].count("light") == 2
+
+    @pytest.mark.asyncio
+    async def test_reservation_is_held_for_registered_workflow(self):
+        pool = FairPool("llm", 3)
+        pool.register("interactive", reservation=1)
+        log: List[str] = []
+        release = asyncio.Event()
+
+        bulk = [asyncio.create_task(_hold(pool, "bulk", f"exec-{i}", log, release)) for i in range(4)]
+        await asyncio.sleep(0.01)
+        assert log.count("bulk") == 2
+
+        interactive = asyncio.create_task(_hold(pool, "interactive", "exec-i", log, release))
+        await asyncio.sleep(0.01)
+        assert "interactive" in log
+
+        pool.unregister("interactive")
+        release.set()
+        await asyncio.gather(*bulk, interactive)
+        assert log.count("bulk") == 4
+
+    @pytest.mark.asyncio
+    async def test_cap_limits_one_workflow(self):
+        pool = FairPool("standard", 4)
+        pool.register("capped", cap=1)
+        log: List[str] = []
+        release = asyncio.Event()
+
+        tasks = [asyncio.create_task(_hold(pool, "capped", f"exec-{i}", log, release)) for i in range(3)]
+        await asyncio.sleep(0.01)
+
+        assert log == ["capped"] and pool.stats()["flows"]["capped"]["waiting"] == 2
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    async def test_executions_share_within_workflow(self):
+        pool = FairPool("standard", 2)
+        release = asyncio.Event()
+        held = [asyncio.create_task(_hold(pool, "wf", "exec-a", [], release)) for _ in range(2)]
+        await asyncio.sleep(0)
+        order: List[str] = []
+
+        async def one(execution_id: str):
+            async with pool.slot("wf", execution_id):
+                order.append(execution_id)
+
+        first = asyncio.create_task(one("exec-a"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(one("exec-b"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*held, first, second)
+
+        # exec-a already held two slots, so exec-b goes first
+        assert order[0] == "exec-b"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_queue(self):
+        pool = FairPool("llm", 1)
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(pool, "wf", "exec-1", [], release))
+        await asyncio.sleep(0)
+
+        waiter = asyncio.create_task(pool.acquire("other", "exec-2"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        release.set()
+        await holder
+
+        assert pool.in_use == 0 and pool.flows == {}
+
+
+# ==================== Executor ====================
+
+RUNNING = {"now": 0, "peak": 0}
+
+
+class PoolProbeNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "input", "type": PortType.UNIVERSAL, "required": False}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        RUNNING["now"] += 1
+        RUNNING["peak"] = max(RUNNING["peak"], RUNNING["now"])
+        await asyncio.sleep(0.01)
+        RUNNING["now"] -= 1
+        return {"output": self.node_id}
+
+
+@pytest.fixture
+def probe_node():
+    NodeRegistry.register("test_pool_probe", PoolProbeNode)
+    RUNNING.update(now=0, peak=0)
+    yield
+    NodeRegistry.unregister("test_pool_probe")
+
+
+class TestExecutorUsesGlobalPools:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_executions_share_capacity(self, probe_node):
+        pools = ResourcePools({"standard": 3, "llm": 1, "ai": 1, "compute": 1})
+
+        async def run(index: int):
+            workflow = WorkflowDefinition(
+                workflow_id=f"wf-{index}",
+                name=f"Fan out {index}",
+                nodes=[
+                    NodeConfiguration(node_id=f"n{i}", node_type="test_pool_probe", name=f"n{i}")
+                    for i in range(4)
+                ],
+                connections=[],
+            )
+            context = ExecutionContext(
+                workflow_id=f"wf-{index}", execution_id=f"exec-{index}", execution_mode=ExecutionMode.PARALLEL
+            )
+            executor = ParallelExecutor({"max_retries": 0, "max_concurrent_nodes": 4, "durable_checkpoints": False})
+            await executor.execute_workflow(workflow, build_execution_graph(workflow), context)
+
+        with patch("app.core.execution.executor.parallel.get_resource_pools", return_value=pools):
+            await asyncio.gather(*(run(i) for i in range(3)))
+
+        assert RUNNING["peak"] == 3
+        stats = pools.stats()["standard"]
+        assert stats["granted"] == 12 and stats["in_use"] == 0
+        assert stats["flows"] == {}
@@ -0,0 +1,233 @@
+"""
+Unit tests for the node result cache
+
+Covers cache keys, the NodeResultCache store (TTL, size limits, eviction)
+and the executor skipping cached nodes across executions.
+"""
+
+import os
+import time
+from typing import Any, Dict
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.database.models.node_result_cache import NodeResultCacheEntry
+from app.core.execution.result_cache import NodeResultCache, Uncacheable, compute_cache_key
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, Connection, PortType
+
+
+@pytest.fixture
+def cache(session_factory):
+    return NodeResultCache(session_factory=session_factory)
+
+
+class TestCacheKey:
+
+    def test_deterministic_and_order_independent(self):
+        first = compute_cache_key("loader", "1", {"a": 1, "b": [1, 2]}, {"input": {"x": 1, "y": 2}})
+        second = compute_cache_key("loader", "1", {"b": [1, 2], "a": 1}, {"input": {"y": 2, "x": 1}})
+
+        assert first == second
+
+    def test_type_version_config_and_inputs_change_key(self):
+        base = compute_cache_key("loader", "1", {"a": 1}, {"input": "x"})
+
+        assert compute_cache_key("other", "1", {"a": 1}, {"input": "x"}) != base
+        assert compute_cache_key("loader", "2", {"a": 1}, {"input": "x"}) != base
+        assert compute_cache_key("loader", "1", {"a": 2}, {"input": "x"}) != base
+        assert compute_cache_key("loader", "1", {"a": 1}, {"input": "y"}) != base
+
+    @pytest.mark.parametrize("reference", [
+        lambda path: {"file_path": path},
+        lambda path: {"type": "document", "format": "txt", "data": path, "data_type": "file_path"},
+    ])
+    def test_file_content_changes_key(self, tmp_path, reference):
+        path = tmp_path / "doc.txt"
+        path.write_text("one")
+        inputs = {"file": reference(str(path))}
+        before = compute_cache_key("loader", None, {}, inputs)
+
+        path.write_text("two, longer")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+
+        assert compute_cache_key("loader", None, {}, inputs) != before
+
+    def test_streams_are_uncacheable(self):
+        async def rows():
+            yield 1
+
+        with pytest.raises(Uncacheable):
+            compute_cache_key("loader", None, {}, {"rows": rows()})
+
+
+class TestNodeResultCache:
+
+    def test_put_and_get(self, cache, session_factory):
+        assert cache.put("k" * 64, {"text": "hello"}, node_type="loader")
+
+        assert cache.get("k" * 64) == {"text": "hello"}
+        assert cache.get("m" * 64) is None
+        assert session_factory().get(NodeResultCacheEntry, "k" * 64).hit_count == 1
+
+    def test_expired_entry_is_a_miss(self, cache):
+        cache.put("k" * 64, {"text": "hello"}, node_type="loader", ttl_seconds=1)
+        time.sleep(1.1)
+
+        assert cache.get("k" * 64) is None
+
+    def test_oversized_entry_not_stored(self, cache):
+        assert not cache.put("k" * 64, {"text": "x" * 100}, node_type="loader", max_entry_bytes=50)
+        assert cache.get("k" * 64) is None
+
+    def test_unserializable_outputs_rejected(self, cache):
+        with pytest.raises(Uncacheable):
+            cache.put("k" * 64, {"value": object()}, node_type="loader")
+
+    @pytest.mark.parametrize("reference", [
+        lambda path: {"file_path": path},
+        lambda path: {"type": "document", "format": "pdf", "data": path, "data_type": "file_path"},
+    ])
+    def test_missing_output_file_is_a_miss(self, cache, tmp_path, reference):
+        path = tmp_path / "out.pdf"
+        path.write_bytes(b"%PDF")
+        cache.put("k" * 64, {"file": reference(str(path))}, node_type="merger")
+        path.unlink()
+
+        assert cache.get("k" * 64) is None
+
+    def test_lru_eviction(self, cache):
+        for key in ("a", "b", "c"):
+            cache.put(key * 64, {"text": "x" * 40}, node_type="loader", max_total_bytes=0)
+            time.sleep(0.01)
+        cache.get("a" * 64)  # "b" is now least recently used
+
+        cache.put("d" * 64, {"text": "x" * 40}, node_type="loader", max_total_bytes=160)
+
+        assert cache.get("b" * 64) is None
+        assert cache.get("a" * 64) is not None
+        assert cache.get("d" * 64) is not None
+
+    def test_invalidate_workflow(self, cache):
+        cache.put("a" * 64, {"v": 1}, node_type="loader", workflow_id="wf-1", node_id="n1")
+        cache.put("b" * 64, {"v": 2}, node_type="loader", workflow_id="wf-2", node_id="n1")
+
+        assert cache.invalidate(workflow_id="wf-1") == 1
+        assert cache.get("a" * 64) is None
+        assert cache.get("b" * 64) == {"v": 2}
+
+
+# ==================== Executor ====================
+
+RUNS = {"count": 0}
+
+
+class ExpensiveNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "input", "type": PortType.UNIVERSAL}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        RUNS["count"] += 1
+        return {"output": f"{self.resolve_config(input_data, 'prefix', '')}{input_data.ports.get('input')}"}
+
+
+class SourceNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        return {"output": input_data.config["value"]}
+
+
+@pytest.fixture
+def cache_nodes(cache):
+    NodeRegistry.register("test_cache_source", SourceNode)
+    NodeRegistry.register("test_expensive", ExpensiveNode, version="1")
+    RUNS["count"] = 0
+    with patch("app.core.execution.executor.parallel.get_result_cache", return_value=cache):
+        yield
+    NodeRegistry.unregister("test_cache_source")
+    NodeRegistry.unregister("test_expensive")
+
+
+def _workflow(value="doc", prefix="read:", cache_results=True):
+    return WorkflowDefinition(
+        workflow_id="wf",
+        name="Cache",
+        nodes=[
+            NodeConfiguration(node_id="source", node_type="test_cache_source", name="Source", config={"value": value}),
+            NodeConfiguration(
+                node_id="expensive", node_type="test_expensive", name="Expensive",
+                config={"prefix": prefix}, cache_results=cache_results
+            ),
+        ],
+        connections=[
+            Connection(source_node_id="source", source_port="output", target_node_id="expensive", target_port="input"),
+        ],
+    )
+
+
+async def _run(workflow, **config):
+    executor = ParallelExecutor({"max_concurrent_nodes": 5, "ai_concurrent_limit": 1, "max_retries": 0, **config})
+    context = ExecutionContext(
+        workflow_id="wf", execution_id="exec-cache", execution_source="manual",
+        execution_mode=ExecutionMode.PARALLEL
+    )
+    with patch("app.database.session.SessionLocal", MagicMock()):
+        await executor.execute_workflow(workflow, build_execution_graph(workflow), context)
+    return context
+
+
+class TestExecutorResultCache:
+
+    @pytest.mark.asyncio
+    async def test_second_run_is_served_from_cache(self, cache_nodes):
+        first = await _run(_workflow())
+        second = await _run(_workflow())
+
+        assert RUNS["count"] == 1
+        assert second.node_outputs["expensive"] == {"output": "read:doc"}
+        assert second.node_results["expensive"].cached is True
+        assert second.node_results["expensive"].to_dict()["cached"] is True
+        assert first.node_results["expensive"].cached is False
+
+    @pytest.mark.asyncio
+    async def test_changed_input_or_config_reruns(self, cache_nodes):
+        await _run(_workflow())
+        await _run(_workflow(value="other"))
+        await _run(_workflow(prefix="load:"))
+
+        assert RUNS["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_not_opted_in(self, cache_nodes):
+        await _run(_workflow(cache_results=False))
+        await _run(_workflow(cache_results=False))
+
+        assert RUNS["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_workflow_policy(self, cache_nodes):
+        await _run(_workflow(), result_cache="off")
+        await _run(_workflow())
+        assert RUNS["count"] == 2
+
+        # Refresh recomputes but keeps the cache warm for later runs
+        await _run(_workflow(), result_cache="refresh")
+        await _run(_workflow())
+        assert RUNS["count"] == 3
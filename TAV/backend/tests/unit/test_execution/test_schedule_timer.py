@@ -0,0 +1,208 @@
+"""
+Unit tests for the shared schedule timer
+
+Covers cron parsing, drift-free interval fires, misfire policies when
+catching up after a restart, batched dispatch and the schedule trigger
+node running on the timer.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from app.database.repositories.trigger_schedule import TriggerScheduleRepository
+from app.core.execution import schedule_timer as schedule_timer_module
+from app.core.execution.schedule_timer import ScheduleSpec, ScheduleTimer, shutdown_schedule_timer
+from app.core.nodes.builtin.triggers.schedule_trigger import ScheduleTriggerNode
+from app.schemas.workflow import NodeConfiguration
+from app.utils.cron import parse_cron
+from app.utils.timezone import get_local_now
+
+
+def _recorder(fired: List[Dict[str, Any]], name: str = "node"):
+    async def callback(fire):
+        fired.append({"node": name, **fire})
+    return callback
+
+
+def _store(factory, node_id: str, spec: ScheduleSpec, last_fire_at: datetime = None, next_fire_at: datetime = None):
+    TriggerScheduleRepository(factory()).save_many([{
+        "workflow_id": None, "node_id": node_id, "schedule_key": spec.key,
+        "last_fire_at": last_fire_at, "next_fire_at": next_fire_at, "fire_count": 3,
+    }])
+
+
+class TestCron:
+
+    def test_next_after(self):
+        assert parse_cron("*/15 * * * *").next_after(datetime(2026, 1, 9, 10, 7)) == datetime(2026, 1, 9, 10, 15)
+        # Friday evening → Monday morning
+        assert parse_cron("0 9 * * mon-fri").next_after(datetime(2026, 1, 9, 10, 0)) == datetime(2026, 1, 12, 9, 0)
+        assert parse_cron("@monthly").next_after(datetime(2026, 12, 9, 10, 7)) == datetime(2027, 1, 1, 0, 0)
+        assert parse_cron("30 6 29 feb *").next_after(datetime(2026, 3, 1)) == datetime(2028, 2, 29, 6, 30)
+
+    def test_day_of_month_or_day_of_week(self):
+        cron = parse_cron("0 0 13 * fri")
+        # Friday the 9th matches via weekday, Tuesday the 13th via day of month
+        assert cron.next_after(datetime(2026, 1, 8)) == datetime(2026, 1, 9)
+        assert cron.next_after(datetime(2026, 1, 9)) == datetime(2026, 1, 13)
+        assert parse_cron("0 0 * * 7").next_after(datetime(2026, 1, 9)) == datetime(2026, 1, 11)
+
+    @pytest.mark.parametrize("expression", ["* * * *", "61 * * * *", "*/0 * * * *", "0 0 30 feb *", "0 0 * * funday"])
+    def test_invalid(self, expression):
+        with pytest.raises(ValueError):
+            ScheduleSpec(cron=expression)
+
+    def test_parsed_once_per_expression(self):
+        assert parse_cron("5 4 * * *") is parse_cron("5 4 * * *")
+
+
+class TestScheduleTimer:
+
+    @pytest.mark.asyncio
+    async def test_interval_fires_anchored_to_schedule(self, session_factory):
+        timer = ScheduleTimer()
+        fired: List[Dict[str, Any]] = []
+        first = await timer.add(None, "node", ScheduleSpec(interval_seconds=1), _recorder(fired))
+
+        await asyncio.sleep(2.3)
+        timer.remove(None, "node")
+
+        assert [f["scheduled_for"] for f in fired] == [first, first + timedelta(seconds=1)]
+        assert not any(f["catch_up"] for f in fired)
+        assert timer.get_stats()["fires"] == 2
+
+    @pytest.mark.asyncio
+    async def test_catch_up_fire_once(self, session_factory):
+        spec = ScheduleSpec(interval_seconds=1, misfire_grace_seconds=0)
+        last = get_local_now() - timedelta(seconds=10.5)
+        _store(session_factory, "node", spec, last)
+        timer = ScheduleTimer()
+        fired: List[Dict[str, Any]] = []
+
+        await timer.add(None, "node", spec, _recorder(fired))
+        await asyncio.sleep(0.2)
+        timer.remove(None, "node")
+
+        assert len(fired) == 1
+        assert fired[0]["missed_count"] == 9 and fired[0]["catch_up"]
+        assert fired[0]["scheduled_for"] == last + timedelta(seconds=10)
+
+        state = TriggerScheduleRepository(session_factory()).get(None, "node")
+        assert state["last_fire_at"] == last + timedelta(seconds=10)
+        assert state["fire_count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_catch_up_fire_all_and_skip(self, session_factory):
+        last = get_local_now() - timedelta(seconds=3.5)
+        fire_all = ScheduleSpec(interval_seconds=1, misfire_policy="fire_all", misfire_grace_seconds=0)
+        skip = ScheduleSpec(interval_seconds=1, misfire_policy="skip", misfire_grace_seconds=0)
+        _store(session_factory, "all", fire_all, last)
+        _store(session_factory, "skip", skip, last)
+        timer = ScheduleTimer()
+        fired: List[Dict[str, Any]] = []
+
+        await timer.add(None, "all", fire_all, _recorder(fired, "all"))
+        await timer.add(None, "skip", skip, _recorder(fired, "skip"))
+        await asyncio.sleep(0.2)
+        next_skip = timer.get_next_fire(None, "skip")
+        await timer.shutdown()
+
+        assert [f["scheduled_for"] for f in fired if f["node"] == "all"] == [
+            last + timedelta(seconds=i) for i in (1, 2, 3)
+        ]
+        assert not [f for f in fired if f["node"] == "skip"]
+        assert next_skip == last + timedelta(seconds=4)
+
+    @pytest.mark.asyncio
+    async def test_due_schedules_dispatched_in_one_batch(self, session_factory):
+        # Same next fire time, like cron schedules sharing a minute
+        spec = ScheduleSpec(interval_seconds=60)
+        due = get_local_now() + timedelta(seconds=0.5)
+        for i in range(3):
+            _store(session_factory, f"node-{i}", spec, next_fire_at=due)
+
+        timer = ScheduleTimer()
+        fired: List[Dict[str, Any]] = []
+        for i in range(3):
+            await timer.add(None, f"node-{i}", spec, _recorder(fired, f"node-{i}"))
+        await asyncio.sleep(0.8)
+        await timer.shutdown()
+
+        assert sorted(f["node"] for f in fired) == ["node-0", "node-1", "node-2"]
+        assert {f["scheduled_for"] for f in fired} == {due}
+        assert timer.get_stats()["batches"] == 1
+        assert timer.get_stats()["largest_batch"] == 3
+
+    @pytest.mark.asyncio
+    async def test_changed_schedule_is_not_caught_up(self, session_factory):
+        _store(session_factory, "node", ScheduleSpec(interval_seconds=5), get_local_now() - timedelta(hours=1))
+        timer = ScheduleTimer()
+        fired: List[Dict[str, Any]] = []
+
+        next_fire = await timer.add(None, "node", ScheduleSpec(interval_seconds=60), _recorder(fired))
+        await asyncio.sleep(0.1)
+        timer.remove(None, "node")
+
+        assert fired == []
+        assert next_fire > get_local_now()
+
+
+    @pytest.mark.asyncio
+    async def test_app_shutdown_awaits_running_fires(self, session_factory):
+        finished = []
+
+        async def slow_callback(fire):
+            await asyncio.sleep(0.3)
+            finished.append(fire["scheduled_for"])
+
+        with patch.object(schedule_timer_module, "_schedule_timer", ScheduleTimer()):
+            timer = schedule_timer_module.get_schedule_timer()
+            await timer.add(None, "node", ScheduleSpec(interval_seconds=1), slow_callback)
+            await asyncio.sleep(1.1)  # First fire (after 1s) is now running
+
+            await shutdown_schedule_timer()
+
+            assert len(finished) == 1
+            assert schedule_timer_module._schedule_timer is None
+
+
+class TestScheduleTriggerNode:
+
+    def _node(self, **config) -> ScheduleTriggerNode:
+        return ScheduleTriggerNode(NodeConfiguration(
+            node_id="schedule", node_type="schedule_trigger", name="schedule", config=config
+        ))
+
+    @pytest.mark.asyncio
+    async def test_fires_through_shared_timer(self, session_factory):
+        node = self._node(interval_minutes=0, interval_seconds=1)
+        fired: List[Dict[str, Any]] = []
+
+        async def callback(workflow_id, trigger_data, execution_source):
+            fired.append(trigger_data)
+
+        with patch("app.core.execution.schedule_timer._schedule_timer", ScheduleTimer()):
+            await node.start_monitoring(None, callback)
+            await asyncio.sleep(1.3)
+            await node.stop_monitoring()
+
+        assert len(fired) == 1
+        assert fired[0]["source"] == "schedule"
+        assert fired[0]["missed_count"] == 0 and "scheduled_for" in fired[0]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("config", [
+        {"interval_minutes": 0},
+        {"schedule_type": "cron", "cron_expression": "every monday"},
+        {"schedule_type": "cron"},
+    ])
+    async def test_invalid_schedule_rejected(self, session_factory, config):
+        async def callback(workflow_id, trigger_data, execution_source):
+            pass
+
+        with pytest.raises(ValueError):
+            await self._node(**config).start_monitoring(None, callback)
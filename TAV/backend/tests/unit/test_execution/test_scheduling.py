@@ -0,0 +1,215 @@
+"""
+Unit tests for priority scheduling
+
+Covers the priority semaphore, critical path ranking, duration estimates
+and the order in which the executor hands out pool slots.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, List
+
+import pytest
+
+from app.database.models.execution import Execution
+from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.execution.scheduling import (
+    PrioritySemaphore, NodeDurationStats, compute_scheduling_keys, get_duration_stats, load_duration_history
+)
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, Connection, PortType
+from app.utils.timezone import get_local_now
+
+
+class TestPrioritySemaphore:
+
+    @pytest.mark.asyncio
+    async def test_grants_waiters_in_key_order(self):
+        sem = PrioritySemaphore(1)
+        order: List[str] = []
+
+        async def worker(name: str, key):
+            async with sem.slot(key):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await sem.acquire()
+        tasks = [
+            asyncio.create_task(worker("low", (9, 0.0))),
+            asyncio.create_task(worker("short_path", (5, -1.0))),
+            asyncio.create_task(worker("long_path", (5, -30.0))),
+            asyncio.create_task(worker("high", (1, 0.0))),
+        ]
+        await asyncio.sleep(0)
+        sem.release()
+        await asyncio.gather(*tasks)
+
+        assert order == ["high", "long_path", "short_path", "low"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_hold_slot(self):
+        sem = PrioritySemaphore(1)
+        await sem.acquire()
+
+        cancelled = asyncio.create_task(sem.acquire((1, 0.0)))
+        waiting = asyncio.create_task(sem.acquire((5, 0.0)))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        sem.release()
+
+        await asyncio.wait_for(waiting, timeout=1)
+        assert sem.locked() and sem.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_plain_async_with(self):
+        sem = PrioritySemaphore(2)
+
+        async with sem:
+            assert sem._value == 1
+        assert sem._value == 2
+
+
+class TestDurationStats:
+
+    def test_moving_average_and_unknown_types(self):
+        stats = NodeDurationStats(alpha=0.5)
+        stats.record("llm", 10.0)
+        stats.record("llm", 20.0)
+        stats.record("http", 1.0)
+        stats.record("math", 0.2)
+
+        assert stats.estimate("llm") == 15.0
+        assert stats.estimate("never_seen") == 1.0  # median of 15, 1, 0.2
+        assert stats.snapshot()["llm"]["samples"] == 2
+
+    def test_load_history_from_completed_executions(self, session_factory):
+        db = session_factory()
+        started = get_local_now()
+        db.add(Execution(
+            id="exec-history", workflow_id="wf", status="completed", started_at=started, completed_at=started,
+            workflow_snapshot={"nodes": [{"node_id": "n1", "node_type": "history_test_type"}]},
+            node_results={"n1": {
+                "success": True,
+                "started_at": started.isoformat(),
+                "completed_at": (started + timedelta(seconds=4)).isoformat(),
+            }},
+        ))
+        db.commit()
+
+        get_duration_stats().clear()
+        try:
+            assert load_duration_history(db) == 1
+            assert get_duration_stats().estimate("history_test_type") == 4.0
+        finally:
+            get_duration_stats().clear()
+            db.close()
+
+
+# ==================== Ranking and executor ====================
+
+STARTED: List[str] = []
+
+
+class SchedStepNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "input", "type": PortType.UNIVERSAL, "required": False}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        STARTED.append(self.node_id)
+        await asyncio.sleep(0.02)
+        return {"output": self.node_id}
+
+
+class SchedSlowNode(SchedStepNode):
+    pass
+
+
+@pytest.fixture
+def sched_nodes():
+    NodeRegistry.register("test_sched_fast", SchedStepNode)
+    NodeRegistry.register("test_sched_slow", SchedSlowNode)
+    STARTED.clear()
+    stats = get_duration_stats()
+    stats.clear()
+    stats.record("test_sched_fast", 0.01)
+    stats.record("test_sched_slow", 2.0)
+    yield
+    stats.clear()
+    NodeRegistry.unregister("test_sched_fast")
+    NodeRegistry.unregister("test_sched_slow")
+
+
+def _skewed_workflow(side_nodes: int = 4) -> WorkflowDefinition:
+    """start → (cheap side nodes listed first) + slow chain chain_1 → chain_2"""
+    nodes = [NodeConfiguration(node_id="start", node_type="test_sched_fast", name="start")]
+    nodes += [
+        NodeConfiguration(node_id=f"side_{i}", node_type="test_sched_fast", name=f"side_{i}")
+        for i in range(side_nodes)
+    ]
+    nodes += [
+        NodeConfiguration(node_id="chain_1", node_type="test_sched_slow", name="chain_1"),
+        NodeConfiguration(node_id="chain_2", node_type="test_sched_slow", name="chain_2"),
+    ]
+    targets = [f"side_{i}" for i in range(side_nodes)] + ["chain_1"]
+    connections = [
+        Connection(source_node_id="start", source_port="output", target_node_id=target, target_port="input")
+        for target in targets
+    ]
+    connections.append(
+        Connection(source_node_id="chain_1", source_port="output", target_node_id="chain_2", target_port="input")
+    )
+    return WorkflowDefinition(workflow_id="wf-sched", name="Skewed", nodes=nodes, connections=connections)
+
+
+class TestSchedulingKeys:
+
+    def test_critical_path_ranks_first(self, sched_nodes):
+        workflow = _skewed_workflow()
+        keys = compute_scheduling_keys(workflow, build_execution_graph(workflow))
+
+        assert keys["chain_1"] == (5, -4.0)
+        assert keys["start"] == (5, -4.01)
+        assert keys["chain_1"] < keys["side_0"]
+
+    def test_explicit_priority_beats_path(self, sched_nodes):
+        workflow = _skewed_workflow()
+        workflow.nodes[1].priority = 1
+        keys = compute_scheduling_keys(workflow, build_execution_graph(workflow), workflow_priority=7)
+
+        assert keys["side_0"][0] == 1
+        assert keys["side_1"][0] == 7
+        assert keys["side_0"] < keys["chain_1"]
+
+
+class TestExecutorOrdering:
+
+    async def _run(self, config: Dict[str, Any]) -> List[str]:
+        workflow = _skewed_workflow()
+        context = ExecutionContext(workflow_id="wf-sched", execution_id="exec-sched", execution_mode=ExecutionMode.PARALLEL)
+        executor = ParallelExecutor({"max_retries": 0, "max_concurrent_nodes": 1, "durable_checkpoints": False, **config})
+        await executor.execute_workflow(workflow, build_execution_graph(workflow), context)
+        return list(STARTED)
+
+    @pytest.mark.asyncio
+    async def test_critical_path_gets_slot_first(self, sched_nodes):
+        started = await self._run({})
+
+        assert started[:2] == ["start", "chain_1"]
+        # chain_2 becomes ready while the side nodes are queued and overtakes the rest of them
+        assert started.index("chain_2") == 3
+
+    @pytest.mark.asyncio
+    async def test_disabled_is_first_come_first_served(self, sched_nodes):
+        started = await self._run({"priority_scheduling": False})
+
+        # chain_2 queues behind every side node that was ready before it
+        assert started[-1] == "chain_2"
@@ -0,0 +1,290 @@
+"""
+Unit tests for streaming node outputs
+
+Covers NodeStream fan-out/backpressure and the executor pipelining a
+producer's async iterator into streaming-aware and regular consumers.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core.execution.streams import NodeStream, StreamError, is_stream_source, is_stream_ref
+from app.core.execution.executor.parallel import ParallelExecutor
+from app.core.execution.context import ExecutionContext, ExecutionMode
+from app.core.execution.graph.builder import build_execution_graph
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, Connection, PortType
+
+
+async def _numbers(count, delay=0.0, fail_at=None):
+    for i in range(count):
+        if fail_at is not None and i == fail_at:
+            raise ValueError("boom")
+        if delay:
+            await asyncio.sleep(delay)
+        yield i
+
+
+class TestNodeStream:
+
+    @pytest.mark.asyncio
+    async def test_fan_out_to_all_consumers(self):
+        stream = NodeStream(_numbers(5), [("a", "in"), ("b", "in")], node_id="p", port="out")
+
+        first = [i async for i in stream.subscribe("a", "in")]
+        second = await stream.collect("b", "in")
+
+        assert first == [0, 1, 2, 3, 4]
+        assert second == [0, 1, 2, 3, 4]
+        assert stream.done and stream.items_produced == 5
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_buffer(self):
+        produced = []
+
+        async def source():
+            for i in range(20):
+                produced.append(i)
+                yield i
+
+        stream = NodeStream(source(), [("a", "in")], buffer_size=3)
+        iterator = stream.subscribe("a", "in")
+
+        assert await iterator.__anext__() == 0
+        await asyncio.sleep(0.01)
+
+        # Producer is held back by the slow consumer
+        assert len(produced) <= 3 + 2
+        assert [i async for i in iterator] == list(range(1, 20))
+
+    @pytest.mark.asyncio
+    async def test_producer_error_reaches_consumers(self):
+        stream = NodeStream(_numbers(5, fail_at=2), [("a", "in")])
+
+        with pytest.raises(StreamError, match="boom"):
+            await stream.collect("a", "in")
+
+    @pytest.mark.asyncio
+    async def test_collect_cached_for_retries(self):
+        stream = NodeStream(_numbers(3), [("a", "in")])
+
+        assert await stream.collect("a", "in") == [0, 1, 2]
+        assert await stream.collect("a", "in") == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_unknown_or_repeated_subscription_rejected(self):
+        stream = NodeStream(_numbers(3), [("a", "in")])
+
+        with pytest.raises(ValueError):
+            stream.subscribe("other", "in")
+
+        iterator = stream.subscribe("a", "in")
+        assert await iterator.__anext__() == 0
+        await iterator.aclose()
+        # Consumed chunks cannot be replayed
+        with pytest.raises(ValueError, match="replayed"):
+            stream.subscribe("a", "in")
+        await stream.aclose()
+
+    @pytest.mark.asyncio
+    async def test_resubscribe_after_attempt_read_nothing(self):
+        stream = NodeStream(_numbers(3), [("a", "in")])
+
+        stream.subscribe("a", "in")  # Attempt failed before reading
+        assert [i async for i in stream.subscribe("a", "in")] == [0, 1, 2]
+
+        empty = NodeStream(_numbers(0), [("a", "in")])
+        assert [i async for i in empty.subscribe("a", "in")] == []
+        assert [i async for i in empty.subscribe("a", "in")] == []
+
+    @pytest.mark.asyncio
+    async def test_released_consumers_stop_buffering(self):
+        stream = NodeStream(_numbers(1000, delay=0.001), [("a", "in"), ("skipped", "in")], buffer_size=4)
+        iterator = stream.subscribe("a", "in")
+        assert await iterator.__anext__() == 0
+        await asyncio.sleep(0.02)
+        assert stream._channels[("skipped", "in")].items
+
+        await stream.release(["skipped"])
+        assert not stream._channels[("skipped", "in")].items
+        with pytest.raises(ValueError, match="released"):
+            stream.subscribe("skipped", "in")
+
+        await iterator.aclose()
+        await stream.release(["a"])
+        await asyncio.sleep(0.05)
+        # No open channel left: the producer stopped early
+        assert stream.done and stream.items_produced < 1000
+
+    @pytest.mark.asyncio
+    async def test_describe_is_placeholder(self):
+        stream = NodeStream(_numbers(1), [("a", "in")], node_id="p", port="out")
+
+        assert is_stream_ref(stream.describe())
+        assert is_stream_source(_numbers(1))
+        assert not is_stream_source([1, 2])
+        await stream.aclose()
+
+
+# ==================== Executor pipelining ====================
+
+EVENTS: List[Any] = []
+
+
+class StreamProducerNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "rows", "type": PortType.UNIVERSAL, "streaming": True}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        async def rows():
+            for i in range(5):
+                await asyncio.sleep(0.01)
+                EVENTS.append(("produced", i))
+                yield i
+        return {"rows": rows()}
+
+
+class StreamConsumerNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "rows", "type": PortType.UNIVERSAL, "streaming": True}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "total", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        total = 0
+        async for row in self.iter_port(input_data, "rows"):
+            EVENTS.append(("consumed", row))
+            total += row
+        return {"total": total}
+
+
+class ListConsumerNode(Node):
+    @classmethod
+    def get_input_ports(cls):
+        return [{"name": "rows", "type": PortType.UNIVERSAL}]
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "rows", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        return {"rows": input_data.ports["rows"]}
+
+
+class FlakyStreamConsumerNode(StreamConsumerNode):
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        if not any(event == "flaky_failed" for event in EVENTS):
+            EVENTS.append("flaky_failed")
+            raise RuntimeError("transient failure before reading")
+        return await super().execute(input_data)
+
+
+@pytest.fixture
+def stream_nodes():
+    NodeRegistry.register("test_stream_producer", StreamProducerNode)
+    NodeRegistry.register("test_stream_consumer", StreamConsumerNode)
+    NodeRegistry.register("test_list_consumer", ListConsumerNode)
+    NodeRegistry.register("test_flaky_stream_consumer", FlakyStreamConsumerNode)
+    EVENTS.clear()
+    yield
+    for node_type in (
+        "test_stream_producer", "test_stream_consumer", "test_list_consumer", "test_flaky_stream_consumer"
+    ):
+        NodeRegistry.unregister(node_type)
+
+
+def _workflow(*consumers):
+    nodes = [NodeConfiguration(node_id="producer", node_type="test_stream_producer", name="Producer")]
+    connections = []
+    for node_id, node_type in consumers:
+        nodes.append(NodeConfiguration(node_id=node_id, node_type=node_type, name=node_id))
+        connections.append(Connection(
+            source_node_id="producer", source_port="rows", target_node_id=node_id, target_port="rows"
+        ))
+    return WorkflowDefinition(workflow_id="wf", name="Streams", nodes=nodes, connections=connections)
+
+
+async def _run(workflow, **config):
+    executor = ParallelExecutor({"max_concurrent_nodes": 5, "ai_concurrent_limit": 1, "max_retries": 0, **config})
+    context = ExecutionContext(
+        workflow_id="wf", execution_id="exec-stream", execution_source="manual",
+        execution_mode=ExecutionMode.PARALLEL
+    )
+    with patch("app.database.session.SessionLocal", MagicMock()):
+        await executor.execute_workflow(workflow, build_execution_graph(workflow), context)
+    return context
+
+
+class TestExecutorStreaming:
+
+    @pytest.mark.asyncio
+    async def test_consumer_runs_while_producer_streams(self, stream_nodes):
+        context = await _run(_workflow(("consumer", "test_stream_consumer")))
+
+        assert context.node_outputs["consumer"]["total"] == 10
+        # First row consumed before the last row was produced
+        assert EVENTS.index(("consumed", 0)) < EVENTS.index(("produced", 4))
+        # Persisted result carries a placeholder, not the iterator
+        assert is_stream_ref(context.node_results["producer"].to_dict()["outputs"]["rows"])
+
+    @pytest.mark.asyncio
+    async def test_regular_consumers_get_lists(self, stream_nodes):
+        context = await _run(_workflow(
+            ("streaming", "test_stream_consumer"),
+            ("listing", "test_list_consumer"),
+        ))
+
+        assert context.node_outputs["streaming"]["total"] == 10
+        assert context.node_outputs["listing"]["rows"] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_retried_consumer_subscribes_again(self, stream_nodes):
+        context = await _run(_workflow(("flaky", "test_flaky_stream_consumer")), max_retries=1, retry_delay=0)
+
+        assert context.node_outputs["flaky"]["total"] == 10
+
+    @pytest.mark.asyncio
+    async def test_unconsumed_stream_is_materialized(self, stream_nodes):
+        context = await _run(_workflow())
+
+        assert context.node_outputs["producer"]["rows"] == [0, 1, 2, 3, 4]
+
+
+class TestCSVReaderStreaming:
+
+    @pytest.mark.asyncio
+    async def test_stream_rows(self, tmp_path):
+        csv_reader = pytest.importorskip("app.core.nodes.builtin.processing.csv_reader")
+        CSVReaderNode = csv_reader.CSVReaderNode
+
+        csv_path = tmp_path / "rows.csv"
+        csv_path.write_text("name,age\nann,30\nbob,40\n")
+        node = CSVReaderNode(NodeConfiguration(
+            node_id="csv", node_type="csv_reader", name="CSV", config={"stream_rows": True}
+        ))
+
+        outputs = await node.execute(NodeExecutionInput(
+            ports={"file": {"file_path": str(csv_path)}},
+            workflow_id="wf", execution_id="exec", node_id="csv",
+            variables={}, config=node.config
+        ))
+
+        assert outputs["headers"] == ["name", "age"]
+        assert outputs["metadata"]["row_count"] is None
+        assert is_stream_source(outputs["data"])
+        assert [row async for row in outputs["data"]] == [
+            {"name": "ann", "age": "30"},
+            {"name": "bob", "age": "40"},
+        ]
@@ -0,0 +1,241 @@
+"""
+Unit tests for trigger micro-batching and debounce
+
+Covers size and window flushes, node-specific batch payloads, debounce
+coalescing by key, pending events on close, and TriggerManager integration.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from app.database.models.event_queue import EventQueue
+from app.database.models.workflow import Workflow
+from app.core.execution.trigger_batching import TriggerBatcher, BatchingConfig
+from app.core.execution.trigger_manager import TriggerManager
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.capabilities import TriggerCapability
+from app.core.nodes.loader import get_node_config_schema
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, NodeCategory, PortType
+
+
+class BatchTestTrigger(Node, TriggerCapability):
+    trigger_type = "test"
+    instances: List["BatchTestTrigger"] = []
+
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        return {"output": None}
+
+    async def start_monitoring(self, workflow_id, executor_callback):
+        self._workflow_id = workflow_id
+        self._executor_callback = executor_callback
+        self._is_monitoring = True
+        BatchTestTrigger.instances.append(self)
+
+    async def stop_monitoring(self):
+        self._is_monitoring = False
+
+
+class RecordingCallback:
+    def __init__(self):
+        self.calls: List[Dict[str, Any]] = []
+
+    async def __call__(self, workflow_id, trigger_data, execution_source):
+        self.calls.append(trigger_data)
+
+
+def _node(**config) -> BatchTestTrigger:
+    return BatchTestTrigger(NodeConfiguration(
+        node_id="trigger", node_type="test_batch_trigger", name="trigger",
+        category=NodeCategory.TRIGGERS, config=config,
+    ))
+
+
+def _batcher(callback, **config) -> TriggerBatcher:
+    node = _node(**config)
+    return TriggerBatcher(node, callback, BatchingConfig.from_node_config(config))
+
+
+class TestTriggerBatcher:
+
+    def test_off_by_default(self):
+        assert TriggerBatcher.for_node(_node(), RecordingCallback()) is None
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_max_items(self):
+        callback = RecordingCallback()
+        batcher = _batcher(callback, event_batching="batch", batch_max_items=3, batch_window_ms=60000)
+
+        for n in range(7):
+            await batcher.submit("wf", {"n": n}, "test")
+
+        assert [call["batch_size"] for call in callback.calls] == [3, 3]
+        assert [event["n"] for event in callback.calls[1]["batch"]] == [3, 4, 5]
+        assert batcher.get_stats()["pending"] == 1
+        batcher.close()
+
+    @pytest.mark.asyncio
+    async def test_flushes_after_window(self):
+        callback = RecordingCallback()
+        batcher = _batcher(callback, event_batching="batch", batch_max_items=100, batch_window_ms=20)
+
+        for n in range(5):
+            await batcher.submit("wf", {"n": n}, "test")
+        assert callback.calls == []
+
+        await asyncio.sleep(0.05)
+
+        assert len(callback.calls) == 1
+        assert callback.calls[0]["signal"] == "batch"
+        assert [event["n"] for event in callback.calls[0]["batch"]] == list(range(5))
+        assert batcher.get_stats()["executions_out"] == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_window_and_debounce_kept(self):
+        config = BatchingConfig.from_node_config({"event_batching": "batch", "batch_window_ms": 0, "debounce_ms": 0})
+        assert config.window_ms == 0 and config.debounce_ms == 0
+        assert BatchingConfig.from_node_config({"batch_window_ms": None}).window_ms == 1000
+
+        callback = RecordingCallback()
+        batcher = _batcher(callback, event_batching="batch", batch_max_items=100, batch_window_ms=0)
+        await batcher.submit("wf", {"n": 1}, "test")
+        await asyncio.sleep(0.01)
+
+        assert [call["batch_size"] for call in callback.calls] == [1]
+
+    @pytest.mark.asyncio
+    async def test_debounce_collapses_duplicates_by_key(self):
+        callback = RecordingCallback()
+        batcher = _batcher(callback, event_batching="debounce", debounce_ms=20, debounce_key="path")
+
+        for version in range(4):
+            await batcher.submit("wf", {"path": "a.txt", "version": version}, "test")
+            await asyncio.sleep(0.005)
+        await batcher.submit("wf", {"path": "b.txt", "version": 0}, "test")
+
+        await asyncio.sleep(0.05)
+
+        by_path = {call["path"]: call for call in callback.calls}
+        assert len(callback.calls) == 2
+        assert by_path["a.txt"]["version"] == 3 and by_path["a.txt"]["debounced_count"] == 4
+        assert "debounced_count" not in by_path["b.txt"]
+
+    @pytest.mark.asyncio
+    async def test_debounce_without_key_matches_identical_payloads(self):
+        callback = RecordingCallback()
+        batcher = _batcher(callback, event_batching="debounce", debounce_ms=10)
+
+        for _ in range(3):
+            await batcher.submit("wf", {"event": "changed"}, "test")
+        await batcher.submit("wf", {"event": "deleted"}, "test")
+        await asyncio.sleep(0.04)
+
+        assert sorted(call["event"] for call in callback.calls) == ["changed", "deleted"]
+
+    @pytest.mark.asyncio
+    async def test_close_returns_pending_events(self):
+        callback = RecordingCallback()
+        batcher = _batcher(callback, event_batching="batch", batch_window_ms=60000)
+        await batcher.submit("wf", {"n": 1}, "test")
+        await batcher.submit("wf", {"n": 2}, "test")
+
+        pending = batcher.close()
+        await batcher.submit("wf", {"n": 3}, "test")
+
+        assert len(pending) == 1
+        assert pending[0][0]["batch_size"] == 2 and pending[0][1] == "test"
+        assert callback.calls == []
+
+    def test_file_trigger_merges_into_files_payload(self):
+        from app.core.nodes.builtin.triggers.file_polling_trigger import FilePollingTriggerNode
+
+        merged = FilePollingTriggerNode.merge_trigger_batch(None, [
+            {"file_name": "a.pdf", "signal": "file_detected"},
+            {"files": [{"file_name": "b.pdf"}, {"file_name": "c.pdf"}], "file_count": 2},
+        ])
+
+        assert merged["file_count"] == 3 and merged["signal"] == "files_detected"
+        assert [f["file_name"] for f in merged["files"]] == ["a.pdf", "b.pdf", "c.pdf"]
+
+    def test_schema_injected_for_triggers(self):
+        schema = get_node_config_schema(BatchTestTrigger)
+
+        assert schema["event_batching"]["default"] == "off"
+        assert {"batch_max_items", "batch_window_ms", "debounce_ms", "debounce_key"} <= set(schema)
+
+
+@pytest.fixture
+def trigger_node():
+    NodeRegistry.register("test_batch_trigger", BatchTestTrigger)
+    BatchTestTrigger.instances = []
+    yield
+    NodeRegistry.unregister("test_batch_trigger")
+
+
+def _add_workflow(factory, workflow_id: str, **node_config):
+    workflow = WorkflowDefinition(
+        workflow_id=workflow_id,
+        name="Batched",
+        nodes=[NodeConfiguration(
+            node_id="trigger", node_type="test_batch_trigger", name="trigger",
+            category=NodeCategory.TRIGGERS, config=node_config,
+        )],
+        connections=[],
+    )
+    db = factory()
+    db.add(Workflow(
+        id=workflow_id, name="Batched", owner_id=1,
+        workflow_data=workflow.model_dump(mode="json"),
+        execution_config={"max_concurrent_runs": 5},
+    ))
+    db.commit()
+    db.close()
+
+
+class TestTriggerManagerBatching:
+
+    @pytest.mark.asyncio
+    async def test_burst_becomes_one_execution(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", event_batching="batch", batch_max_items=50, batch_window_ms=20)
+        executions = RecordingCallback()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+
+        trigger = BatchTestTrigger.instances[-1]
+        for n in range(20):
+            await trigger.fire_trigger({"n": n})
+        await asyncio.sleep(0.05)
+
+        assert len(executions.calls) == 1
+        assert executions.calls[0]["batch_size"] == 20
+        batching = manager.get_active_workflows()["wf"]["batching"]["trigger"]
+        assert batching["events_in"] == 20 and batching["executions_out"] == 1
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_queues_pending_batch(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", event_batching="batch", batch_window_ms=60000)
+        executions = RecordingCallback()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+
+        trigger = BatchTestTrigger.instances[-1]
+        for n in range(3):
+            await trigger.fire_trigger({"n": n})
+        await manager.shutdown()
+
+        db = session_factory()
+        rows = db.query(EventQueue).all()
+        db.close()
+        assert executions.calls == []
+        assert len(rows) == 1 and rows[0].event_data["trigger_data"]["batch_size"] == 3
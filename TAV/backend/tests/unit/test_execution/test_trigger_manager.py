@@ -0,0 +1,344 @@
+"""
+Unit tests for TriggerManager concurrency accounting
+
+Covers in-memory counters, cached limits and their invalidation, the
+durable queue drain worker, overflow policies and reconciliation with the
+database.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+from unittest.mock import patch
+
+from app.database.models.event_queue import EventQueue
+from app.database.models.execution import Execution
+from app.database.models.workflow import Workflow
+from app.core.execution.trigger_manager import TriggerManager, EVENT_TRIGGER_FIRED
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.capabilities import TriggerCapability
+from app.core.nodes.registry import NodeRegistry
+from app.schemas.workflow import WorkflowDefinition, NodeConfiguration, NodeCategory, PortType
+from app.utils.timezone import get_local_now
+
+
+class ManualTestTrigger(Node, TriggerCapability):
+    trigger_type = "test"
+    instances: List["ManualTestTrigger"] = []
+
+    @classmethod
+    def get_input_ports(cls):
+        return []
+
+    @classmethod
+    def get_output_ports(cls):
+        return [{"name": "output", "type": PortType.UNIVERSAL}]
+
+    async def execute(self, input_data: NodeExecutionInput) -> Dict[str, Any]:
+        return {"output": None}
+
+    async def start_monitoring(self, workflow_id, executor_callback):
+        self._workflow_id = workflow_id
+        self._executor_callback = executor_callback
+        self._is_monitoring = True
+        ManualTestTrigger.instances.append(self)
+
+    async def stop_monitoring(self):
+        self._is_monitoring = False
+
+
+class CountingSessionFactory:
+    """Session factory that counts sessions opened"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.opened = 0
+
+    def __call__(self):
+        self.opened += 1
+        return self.factory()
+
+
+class FakeExecutions:
+    """Execution callback whose runs finish when released"""
+
+    def __init__(self):
+        self.started: List[Dict] = []
+        self.running = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, workflow_id, trigger_data, execution_source):
+        self.started.append(trigger_data)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.release.wait()
+        finally:
+            self.running -= 1
+        return f"exec-{trigger_data['n']}"
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    return CountingSessionFactory(session_factory)
+
+
+@pytest.fixture
+def trigger_node():
+    NodeRegistry.register("test_manual_trigger", ManualTestTrigger)
+    ManualTestTrigger.instances = []
+    yield
+    NodeRegistry.unregister("test_manual_trigger")
+
+
+def _add_workflow(factory, workflow_id: str, max_concurrent_runs: int, **execution_config):
+    workflow = WorkflowDefinition(
+        workflow_id=workflow_id,
+        name="Triggered",
+        nodes=[NodeConfiguration(
+            node_id="trigger", node_type="test_manual_trigger", name="trigger", category=NodeCategory.TRIGGERS
+        )],
+        connections=[],
+    )
+    db = factory()
+    db.add(Workflow(
+        id=workflow_id, name="Triggered", owner_id=1,
+        workflow_data=workflow.model_dump(mode="json"),
+        execution_config={"max_concurrent_runs": max_concurrent_runs, **execution_config},
+    ))
+    db.commit()
+    db.close()
+
+
+async def _fire(count: int, start: int = 0) -> List[asyncio.Task]:
+    trigger = ManualTestTrigger.instances[-1]
+    tasks = [asyncio.create_task(trigger.fire_trigger({"n": start + i})) for i in range(count)]
+    await asyncio.sleep(0.01)
+    return tasks
+
+
+class TestTriggerConcurrency:
+
+    @pytest.mark.asyncio
+    async def test_fires_without_db_reads(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=2)
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+
+        tasks = await _fire(1)
+        opened = session_factory.opened
+        tasks += await _fire(5, start=1)
+
+        # Only queueing touches the database
+        assert session_factory.opened == opened + 4
+        assert executions.running == 2
+        assert manager.queued_counts["wf"] == 4
+
+        executions.release.set()
+        await asyncio.gather(*tasks)
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_drains_in_order_within_limit(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=2)
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+
+        tasks = await _fire(50)
+        executions.release.set()
+        await asyncio.gather(*tasks)
+        while manager.queued_counts["wf"] or manager._queued_runs:
+            await asyncio.sleep(0.01)
+
+        assert [data["n"] for data in executions.started] == list(range(50))
+        assert executions.peak == 2
+        assert manager._count_active_executions("wf") == 0
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_limits_reloads_and_drains(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=1)
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+        tasks = await _fire(3)
+        assert executions.running == 1
+
+        db = session_factory()
+        db.query(Workflow).filter(Workflow.id == "wf").update({"execution_config": {"max_concurrent_runs": 3}})
+        db.commit()
+        db.close()
+        manager.invalidate_limits("wf")
+        await asyncio.sleep(0.01)
+
+        assert executions.running == 3
+
+        executions.release.set()
+        await asyncio.gather(*tasks)
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_reconcile_counts_runs_started_elsewhere(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=2)
+        db = session_factory()
+        db.add(Execution(
+            id="manual-run", workflow_id="wf", status="running", execution_mode="parallel",
+            started_at=get_local_now(), node_results={},
+        ))
+        db.commit()
+
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+        tasks = await _fire(2)
+
+        # The manual run holds one of the two slots
+        assert executions.running == 1
+
+        db.query(Execution).filter(Execution.id == "manual-run").update({"status": "completed"})
+        db.commit()
+        manager.reconcile_counts(db)
+        db.close()
+        await asyncio.sleep(0.01)
+
+        assert executions.running == 2
+
+        executions.release.set()
+        await asyncio.gather(*tasks)
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_deactivate_clears_queue_and_worker(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=1)
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+        tasks = await _fire(3)
+
+        await manager.deactivate_workflow("wf")
+        executions.release.set()
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0.01)
+
+        assert len(executions.started) == 1
+        assert manager.queued_counts == {} and manager._drain_tasks == {}
+        db = session_factory()
+        assert db.query(EventQueue).count() == 0
+        db.close()
+
+
+def _queued_numbers(factory) -> List[int]:
+    db = factory()
+    rows = (
+        db.query(EventQueue)
+        .filter(EventQueue.event_type == EVENT_TRIGGER_FIRED, EventQueue.status == "pending")
+        .order_by(EventQueue.scheduled_for)
+        .all()
+    )
+    numbers = [row.event_data["trigger_data"]["n"] for row in rows]
+    db.close()
+    return numbers
+
+
+class TestDurableTriggerQueue:
+
+    @pytest.mark.asyncio
+    async def test_queue_survives_restart(self, session_factory, trigger_node):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=1)
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+        tasks = await _fire(4)
+
+        await manager.shutdown()
+        executions.release.set()
+        await asyncio.gather(*tasks)
+        assert _queued_numbers(session_factory) == [1, 2, 3]
+
+        # A new manager drains the backlog once the workflow is activated again
+        restarted = FakeExecutions()
+        restarted.release.set()
+        manager = TriggerManager(session_factory, restarted)
+        await manager.activate_workflow("wf")
+        while manager.queued_counts["wf"] or manager._queued_runs:
+            await asyncio.sleep(0.01)
+
+        assert [data["n"] for data in restarted.started] == [1, 2, 3]
+        assert _queued_numbers(session_factory) == []
+        await manager.shutdown()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("policy, expected", [
+        ("spill", [1, 2, 3, 4]),
+        ("drop_oldest", [3, 4]),
+        ("drop_newest", [1, 2]),
+        ("coalesce", [1, 4]),
+    ])
+    async def test_overflow_policies(self, session_factory, trigger_node, policy, expected):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=1, trigger_overflow_policy=policy)
+        executions = FakeExecutions()
+        manager = TriggerManager(session_factory, executions)
+        await manager.activate_workflow("wf")
+        limits = manager._get_limits("wf")
+        manager._limits["wf"] = limits._replace(max_queue_depth=2)
+
+        tasks = await _fire(5)
+
+        assert _queued_numbers(session_factory) == expected
+        stats = manager.get_queue_stats()["wf"]
+        assert stats["queued"] == len(expected) and stats["overflow_policy"] == policy
+        assert stats["oldest_age_seconds"] >= 0
+        if policy in ("drop_oldest", "drop_newest"):
+            assert stats["dropped"] == 2
+        if policy == "coalesce":
+            assert stats["coalesced"] == 2
+
+        await manager.deactivate_workflow("wf")
+        executions.release.set()
+        await asyncio.gather(*tasks)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("failures, expected_status", [(1, "completed"), (10, "failed")])
+    async def test_event_kept_when_execution_fails_to_start(
+        self, session_factory, trigger_node, failures, expected_status
+    ):
+        _add_workflow(session_factory, "wf", max_concurrent_runs=1)
+        executions = FakeExecutions()
+        executions.release.set()
+        attempts = []
+
+        async def flaky_callback(workflow_id, trigger_data, execution_source):
+            attempts.append(trigger_data["n"])
+            if trigger_data["n"] == 1 and attempts.count(1) <= failures:
+                raise RuntimeError("database unavailable")
+            return await executions(workflow_id, trigger_data, execution_source)
+
+        manager = TriggerManager(session_factory, flaky_callback)
+        await manager.activate_workflow("wf")
+        with patch("app.core.execution.trigger_manager.EVENT_RETRY_DELAY", 0.01):
+            manager._execution_started("wf")  # Hold the only slot so the next fire is queued
+            tasks = await _fire(1, start=1)
+            manager._execution_finished("wf")
+            await asyncio.gather(*tasks)
+            for _ in range(200):
+                db = session_factory()
+                status = db.query(EventQueue.status).scalar()
+                db.close()
+                if status == expected_status:
+                    break
+                await asyncio.sleep(0.01)
+
+        db = session_factory()
+        event = db.query(EventQueue).one()
+        db.close()
+        assert event.status == expected_status
+        if expected_status == "completed":
+            assert attempts == [1, 1] and event.retry_count == 1
+        else:
+            assert event.error_message == "database unavailable"
+            assert len(attempts) == event.max_retries + 1
+        await manager.shutdown()
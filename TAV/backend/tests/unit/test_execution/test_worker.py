@@ -0,0 +1,241 @@
+"""
+Unit tests for queue-backed execution workers
+
+Covers EventQueueRepository leasing (claim / heartbeat / complete / fail /
+reclaim of expired leases) and ExecutionWorker job handling with the
+orchestrator dispatch patched out.
+"""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.database.models.event_queue import EventQueue
+from app.database.models.execution import Execution
+from app.database.repositories.event_queue import (
+    EventQueueRepository,
+    STATUS_PENDING,
+    STATUS_PROCESSING,
+    STATUS_COMPLETED,
+    STATUS_FAILED,
+)
+from app.core.execution.worker import (
+    ExecutionWorker,
+    EVENT_EXECUTE_WORKFLOW,
+    enqueue_execution,
+)
+from app.utils.timezone import get_local_now
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def _expire_lease(db, event_id):
+    db.query(EventQueue).filter(EventQueue.id == event_id).update(
+        {EventQueue.locked_until: get_local_now() - timedelta(seconds=1)},
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+# ==================== REPOSITORY ====================
+
+class TestEventQueueRepository:
+
+    def test_claim_sets_lease(self, db):
+        repo = EventQueueRepository(db)
+        event = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {"execution_id": "exec-1"})
+
+        claimed = repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW], limit=5, lease_seconds=30)
+
+        assert [e.id for e in claimed] == [event.id]
+        assert claimed[0].status == STATUS_PROCESSING
+        assert claimed[0].locked_by == "worker-a"
+        assert claimed[0].locked_until is not None
+
+    def test_claimed_event_not_handed_out_twice(self, db):
+        repo = EventQueueRepository(db)
+        repo.enqueue(EVENT_EXECUTE_WORKFLOW, {})
+
+        assert len(repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW])) == 1
+        assert repo.claim("worker-b", [EVENT_EXECUTE_WORKFLOW]) == []
+
+    def test_claim_respects_priority_and_type(self, db):
+        repo = EventQueueRepository(db)
+        low = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {}, priority=9)
+        high = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {}, priority=1)
+        repo.enqueue("other.event", {}, priority=1)
+
+        claimed = repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW], limit=5)
+
+        assert [e.id for e in claimed] == [high.id, low.id]
+
+    def test_claim_skips_future_events(self, db):
+        repo = EventQueueRepository(db)
+        repo.enqueue(EVENT_EXECUTE_WORKFLOW, {}, scheduled_for=get_local_now() + timedelta(minutes=5))
+
+        assert repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW]) == []
+
+    def test_expired_lease_is_reclaimed(self, db):
+        repo = EventQueueRepository(db)
+        event = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {})
+        repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW])
+        _expire_lease(db, event.id)
+
+        claimed = repo.claim("worker-b", [EVENT_EXECUTE_WORKFLOW])
+
+        assert len(claimed) == 1
+        assert claimed[0].locked_by == "worker-b"
+        assert claimed[0].retry_count == 1
+
+    def test_expired_lease_past_max_retries_fails(self, db):
+        db.add(Execution(id="exec-1", workflow_id="wf-1", status="running", started_at=get_local_now()))
+        db.commit()
+        repo = EventQueueRepository(db)
+        event = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {"execution_id": "exec-1"}, max_retries=0)
+        repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW])
+        _expire_lease(db, event.id)
+
+        assert repo.claim("worker-b", [EVENT_EXECUTE_WORKFLOW]) == []
+        db.expire_all()
+        assert repo.get_by_id(event.id).status == STATUS_FAILED
+
+        # The execution it carried does not stay RUNNING forever
+        execution = db.get(Execution, "exec-1")
+        assert execution.status == "failed"
+        assert execution.error_message == "Lease expired too many times (worker lost)"
+
+    def test_heartbeat_only_renews_own_leases(self, db):
+        repo = EventQueueRepository(db)
+        event = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {})
+        repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW])
+
+        assert repo.heartbeat("worker-a", [event.id]) == 1
+        assert repo.heartbeat("worker-b", [event.id]) == 0
+        assert repo.lost_leases("worker-a", [event.id]) == []
+        assert repo.lost_leases("worker-b", [event.id]) == [event.id]
+
+    def test_complete_releases_lease(self, db):
+        repo = EventQueueRepository(db)
+        event = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {})
+        repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW])
+
+        assert repo.complete(event.id, "worker-b") is False
+        assert repo.complete(event.id, "worker-a") is True
+
+        db.expire_all()
+        stored = repo.get_by_id(event.id)
+        assert stored.status == STATUS_COMPLETED
+        assert stored.locked_by is None
+
+    def test_fail_with_retry_delay_requeues(self, db):
+        repo = EventQueueRepository(db)
+        event = repo.enqueue(EVENT_EXECUTE_WORKFLOW, {})
+        repo.claim("worker-a", [EVENT_EXECUTE_WORKFLOW])
+
+        assert repo.fail(event.id, "worker-a", "boom", retry_delay_seconds=60) is True
+
+        db.expire_all()
+        stored = repo.get_by_id(event.id)
+        assert stored.status == STATUS_PENDING
+        assert stored.retry_count == 1
+        assert repo.get_depth(EVENT_EXECUTE_WORKFLOW) == {STATUS_PENDING: 1}
+
+
+# ==================== WORKER ====================
+
+class TestExecutionWorker:
+
+    @pytest.mark.asyncio
+    async def test_poll_once_runs_and_completes_job(self, session_factory, db):
+        enqueue_execution(db, execution_id="exec-1", workflow_id="wf-1", execution_mode="parallel")
+        worker = ExecutionWorker(session_factory=session_factory, concurrency=2, worker_id="worker-a")
+
+        with patch.object(worker, "_dispatch", new=AsyncMock()) as dispatch:
+            assert await worker.poll_once() == 1
+            await asyncio.gather(*worker.running_jobs.values())
+
+        dispatch.assert_awaited_once()
+        event_type, event_data = dispatch.await_args.args
+        assert event_type == EVENT_EXECUTE_WORKFLOW
+        assert event_data["execution_id"] == "exec-1"
+        assert worker.running_jobs == {}
+
+        db.expire_all()
+        assert EventQueueRepository(db).get_depth() == {STATUS_COMPLETED: 1}
+
+    @pytest.mark.asyncio
+    async def test_poll_once_claims_only_free_slots(self, session_factory, db):
+        for i in range(3):
+            enqueue_execution(db, execution_id=f"exec-{i}", workflow_id="wf-1")
+        worker = ExecutionWorker(session_factory=session_factory, concurrency=2, worker_id="worker-a")
+        release = asyncio.Event()
+
+        async def blocked_dispatch(event_type, event_data):
+            await release.wait()
+
+        with patch.object(worker, "_dispatch", new=blocked_dispatch):
+            assert await worker.poll_once() == 2
+            assert await worker.poll_once() == 0
+            release.set()
+            await asyncio.gather(*worker.running_jobs.values())
+
+        db.expire_all()
+        assert EventQueueRepository(db).get_depth() == {STATUS_COMPLETED: 2, STATUS_PENDING: 1}
+
+    @pytest.mark.asyncio
+    async def test_dispatch_error_completes_job_with_error(self, session_factory, db):
+        enqueue_execution(db, execution_id="exec-1", workflow_id="wf-1")
+        worker = ExecutionWorker(session_factory=session_factory, concurrency=1, worker_id="worker-a")
+
+        with patch.object(worker, "_dispatch", new=AsyncMock(side_effect=RuntimeError("boom"))):
+            await worker.poll_once()
+            await asyncio.gather(*worker.running_jobs.values())
+
+        db.expire_all()
+        event = db.query(EventQueue).one()
+        assert event.status == STATUS_COMPLETED
+        assert event.error_message == "boom"
+
+    @pytest.mark.asyncio
+    async def test_reclaimed_lease_cancels_local_job(self, session_factory, db):
+        enqueue_execution(db, execution_id="exec-1", workflow_id="wf-1")
+        worker = ExecutionWorker(session_factory=session_factory, concurrency=1, worker_id="worker-a")
+        cancelled = asyncio.Event()
+
+        async def blocked_dispatch(event_type, event_data):
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        executor = AsyncMock()
+        with patch.object(worker, "_dispatch", new=blocked_dispatch), \
+                patch.dict("app.core.execution.orchestrator._active_executions", {"exec-1": executor}):
+            await worker.poll_once()
+            await asyncio.sleep(0)
+            task = next(iter(worker.running_jobs.values()))
+
+            # Another worker took the job over (e.g. after a long GC pause here)
+            db.query(EventQueue).update({EventQueue.locked_by: "worker-b"}, synchronize_session=False)
+            db.commit()
+
+            await worker.heartbeat_once()
+            await asyncio.wait_for(task, timeout=1)
+
+        assert cancelled.is_set()
+        executor.abandon.assert_awaited_once()
+        assert worker.running_jobs == {}
+
+        # The job is left to its new owner
+        db.expire_all()
+        event = db.query(EventQueue).one()
+        assert event.status == STATUS_PROCESSING
+        assert event.locked_by == "worker-b"
@@ -0,0 +1,192 @@
+"""
+Unit tests for folder watching used by file triggers
+
+Covers the inotify and polling backends, settle detection for files still
+being written, deletions, streamed hashing, and the file polling trigger
+and file listener running on top of the watcher.
+"""
+
+import asyncio
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from app.core.nodes.base import NodeExecutionInput
+from app.core.nodes.builtin.triggers.file_polling_trigger import FilePollingTriggerNode
+from app.schemas.workflow import NodeConfiguration
+from app.utils.file_watcher import FolderWatcher, hash_file
+
+
+BACKENDS = [
+    pytest.param(True, marks=pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")),
+    False,
+]
+
+
+async def _next(watcher: FolderWatcher, timeout: float = 3.0):
+    return await asyncio.wait_for(watcher.events().__anext__(), timeout)
+
+
+def _watcher(folder: Path, use_inotify: bool, **kwargs) -> FolderWatcher:
+    options = dict(pattern="*.txt", poll_interval=0.05, settle_seconds=0.05, use_inotify=use_inotify)
+    options.update(kwargs)
+    return FolderWatcher(folder, **options)
+
+
+class TestFolderWatcher:
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_inotify", BACKENDS)
+    async def test_reports_new_matching_files(self, tmp_path, use_inotify):
+        (tmp_path / "existing.txt").write_text("old")
+        watcher = _watcher(tmp_path, use_inotify, recursive=True)
+        await watcher.start()
+        assert watcher.backend == ("inotify" if use_inotify else "polling")
+
+        (tmp_path / "new.txt").write_text("hello")
+        (tmp_path / "ignored.log").write_text("x")
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "nested.txt").write_text("x")
+
+        names = set()
+        while len(names) < 2:
+            names |= {event.path.name for event in await _next(watcher)}
+        watcher.close()
+
+        assert names == {"new.txt", "nested.txt"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_inotify", BACKENDS)
+    async def test_deleted_file_reported_again_when_recreated(self, tmp_path, use_inotify):
+        watcher = _watcher(tmp_path, use_inotify)
+        await watcher.start()
+        target = tmp_path / "a.txt"
+
+        target.write_text("one")
+        assert [event.path for event in await _next(watcher)] == [target]
+
+        target.unlink()
+        events = await _next(watcher)
+        assert events[0].deleted and events[0].path == target
+
+        target.write_text("one")
+        assert not (await _next(watcher))[0].deleted
+        watcher.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_inotify", BACKENDS)
+    async def test_waits_for_file_to_settle(self, tmp_path, use_inotify):
+        watcher = _watcher(tmp_path, use_inotify, settle_seconds=0.3)
+        await watcher.start()
+        target = tmp_path / "upload.txt"
+
+        events_task = asyncio.create_task(_next(watcher))
+        with open(target, "w") as f:
+            for _ in range(4):
+                f.write("chunk")
+                f.flush()
+                await asyncio.sleep(0.1)
+        assert not events_task.done()
+
+        events = await events_task
+        watcher.close()
+
+        assert events[0].size == len("chunk") * 4
+
+    @pytest.mark.asyncio
+    async def test_include_existing(self, tmp_path):
+        (tmp_path / "existing.txt").write_text("old")
+        watcher = _watcher(tmp_path, use_inotify=False)
+        await watcher.start(include_existing=True)
+
+        assert [event.path.name for event in await _next(watcher)] == ["existing.txt"]
+        watcher.close()
+
+    @pytest.mark.asyncio
+    async def test_network_share_compares_size_only(self, tmp_path):
+        target = tmp_path / "shared.txt"
+        target.write_text("same")
+        with patch("app.utils.file_watcher.NetworkShareAuth.is_unc_path", return_value=True):
+            watcher = _watcher(tmp_path, use_inotify=True)
+        await watcher.start()
+        assert watcher.backend == "polling"
+
+        # Unreliable remote timestamps must not re-trigger an unchanged file
+        stat = target.stat()
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with pytest.raises(asyncio.TimeoutError):
+            await _next(watcher, timeout=0.3)
+
+        target.write_text("grown")
+        events = await _next(watcher)
+        watcher.close()
+
+        assert [event.path for event in events] == [target]
+        assert events[0].signature == (len("grown"), 0)
+
+    def test_hash_file_streams_in_chunks(self, tmp_path):
+        target = tmp_path / "data.bin"
+        content = bytes(range(256)) * 1000
+        target.write_bytes(content)
+
+        assert hash_file(target, chunk_size=1024) == hashlib.sha256(content).hexdigest()
+
+
+def _node(node_class, node_type: str, **config):
+    return node_class(NodeConfiguration(node_id="files", node_type=node_type, name="files", config=config))
+
+
+class TestFileNodes:
+
+    @pytest.mark.asyncio
+    async def test_trigger_fires_with_content_hash(self, tmp_path, session_factory):
+        node = _node(
+            FilePollingTriggerNode, "file_polling_trigger",
+            watch_folder=str(tmp_path), file_pattern="*.txt", polling_interval=1, settle_seconds=0.05,
+        )
+        fired: List[Dict[str, Any]] = []
+
+        async def callback(workflow_id, trigger_data, execution_source):
+            fired.append(trigger_data)
+
+        await node.start_monitoring("wf", callback)
+        await asyncio.sleep(0.1)
+        (tmp_path / "report.txt").write_text("content")
+        for _ in range(100):
+            if fired:
+                break
+            await asyncio.sleep(0.02)
+        await node.stop_monitoring()
+
+        assert fired[0]["file_name"] == "report.txt"
+        assert fired[0]["content_hash"] == hashlib.sha256(b"content").hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_listener_returns_new_file(self, tmp_path):
+        # The processing package pulls in PyMuPDF
+        listener = pytest.importorskip("app.core.nodes.builtin.processing.file_listener")
+        node = _node(listener.FileListenerNode, "file_listener")
+        config = {
+            "watch_folder": str(tmp_path), "file_pattern": "*.csv",
+            "settle_seconds": 0.05, "timeout_seconds": 5,
+        }
+        input_data = NodeExecutionInput(
+            ports={}, workflow_id="wf", execution_id="exec", node_id="files", variables={}, config=config
+        )
+        node.config = config
+
+        async def drop_file():
+            await asyncio.sleep(0.1)
+            (tmp_path / "data.csv").write_text("a,b")
+
+        writer = asyncio.create_task(drop_file())
+        result = await node.execute(input_data)
+        await writer
+
+        assert result["file_name"] == "data.csv"
+        assert "error" not in result
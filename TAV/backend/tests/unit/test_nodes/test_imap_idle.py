@@ -0,0 +1,408 @@
+"""
+Unit tests for the persistent IMAP mailbox and the email trigger's persistent mode
+
+Runs against a small in-process IMAP server (LOGIN, SELECT, UID SEARCH/FETCH/
+STORE, IDLE) so the real imaplib protocol handling is exercised: UID
+cursors, BODYSTRUCTURE parsing, on-demand attachments and IDLE push.
+"""
+
+import asyncio
+import email
+import re
+import socketserver
+import threading
+from email.message import EmailMessage
+from typing import Any, Dict, List
+from unittest.mock import patch
+import imaplib
+
+import pytest
+
+from app.core.nodes.builtin.triggers.email_polling_trigger import EmailPollingTriggerNode
+from app.schemas.workflow import NodeConfiguration
+from app.services.imap_service import IMAPMailbox, IMAPService, _parse_fetch_response, _walk_structure
+
+
+PDF_BYTES = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+
+def _message(subject: str, body: str = "Hello", attachment: bool = False) -> bytes:
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = "Alice <alice@example.com>"
+    msg["To"] = "support@example.com"
+    msg["Message-ID"] = f"<{subject.replace(' ', '-')}@example.com>"
+    msg.set_content(body)
+    msg.add_alternative(f"<p>{body}</p>", subtype="html")
+    if attachment:
+        msg.add_attachment(PDF_BYTES, maintype="application", subtype="pdf", filename="invoice.pdf")
+    return msg.as_bytes()
+
+
+def _structure(part) -> str:
+    """BODYSTRUCTURE of an email.message part"""
+    if part.is_multipart():
+        children = "".join(_structure(child) for child in part.get_payload())
+        return f'({children} "{part.get_content_subtype().upper()}" ("BOUNDARY" "{part.get_boundary()}") NIL NIL NIL)'
+    maintype, subtype = part.get_content_maintype().upper(), part.get_content_subtype().upper()
+    filename = part.get_filename()
+    if maintype == "TEXT":
+        params = f'("CHARSET" "{part.get_content_charset() or "us-ascii"}")'
+    else:
+        params = f'("NAME" "{filename}")' if filename else "NIL"
+    encoding = (part.get("Content-Transfer-Encoding") or "7BIT").upper()
+    body = part.get_payload()
+    fields = f'"{maintype}" "{subtype}" {params} NIL NIL "{encoding}" {len(body.encode())}'
+    if maintype == "TEXT":
+        fields += f" {body.count(chr(10))}"
+    disposition = f'("ATTACHMENT" ("FILENAME" "{filename}"))' if part.get_content_disposition() == "attachment" else "NIL"
+    return f"({fields} NIL {disposition} NIL NIL)"
+
+
+def _section(msg, section: str):
+    part = msg
+    for index in section.split("."):
+        if part.is_multipart():
+            part = part.get_payload()[int(index) - 1]
+    return part.get_payload().encode()
+
+
+class FakeIMAPServer(socketserver.ThreadingTCPServer):
+    """Minimal IMAP4rev1 server with one folder"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, idle: bool = True):
+        super().__init__(("127.0.0.1", 0), FakeIMAPHandler)
+        self.idle = idle
+        self.uidvalidity = 1000
+        self.messages: Dict[int, Dict[str, Any]] = {}
+        self.next_uid = 1
+        self.logins = 0
+        self.commands: List[str] = []
+        self.idlers: List["FakeIMAPHandler"] = []
+        self.lock = threading.Lock()
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def deliver(self, raw: bytes, seen: bool = False) -> int:
+        with self.lock:
+            uid = self.next_uid
+            self.next_uid += 1
+            self.messages[uid] = {"raw": raw, "msg": email.message_from_bytes(raw), "seen": seen}
+            idlers = list(self.idlers)
+        for handler in idlers:
+            handler.send(f"* {len(self.messages)} EXISTS")
+        return uid
+
+
+class FakeIMAPHandler(socketserver.StreamRequestHandler):
+
+    def send(self, line: str):
+        with self.write_lock:
+            self.wfile.write(line.encode() + b"\r\n")
+            self.wfile.flush()
+
+    def handle(self):
+        server: FakeIMAPServer = self.server
+        self.write_lock = threading.Lock()
+        capabilities = "IMAP4rev1" + (" IDLE" if server.idle else "")
+        self.send(f"* OK [CAPABILITY {capabilities}] Fake IMAP ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            tag, command, *rest = line.decode().rstrip("\r\n").split(" ", 2)
+            args = rest[0] if rest else ""
+            command = command.upper()
+            server.commands.append(f"{command} {args}".strip())
+
+            if command == "CAPABILITY":
+                self.send(f"* CAPABILITY {capabilities}")
+            elif command == "LOGIN":
+                server.logins += 1
+            elif command == "SELECT":
+                self.send(f"* {len(server.messages)} EXISTS")
+                self.send(f"* OK [UIDVALIDITY {server.uidvalidity}] UIDs valid")
+                self.send(f"* OK [UIDNEXT {server.next_uid}] Predicted next UID")
+            elif command == "UID":
+                self._uid(tag, args)
+                continue
+            elif command == "IDLE":
+                self.send("+ idling")
+                with server.lock:
+                    server.idlers.append(self)
+                done = self.rfile.readline()
+                with server.lock:
+                    server.idlers.remove(self)
+                if not done:
+                    return
+            elif command == "LOGOUT":
+                self.send("* BYE logging out")
+                self.send(f"{tag} OK LOGOUT completed")
+                return
+            self.send(f"{tag} OK {command} completed")
+
+    def _uid(self, tag: str, args: str):
+        server: FakeIMAPServer = self.server
+        subcommand, args = args.split(" ", 1)
+        subcommand = subcommand.upper()
+        if subcommand == "SEARCH":
+            match = re.match(r"UID (\d+):\*", args)
+            low = int(match.group(1))
+            uids = [uid for uid in server.messages if uid >= low]
+            if "UNSEEN" in args:
+                uids = [uid for uid in uids if not server.messages[uid]["seen"]]
+            if not uids and server.messages:
+                uids = [max(server.messages)]  # n:* includes the highest UID
+            self.send("* SEARCH " + " ".join(map(str, uids)))
+        elif subcommand == "FETCH":
+            uid_set, items = args.split(" ", 1)
+            for uid in map(int, uid_set.split(",")):
+                self._fetch(uid, items)
+        elif subcommand == "STORE":
+            uid_set, _ = args.split(" ", 1)
+            for uid in map(int, uid_set.split(",")):
+                server.messages[uid]["seen"] = True
+        self.send(f"{tag} OK UID {subcommand} completed")
+
+    def _fetch(self, uid: int, items: str):
+        server: FakeIMAPServer = self.server
+        stored = server.messages[uid]
+        msg = stored["msg"]
+        seq = list(server.messages).index(uid) + 1
+        out = f"* {seq} FETCH (UID {uid}".encode()
+        if "FLAGS" in items:
+            out += b" FLAGS (\\Seen)" if stored["seen"] else b" FLAGS ()"
+        if "RFC822.SIZE" in items:
+            out += f" RFC822.SIZE {len(stored['raw'])}".encode()
+        if "BODYSTRUCTURE" in items:
+            out += b" BODYSTRUCTURE " + _structure(msg).encode()
+        header = re.search(r"BODY\.PEEK\[HEADER\.FIELDS \(([^)]*)\)\]", items)
+        if header:
+            wanted = header.group(1).upper().split()
+            data = "".join(f"{k}: {v}\r\n" for k, v in msg.items() if k.upper() in wanted).encode() + b"\r\n"
+            out += f" BODY[HEADER.FIELDS ({header.group(1)})] {{{len(data)}}}\r\n".encode() + data
+        for section in re.findall(r"BODY\.PEEK\[([\d.]+)\]", items):
+            data = _section(msg, section)
+            out += f" BODY[{section}] {{{len(data)}}}\r\n".encode() + data
+        with self.write_lock:
+            self.wfile.write(out + b")\r\n")
+            self.wfile.flush()
+
+
+@pytest.fixture
+def imap_server():
+    server = FakeIMAPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    # Plain IMAP for the local server
+    with patch("imaplib.IMAP4_SSL", imaplib.IMAP4):
+        yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetched_sections(server: FakeIMAPServer) -> List[str]:
+    return [s for command in server.commands for s in re.findall(r"BODY\.PEEK\[([\d.]+)\]", command)]
+
+
+class TestFetchParsing:
+
+    def test_parse_fetch_response_with_literals(self):
+        data = [
+            (b'1 (UID 7 FLAGS (\\Seen) BODY[HEADER.FIELDS (SUBJECT)] {15}', b"Subject: Hi\r\n\r\n"),
+            (b' BODY[1] {5}', b"Hello"),
+            b')',
+            b'2 (UID 9 FLAGS ())',
+        ]
+        messages = _parse_fetch_response(data)
+
+        assert messages[7]["FLAGS"] == ["\\Seen"]
+        assert messages[7]["BODY[HEADER.FIELDS (SUBJECT)]"] == b"Subject: Hi\r\n\r\n"
+        assert messages[7]["BODY[1]"] == b"Hello"
+        assert messages[9]["FLAGS"] == []
+
+    def test_walk_structure_sections(self):
+        msg = email.message_from_bytes(_message("Invoice", attachment=True))
+        structure = _parse_fetch_response([f"1 (UID 1 BODYSTRUCTURE {_structure(msg)})".encode()])[1]["BODYSTRUCTURE"]
+        parts = {part["section"]: part for part in _walk_structure(structure)}
+
+        assert parts["1.1"]["content_type"] == "text/plain"
+        assert parts["1.2"]["content_type"] == "text/html"
+        assert parts["2"]["filename"] == "invoice.pdf"
+        assert parts["2"]["disposition"] == "attachment"
+        assert parts["2"]["encoding"] == "base64"
+
+
+class TestIMAPMailbox:
+
+    @pytest.mark.asyncio
+    async def test_fetches_only_new_uids_without_attachments(self, imap_server):
+        imap_server.deliver(_message("Old"))
+        mailbox = IMAPMailbox("127.0.0.1", imap_server.port, "user", "secret")
+        await mailbox.run(mailbox.connect)
+        assert mailbox.uidvalidity == 1000
+        assert mailbox.uidnext == 2
+
+        uid = imap_server.deliver(_message("Invoice", body="Please pay", attachment=True))
+        emails, last_uid, more = await mailbox.run(mailbox.fetch_new, 1, ["UNSEEN"], 10)
+
+        assert (last_uid, more) == (uid, False)
+        assert [e["subject"] for e in emails] == ["Invoice"]
+        assert emails[0]["content"].strip() == "Please pay"
+        assert emails[0]["html_content"].strip() == "<p>Please pay</p>"
+        assert emails[0]["attachments"][0]["filename"] == "invoice.pdf"
+        assert "2" not in _fetched_sections(imap_server)
+
+        # Nothing new: the "n:*" match on the highest UID is dropped
+        assert await mailbox.run(mailbox.fetch_new, last_uid, ["UNSEEN"], 10) == ([], last_uid, False)
+
+        attachment = emails[0]["attachments"][0]
+        content = await mailbox.run(mailbox.fetch_part, uid, attachment["section"], attachment["encoding"])
+        assert content == PDF_BYTES
+        assert not imap_server.messages[uid]["seen"]
+        await mailbox.aclose()
+
+    @pytest.mark.asyncio
+    async def test_fetch_new_respects_limit(self, imap_server):
+        for i in range(3):
+            imap_server.deliver(_message(f"Mail {i}"))
+        mailbox = IMAPMailbox("127.0.0.1", imap_server.port, "user", "secret")
+        await mailbox.run(mailbox.connect)
+
+        emails, last_uid, more = await mailbox.run(mailbox.fetch_new, 0, ["ALL"], 2)
+        assert ([e["subject"] for e in emails], last_uid, more) == (["Mail 0", "Mail 1"], 2, True)
+        emails, last_uid, more = await mailbox.run(mailbox.fetch_new, last_uid, ["ALL"], 2)
+        assert ([e["subject"] for e in emails], last_uid, more) == (["Mail 2"], 3, False)
+        await mailbox.aclose()
+
+    @pytest.mark.asyncio
+    async def test_idle_returns_on_new_mail(self, imap_server):
+        mailbox = IMAPMailbox("127.0.0.1", imap_server.port, "user", "secret")
+        await mailbox.run(mailbox.connect)
+        assert mailbox.supports_idle
+
+        idle = asyncio.create_task(mailbox.run(mailbox.idle, 30))
+        await asyncio.sleep(0.2)
+        assert not idle.done()
+        imap_server.deliver(_message("Pushed"))
+
+        assert await asyncio.wait_for(idle, 5) is True
+        # Timeout ends IDLE without changes
+        assert await mailbox.run(mailbox.idle, 0.1) is False
+        await mailbox.aclose()
+
+    @pytest.mark.asyncio
+    async def test_service_fetch_attachment(self, imap_server):
+        uid = imap_server.deliver(_message("Invoice", attachment=True))
+
+        content = await IMAPService().fetch_attachment(
+            "user", "secret", uid, "2", "base64",
+            provider="custom", imap_server="127.0.0.1", imap_port=imap_server.port, uidvalidity=1000
+        )
+        assert content == PDF_BYTES
+
+        with pytest.raises(ValueError):
+            await IMAPService().fetch_attachment(
+                "user", "secret", uid, "2", "base64",
+                provider="custom", imap_server="127.0.0.1", imap_port=imap_server.port, uidvalidity=1
+            )
+
+
+class TestPersistentTrigger:
+
+    def _node(self, port: int, **config) -> EmailPollingTriggerNode:
+        EmailPollingTriggerNode._mailbox_cursors.pop("mail", None)
+        return EmailPollingTriggerNode(NodeConfiguration(
+            node_id="mail", node_type="email_polling_trigger", name="mail",
+            config={
+                "connection_mode": "persistent", "provider": "custom", "custom_imap_server": "127.0.0.1",
+                "custom_imap_port": port, "email_address": "user", "password": "secret", **config,
+            },
+        ))
+
+    async def _wait_for(self, fired: List[Dict[str, Any]], count: int):
+        for _ in range(200):
+            if len(fired) >= count:
+                return
+            await asyncio.sleep(0.02)
+
+    @pytest.mark.asyncio
+    async def test_idle_push_over_one_connection(self, imap_server):
+        imap_server.deliver(_message("Existing"))
+        node = self._node(imap_server.port, mark_as_read=True)
+        fired: List[Dict[str, Any]] = []
+
+        async def callback(workflow_id, trigger_data, execution_source):
+            fired.append(trigger_data)
+
+        await node.start_monitoring("wf", callback)
+        for subject in ("First", "Second"):
+            for _ in range(100):
+                if imap_server.idlers:
+                    break
+                await asyncio.sleep(0.02)
+            imap_server.deliver(_message(subject, attachment=True))
+            await self._wait_for(fired, 2 if subject == "Second" else 1)
+        await node.stop_monitoring()
+
+        assert [data["subject"] for data in fired] == ["First", "Second"]
+        assert fired[0]["attachments"][0]["section"] == "2"
+        assert imap_server.logins == 1
+        assert "2" not in _fetched_sections(imap_server)
+        assert [imap_server.messages[uid]["seen"] for uid in (1, 2, 3)] == [False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_polls_without_idle_and_resumes_cursor(self, imap_server):
+        imap_server.idle = False
+        imap_server.deliver(_message("Existing"))
+        node = self._node(imap_server.port, ignore_existing=False, polling_interval=0.05, only_unread=False)
+        fired: List[str] = []
+
+        async def callback(workflow_id, trigger_data, execution_source):
+            fired.append(trigger_data["subject"])
+
+        await node.start_monitoring("wf", callback)
+        await self._wait_for(fired, 1)
+        imap_server.deliver(_message("Polled"))
+        await self._wait_for(fired, 2)
+        await node.stop_monitoring()
+        assert fired == ["Existing", "Polled"]
+
+        # Restart within the process: cursor kept, nothing fires again
+        await node.start_monitoring("wf", callback)
+        await asyncio.sleep(0.3)
+        await node.stop_monitoring()
+        assert fired == ["Existing", "Polled"]
+        assert not any(command.startswith("IDLE") for command in imap_server.commands)
+
+    @pytest.mark.asyncio
+    async def test_failed_fire_retried_after_reconnect(self, imap_server):
+        imap_server.idle = False
+        imap_server.deliver(_message("Flaky"))
+        node = self._node(
+            imap_server.port, ignore_existing=False, polling_interval=0.05, only_unread=False, mark_as_read=True
+        )
+        attempts: List[bool] = []
+
+        async def callback(workflow_id, trigger_data, execution_source):
+            attempts.append(imap_server.messages[1]["seen"])
+            if len(attempts) == 1:
+                raise RuntimeError("executor unavailable")
+
+        await node.start_monitoring("wf", callback)
+        for _ in range(200):
+            if len(attempts) >= 2 and imap_server.messages[1]["seen"]:
+                break
+            await asyncio.sleep(0.02)
+        await node.stop_monitoring()
+
+        # Neither marked as read nor skipped by the cursor after the failed fire
+        assert attempts == [False, False]
+        assert imap_server.messages[1]["seen"]
+        assert imap_server.logins == 2
+        assert EmailPollingTriggerNode._mailbox_cursors["mail"] == (1000, 1)
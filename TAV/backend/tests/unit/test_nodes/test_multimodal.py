@@ -0,0 +1,157 @@
+"""
+Unit tests for multimodal MediaFormat helpers
+
+Focus on lazy file-backed media (MediaHandle) and on materialization
+helpers working the same for file, base64 and text media.
+"""
+
+import base64
+import json
+from pathlib import Path
+
+import pytest
+
+from app.core.nodes.multimodal import (
+    MediaHandle,
+    ImageFormatter,
+    VideoFormatter,
+    DocumentFormatter,
+    TextFormatter,
+    auto_format_media,
+    extract_media_data,
+    extract_content,
+    is_media_format,
+    media_bytes,
+    media_base64,
+    open_media,
+)
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(b"\x00\x01video-bytes" * 100)
+    return path
+
+
+class TestMediaHandle:
+    """Test lazy file-backed MediaFormat"""
+
+    def test_is_standard_file_path_media_format(self, video_file):
+        """Test that a handle looks like any file_path MediaFormat"""
+        handle = MediaHandle(video_file)
+
+        assert is_media_format(handle)
+        assert handle["type"] == "video"
+        assert handle["format"] == "mp4"
+        assert handle["data_type"] == "file_path"
+        assert handle["data"] == str(video_file)
+        assert handle["metadata"]["size_bytes"] == video_file.stat().st_size
+
+    def test_json_serializable(self, video_file):
+        """Test that a handle persists like a plain dict"""
+        handle = MediaHandle(video_file, metadata={"duration": 3})
+
+        restored = json.loads(json.dumps(handle))
+
+        assert restored == dict(handle)
+        assert restored["metadata"]["duration"] == 3
+
+    def test_materializes_on_demand(self, video_file):
+        """Test bytes, base64, chunks and mmap access"""
+        handle = MediaHandle(video_file)
+        content = video_file.read_bytes()
+
+        assert handle.read_bytes() == content
+        assert base64.b64decode(handle.to_base64()) == content
+        assert b"".join(handle.iter_chunks(chunk_size=64)) == content
+        with handle.mmap() as view:
+            assert view[:2] == b"\x00\x01"
+            assert len(view) == len(content)
+
+    def test_missing_file_has_no_size(self, tmp_path):
+        """Test that handles can point at files that do not exist yet"""
+        handle = MediaHandle(tmp_path / "later.pdf")
+
+        assert handle.size_bytes is None
+        assert handle["type"] == "document"
+
+    def test_formatters_return_handles(self, video_file):
+        """Test that from_file_path formatters are lazy"""
+        assert isinstance(VideoFormatter.from_file_path(str(video_file)), MediaHandle)
+        assert ImageFormatter.from_file_path("/tmp/x.png")["type"] == "image"
+        assert DocumentFormatter.from_file_path("/tmp/x.pdf")["format"] == "pdf"
+
+
+class TestAutoFormatMedia:
+    """Test auto_format_media with file references"""
+
+    def test_existing_file_path_becomes_handle(self, video_file):
+        """Test that a file path string becomes a lazy handle"""
+        result = auto_format_media(str(video_file))
+
+        assert isinstance(result, MediaHandle)
+        assert result["type"] == "video"
+
+    def test_path_object_becomes_handle(self, video_file):
+        """Test that Path objects are treated as file references"""
+        result = auto_format_media(video_file, media_type="document")
+
+        assert isinstance(result, MediaHandle)
+        assert result["type"] == "document"
+
+    def test_handle_passes_through(self, video_file):
+        """Test that already formatted media is returned as-is"""
+        handle = MediaHandle(video_file)
+
+        assert auto_format_media(handle) is handle
+
+    def test_base64_unchanged(self):
+        """Test that base64 data keeps its previous behavior"""
+        result = auto_format_media("aGVsbG8=", media_type="document", format="txt")
+
+        assert result["data_type"] == "base64"
+        assert result["data"] == "aGVsbG8="
+
+
+class TestMaterialization:
+    """Test extract_media_data / media_bytes / media_base64 / open_media"""
+
+    def test_extract_media_data_default_returns_stored_data(self, video_file):
+        """Test that extract_media_data keeps returning the stored value"""
+        assert extract_media_data(MediaHandle(video_file)) == str(video_file)
+        assert extract_content(MediaHandle(video_file)) == str(video_file)
+
+    def test_extract_media_data_materializes(self, video_file):
+        """Test materialize="bytes"/"base64" for file-backed media"""
+        handle = MediaHandle(video_file)
+        content = video_file.read_bytes()
+
+        assert extract_media_data(handle, materialize="bytes") == content
+        assert extract_media_data(handle, materialize="base64") == base64.b64encode(content).decode()
+
+    def test_plain_dict_copy_still_works(self, video_file):
+        """Test that helpers work after the handle is copied into a plain dict"""
+        plain = dict(MediaHandle(video_file))
+
+        assert media_bytes(plain) == video_file.read_bytes()
+        with open_media(plain) as f:
+            assert f.read(2) == b"\x00\x01"
+
+    def test_base64_media(self):
+        """Test materializing inline base64 media"""
+        media = DocumentFormatter.from_base64(base64.b64encode(b"pdf-bytes").decode(), format="pdf")
+
+        assert media_bytes(media) == b"pdf-bytes"
+        assert media_base64(media) is media["data"]
+        with open_media(media) as f:
+            assert f.read() == b"pdf-bytes"
+
+    def test_text_media(self):
+        """Test materializing text media"""
+        assert media_bytes(TextFormatter.format("héllo")) == "héllo".encode("utf-8")
+
+    def test_url_media_not_materialized(self):
+        """Test that URL media must be fetched by the consumer"""
+        with pytest.raises(ValueError):
+            media_bytes(ImageFormatter.from_url("https://example.com/a.png"))
@@ -0,0 +1,116 @@
+"""
+Unit tests for the cached node catalog
+
+Covers building /nodes/definitions once per registry version, ETag
+revalidation with 304 responses, precompressed bodies and invalidation when
+nodes are (re-)registered.
+"""
+
+import gzip
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.api.v1.endpoints import nodes as nodes_endpoint
+from app.core.nodes.base import Node, NodeExecutionInput
+from app.core.nodes.registry import NodeRegistry
+
+DEFINITIONS_URL = "/api/v1/nodes/definitions"
+
+
+class CatalogNode(Node):
+    """Catalog test node"""
+
+    @classmethod
+    def get_config_schema(cls):
+        return {"mode": {"type": "string", "default": "fast"}}
+
+    async def execute(self, input_data: NodeExecutionInput):
+        return {"output": "ok"}
+
+
+@pytest.fixture
+def client():
+    NodeRegistry.clear()
+    NodeRegistry.register("catalog_node", CatalogNode, display_name="Catalog Node", category="processing")
+    yield TestClient(app)
+    NodeRegistry.clear()
+
+
+def _get(client, **headers):
+    headers.setdefault("Accept-Encoding", "identity")
+    return client.get(DEFINITIONS_URL, headers=headers)
+
+
+class TestNodeCatalogCache:
+
+    def test_catalog_built_once_per_registry_version(self, client):
+        with patch.object(nodes_endpoint, "_build_node_definitions", wraps=nodes_endpoint._build_node_definitions) as build:
+            first = _get(client)
+            second = _get(client)
+
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content
+        assert build.call_count == 1
+        assert first.json()["nodes"][0]["config_schema"]["mode"]["default"] == "fast"
+
+    def test_registry_details_cached_per_version(self, client):
+        with patch("app.core.nodes.registry.describe_node_class", wraps=lambda c: {"input_ports": []}) as describe:
+            NodeRegistry.list_all_with_details()
+            NodeRegistry.list_all_with_details()
+            assert describe.call_count == 1
+
+            NodeRegistry.register("catalog_other", CatalogNode)
+            assert set(NodeRegistry.list_all_with_details()) == {"catalog_node", "catalog_other"}
+
+    def test_matching_etag_returns_304(self, client):
+        response = _get(client)
+        etag = response.headers["etag"]
+        assert etag.startswith('"') and not etag.startswith("W/")
+        assert response.headers["cache-control"] == "no-cache"
+
+        not_modified = _get(client, **{"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+
+        assert _get(client, **{"If-None-Match": f'W/{etag}, "other"'}).status_code == 304
+        assert _get(client, **{"If-None-Match": '"other"'}).status_code == 200
+
+    def test_gzip_body_precompressed(self, client):
+        plain = _get(client)
+        compressed = client.get(DEFINITIONS_URL, headers={"Accept-Encoding": "gzip, deflate"})
+
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in compressed.headers["vary"]
+        assert compressed.content == plain.content  # Decoded by the client
+        assert compressed.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+
+        # Either representation's ETag revalidates the other
+        assert _get(client, **{"If-None-Match": compressed.headers["etag"]}).status_code == 304
+
+        assert gzip.decompress(nodes_endpoint._get_catalog_body(None, None).gzip_body) == plain.content
+
+    def test_registry_change_invalidates_catalog(self, client):
+        etag = _get(client).headers["etag"]
+
+        # e.g. custom node hot-reload re-registering a class
+        NodeRegistry.register("catalog_node", CatalogNode, display_name="Catalog Node v2", category="processing")
+        response = _get(client, **{"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()["nodes"][0]["display_name"] == "Catalog Node v2"
+
+    def test_filtered_catalogs_cached_separately(self, client):
+        NodeRegistry.register("catalog_other", CatalogNode, display_name="Other", category="actions")
+
+        everything = client.get(DEFINITIONS_URL).json()
+        actions = client.get(DEFINITIONS_URL, params={"category": "actions"}).json()
+        searched = client.get(DEFINITIONS_URL, params={"search": "catalog"}).json()
+
+        assert everything["total_nodes"] == 2
+        assert [n["node_type"] for n in actions["nodes"]] == ["catalog_other"]
+        assert [n["node_type"] for n in searched["nodes"]] == ["catalog_node"]
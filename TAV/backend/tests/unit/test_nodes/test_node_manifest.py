@@ -0,0 +1,174 @@
+"""
+Unit tests for the node manifest
+
+Covers registering nodes from the cached manifest without importing their
+modules, importing a node module on first use, and rebuilding the manifest
+when node sources change.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.core.nodes.loader import discover_and_register_nodes
+from app.core.nodes.registry import NodeRegistry
+
+NODE_SOURCE = '''
+from app.core.nodes.base import Node
+from app.core.nodes.registry import register_node
+
+
+@register_node(node_type="{node_type}", display_name="{display_name}", category="processing")
+class {class_name}(Node):
+    """{display_name} node"""
+
+    @classmethod
+    def get_input_ports(cls):
+        return [{{"name": "input", "type": "universal", "required": True}}]
+
+    @classmethod
+    def get_config_schema(cls):
+        return {{"mode": {{"type": "string", "default": "fast"}}}}
+
+    async def execute(self, input_data):
+        return {{"output": "{display_name}"}}
+'''
+
+
+def _write_node(package_dir, module: str, node_type: str, display_name: str, class_name: str = "FakeNode"):
+    path = package_dir / f"{module}.py"
+    path.write_text(NODE_SOURCE.format(node_type=node_type, display_name=display_name, class_name=class_name))
+    return path
+
+
+@pytest.fixture
+def node_package(tmp_path):
+    """A throwaway node package on sys.path, with the manifest in tmp_path"""
+    package_dir = tmp_path / "manifest_nodes"
+    package_dir.mkdir()
+    (package_dir / "__init__.py").write_text("")
+    _write_node(package_dir, "alpha", "manifest_alpha", "Alpha", "AlphaNode")
+    _write_node(package_dir, "beta", "manifest_beta", "Beta", "BetaNode")
+
+    sys.path.insert(0, str(tmp_path))
+    NodeRegistry.clear()
+    with patch.object(settings, "NODE_MANIFEST_PATH", str(tmp_path / "node_manifest.json")):
+        yield package_dir
+    NodeRegistry.clear()
+    sys.path.remove(str(tmp_path))
+    for name in [m for m in sys.modules if m.startswith("manifest_nodes")]:
+        del sys.modules[name]
+
+
+def _discover(package_dir):
+    return discover_and_register_nodes([(package_dir, "manifest_nodes")])
+
+
+def _forget_modules():
+    """Simulate a fresh process: registry empty, node modules not imported"""
+    NodeRegistry.clear()
+    for name in [m for m in sys.modules if m.startswith("manifest_nodes.")]:
+        del sys.modules[name]
+
+
+class TestNodeManifest:
+
+    def test_manifest_built_on_first_discovery(self, node_package):
+        stats = _discover(node_package)
+
+        assert stats["manifest"] == "rebuilt"
+        assert stats["modules_imported"] == 2
+        manifest = json.loads((node_package.parent / "node_manifest.json").read_text())
+        assert set(manifest["nodes"]) == {"manifest_alpha", "manifest_beta"}
+        alpha = manifest["nodes"]["manifest_alpha"]
+        assert alpha["module"] == "manifest_nodes.alpha" and alpha["class_name"] == "AlphaNode"
+        assert alpha["details"]["config_schema"]["mode"]["default"] == "fast"
+
+    def test_unchanged_sources_register_without_importing(self, node_package):
+        _discover(node_package)
+        _forget_modules()
+
+        stats = _discover(node_package)
+
+        assert stats["manifest"] == "hit"
+        assert stats["modules_imported"] == 0
+        assert "manifest_nodes.alpha" not in sys.modules
+        assert NodeRegistry.is_registered("manifest_alpha")
+        assert not NodeRegistry.is_loaded("manifest_alpha")
+        assert NodeRegistry.get_metadata("manifest_alpha")["display_name"] == "Alpha"
+
+        details = NodeRegistry.list_all_with_details()["manifest_beta"]
+        assert details["input_ports"][0]["name"] == "input"
+        assert details["docstring"] == "Beta node"
+        assert "manifest_nodes.beta" not in sys.modules
+
+    def test_module_imported_on_first_use(self, node_package):
+        _discover(node_package)
+        _forget_modules()
+        _discover(node_package)
+
+        node_class = NodeRegistry.get("manifest_alpha")
+
+        assert node_class.__name__ == "AlphaNode"
+        assert NodeRegistry.is_loaded("manifest_alpha")
+        assert "manifest_nodes.alpha" in sys.modules
+        assert "manifest_nodes.beta" not in sys.modules
+
+    def test_first_use_after_registry_clear(self, node_package):
+        # Module stays imported, so @register_node does not run again
+        _discover(node_package)
+        NodeRegistry.clear()
+        _discover(node_package)
+
+        assert NodeRegistry.get("manifest_beta").__name__ == "BetaNode"
+
+    def test_changed_source_rebuilds_manifest(self, node_package):
+        _discover(node_package)
+        _forget_modules()
+        path = _write_node(node_package, "alpha", "manifest_alpha", "Alpha Renamed", "AlphaNode")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _write_node(node_package, "gamma", "manifest_gamma", "Gamma", "GammaNode")
+
+        stats = _discover(node_package)
+
+        assert stats["manifest"] == "rebuilt"
+        assert NodeRegistry.get_metadata("manifest_alpha")["display_name"] == "Alpha Renamed"
+        assert NodeRegistry.is_registered("manifest_gamma")
+
+        _forget_modules()
+        assert _discover(node_package)["manifest"] == "hit"
+        assert NodeRegistry.get_metadata("manifest_alpha")["display_name"] == "Alpha Renamed"
+
+    def test_failed_module_retried_on_each_discovery(self, node_package):
+        (node_package / "broken.py").write_text("import module_that_does_not_exist\n")
+        stats = _discover(node_package)
+        assert len(stats["errors"]) == 1
+        _forget_modules()
+
+        stats = _discover(node_package)
+
+        assert stats["manifest"] == "hit"
+        assert len(stats["errors"]) == 1
+        assert "manifest_nodes.alpha" not in sys.modules
+
+    def test_manifest_disabled(self, node_package):
+        with patch.object(settings, "NODE_MANIFEST_PATH", ""):
+            stats = _discover(node_package)
+
+        assert stats["manifest"] == "disabled"
+        assert NodeRegistry.is_loaded("manifest_alpha")
+        assert not (node_package.parent / "node_manifest.json").exists()
+
+    def test_failed_import_on_first_use_unregisters_node(self, node_package):
+        _discover(node_package)
+        _forget_modules()
+        _discover(node_package)
+        (node_package / "alpha.py").write_text("raise ImportError('dependency missing')\n")
+
+        assert NodeRegistry.get("manifest_alpha") is None
+        assert not NodeRegistry.is_registered("manifest_alpha")
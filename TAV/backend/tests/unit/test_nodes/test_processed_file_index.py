@@ -0,0 +1,134 @@
+"""
+Unit tests for the processed-file index of file polling triggers
+
+Covers the repository (record, load, tombstones, compaction) and trigger
+restarts resuming from the index without firing again.
+"""
+
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, List
+from unittest.mock import patch
+
+import pytest
+
+from app.database.models.processed_file import ProcessedFile
+from app.database.repositories.processed_file import (
+    ProcessedFileRepository, STATUS_IGNORED, STATUS_TRIGGERED, STATUS_MOVED, STATUS_DELETED
+)
+from app.core.nodes.builtin.triggers.file_polling_trigger import FilePollingTriggerNode
+from app.schemas.workflow import NodeConfiguration
+from app.utils.timezone import get_local_now
+
+
+def _entry(path: str, size: int = 1, mtime_ns: int = 1000) -> Dict[str, Any]:
+    return {"path": path, "size_bytes": size, "mtime_ns": mtime_ns}
+
+
+class TestProcessedFileRepository:
+
+    def test_record_and_load(self, session_factory):
+        repo = ProcessedFileRepository(session_factory())
+        repo.record(None, "trigger", [_entry("/in/a.pdf"), _entry("/in/b.pdf", size=2)])
+        repo.record(None, "trigger", [_entry("/in/a.pdf", size=5, mtime_ns=2000)])
+        repo.record(None, "other", [_entry("/in/c.pdf")])
+
+        assert repo.load(None, "trigger") == {"/in/a.pdf": (5, 2000), "/in/b.pdf": (2, 1000)}
+        assert repo.count(None, "trigger") == 2
+
+    def test_deleted_and_moved_files_not_loaded(self, session_factory):
+        repo = ProcessedFileRepository(session_factory())
+        repo.record(None, "trigger", [_entry("/in/a.pdf"), _entry("/in/b.pdf")])
+        repo.record(None, "trigger", [_entry("/in/c.pdf")], status=STATUS_MOVED)
+
+        assert repo.mark_deleted(None, "trigger", ["/in/a.pdf", "/in/c.pdf"]) == 1
+
+        statuses = {row.path: row.status for row in repo.db.query(ProcessedFile)}
+        assert statuses == {"/in/a.pdf": STATUS_DELETED, "/in/b.pdf": STATUS_TRIGGERED, "/in/c.pdf": STATUS_MOVED}
+        assert list(repo.load(None, "trigger")) == ["/in/b.pdf"]
+
+    def test_compact_by_retention(self, session_factory):
+        repo = ProcessedFileRepository(session_factory())
+        repo.record(None, "trigger", [_entry("/in/old.pdf"), _entry("/in/kept.pdf")], status=STATUS_MOVED)
+        repo.record(None, "trigger", [_entry("/in/present.pdf")])
+        repo.db.query(ProcessedFile).filter(ProcessedFile.path != "/in/kept.pdf").update(
+            {"updated_at": get_local_now() - timedelta(days=40)}, synchronize_session=False
+        )
+        repo.db.commit()
+
+        assert repo.compact(retention_days=30, max_entries=0) == 1
+        assert {row.path for row in repo.db.query(ProcessedFile)} == {"/in/kept.pdf", "/in/present.pdf"}
+
+    def test_compact_by_size_keeps_present_files(self, session_factory):
+        repo = ProcessedFileRepository(session_factory())
+        repo.record(None, "trigger", [_entry(f"/in/gone-{i}.pdf") for i in range(5)], status=STATUS_MOVED)
+        repo.record(None, "trigger", [_entry(f"/in/present-{i}.pdf") for i in range(3)], status=STATUS_IGNORED)
+
+        assert repo.compact(retention_days=0, max_entries=4) == 4
+        assert repo.count(None, "trigger") == 4
+        assert len(repo.load(None, "trigger")) == 3
+
+
+class TestTriggerRestart:
+
+    async def _run(self, folder, fire_files=(), **config) -> List[str]:
+        """Run a trigger node briefly, dropping fire_files into the folder"""
+        node = FilePollingTriggerNode(NodeConfiguration(
+            node_id="files", node_type="file_polling_trigger", name="files",
+            config={"watch_folder": str(folder), "file_pattern": "*.txt", "settle_seconds": 0.05, **config},
+        ))
+        fired: List[str] = []
+
+        async def callback(workflow_id, trigger_data, execution_source):
+            fired.append(trigger_data["file_name"])
+
+        await node.start_monitoring(None, callback)
+        await asyncio.sleep(0.2)
+        for name in fire_files:
+            (folder / name).write_text(name)
+        await asyncio.sleep(0.3)
+        await node.stop_monitoring()
+        return sorted(fired)
+
+    @pytest.mark.asyncio
+    async def test_resumes_without_duplicates(self, session_factory, tmp_path):
+        (tmp_path / "existing.txt").write_text("old")
+
+        assert await self._run(tmp_path, ["first.txt"]) == ["first.txt"]
+
+        # Arrived while the workflow was stopped
+        (tmp_path / "offline.txt").write_text("new")
+        assert await self._run(tmp_path) == ["offline.txt"]
+        assert await self._run(tmp_path) == []
+
+        statuses = {row.path.rsplit("/", 1)[-1]: row.status for row in session_factory().query(ProcessedFile)}
+        assert statuses == {"existing.txt": STATUS_IGNORED, "first.txt": STATUS_TRIGGERED, "offline.txt": STATUS_TRIGGERED}
+
+    @pytest.mark.asyncio
+    async def test_changed_and_reuploaded_files_trigger_again(self, session_factory, tmp_path):
+        (tmp_path / "report.txt").write_text("v1")
+        assert await self._run(tmp_path, ignore_existing=False) == ["report.txt"]
+
+        (tmp_path / "report.txt").write_text("version 2")
+        assert await self._run(tmp_path, ignore_existing=False) == ["report.txt"]
+
+        (tmp_path / "report.txt").unlink()
+        assert await self._run(tmp_path, ["report.txt"], ignore_existing=False) == ["report.txt"]
+
+    @pytest.mark.asyncio
+    async def test_unreadable_index_is_retried_not_treated_as_empty(self, session_factory, tmp_path):
+        (tmp_path / "report.txt").write_text("v1")
+        assert await self._run(tmp_path, ignore_existing=False) == ["report.txt"]
+
+        load = ProcessedFileRepository.load
+        calls = []
+
+        def flaky_load(repo, *args):
+            calls.append(args)
+            if len(calls) == 1:
+                raise RuntimeError("database unavailable")
+            return load(repo, *args)
+
+        with patch.object(ProcessedFileRepository, "load", flaky_load):
+            assert await self._run(tmp_path, ignore_existing=False, polling_interval=0.05) == []
+        assert len(calls) == 2
@@ -6,13 +6,17 @@ Tests variable references, templates, and system variables.
 
 import pytest
 from datetime import datetime
+from unittest.mock import patch
 from app.core.nodes.variables import (
     get_system_variable,
     resolve_variable,
     resolve_template,
     resolve_config_value,
     get_available_variables,
-    get_variable_paths
+    get_variable_paths,
+    compile_template,
+    _resolve_template_two_pass,
+    SystemVariables
 )
 
 
@@ -428,3 +432,81 @@ class TestGetVariablePaths:
         assert "node1.nested" in result
         assert len(result) == 2
 
+
+class TestCompiledTemplates:
+    """Test precompiled template resolution"""
+    
+    VARIABLES = {
+        "_nodes": {
+            "node1": {"name": "John", "items": [{"sku": "A1"}]},
+        },
+        "trigger_data": {"order_id": "12345"}
+    }
+    
+    @pytest.mark.parametrize("template", [
+        "plain text",
+        "Hello {{node1.name}}",
+        "{{ node1.name }} / {{node1.items.0.sku}} / {{trigger.order_id}}",
+        "Today is {current_date}, year {{system.year}}",
+        "{unknown} { current_date } {{missing.field}} {{nodot}}",
+        "{{a {current_date} b}}",
+        "{{{node1.name}}}",
+        '{"json": {"key": "value"}}',
+    ])
+    def test_matches_two_pass_resolution(self, template):
+        """Test compiled resolution matches the two-pass regex resolver"""
+        fixed_now = datetime(2024, 1, 15, 9, 30, 0)
+        with patch("app.core.nodes.variables.datetime") as mock_datetime:
+            mock_datetime.now.return_value = fixed_now
+            compiled = resolve_template(template, self.VARIABLES)
+            two_pass = _resolve_template_two_pass(template, self.VARIABLES)
+        
+        assert compiled == two_pass
+    
+    def test_compiled_template_is_cached(self):
+        """Test that the same template string compiles once"""
+        template = "Cached {{node1.name}}"
+        
+        assert compile_template(template) is compile_template(template)
+    
+    def test_static_template(self):
+        """Test that templates without placeholders are marked static"""
+        assert compile_template("no placeholders here").is_static
+        assert not compile_template("{{node1.name}}").is_static
+    
+    def test_spanning_placeholder_falls_back(self):
+        """Test that a {{...}} spanning a system variable is not compiled"""
+        assert compile_template("{{a {current_date} b}}") is None
+    
+    def test_system_variables_computed_once_per_resolution(self):
+        """Test that one resolution takes a single datetime.now()"""
+        with patch("app.core.nodes.variables.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 15, 9, 30, 0)
+            result = resolve_template("{current_date} {current_time} {year} {{system.month}}", {})
+        
+        assert result == "2024-01-15 09:30:00 2024 1"
+        assert mock_datetime.now.call_count == 1
+    
+    def test_system_variables_lazy(self):
+        """Test that unknown names never touch the clock"""
+        with patch("app.core.nodes.variables.datetime") as mock_datetime:
+            assert SystemVariables().get("not_a_variable") is None
+        
+        mock_datetime.now.assert_not_called()
+    
+    def test_repeated_resolution_is_single_pass(self):
+        """Test that resolving a cached template never re-runs the regex passes"""
+        template = "Hello {{node1.name}}, order #{{trigger.order_id}} on {current_date} ({{node1.items.0.sku}})"
+        with patch("app.core.nodes.variables.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2024, 1, 15, 9, 30, 0)
+            expected = _resolve_template_two_pass(template, self.VARIABLES)
+            compile_template(template)
+            hits = compile_template.cache_info().hits
+            
+            with patch("app.core.nodes.variables._SYSTEM_PLACEHOLDER") as system_pattern, \
+                    patch("app.core.nodes.variables._NODE_PLACEHOLDER") as node_pattern:
+                results = [resolve_template(template, self.VARIABLES) for _ in range(3)]
+        
+        assert results == [expected] * 3
+        assert system_pattern.method_calls == [] and node_pattern.method_calls == []
+        assert compile_template.cache_info().hits == hits + 3
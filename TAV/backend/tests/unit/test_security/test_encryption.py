@@ -231,3 +231,25 @@ class TestEncryptionRoundTrip:
         
         assert decrypted == original
 
+
+
+class TestCipherCache:
+    """Test process-level caching of the Fernet cipher"""
+    
+    def test_cipher_is_reused_across_calls(self):
+        """Test that the cipher is built once per encryption key"""
+        from app.security.encryption import _get_fernet
+        
+        assert _get_fernet() is _get_fernet()
+    
+    def test_changed_key_gets_new_cipher(self):
+        """Test that changing ENCRYPTION_KEY does not reuse the old cipher"""
+        from app.config import settings
+        
+        encrypted = encrypt_value("secret")
+        
+        with patch.object(settings, "ENCRYPTION_KEY", "another-encryption-key-32-chars!!"):
+            with pytest.raises(ValueError):
+                decrypt_value(encrypted)
+        
+        assert decrypt_value(encrypted) == "secret"
@@ -79,8 +79,10 @@ export default function SettingsDemo() {
       max_concurrent_nodes: 5,
       ai_concurrent_limit: 1,
       max_concurrent_runs_global: 8,
+      max_queued_runs_global: 100,
       max_concurrent_runs_per_workflow: 20,
       max_queue_depth_per_workflow: 200,
+      trigger_overflow_policy: "spill",
       default_timeout: 300,
       http_timeout: 60,
       workflow_timeout: 1800,
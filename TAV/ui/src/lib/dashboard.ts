@@ -20,6 +20,7 @@ export interface Workflow {
   last_run_at: string | null;
   progress?: number; // Progress percentage (0-100)
   is_running?: boolean; // Whether workflow is currently executing
+  queue_position?: number; // Position in the admission queue while waiting for an execution slot
   recommended_await_completion: string; // Recommended X-Await-Completion header value, defaults to "false"
 }
 
@@ -116,9 +117,20 @@ export async function fetchActiveExecutions(): Promise<any> {
 export async function fetchWorkflowsWithProgress(): Promise<Workflow[]> {
   const [workflows, activeData] = await Promise.all([
     fetchWorkflows(),
-    fetchActiveExecutions().catch(() => ({ active_executions: [], monitoring_workflows: [] }))
+    fetchActiveExecutions().catch(() => ({ active_executions: [], monitoring_workflows: [], queued_executions: [] }))
   ]);
   
+  // Queued executions (waiting for a global execution slot) - earliest position per workflow
+  const queueMap = new Map<string, number>();
+  if (activeData.queued_executions) {
+    activeData.queued_executions.forEach((entry: any) => {
+      const current = queueMap.get(entry.workflow_id);
+      if (current === undefined || entry.position < current) {
+        queueMap.set(entry.workflow_id, entry.position);
+      }
+    });
+  }
+  
   // Create a map of workflow_id -> progress info
   const progressMap = new Map<string, { progress: number; is_running: boolean }>();
   
@@ -149,6 +161,17 @@ export async function fetchWorkflowsWithProgress(): Promise<Workflow[]> {
   // Merge progress into workflows
   return workflows.map(workflow => {
     const activeProgress = progressMap.get(workflow.id);
+    const queuePosition = queueMap.get(workflow.id);
+    
+    // Waiting for a slot and nothing running yet
+    if (!activeProgress && queuePosition !== undefined) {
+      return {
+        ...workflow,
+        progress: 0,
+        is_running: true,
+        queue_position: queuePosition
+      };
+    }
     
     // If we have active execution data, use it (takes priority over database status)
     if (activeProgress) {
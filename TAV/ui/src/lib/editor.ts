@@ -396,8 +396,10 @@ export interface ExecutionSettings {
   max_concurrent_nodes: number;
   ai_concurrent_limit: number;
   max_concurrent_runs_global: number;
+  max_queued_runs_global: number;
   max_concurrent_runs_per_workflow: number;
   max_queue_depth_per_workflow: number;
+  trigger_overflow_policy: "spill" | "drop_oldest" | "drop_newest" | "coalesce";
   
   // Timeouts & Limits
   default_timeout: number;